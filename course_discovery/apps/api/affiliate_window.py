@@ -0,0 +1,178 @@
+"""
+Affiliate Window product feeds, which are streamed from the database or pre-generated into compressed files.
+"""
+import gzip
+import hashlib
+import logging
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from course_discovery.apps.api import serializers
+from course_discovery.apps.api.cache import get_accepted_encodings
+from course_discovery.apps.api.renderers import AffiliateWindowXMLRenderer
+from course_discovery.apps.core.utils import iterate_in_chunks
+from course_discovery.apps.course_metadata.models import CourseRun, CourseType, ProgramType, Seat
+
+logger = logging.getLogger(__name__)
+FEED_CONTENT_TYPE = 'application/xml; charset=utf-8'
+FEED_STORAGE_PREFIX = 'affiliate_window'
+FEED_READ_SIZE = 64 * 1024
+
+
+def get_seats(catalog, exclude_2u_products=False):
+    """
+    Returns the verified and professional seats of the active, marketable course runs of a catalog's courses.
+    """
+    courses = catalog.courses()
+    if exclude_2u_products:
+        courses = courses.exclude(type__slug__in=[CourseType.EXECUTIVE_EDUCATION_2U, CourseType.BOOTCAMP_2U])
+
+    course_runs = CourseRun.objects.filter(course__in=courses).active().marketable()
+    seats = Seat.objects.filter(type__in=[Seat.VERIFIED, Seat.PROFESSIONAL]).filter(course_run__in=course_runs)
+    return seats.select_related(
+        'course_run',
+        'course_run__language',
+        'course_run__course',
+        'course_run__course__level_type',
+        'course_run__course__partner',
+        'course_run__course__type',
+        'course_run__type',
+        'type',
+    ).prefetch_related(
+        'course_run__course__authoring_organizations',
+        'course_run__course__subjects',
+    )
+
+
+def get_programs(catalog):
+    """
+    Returns the marketable programs of a catalog, except degrees, licenses and certificates.
+    """
+    exclude_type_slugs = [
+        ProgramType.MASTERS, ProgramType.BACHELORS, ProgramType.DOCTORATE,
+        ProgramType.LICENSE, ProgramType.CERTIFICATE
+    ]
+    exclude_types = ProgramType.objects.filter(slug__in=exclude_type_slugs)
+
+    return catalog.programs().marketable().exclude(type__in=exclude_types).select_related(
+        'type',
+        'partner',
+    ).prefetch_related(
+        'excluded_course_runs',
+        'type__applicable_seat_types',
+        'type__translations',
+        'courses',
+        'courses__course_runs',
+        'courses__course_runs__language',
+        'courses__canonical_course_run',
+        'courses__canonical_course_run__seats',
+        'courses__canonical_course_run__seats__course_run__course',
+        'courses__canonical_course_run__seats__type',
+        'courses__canonical_course_run__seats__currency',
+        'courses__course_runs__seats',
+        'courses__entitlements',
+        'courses__entitlements__currency',
+        'courses__entitlements__mode',
+    )
+
+
+def render_feed(queryset, serializer_class):
+    """
+    Renders the products of a queryset into a feed, yielding it in chunks as the products are read from
+    the database one chunk at a time.
+    """
+    serializer = serializer_class()
+    products = (
+        serializer.to_representation(instance)
+        for instance in iterate_in_chunks(queryset, settings.AFFILIATE_WINDOW_FEED_CHUNK_SIZE)
+    )
+    return AffiliateWindowXMLRenderer().render_stream(products)
+
+
+def render_seat_feed(catalog, exclude_2u_products=False):
+    return render_feed(get_seats(catalog, exclude_2u_products), serializers.AffiliateWindowSerializer)
+
+
+def render_program_feed(catalog):
+    return render_feed(get_programs(catalog), serializers.ProgramsAffiliateWindowSerializer)
+
+
+def get_seat_feed_path(catalog, exclude_2u_products=False):
+    suffix = '-no-2u' if exclude_2u_products else ''
+    return f'{FEED_STORAGE_PREFIX}/catalogs/{catalog.id}{suffix}.xml.gz'
+
+
+def get_program_feed_path(catalog):
+    return f'{FEED_STORAGE_PREFIX}/programs/catalogs/{catalog.id}.xml.gz'
+
+
+def save_feed(path, chunks):
+    """
+    Compresses a rendered feed into a file in storage, replacing the previous file once the feed is complete.
+    """
+    with tempfile.TemporaryFile() as feed_file:
+        with gzip.GzipFile(fileobj=feed_file, mode='wb') as compressed_file:
+            for chunk in chunks:
+                compressed_file.write(chunk)
+
+        feed_file.seek(0)
+        if default_storage.exists(path):
+            default_storage.delete(path)
+        default_storage.save(path, File(feed_file))
+
+
+def generate_feeds(catalog):
+    """
+    Pre-generates the seat feeds of a catalog, with and without 2U products, and its program feed.
+    """
+    for exclude_2u_products in (False, True):
+        save_feed(
+            get_seat_feed_path(catalog, exclude_2u_products),
+            render_seat_feed(catalog, exclude_2u_products),
+        )
+    save_feed(get_program_feed_path(catalog), render_program_feed(catalog))
+    logger.info('Generated the Affiliate Window feeds of catalog [%d].', catalog.id)
+
+
+def _iter_decompressed(feed_file):
+    with feed_file, gzip.GzipFile(fileobj=feed_file, mode='rb') as decompressed_file:
+        yield from iter(lambda: decompressed_file.read(FEED_READ_SIZE), b'')
+
+
+def get_pregenerated_feed_response(request, path):
+    """
+    Returns a response serving the pre-generated feed stored at path, or None if it hasn't been generated.
+
+    The compressed file is passed through as-is to clients accepting gzip, and decompressed while it is
+    streamed to the others. Clients holding the current version of the feed get a 304 response. Both
+    representations have their own ETag, as their bytes differ.
+    """
+    if not default_storage.exists(path):
+        return None
+
+    is_gzip = 'gzip' in get_accepted_encodings(request)
+    modified = default_storage.get_modified_time(path)
+    version = f'{path}:{modified.timestamp()}:{default_storage.size(path)}'
+    etag = hashlib.md5(version.encode('utf-8')).hexdigest()
+    etag = quote_etag(f'{etag}-gzip' if is_gzip else etag)
+    last_modified = int(modified.timestamp())
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        feed_file = default_storage.open(path, 'rb')
+        if is_gzip:
+            response = FileResponse(feed_file, content_type=FEED_CONTENT_TYPE)
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = StreamingHttpResponse(_iter_decompressed(feed_file), content_type=FEED_CONTENT_TYPE)
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
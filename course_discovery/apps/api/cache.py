@@ -1,10 +1,14 @@
+import gzip
 import logging
 import time
 import zlib
 
+import brotli
 from django.conf import settings
 from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
 from django.http.response import HttpResponse
+from django.utils.cache import patch_vary_headers
 from rest_framework.renderers import JSONRenderer
 from rest_framework_extensions.cache.decorators import CacheResponse
 from rest_framework_extensions.key_constructor.bits import KeyBitBase, QueryParamsKeyBit
@@ -17,15 +21,172 @@ from course_discovery.apps.api.utils import conditional_decorator
 
 logger = logging.getLogger(__name__)
 API_TIMESTAMP_KEY = 'api_timestamp'
+API_TIMESTAMP_TAG = 'api_timestamp'
+API_CACHE_TAG_KEY_PREFIX = 'api_cache_tag'
+API_CACHE_STATS_KEY_PREFIX = 'api_cache_stats'
+API_CACHE_FORMAT_VERSION = 4
+# Compression settings for the encoded bodies stored in the cache. These favor speed over size,
+# since large list pages are compressed on the request that regenerates them.
+API_CACHE_GZIP_LEVEL = 6
+API_CACHE_BROTLI_QUALITY = 5
+ALL_MODELS = '__all__'
+
+# Models a course's representation is built from: the course itself, its runs, seats and entitlements,
+# the objects they embed and the summaries of the programs containing it. The Algolia proxies are
+# saved as courses and programs, so they're listed along with them.
+API_CACHE_COURSE_MODELS = (
+    'course_metadata.additionalmetadata',
+    'course_metadata.additionalpromoarea',
+    'course_metadata.algoliaproxycourse',
+    'course_metadata.algoliaproxyproduct',
+    'course_metadata.algoliaproxyprogram',
+    'course_metadata.certificateinfo',
+    'course_metadata.collaborator',
+    'course_metadata.course',
+    'course_metadata.courseeditor',
+    'course_metadata.courseentitlement',
+    'course_metadata.courselocationrestriction',
+    'course_metadata.coursereview',
+    'course_metadata.courserun',
+    'course_metadata.courseruntype',
+    'course_metadata.coursetype',
+    'course_metadata.courseurlredirect',
+    'course_metadata.courseurlslug',
+    'course_metadata.curriculumcoursemembership',
+    'course_metadata.curriculumcourserunexclusion',
+    'course_metadata.expectedlearningitem',
+    'course_metadata.fact',
+    'course_metadata.geolocation',
+    'course_metadata.image',
+    'course_metadata.leveltype',
+    'course_metadata.leveltypetranslation',
+    'course_metadata.mode',
+    'course_metadata.organization',
+    'course_metadata.organizationmapping',
+    'course_metadata.person',
+    'course_metadata.position',
+    'course_metadata.prerequisite',
+    'course_metadata.productmeta',
+    'course_metadata.productvalue',
+    'course_metadata.program',
+    'course_metadata.programtype',
+    'course_metadata.programtypetranslation',
+    'course_metadata.seat',
+    'course_metadata.seattype',
+    'course_metadata.source',
+    'course_metadata.subject',
+    'course_metadata.subjecttranslation',
+    'course_metadata.syllabusitem',
+    'course_metadata.taxiform',
+    'course_metadata.topic',
+    'course_metadata.topictranslation',
+    'course_metadata.track',
+    'course_metadata.video',
+)
+# Models a program's representation is built from: its courses, along with its curricula, degree
+# details, subscription, endorsements and pathways.
+API_CACHE_PROGRAM_MODELS = API_CACHE_COURSE_MODELS + (
+    'course_metadata.corporateendorsement',
+    'course_metadata.curriculum',
+    'course_metadata.curriculumprogrammembership',
+    'course_metadata.degree',
+    'course_metadata.degreeadditionalmetadata',
+    'course_metadata.degreecost',
+    'course_metadata.degreedeadline',
+    'course_metadata.endorsement',
+    'course_metadata.faq',
+    'course_metadata.icontextpairing',
+    'course_metadata.joboutlookitem',
+    'course_metadata.pathway',
+    'course_metadata.personareaofexpertise',
+    'course_metadata.personsocialnetwork',
+    'course_metadata.programlocationrestriction',
+    'course_metadata.programsubscription',
+    'course_metadata.programsubscriptionprice',
+    'course_metadata.ranking',
+    'course_metadata.specialization',
+)
 
-
-class ApiTimestampKeyBit(KeyBitBase):
+# Cached API resources, keyed by the ``cache_resource`` name of the views serving them.
+# ``models`` lists the course_metadata models a resource's responses are built from; a change
+# to any of them invalidates every cached page of the resource. Models listed under
+# ``object_models`` are embedded in a single object's representation, so a change to one of
+# them only invalidates that object's detail page along with the resource's list pages.
+# Configuration and bookkeeping models, like the data loader and search settings, are in none
+# of these lists. Views that don't name a resource fall back to the default, which depends on
+# every model.
+API_CACHE_RESOURCES = {
+    'default': {
+        'models': ALL_MODELS,
+        'object_models': (),
+    },
+    'course': {
+        'models': API_CACHE_COURSE_MODELS,
+        'object_models': (
+            'course_metadata.courserun',
+            'course_metadata.seat',
+            'course_metadata.courseentitlement',
+        ),
+    },
+    'program': {
+        'models': API_CACHE_PROGRAM_MODELS,
+        'object_models': (),
+    },
+    # Pathways embed the full representation of their programs.
+    'pathway': {
+        'models': API_CACHE_PROGRAM_MODELS,
+        'object_models': (),
+    },
+    'person': {
+        'models': (
+            'course_metadata.person',
+            'course_metadata.position',
+            'course_metadata.organization',
+            'course_metadata.personsocialnetwork',
+            'course_metadata.personareaofexpertise',
+        ),
+        'object_models': (
+            'course_metadata.position',
+            'course_metadata.personsocialnetwork',
+            'course_metadata.personareaofexpertise',
+        ),
+    },
+    'organization': {
+        'models': ('course_metadata.organization',),
+        'object_models': (),
+    },
+    'source': {
+        'models': ('course_metadata.source',),
+        'object_models': (),
+    },
+    'collaborator': {
+        'models': ('course_metadata.collaborator',),
+        'object_models': (),
+    },
+}
+
+# Attribute paths from an instance of a model to the objects whose detail pages embed it.
+API_CACHE_PARENT_PATHS = {
+    'course_metadata.courserun': ('course',),
+    'course_metadata.seat': ('course_run.course',),
+    'course_metadata.courseentitlement': ('course',),
+    'course_metadata.position': ('person',),
+    'course_metadata.personsocialnetwork': ('person',),
+    'course_metadata.personareaofexpertise': ('person',),
+}
+
+
+class ApiCacheFormatKeyBit(KeyBitBase):
+    """
+    Keeps entries written in an older format, which can't be validated against cache
+    tags, from being served.
+    """
     def get_data(self, **kwargs):  # pylint: disable=arguments-differ
-        return cache.get_or_set(API_TIMESTAMP_KEY, time.time, None)
+        return API_CACHE_FORMAT_VERSION
 
 
 class TimestampedListKeyConstructor(DefaultListKeyConstructor):
-    timestamp = ApiTimestampKeyBit()
+    cache_format = ApiCacheFormatKeyBit()
     # The DefaultListKeyConstructor includes the PaginationKeyBit. While it does
     # subclass QueryParamsKeyBit, it also bypasses logic which includes all query
     # params in the cache key, restricting the set of query params that end up in
@@ -36,7 +197,7 @@ class TimestampedListKeyConstructor(DefaultListKeyConstructor):
 
 
 class TimestampedObjectKeyConstructor(DefaultObjectKeyConstructor):
-    timestamp = ApiTimestampKeyBit()
+    cache_format = ApiCacheFormatKeyBit()
     # The DefaultObjectKeyConstructor doesn't include querystring parameters
     # in its cache key.
     querystring = QueryParamsKeyBit()
@@ -51,21 +212,174 @@ def timestamped_object_key_constructor(*args, **kwargs):
 
 
 def set_api_timestamp():
+    """
+    Invalidate every cached API response at once. Reserved for bulk operations like data
+    loading; individual model changes go through api_change_receiver instead.
+    """
     timestamp = time.time()
     cache.set(API_TIMESTAMP_KEY, timestamp, None)
 
 
-def api_change_receiver(sender, **kwargs):  # pylint: disable=unused-argument
+def get_resource_cache_tag(resource):
+    return f'resource:{resource}'
+
+
+def get_resource_list_cache_tag(resource):
+    return f'resource:{resource}:list'
+
+
+def get_object_cache_tag(label, uuid):
+    return f'object:{label}:{uuid}'
+
+
+def get_partner_cache_tag(partner_id):
+    return f'partner:{partner_id}'
+
+
+def increment_api_cache_stat(name, delta=1):
+    key = f'{API_CACHE_STATS_KEY_PREFIX}:{name}'
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # The counter was evicted between add and incr. Losing a count is fine.
+        pass
+
+
+def get_api_cache_stats(*names):
+    """
+    Return the values of the given API cache counters, e.g. 'hits', 'misses', 'stale',
+    'invalidations' or 'invalidations:course_metadata.seat'.
+    """
+    keys = {f'{API_CACHE_STATS_KEY_PREFIX}:{name}': name for name in names}
+    values = cache.get_many(keys)
+    return {name: values.get(key, 0) for key, name in keys.items()}
+
+
+def get_api_cache_tag_key(tag):
+    # The global API timestamp is the tag every cached response depends on.
+    if tag == API_TIMESTAMP_TAG:
+        return API_TIMESTAMP_KEY
+    return f'{API_CACHE_TAG_KEY_PREFIX}:{tag}'
+
+
+def get_api_cache_tag_versions(tags):
+    """
+    Return the current version of each of the given cache tags, initializing missing ones.
+    """
+    keys = {tag: get_api_cache_tag_key(tag) for tag in tags}
+    versions = cache.get_many(keys.values())
+
+    missing = {key: time.time() for key in keys.values() if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+
+    return {tag: versions[key] for tag, key in keys.items()}
+
+
+def invalidate_api_cache_tags(tags):
+    """
+    Invalidate every cached API response that recorded one of the given tags.
+    """
+    if not tags:
+        return
+
+    version = time.time()
+    cache.set_many({get_api_cache_tag_key(tag): version for tag in tags}, None)
+    increment_api_cache_stat('invalidations', len(tags))
+
+
+def encode_response_content(content):
+    """
+    Return the given response body in each content coding cached responses can be served in.
+    """
+    return {
+        'gzip': gzip.compress(content, compresslevel=API_CACHE_GZIP_LEVEL),
+        'br': brotli.compress(content, quality=API_CACHE_BROTLI_QUALITY),
+    }
+
+
+def get_accepted_encodings(request):
+    """
+    Return the content codings the client accepts, according to its Accept-Encoding header.
+    """
+    accepted_encodings = set()
+    for coding in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        name, __, params = coding.partition(';')
+        name = name.strip().lower()
+        params = params.replace(' ', '')
+        if not name or (params.startswith('q=') and not params[2:].strip('0.')):
+            # Skip empty values and codings the client refuses with q=0.
+            continue
+        accepted_encodings.add(name)
+
+    if '*' in accepted_encodings:
+        accepted_encodings.add('gzip')
+
+    return accepted_encodings
+
+
+def get_instance_cache_tags(sender, instance):
+    """
+    Return the cache tags affected by a change to the given course_metadata model instance.
+    """
+    label = sender._meta.label_lower
+    tags = set()
+
+    for resource, spec in API_CACHE_RESOURCES.items():
+        if label in spec['object_models']:
+            tags.add(get_resource_list_cache_tag(resource))
+        elif spec['models'] == ALL_MODELS or label in spec['models']:
+            tags.add(get_resource_cache_tag(resource))
+
+    if instance is None:
+        return tags
+
+    if getattr(instance, 'uuid', None):
+        tags.add(get_object_cache_tag(label, instance.uuid))
+
+    for path in API_CACHE_PARENT_PATHS.get(label, ()):
+        parent = instance
+        try:
+            for attr in path.split('.'):
+                parent = getattr(parent, attr)
+        except ObjectDoesNotExist:
+            # The parent is being deleted along with this instance.
+            parent = None
+
+        if parent is not None and getattr(parent, 'uuid', None):
+            tags.add(get_object_cache_tag(parent._meta.label_lower, parent.uuid))
+
+    return tags
+
+
+def api_change_receiver(sender, **kwargs):
     """
     Receiver function for handling post_save and post_delete signals emitted by
-    course_metadata models.
+    course_metadata models. Only the cached responses depending on the changed
+    model, the changed object or the objects embedding it are invalidated.
     """
-    set_api_timestamp()
+    instance = kwargs.get('instance')
+    tags = get_instance_cache_tags(sender, instance)
+    invalidate_api_cache_tags(tags)
+    increment_api_cache_stat(f'invalidations:{sender._meta.label_lower}')
+    logger.debug('Invalidated API cache tags %s after a change to %s', sorted(tags), sender._meta.label_lower)
+
+
+def partner_change_receiver(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Receiver function for handling post_save signals emitted by Partner. Every cached
+    response served for the partner's site is invalidated.
+    """
+    invalidate_api_cache_tags({get_partner_cache_tag(instance.id)})
 
 
 class CompressedCacheResponse(CacheResponse):
     """
-    Subclasses CacheResponse to allow for compression of content going into the cache
+    Subclasses CacheResponse to allow for compression of content going into the cache.
+    Content is stored in the codings clients accept, so cache hits can be served without
+    decompressing and recompressing it.
     See https://github.com/chibisov/drf-extensions/blob/master/rest_framework_extensions/cache/decorators.py#L52
     for a similar implementation of process_cache_response without compression
     """
@@ -87,57 +401,240 @@ class CompressedCacheResponse(CacheResponse):
                 args=args,
                 kwargs=kwargs
             )
-            response_triple = self.cache.get(key)
+            response_triple, is_stale = self.get_cache_entry(key, view_instance)
         else:
             logger.info("Skipping page caching for %s", flag_name)
-            response_triple = None
+            response_triple, is_stale = None, False
+
+        regeneration_lock_key = None
+        if is_stale:
+            # Keep serving the stale entry while a single worker regenerates it.
+            if self.acquire_regeneration_lock(key):
+                regeneration_lock_key = self.get_regeneration_lock_key(key)
+                response_triple = None
+            else:
+                increment_api_cache_stat('stale_served')
 
         if not response_triple:
-            response = view_method(view_instance, request, *args, **kwargs)
-            response = view_instance.finalize_response(request, response, *args, **kwargs)
-            response.render()
-
-            if (not (response.status_code >= 400 or self.cache_errors) and
-                    isinstance(response.accepted_renderer, JSONRenderer) and
-                    use_page_cache):
-                # Put the response in the cache only if there are no cache errors, response errors,
-                # and the format is json. We avoid caching for the BrowsableAPIRenderer so that users don't see
-                # different usernames that are cached from the BrowsableAPIRenderer html
-
-                # django 3.0 has not .items() method, django 3.2 has not ._headers
-                if hasattr(response, '_headers'):
-                    headers = response._headers.copy()  # pylint: disable=protected-access
-                else:
-                    headers = {k: (k, v) for k, v in response.items()}
-
-                response_triple = (
-                    zlib.compress(response.rendered_content),
-                    response.status_code,
-                    headers
-                )
-                self.cache.set(key, response_triple, self.timeout)
-        else:
-            # If we get data from the cache, we reassemble the data to build a response
-            # We reassemble the pieces from the cache because we can't actually set rendered_content
-            # which is the part of the response that we compress
-            compressed_content, status, headers = response_triple
+            if use_page_cache:
+                # Read the tag versions before rendering, so that changes made while the view
+                # runs invalidate the entry we're about to store.
+                tag_versions = get_api_cache_tag_versions(self.get_cache_tags(view_instance, request, kwargs))
 
             try:
-                decompressed_content = zlib.decompress(compressed_content)
-            except (TypeError, zlib.error):
-                # If we get a type error or a zlib error, the response content was never compressed
-                decompressed_content = compressed_content
-
-            response = HttpResponse(content=decompressed_content, status=status)
+                response = view_method(view_instance, request, *args, **kwargs)
+                response = view_instance.finalize_response(request, response, *args, **kwargs)
+                response.render()
+
+                if (not (response.status_code >= 400 or self.cache_errors) and
+                        isinstance(response.accepted_renderer, JSONRenderer) and
+                        use_page_cache):
+                    # Put the response in the cache only if there are no cache errors, response errors,
+                    # and the format is json. We avoid caching for the BrowsableAPIRenderer so that users don't see
+                    # different usernames that are cached from the BrowsableAPIRenderer html
+
+                    # django 3.0 has not .items() method, django 3.2 has not ._headers
+                    if hasattr(response, '_headers'):
+                        headers = response._headers.copy()  # pylint: disable=protected-access
+                    else:
+                        headers = {k: (k, v) for k, v in response.items()}
+
+                    tag_versions.update(self.get_response_tag_versions(view_instance, kwargs, response))
+                    response_triple = (
+                        encode_response_content(response.rendered_content),
+                        response.status_code,
+                        headers,
+                        tag_versions,
+                        self.get_fresh_until(),
+                    )
+                    self.cache.set(key, response_triple, self.get_storage_timeout())
+            finally:
+                # Other workers keep serving the stale entry until the regenerated one is stored.
+                if regeneration_lock_key:
+                    self.cache.delete(regeneration_lock_key)
 
-            for k, v in headers.values():
-                response[k] = v
+        else:
+            response = self.build_cached_response(request, response_triple)
 
         if not hasattr(response, '_closable_objects'):
             response._closable_objects = []  # pylint: disable=protected-access
 
         return response
 
+    def get_response_tag_versions(self, view_instance, kwargs, response):
+        """
+        Return the versions of the cache tags a rendered response depends on beyond those of its view.
+        """
+        object_tag = self.get_object_cache_tag(view_instance, kwargs, response)
+        if object_tag:
+            return get_api_cache_tag_versions([object_tag])
+
+        if self.is_detail(view_instance, kwargs):
+            # Without knowing which object this is, changes to the models embedded in
+            # it have to invalidate it like they invalidate list pages.
+            resource = self.get_cache_resource(view_instance)
+            return get_api_cache_tag_versions([get_resource_list_cache_tag(resource)])
+
+        return {}
+
+    def build_cached_response(self, request, response_triple):
+        """
+        Reassemble a response from a cache entry. We reassemble the pieces from the cache
+        because we can't actually set rendered_content, which is the part of the response
+        that we compress.
+        """
+        encoded_content, status, headers = response_triple[:3]
+
+        if isinstance(encoded_content, dict):
+            return self.build_encoded_response(request, encoded_content, status, headers)
+
+        try:
+            decompressed_content = zlib.decompress(encoded_content)
+        except (TypeError, zlib.error):
+            # If we get a type error or a zlib error, the response content was never compressed
+            decompressed_content = encoded_content
+
+        response = HttpResponse(content=decompressed_content, status=status)
+
+        for k, v in headers.values():
+            response[k] = v
+
+        return response
+
+    def get_response_encoding(self, request, encoded_content):
+        """
+        Return the preferred content coding of the cached body that the client accepts, if any.
+        """
+        accepted_encodings = get_accepted_encodings(request)
+        return next((name for name in ('br', 'gzip') if name in encoded_content and name in accepted_encodings), None)
+
+    def build_encoded_response(self, request, encoded_content, status, headers):
+        """
+        Build a response from cached encoded bodies, passing the body through as-is in the
+        preferred coding the client accepts and only decompressing it for clients that
+        accept neither.
+        """
+        encoding = self.get_response_encoding(request, encoded_content)
+
+        if encoding:
+            content = encoded_content[encoding]
+        else:
+            content = gzip.decompress(encoded_content['gzip'])
+
+        response = HttpResponse(content=content, status=status)
+
+        for k, v in headers.values():
+            response[k] = v
+
+        if encoding:
+            response['Content-Encoding'] = encoding
+        response['Content-Length'] = str(len(content))
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        return response
+
+    def get_fresh_until(self):
+        return None if self.timeout is None else time.time() + self.timeout
+
+    def get_storage_timeout(self):
+        """
+        Keep entries around for API_CACHE_STALE_TIMEOUT past their timeout, so an expired
+        entry can still be served while a single worker regenerates it.
+        """
+        return None if self.timeout is None else self.timeout + settings.API_CACHE_STALE_TIMEOUT
+
+    def get_cache_entry(self, key, view_instance):
+        """
+        Return the cached entry for the given key and whether it is stale. The entry is None
+        if it is missing or any of the cache tags it was stored with has been invalidated
+        since, unless that happened within the stale grace period, in which case it is
+        returned flagged as stale. Entries past their timeout are returned flagged as stale
+        for as long as the cache keeps them.
+        """
+        resource = self.get_cache_resource(view_instance)
+        entry = self.cache.get(key)
+
+        if entry and len(entry) > 3:
+            tag_versions = entry[3]
+            current_versions = get_api_cache_tag_versions(tag_versions)
+            if current_versions != tag_versions:
+                increment_api_cache_stat('stale')
+                increment_api_cache_stat(f'stale:{resource}')
+
+                invalidated_at = max(
+                    version for tag, version in current_versions.items() if version != tag_versions[tag]
+                )
+                if time.time() - invalidated_at < settings.API_CACHE_STALE_GRACE_PERIOD:
+                    return entry, True
+                entry = None
+
+        if entry and len(entry) > 4 and entry[4] is not None and time.time() >= entry[4]:
+            increment_api_cache_stat('expired')
+            increment_api_cache_stat(f'expired:{resource}')
+            return entry, True
+
+        if entry:
+            increment_api_cache_stat('hits')
+        else:
+            increment_api_cache_stat('misses')
+            increment_api_cache_stat(f'misses:{resource}')
+
+        return entry, False
+
+    def get_regeneration_lock_key(self, key):
+        return f'{key}:regeneration_lock'
+
+    def acquire_regeneration_lock(self, key):
+        """
+        Claim the right to regenerate a stale entry. add() is atomic in the shared cache
+        backends, so exactly one worker gets the lock until it expires or is released.
+        """
+        return self.cache.add(
+            self.get_regeneration_lock_key(key), True, settings.API_CACHE_REGENERATION_LOCK_TIMEOUT
+        )
+
+    def get_cache_resource(self, view_instance):
+        return getattr(view_instance, 'cache_resource', None) or 'default'
+
+    def is_detail(self, view_instance, kwargs):
+        lookup = getattr(view_instance, 'lookup_url_kwarg', None) or getattr(view_instance, 'lookup_field', None)
+        return bool(lookup) and lookup in kwargs
+
+    def get_cache_tags(self, view_instance, request, kwargs):
+        """
+        Return the cache tags a response of the given view depends on, apart from the tag
+        of the object it represents, which is only known once the response is rendered.
+        """
+        resource = self.get_cache_resource(view_instance)
+        tags = [API_TIMESTAMP_TAG, get_resource_cache_tag(resource)]
+
+        if not self.is_detail(view_instance, kwargs):
+            tags.append(get_resource_list_cache_tag(resource))
+
+        try:
+            partner = request.site.partner
+        except (AttributeError, ObjectDoesNotExist):
+            partner = None
+
+        if partner:
+            tags.append(get_partner_cache_tag(partner.id))
+
+        return tags
+
+    def get_object_cache_tag(self, view_instance, kwargs, response):
+        data = getattr(response, 'data', None)
+        if not self.is_detail(view_instance, kwargs) or not isinstance(data, dict):
+            return None
+
+        uuid = data.get('uuid')
+        get_serializer_class = getattr(view_instance, 'get_serializer_class', None)
+        serializer_class = get_serializer_class() if get_serializer_class else None
+        model = getattr(getattr(serializer_class, 'Meta', None), 'model', None)
+        if not (uuid and model):
+            return None
+
+        return get_object_cache_tag(model._meta.label_lower, uuid)
+
 
 # Decorator for mixin
 compressed_cache_response = CompressedCacheResponse
@@ -147,6 +644,8 @@ class CompressedCacheResponseMixin():
     """
     Acts like drf-extensions CacheResponseMixin, but with compression into the cache and decompression out of it
     """
+    # Name of the entry in API_CACHE_RESOURCES describing what this view's responses depend on.
+    cache_resource = None
     object_cache_key_func = timestamped_object_key_constructor
     list_cache_key_func = timestamped_list_key_constructor
     object_cache_timeout = settings.REST_FRAMEWORK_EXTENSIONS['DEFAULT_CACHE_RESPONSE_TIMEOUT']
@@ -1,3 +1,6 @@
+from io import StringIO
+
+from django.utils.xmlutils import SimplerXMLGenerator
 from rest_framework_csv.renderers import CSVStreamingRenderer
 from rest_framework_xml.renderers import XMLRenderer
 
@@ -11,6 +14,34 @@ class AffiliateWindowXMLRenderer(XMLRenderer):
     item_tag_name = 'product'
     root_tag_name = 'merchant'
 
+    def render_stream(self, items):
+        """
+        Renders an iterable of products incrementally, yielding the encoded document one product at a time.
+
+        The output is identical to rendering the same products as a list with render().
+        """
+        stream = StringIO()
+        xml = SimplerXMLGenerator(stream, self.charset)
+        xml.startDocument()
+        xml.startElement(self.root_tag_name, {})
+        yield self._flush(stream)
+
+        for item in items:
+            xml.startElement(self.item_tag_name, {})
+            self._to_xml(xml, item)
+            xml.endElement(self.item_tag_name)
+            yield self._flush(stream)
+
+        xml.endElement(self.root_tag_name)
+        xml.endDocument()
+        yield self._flush(stream)
+
+    def _flush(self, stream):
+        content = stream.getvalue()
+        stream.seek(0)
+        stream.truncate()
+        return content.encode(self.charset)
+
 
 class CourseRunCSVRenderer(CSVStreamingRenderer):
     """ CSV renderer for course runs. """
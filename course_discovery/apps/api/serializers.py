@@ -32,6 +32,7 @@ from course_discovery.apps.api.fields import (
 )
 from course_discovery.apps.api.utils import StudioAPI
 from course_discovery.apps.catalogs.models import Catalog
+from course_discovery.apps.catalogs.utils import MAX_CONTAINED_KEYS
 from course_discovery.apps.core.api_client.lms import LMSAPIClient
 from course_discovery.apps.core.utils import update_instance
 from course_discovery.apps.course_metadata.choices import CourseRunStatus, ProgramStatus
@@ -1553,7 +1554,7 @@ class CourseWithProgramsSerializer(CourseSerializer):
         """
         queryset = queryset if queryset is not None else Course.objects.filter(partner=partner)
         queryset = super().prefetch_queryset(partner=partner, queryset=queryset, course_runs=course_runs)
-        return queryset.prefetch_related(
+        return queryset.select_related('availability_snapshot').prefetch_related(
             Prefetch('programs', queryset=NestedProgramSerializer.prefetch_queryset(queryset=programs)),
         )
 
@@ -1675,6 +1676,33 @@ class ContainedCoursesSerializer(serializers.Serializer):
     )
 
 
+class CatalogsContainsSerializer(serializers.Serializer):
+    """Serializer used to validate requests checking the contents of several catalogs or queries at once."""
+    catalog_ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, default=list,
+        help_text=_('IDs of the catalogs to check')
+    )
+    queries = serializers.ListField(
+        child=serializers.CharField(), required=False, default=list,
+        help_text=_('Elasticsearch queries to check')
+    )
+    course_ids = serializers.ListField(
+        child=serializers.CharField(), required=False, default=list, max_length=MAX_CONTAINED_KEYS,
+        help_text=_('Course IDs to check for existence in each catalog or query')
+    )
+    course_run_ids = serializers.ListField(
+        child=serializers.CharField(), required=False, default=list, max_length=MAX_CONTAINED_KEYS,
+        help_text=_('Course run IDs to check for existence in each catalog or query')
+    )
+
+    def validate(self, attrs):
+        if not (attrs['catalog_ids'] or attrs['queries']):
+            raise serializers.ValidationError(_('At least one catalog ID or query is required.'))
+        if not (attrs['course_ids'] or attrs['course_run_ids']):
+            raise serializers.ValidationError(_('At least one course ID or course run ID is required.'))
+        return attrs
+
+
 class MinimalProgramCourseSerializer(MinimalCourseSerializer):
     """
     Serializer used to filter out excluded course runs in a course associated with the program.
@@ -0,0 +1,20 @@
+import ddt
+from django.test import SimpleTestCase
+
+from course_discovery.apps.api.renderers import AffiliateWindowXMLRenderer
+
+
+@ddt.ddt
+class AffiliateWindowXMLRendererTests(SimpleTestCase):
+    @ddt.data(
+        [],
+        [{'pid': 'course-v1:edX+DemoX+Demo-verified', 'name': 'Demo & <Test>', 'price': {'actualp': '100.00'}}],
+        [{'pid': '1', 'desc': None}, {'pid': '2', 'lang': 'EN'}],
+    )
+    def test_render_stream(self, products):
+        """ Verify streaming products renders the same document as rendering them as a list. """
+        renderer = AffiliateWindowXMLRenderer()
+        chunks = list(renderer.render_stream(iter(products)))
+
+        assert len(chunks) == len(products) + 2
+        assert b''.join(chunks) == renderer.render(products).encode('utf-8')
@@ -1,5 +1,10 @@
+import gzip
+import time
+import uuid
 import zlib
+from unittest import mock
 
+import brotli
 import ddt
 from django.core.cache import cache
 from django.test import TestCase, override_settings
@@ -9,7 +14,11 @@ from rest_framework.response import Response
 from rest_framework_extensions.test import APIRequestFactory
 from waffle.testutils import override_flag
 
-from course_discovery.apps.api.cache import compressed_cache_response
+from course_discovery.apps.api.cache import (
+    compressed_cache_response, get_accepted_encodings, get_api_cache_stats, get_instance_cache_tags,
+    invalidate_api_cache_tags
+)
+from course_discovery.apps.course_metadata.models import Course, CourseRun, DataLoaderConfig, Person, Seat, Source
 
 factory = APIRequestFactory()
 
@@ -127,6 +136,64 @@ class CompressedCacheResponseTest(TestCase):
         else:
             assert cache.get(self.cache_response_key) is None
 
+    @ddt.data(
+        ('gzip, deflate', 'gzip'),
+        ('br;q=0, gzip', 'gzip'),
+        ('', None),
+        ('gzip;q=0', None),
+    )
+    @ddt.unpack
+    def test_should_serve_encoded_content_from_cache(self, accept_encoding, expected_encoding):
+        """ Verify that cached content is passed through in an encoding the client accepts """
+        def key_func(**kwargs):
+            return self.cache_response_key
+
+        class TestView(views.APIView):
+            permission_classes = [permissions.AllowAny]
+            renderer_classes = [JSONRenderer]
+
+            @compressed_cache_response(key_func=key_func)
+            def get(self, request, *_args, **_kwargs):
+                return Response('test response')
+
+        view_instance = TestView()
+        view_instance.headers = {}  # pylint: disable=attribute-defined-outside-init
+        request = factory.get('', HTTP_ACCEPT_ENCODING=accept_encoding)
+        view_instance.dispatch(request=request)
+        response = view_instance.dispatch(request=request)
+
+        assert response.get('Content-Encoding') == expected_encoding
+        assert 'Accept-Encoding' in response['Vary']
+        content = gzip.decompress(response.content) if expected_encoding else response.content
+        assert content.decode('utf-8') == '"test response"'
+        assert response['Content-Length'] == str(len(response.content))
+
+    def test_should_prefer_brotli_content_from_cache(self):
+        """ Verify that brotli encoded content is preferred when the client accepts it """
+        def key_func(**kwargs):
+            return self.cache_response_key
+
+        class TestView(views.APIView):
+            permission_classes = [permissions.AllowAny]
+            renderer_classes = [JSONRenderer]
+
+            @compressed_cache_response(key_func=key_func)
+            def get(self, request, *_args, **_kwargs):
+                return Response('test response')
+
+        view_instance = TestView()
+        view_instance.headers = {}  # pylint: disable=attribute-defined-outside-init
+        request = factory.get('', HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        view_instance.dispatch(request=request)
+        response = view_instance.dispatch(request=request)
+
+        assert response['Content-Encoding'] == 'br'
+        assert brotli.decompress(response.content).decode('utf-8') == '"test response"'
+
+    def test_get_accepted_encodings(self):
+        request = factory.get('', HTTP_ACCEPT_ENCODING='GZIP;q=0.5, br;q=0.0, identity, *')
+        assert get_accepted_encodings(request) == {'gzip', 'identity', '*'}
+
     def get_header(self, cache_response):
         """
         django 3.0 has not .items() method, django 3.2 has not ._headers
@@ -169,3 +236,162 @@ class CompressedCacheResponseTest(TestCase):
         cache.set('cache_response_key', response_dict)
         response = view_instance.dispatch(request=self.request)
         self.assertEqual(response['test'], 'foo')
+
+
+@override_settings(USE_API_CACHING=True)
+class CacheTagInvalidationTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.request = factory.get('')
+        self.render_count = 0
+
+    def get_view_instance(self, resource, timeout=None):
+        test = self
+
+        class TestView(views.APIView):
+            cache_resource = resource
+            permission_classes = [permissions.AllowAny]
+            renderer_classes = [JSONRenderer]
+
+            @compressed_cache_response(key_func=lambda **kwargs: 'tagged_cache_key', timeout=timeout)
+            def get(self, request, *_args, **_kwargs):
+                test.render_count += 1
+                return Response('test response')
+
+        view_instance = TestView()
+        view_instance.headers = {}  # pylint: disable=attribute-defined-outside-init
+        return view_instance
+
+    def test_cached_response_served_until_tag_invalidated(self):
+        """ Verify that a cached response is only rebuilt once a tag it depends on is invalidated. """
+        view_instance = self.get_view_instance('person')
+        view_instance.dispatch(request=self.request)
+        view_instance.dispatch(request=self.request)
+        assert self.render_count == 1
+
+        invalidate_api_cache_tags({'resource:course'})
+        view_instance.dispatch(request=self.request)
+        assert self.render_count == 1
+
+        invalidate_api_cache_tags({'resource:person:list'})
+        response = view_instance.dispatch(request=self.request)
+        assert self.render_count == 2
+        assert response.content.decode('utf-8') == '"test response"'
+
+        stats = get_api_cache_stats('hits', 'misses', 'stale')
+        assert stats == {'hits': 2, 'misses': 1, 'stale': 1}
+
+    @override_settings(API_CACHE_STALE_GRACE_PERIOD=60)
+    def test_stale_response_served_while_regenerating(self):
+        """ Verify that an invalidated response keeps being served while another worker regenerates it. """
+        view_instance = self.get_view_instance('person')
+        view_instance.dispatch(request=self.request)
+
+        # Another worker holds the regeneration lock.
+        cache.add('tagged_cache_key:regeneration_lock', True)
+        invalidate_api_cache_tags({'resource:person'})
+        response = view_instance.dispatch(request=self.request)
+        assert self.render_count == 1
+        assert response.content.decode('utf-8') == '"test response"'
+        assert get_api_cache_stats('stale_served') == {'stale_served': 1}
+
+        # Once the lock is released, the next request regenerates the entry and releases the lock again.
+        cache.delete('tagged_cache_key:regeneration_lock')
+        view_instance.dispatch(request=self.request)
+        assert self.render_count == 2
+        assert cache.get('tagged_cache_key:regeneration_lock') is None
+
+        view_instance.dispatch(request=self.request)
+        assert self.render_count == 2
+
+    @override_settings(API_CACHE_STALE_GRACE_PERIOD=60)
+    def test_stale_response_outside_grace_period(self):
+        """ Verify that responses invalidated longer ago than the grace period are regenerated. """
+        view_instance = self.get_view_instance('person')
+        view_instance.dispatch(request=self.request)
+
+        cache.add('tagged_cache_key:regeneration_lock', True)
+        with mock.patch('course_discovery.apps.api.cache.time.time', return_value=time.time() - 120):
+            invalidate_api_cache_tags({'resource:person'})
+
+        view_instance.dispatch(request=self.request)
+        assert self.render_count == 2
+
+    def test_expired_response_served_while_regenerating(self):
+        """ Verify that a response past its timeout is kept and served while another worker regenerates it. """
+        view_instance = self.get_view_instance('person', timeout=60)
+        view_instance.dispatch(request=self.request)
+
+        cache.add('tagged_cache_key:regeneration_lock', True)
+        with mock.patch('course_discovery.apps.api.cache.time.time', return_value=time.time() + 120):
+            response = view_instance.dispatch(request=self.request)
+            assert self.render_count == 1
+            assert response.content.decode('utf-8') == '"test response"'
+
+            cache.delete('tagged_cache_key:regeneration_lock')
+            view_instance.dispatch(request=self.request)
+            assert self.render_count == 2
+
+        assert get_api_cache_stats('expired', 'stale_served') == {'expired': 2, 'stale_served': 1}
+
+    def test_regeneration_lock_released_when_view_raises(self):
+        """ Verify that a worker failing to regenerate a stale response lets the next one try. """
+        view_instance = self.get_view_instance('person')
+        view_instance.dispatch(request=self.request)
+        invalidate_api_cache_tags({'resource:person'})
+
+        with mock.patch.object(view_instance, 'finalize_response', side_effect=ValueError):
+            with self.assertRaises(ValueError):
+                view_instance.dispatch(request=self.request)
+
+        assert cache.get('tagged_cache_key:regeneration_lock') is None
+
+    def test_regeneration_lock_held_until_stored(self):
+        """ Verify that other workers keep serving the stale response until the regenerated one is stored. """
+        view_instance = self.get_view_instance('person')
+        view_instance.dispatch(request=self.request)
+        invalidate_api_cache_tags({'resource:person'})
+
+        cache_set = cache.set
+        locked_while_storing = []
+
+        def set_and_check_lock(key, *args, **kwargs):
+            if key == 'tagged_cache_key':
+                locked_while_storing.append(cache.get('tagged_cache_key:regeneration_lock') is not None)
+            return cache_set(key, *args, **kwargs)
+
+        with mock.patch.object(cache, 'set', side_effect=set_and_check_lock):
+            view_instance.dispatch(request=self.request)
+
+        assert locked_while_storing == [True]
+        assert cache.get('tagged_cache_key:regeneration_lock') is None
+
+    def test_owned_model_tags(self):
+        """ Verify that a seat change only touches its course's page and course lists, not every course. """
+        course = Course(uuid=uuid.uuid4())
+        seat = Seat(course_run=CourseRun(course=course))
+
+        tags = get_instance_cache_tags(Seat, seat)
+
+        assert f'object:course_metadata.course:{course.uuid}' in tags
+        assert 'resource:course:list' in tags
+        assert 'resource:course' not in tags
+        assert 'resource:program' in tags
+        assert 'resource:person' not in tags
+        assert 'resource:person:list' not in tags
+
+    def test_unrelated_model_tags(self):
+        """ Verify that a change to a model only used by one resource leaves other resources alone. """
+        tags = get_instance_cache_tags(Source, Source())
+        assert tags == {'resource:default', 'resource:course', 'resource:program', 'resource:pathway',
+                        'resource:source'}
+
+        tags = get_instance_cache_tags(DataLoaderConfig, DataLoaderConfig())
+        assert tags == {'resource:default'}
+
+        person = Person()
+        tags = get_instance_cache_tags(Person, person)
+        assert f'object:course_metadata.person:{person.uuid}' in tags
+        assert 'resource:person' in tags
+        assert 'resource:organization' not in tags
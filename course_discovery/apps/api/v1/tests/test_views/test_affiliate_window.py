@@ -1,14 +1,19 @@
 import datetime
+import gzip
 import xml.etree.ElementTree as ET
 from os.path import abspath, dirname, join
 
 import ddt
 import mock
 import pytz
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import override_settings
 from lxml import etree
 from rest_framework import status
 from rest_framework.reverse import reverse
 
+from course_discovery.apps.api.affiliate_window import get_program_feed_path, get_seat_feed_path
 from course_discovery.apps.api.serializers import AffiliateWindowSerializer, ProgramsAffiliateWindowSerializer
 from course_discovery.apps.api.v1.tests.test_views.mixins import APITestCase, SerializationMixin
 from course_discovery.apps.catalogs.tests.factories import CatalogFactory
@@ -99,7 +104,7 @@ class ProgramsAffiliateWindowViewSetTests(SerializationMixin, APITestCase):
         """
         response = self.client.get(self.affiliate_url)
         assert response.status_code == status.HTTP_200_OK
-        root = ET.fromstring(response.content)
+        root = ET.fromstring(b''.join(response.streaming_content))
 
         # Assert that there is only one Program in the returned data even though 6
         # are created in setup
@@ -115,7 +120,7 @@ class ProgramsAffiliateWindowViewSetTests(SerializationMixin, APITestCase):
 
         response = self.client.get(self.affiliate_url)
         assert response.status_code == status.HTTP_200_OK
-        root = ET.fromstring(response.content)
+        root = ET.fromstring(b''.join(response.streaming_content))
 
         # Assert that there are two Programs in the returned data even though 7
         # are created in setup
@@ -141,6 +146,25 @@ class ProgramsAffiliateWindowViewSetTests(SerializationMixin, APITestCase):
         # Verify that the Certificate program is not in the data
         assert not root.findall(f'product/[pid="{self.certificate_program.uuid}"]')
 
+    @override_settings(AFFILIATE_WINDOW_PREGENERATED_FEEDS=True)
+    def test_pregenerated_feed(self):
+        """ Verify the pre-generated feed is served once it has been generated. """
+        live_content = b''.join(self.client.get(self.affiliate_url).streaming_content)
+
+        call_command('generate_affiliate_window_feeds', f'--catalog-id={self.catalog.id}')
+        self.addCleanup(default_storage.delete, get_program_feed_path(self.catalog))
+        self.addCleanup(default_storage.delete, get_seat_feed_path(self.catalog))
+        self.addCleanup(default_storage.delete, get_seat_feed_path(self.catalog, exclude_2u_products=True))
+        ProgramFactory(
+            type=ProgramType.objects.get(slug=ProgramType.MICROMASTERS), courses=[self.course],
+            banner_image=self.test_image,
+        )
+
+        response = self.client.get(self.affiliate_url)
+        assert response.status_code == 200
+        assert response['ETag']
+        assert b''.join(response.streaming_content) == live_content
+
 
 @ddt.ddt
 class AffiliateWindowViewSetTests(ElasticsearchTestMixin, SerializationMixin, APITestCase):
@@ -172,7 +196,7 @@ class AffiliateWindowViewSetTests(ElasticsearchTestMixin, SerializationMixin, AP
         response = self.client.get(self.affiliate_url)
 
         assert response.status_code == 200
-        root = ET.fromstring(response.content)
+        root = ET.fromstring(b''.join(response.streaming_content))
         assert 1 == len(root.findall('product'))
         self.assert_product_xml(
             root.findall(f'product/[pid="{self.course_run.key}-{self.seat_verified.type.slug}"]')[0],
@@ -183,7 +207,7 @@ class AffiliateWindowViewSetTests(ElasticsearchTestMixin, SerializationMixin, AP
         seat_professional = SeatFactory(course_run=self.course_run, type=SeatTypeFactory.professional())
 
         response = self.client.get(self.affiliate_url)
-        root = ET.fromstring(response.content)
+        root = ET.fromstring(b''.join(response.streaming_content))
         assert 2 == len(root.findall('product'))
 
         self.assert_product_xml(
@@ -204,7 +228,7 @@ class AffiliateWindowViewSetTests(ElasticsearchTestMixin, SerializationMixin, AP
 
         response = self.client.get(self.affiliate_url)
         assert response.status_code == 200
-        root = ET.fromstring(response.content)
+        root = ET.fromstring(b''.join(response.streaming_content))
         assert 0 == len(root.findall('product'))
 
     def test_with_closed_enrollment(self):
@@ -219,7 +243,7 @@ class AffiliateWindowViewSetTests(ElasticsearchTestMixin, SerializationMixin, AP
         response = self.client.get(self.affiliate_url)
 
         assert response.status_code == 200
-        root = ET.fromstring(response.content)
+        root = ET.fromstring(b''.join(response.streaming_content))
         assert 0 == len(root.findall('product'))
 
     @ddt.data(('approved', 1), ('pending', 3))
@@ -255,9 +279,48 @@ class AffiliateWindowViewSetTests(ElasticsearchTestMixin, SerializationMixin, AP
         ):
             response = self.client.get(self.affiliate_url)
             assert response.status_code == 200
-            root = ET.fromstring(response.content)
+            root = ET.fromstring(b''.join(response.streaming_content))
             assert len(root.findall('product')) == product_count
 
+    @override_settings(AFFILIATE_WINDOW_PREGENERATED_FEEDS=True)
+    def test_pregenerated_feed(self):
+        """ Verify the pre-generated feed is served compressed or not, and only regenerated by the command. """
+        live_content = b''.join(self.client.get(self.affiliate_url).streaming_content)
+
+        call_command('generate_affiliate_window_feeds')
+        for path in (get_seat_feed_path(self.catalog), get_seat_feed_path(self.catalog, exclude_2u_products=True),
+                     get_program_feed_path(self.catalog)):
+            self.addCleanup(default_storage.delete, path)
+        SeatFactory(course_run=self.course_run, type=SeatTypeFactory.professional())
+
+        response = self.client.get(self.affiliate_url)
+        assert response.status_code == 200
+        assert 'Content-Encoding' not in response
+        assert b''.join(response.streaming_content) == live_content
+        identity_etag = response['ETag']
+
+        response = self.client.get(self.affiliate_url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        assert response.status_code == 200
+        assert response['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response['Vary']
+        assert gzip.decompress(b''.join(response.streaming_content)) == live_content
+        gzip_etag = response['ETag']
+        assert gzip_etag != identity_etag
+
+        response = self.client.get(self.affiliate_url, HTTP_IF_NONE_MATCH=identity_etag)
+        assert response.status_code == 304
+        response = self.client.get(self.affiliate_url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=gzip_etag)
+        assert response.status_code == 304
+        # A representation is only validated by its own ETag.
+        response = self.client.get(self.affiliate_url, HTTP_IF_NONE_MATCH=gzip_etag)
+        assert response.status_code == 200
+        assert b''.join(response.streaming_content) == live_content
+
+        call_command('generate_affiliate_window_feeds')
+        response = self.client.get(self.affiliate_url)
+        root = ET.fromstring(b''.join(response.streaming_content))
+        assert 2 == len(root.findall('product'))
+
     def assert_product_xml(self, content, seat):
         """ Helper method to verify product data in xml format. """
         assert content.find('pid').text == f'{self.course_run.key}-{seat.type.slug}'
@@ -276,7 +339,7 @@ class AffiliateWindowViewSetTests(ElasticsearchTestMixin, SerializationMixin, AP
 
         filename = abspath(join(dirname(dirname(__file__)), 'affiliate_window_product_feed.1.4.dtd'))
         dtd = etree.DTD(open(filename))  # lint-amnesty, pylint: disable=consider-using-with,c-extension-no-member
-        root = etree.XML(response.content)  # pylint: disable=c-extension-no-member
+        root = etree.XML(b''.join(response.streaming_content))  # pylint: disable=c-extension-no-member
         assert dtd.validate(root)
 
     def test_permissions(self):
@@ -291,6 +354,7 @@ class AffiliateWindowViewSetTests(ElasticsearchTestMixin, SerializationMixin, AP
         with self.assertNumQueries(6, threshold=5):  # CI is often 7
             response = self.client.get(url)
             assert response.status_code == 200
+            b''.join(response.streaming_content)
 
         # Regular users can only view catalogs belonging to them
         self.client.force_authenticate(self.user)
@@ -301,6 +365,7 @@ class AffiliateWindowViewSetTests(ElasticsearchTestMixin, SerializationMixin, AP
         with self.assertNumQueries(9, threshold=1):  # CI is often 10
             response = self.client.get(url)
             assert response.status_code == 200
+            b''.join(response.streaming_content)
 
     def test_unpublished_status(self):
         """ Verify the endpoint does not return CourseRuns in a non-published state. """
@@ -312,5 +377,5 @@ class AffiliateWindowViewSetTests(ElasticsearchTestMixin, SerializationMixin, AP
         response = self.client.get(self.affiliate_url)
 
         assert response.status_code == 200
-        root = ET.fromstring(response.content)
+        root = ET.fromstring(b''.join(response.streaming_content))
         assert 0 == len(root.findall('product'))
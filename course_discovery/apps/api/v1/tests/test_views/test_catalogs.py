@@ -10,12 +10,14 @@ import pytest
 import pytz
 from django.contrib.auth import get_user_model
 from django.core.management import call_command
+from django.test import override_settings
 from rest_framework.reverse import reverse
 
 from course_discovery.apps.api.tests.jwt_utils import generate_jwt_header_for_user
 from course_discovery.apps.api.v1.tests.test_views.mixins import APITestCase, OAuth2Mixin, SerializationMixin
 from course_discovery.apps.catalogs.models import Catalog
 from course_discovery.apps.catalogs.tests.factories import CatalogFactory
+from course_discovery.apps.catalogs.utils import MAX_CONTAINED_KEYS
 from course_discovery.apps.core.tests.factories import UserFactory
 from course_discovery.apps.core.tests.mixins import ElasticsearchTestMixin
 from course_discovery.apps.course_metadata.choices import CourseRunStatus
@@ -388,6 +390,74 @@ class CatalogViewSetTests(ElasticsearchTestMixin, SerializationMixin, OAuth2Mixi
         query_string_kwargs = {'course_run_id': course_run_key}
         self.assert_catalog_contains_query_string(query_string_kwargs, course_run_key)
 
+    def test_bulk_contains(self):
+        """ Verify the endpoint reports the contents of several catalogs and queries at once. """
+        other_catalog = CatalogFactory(query='title:xyz*')
+        data = {
+            'catalog_ids': [self.catalog.id, other_catalog.id],
+            'queries': ['title:abc*', 'title:xyz*'],
+            'course_ids': [self.course.key],
+            'course_run_ids': [self.course_run.key, 'course-v1:a+b+c'],
+        }
+
+        response = self.client.post(reverse('api:v1:catalog-bulk-contains'), data, format='json')
+
+        assert response.status_code == 200
+        contained = {
+            'courses': {self.course.key: True},
+            'course_runs': {self.course_run.key: True, 'course-v1:a+b+c': False},
+        }
+        uncontained = {
+            'courses': {self.course.key: False},
+            'course_runs': {self.course_run.key: False, 'course-v1:a+b+c': False},
+        }
+        assert response.data == {
+            'catalogs': {str(self.catalog.id): contained, str(other_catalog.id): uncontained},
+            'queries': {'title:abc*': contained, 'title:xyz*': uncontained},
+        }
+
+    def test_bulk_contains_failed_search(self):
+        """ Verify the endpoint fails instead of reporting nothing as contained when a search fails. """
+        # A query no other test evaluates, whose results can't have been cached
+        data = {'queries': ['title:unavailable*'], 'course_ids': [self.course.key]}
+
+        with mock.patch('elasticsearch_dsl.MultiSearch.execute', return_value=[None]):
+            response = self.client.post(reverse('api:v1:catalog-bulk-contains'), data, format='json')
+
+        assert response.status_code == 503
+
+    def test_bulk_contains_without_permission(self):
+        """ Verify the endpoint refuses to report the contents of catalogs the user can't view. """
+        user = UserFactory()
+        self.client.force_authenticate(user)
+        url = reverse('api:v1:catalog-bulk-contains')
+        data = {'catalog_ids': [self.catalog.id], 'course_ids': [self.course.key]}
+
+        response = self.client.post(url, data, format='json')
+        assert response.status_code == 403
+
+        self.grant_catalog_permission_to_user(user, 'view')
+        response = self.client.post(url, data, format='json')
+        assert response.status_code == 200
+        assert response.data['catalogs'] == {
+            str(self.catalog.id): {'courses': {self.course.key: True}, 'course_runs': {}}
+        }
+
+    @ddt.data(
+        ({'course_ids': ['a/b/c']}, 400),
+        ({'catalog_ids': [1]}, 400),
+        ({'queries': ['*'], 'course_run_ids': ['a/b/c'] * (MAX_CONTAINED_KEYS + 1)}, 400),
+        ({'catalog_ids': [0], 'course_ids': ['a/b/c']}, 404),
+    )
+    @ddt.unpack
+    def test_bulk_contains_invalid_request(self, data, expected_status):
+        """
+        Verify the endpoint requires existing catalogs or queries, and at most MAX_CONTAINED_KEYS course or
+        course run IDs.
+        """
+        response = self.client.post(reverse('api:v1:catalog-bulk-contains'), data, format='json')
+        assert response.status_code == expected_status
+
     def test_csv(self):
         SeatFactory(type=SeatTypeFactory.audit(), course_run=self.course_run)
         SeatFactory(type=SeatTypeFactory.verified(), course_run=self.course_run)
@@ -399,6 +469,8 @@ class CatalogViewSetTests(ElasticsearchTestMixin, SerializationMixin, OAuth2Mixi
 
         with self.assertNumQueries(23, threshold=10):
             response = self.client.get(url)
+            # collect streamed content, which is only read from the database as it is streamed
+            received_content = b''.join(response.streaming_content)
 
         course_run = self.serialize_catalog_flat_course_run(self.course_run)
         expected = [
@@ -453,11 +525,6 @@ class CatalogViewSetTests(ElasticsearchTestMixin, SerializationMixin, OAuth2Mixi
             course_run['video']['src'],
         ]
 
-        # collect streamed content
-        received_content = b''
-        for item in response.streaming_content:
-            received_content += item
-
         # convert received content to csv for comparison
         f = StringIO(received_content.decode('utf-8'))
         reader = csv.reader(f)
@@ -466,6 +533,22 @@ class CatalogViewSetTests(ElasticsearchTestMixin, SerializationMixin, OAuth2Mixi
         assert response.status_code == 200
         assert expected == content[1]
 
+    @override_settings(CATALOG_CSV_CHUNK_SIZE=2)
+    def test_csv_in_chunks(self):
+        """ Verify every course run is streamed when the export reads them in several chunks. """
+        course_runs = [self.course_run] + CourseRunFactory.create_batch(
+            2, enrollment_end=self.course_run.enrollment_end, end=self.course_run.end, course=self.course
+        )
+        for course_run in course_runs:
+            SeatFactory(type=SeatTypeFactory.verified(), course_run=course_run)
+
+        url = reverse('api:v1:catalog-csv', kwargs={'id': self.catalog.id})
+        response = self.client.get(url)
+        content = list(csv.DictReader(StringIO(b''.join(response.streaming_content).decode('utf-8'))))
+
+        assert response.status_code == 200
+        assert sorted(row['key'] for row in content) == sorted(course_run.key for course_run in course_runs)
+
     def test_get(self):
         """ Verify the endpoint returns the details for a single catalog. """
         url = reverse('api:v1:catalog-detail', kwargs={'id': self.catalog.id})
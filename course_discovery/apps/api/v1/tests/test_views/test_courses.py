@@ -1042,7 +1042,7 @@ class CourseViewSetTests(SerializationMixin, ElasticsearchTestMixin, OAuth2Mixin
         with mock.patch(
             # We are using get_course_key because it is called prior to trying to contact the
             # e-commerce service and still gives the effect of an api exception.
-            'course_discovery.apps.api.v1.views.courses.CourseViewSet.get_course_key',
+            'course_discovery.apps.api.services.get_course_key',
             side_effect=IntegrityError('Error')
         ):
             with LogCapture(course_logger.name) as log_capture:
@@ -2171,7 +2171,7 @@ class CourseViewSetTests(SerializationMixin, ElasticsearchTestMixin, OAuth2Mixin
         }
 
         with mock.patch(
-            'course_discovery.apps.api.v1.views.courses.CourseViewSet.update_entitlement',
+            'course_discovery.apps.api.services.update_entitlement',
             side_effect=IntegrityError('Nope')
         ):
             with LogCapture(course_logger.name) as log_capture:
@@ -1,11 +1,13 @@
 import datetime
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import transaction
 from django.http import StreamingHttpResponse
 from dry_rest_permissions.generics import DRYPermissions
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework.response import Response
 
 from course_discovery.apps.api import filters, serializers
@@ -13,7 +15,9 @@ from course_discovery.apps.api.pagination import ProxiedPagination
 from course_discovery.apps.api.renderers import CourseRunCSVRenderer
 from course_discovery.apps.api.utils import check_catalog_api_access
 from course_discovery.apps.catalogs.models import Catalog
-from course_discovery.apps.course_metadata.models import CourseRun, CourseType
+from course_discovery.apps.catalogs.utils import get_catalogs_contains, get_contained_keys
+from course_discovery.apps.core.utils import iterate_in_chunks
+from course_discovery.apps.course_metadata.models import Course, CourseRun, CourseType
 
 User = get_user_model()
 
@@ -157,6 +161,52 @@ class CatalogViewSet(viewsets.ModelViewSet):
         serializer = serializers.ContainedCoursesSerializer(instance)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['post'], url_path='contains')
+    def bulk_contains(self, request):
+        """
+        Determine which of the provided courses and course runs are contained in each of several catalogs or queries.
+
+        All queries are evaluated together, so a single request replaces a call to the contains
+        endpoint per catalog. Query results are restricted to the request's partner.
+        A dictionary mapping each catalog ID and query to its `courses` and `course_runs`,
+        each mapping IDs to booleans indicating presence, will be returned. If Elasticsearch fails to evaluate
+        a query, a 503 is returned instead.
+        ---
+        serializer: serializers.CatalogsContainsSerializer
+        """
+        serializer = serializers.CatalogsContainsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        course_ids = data['course_ids']
+        course_run_ids = data['course_run_ids']
+
+        catalogs = list(Catalog.objects.filter(id__in=data['catalog_ids']))
+        missing_ids = set(data['catalog_ids']) - {catalog.id for catalog in catalogs}
+        if missing_ids:
+            raise NotFound(f'No catalogs exist with the IDs {sorted(missing_ids)}.')
+        for catalog in catalogs:
+            if not catalog.has_object_read_permission(request):
+                raise PermissionDenied(f'You do not have permission to view catalog {catalog.id}.')
+
+        catalogs_contains = get_catalogs_contains(catalogs, course_ids, course_run_ids)
+
+        queries = data['queries']
+        partner = request.site.partner
+        contained_course_ids = get_contained_keys(Course, queries, course_ids, partner)
+        contained_course_run_ids = get_contained_keys(CourseRun, queries, course_run_ids, partner)
+        queries_contains = {
+            query: {
+                'courses': {key: key in contained_course_ids[query] for key in course_ids},
+                'course_runs': {key: key in contained_course_run_ids[query] for key in course_run_ids},
+            }
+            for query in queries
+        }
+
+        return Response({
+            'catalogs': {str(catalog_id): contains for catalog_id, contains in catalogs_contains.items()},
+            'queries': queries_contains,
+        })
+
     @action(detail=True)
     def csv(self, request, id=None):  # pylint: disable=redefined-builtin
         """
@@ -177,10 +227,14 @@ class CatalogViewSet(viewsets.ModelViewSet):
         prefetch_fields += serializers.PREFETCH_FIELDS['course_run']
         course_runs = course_runs.prefetch_related(*prefetch_fields)
 
-        serializer = serializers.FlattenedCourseRunWithCourseSerializer(
-            course_runs, many=True, context={'request': request}
+        # Course runs are read, prefetched and serialized one chunk at a time while the response is streamed,
+        # so neither the first byte nor memory use waits on the size of the catalog.
+        serializer = serializers.FlattenedCourseRunWithCourseSerializer(context={'request': request})
+        rows = (
+            serializer.to_representation(course_run)
+            for course_run in iterate_in_chunks(course_runs, settings.CATALOG_CSV_CHUNK_SIZE)
         )
-        data = CourseRunCSVRenderer().render(serializer.data)
+        data = CourseRunCSVRenderer().render(rows)
 
         response = StreamingHttpResponse(data, content_type='text/csv')
         response['Content-Disposition'] = 'attachment; filename="catalog_{id}_{date}.csv"'.format(
@@ -15,6 +15,7 @@ logger = logging.getLogger(__name__)
 class CollaboratorViewSet(CompressedCacheResponseMixin, viewsets.ModelViewSet):
     """ CollaboratorSerializer resource. """
 
+    cache_resource = 'collaborator'
     lookup_field = 'uuid'
     lookup_value_regex = '[0-9a-f-]+'
     permission_classes = (IsAuthenticated, IsInOrgOrReadOnly,)
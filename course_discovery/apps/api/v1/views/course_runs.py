@@ -13,18 +13,18 @@ from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
 from rest_framework.response import Response
 
-from course_discovery.apps.api import filters, serializers
+from course_discovery.apps.api import filters, serializers, services
 from course_discovery.apps.api.mixins import ValidElasticSearchQueryRequiredMixin
 from course_discovery.apps.api.pagination import ProxiedPagination
 from course_discovery.apps.api.permissions import IsCourseRunEditorOrDjangoOrReadOnly
 from course_discovery.apps.api.serializers import MetadataWithRelatedChoices
-from course_discovery.apps.api.utils import StudioAPI, get_query_param, reviewable_data_has_changed
+from course_discovery.apps.api.utils import get_query_param
 from course_discovery.apps.api.v1.exceptions import EditableAndQUnsupported
 from course_discovery.apps.core.utils import SearchQuerySetWrapper
 from course_discovery.apps.course_metadata.choices import CourseRunStatus
 from course_discovery.apps.course_metadata.constants import COURSE_RUN_ID_REGEX
 from course_discovery.apps.course_metadata.exceptions import EcommerceSiteAPIClientException
-from course_discovery.apps.course_metadata.models import Course, CourseEditor, CourseRun
+from course_discovery.apps.course_metadata.models import CourseEditor, CourseRun
 from course_discovery.apps.course_metadata.utils import ensure_draft_world
 from course_discovery.apps.publisher.utils import is_publisher_user
 
@@ -178,27 +178,9 @@ class CourseRunViewSet(ValidElasticSearchQueryRequiredMixin, viewsets.ModelViewS
         """
         return super().list(request, *args, **kwargs)
 
-    @classmethod
-    def push_to_studio(cls, request, course_run, create=False, old_course_run_key=None):
-        if course_run.course.partner.studio_url:
-            api = StudioAPI(course_run.course.partner)
-            api.push_to_studio(course_run, create, old_course_run_key, user=request.user)
-        else:
-            log.info('Not pushing course run info for %s to Studio as partner %s has no studio_url set.',
-                     course_run.key, course_run.course.partner.short_code)
-
-    @classmethod
-    def update_course_run_image_in_studio(cls, course_run):
-        if course_run.course.partner.studio_url:
-            api = StudioAPI(course_run.course.partner)
-            api.update_course_run_image_in_studio(course_run)
-        else:
-            log.info('Not updating course run image for %s to Studio as partner %s has no studio_url set.',
-                     course_run.key, course_run.course.partner.short_code)
-
     @writable_request_wrapper
     def create_run_helper(self, run_data, request=None):
-        # These are both required to be part of self because when we call self.get_serializer, it tries
+        # These are both required to be part of self because when we call self.get_serializer_context, it tries
         # to set these two variables as part of the serializer context. When the endpoint is hit directly,
         # self.request should exist, but when this function is called from the Course POST endpoint in courses.py
         # we have to manually set these values.
@@ -207,55 +189,9 @@ class CourseRunViewSet(ValidElasticSearchQueryRequiredMixin, viewsets.ModelViewS
         if not hasattr(self, 'format_kwarg'):
             self.format_kwarg = None  # pylint: disable=attribute-defined-outside-init
 
-        # Set a pacing default when creating (studio requires this to be set, even though discovery does not)
-        run_data.setdefault('pacing_type', 'instructor_paced')
-
-        # Guard against externally setting the draft state
-        run_data.pop('draft', None)
-
-        prices = run_data.pop('prices', {})
-
-        # Grab any existing course run for this course (we'll use it when talking to studio to form basis of rerun)
-        course_key = run_data.get('course', None)  # required field
-        if not course_key:
-            raise ValidationError({'course': ['This field is required.']})
-
-        # Before creating the serializer we need to ensure the course has draft rows as expected
-        # The serializer will attempt to retrieve the draft version of the Course
-        course = Course.objects.filter_drafts().get(key=course_key)
-        course = ensure_draft_world(course)
-        old_course_run_key = run_data.pop('rerun', None)
-
-        serializer = self.get_serializer(data=run_data)
-        serializer.is_valid(raise_exception=True)
-
-        # Save run to database
-        course_run = serializer.save(draft=True)
-
-        course_run.update_or_create_seats(course_run.type, prices)
-
-        # Set canonical course run if needed (done this way to match historical behavior - but shouldn't this be
-        # updated *each* time we make a new run?)
-        if not course.canonical_course_run:
-            course.canonical_course_run = course_run
-            course.save()
-        elif not old_course_run_key:
-            # On a rerun, only set the old course run key to the canonical key if a rerun hasn't been provided
-            # This will prevent a breaking change if users of this endpoint don't choose to provide a key on rerun
-            old_course_run_key = course.canonical_course_run.key
-
-        if old_course_run_key:
-            old_course_run = CourseRun.objects.filter_drafts().get(key=old_course_run_key)
-            course_run.language = old_course_run.language
-            course_run.min_effort = old_course_run.min_effort
-            course_run.max_effort = old_course_run.max_effort
-            course_run.weeks_to_complete = old_course_run.weeks_to_complete
-            course_run.save()
-            course_run.staff.set(old_course_run.staff.all())
-            course_run.transcript_languages.set(old_course_run.transcript_languages.all())
-
-        # And finally, push run to studio
-        self.push_to_studio(self.request, course_run, create=True, old_course_run_key=old_course_run_key)
+        __, serializer = services.create_course_run(
+            self.request.user, run_data, context=self.get_serializer_context()
+        )
 
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
@@ -266,42 +202,13 @@ class CourseRunViewSet(ValidElasticSearchQueryRequiredMixin, viewsets.ModelViewS
         if response.status_code == 201:
             run_key = response.data.get('key')
             course_run = CourseRun.everything.get(key=run_key, draft=models.Value(1))
-            self.update_course_run_image_in_studio(course_run)
+            services.update_course_run_image_in_studio(course_run)
 
         return response
 
     @writable_request_wrapper
-    def _update_course_run(self, course_run, draft, changed, serializer, request, prices, upgrade_deadline_override):
-        save_kwargs = {}
-        # If changes are made after review and before publish, revert status to unpublished.
-        # Unless we're just switching the status
-        non_exempt_update = changed and course_run.status == CourseRunStatus.Reviewed
-        if non_exempt_update:
-            save_kwargs['status'] = CourseRunStatus.Unpublished
-            official_run = course_run.official_version
-            official_run.status = CourseRunStatus.Unpublished
-            official_run.save()
-        # When the course run is being updated and is coming from the Unpublished state, we always want to set
-        # it's status to in legal review.  If it is coming from the Reviewed state, we only want to put it
-        # back into legal review if a non exempt field was changed (expected_program_name and expected_program_type)
-        if not draft and (course_run.status == CourseRunStatus.Unpublished or non_exempt_update):
-            save_kwargs['status'] = CourseRunStatus.LegalReview
-
-        course_run = serializer.save(**save_kwargs)
-
-        if course_run in course_run.course.active_course_runs:
-            course_run.update_or_create_seats(course_run.type, prices, upgrade_deadline_override,)
-
-        self.push_to_studio(request, course_run, create=False)
-
-        # Published course runs can be re-published directly or course runs that remain in the Reviewed
-        # state can update their official version. We want to do this even in the Reviewed case for
-        # when an exempt field is changed and we still want to update the official even though we don't
-        # want to completely unpublish it.
-        if ((not draft and course_run.status == CourseRunStatus.Published) or
-           course_run.status == CourseRunStatus.Reviewed):
-            course_run.update_or_create_official_version()
-
+    def _update_course_run(self, course_run, draft, serializer, request, prices, upgrade_deadline_override):
+        services.update_course_run(course_run, serializer, request.user, draft, prices, upgrade_deadline_override)
         return Response(serializer.data)
 
     def handle_internal_review(self, request, serializer):
@@ -359,15 +266,9 @@ class CourseRunViewSet(ValidElasticSearchQueryRequiredMixin, viewsets.ModelViewS
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-        changed_fields = reviewable_data_has_changed(
-            course_run,
-            serializer.validated_data.items(),
-            CourseRun.STATUS_CHANGE_EXEMPT_FIELDS
-        )
-        response = self._update_course_run(course_run, draft, bool(changed_fields),
-                                           serializer, request, prices, upgrade_deadline_override,)
+        response = self._update_course_run(course_run, draft, serializer, request, prices, upgrade_deadline_override)
 
-        self.update_course_run_image_in_studio(course_run)
+        services.update_course_run_image_in_studio(course_run)
 
         return response
 
@@ -13,6 +13,7 @@ from course_discovery.apps.publisher.models import OrganizationExtension
 class OrganizationViewSet(CompressedCacheResponseMixin, viewsets.ReadOnlyModelViewSet):
     """ Organization resource. """
 
+    cache_resource = 'organization'
     filter_backends = (DjangoFilterBackend,)
     filterset_class = filters.OrganizationFilter
     lookup_field = 'uuid'
@@ -7,6 +7,7 @@ from course_discovery.apps.api.permissions import ReadOnlyByPublisherUser
 
 
 class PathwayViewSet(CompressedCacheResponseMixin, viewsets.ReadOnlyModelViewSet):
+    cache_resource = 'pathway'
     permission_classes = (ReadOnlyByPublisherUser,)
     serializer_class = serializers.PathwaySerializer
 
@@ -18,6 +18,7 @@ logger = logging.getLogger(__name__)
 class PersonViewSet(CompressedCacheResponseMixin, viewsets.ModelViewSet):
     """ PersonSerializer resource. """
 
+    cache_resource = 'person'
     filter_backends = (DjangoFilterBackend,)
     filterset_class = filters.PersonFilter
     lookup_field = 'uuid'
@@ -18,6 +18,7 @@ from course_discovery.apps.course_metadata.models import Program
 
 class ProgramViewSet(CompressedCacheResponseMixin, viewsets.ReadOnlyModelViewSet):
     """ Program resource. """
+    cache_resource = 'program'
     lookup_field = 'uuid'
     lookup_value_regex = '[0-9a-f-]+'
     permission_classes = (IsAuthenticated,)
@@ -10,6 +10,7 @@ from course_discovery.apps.course_metadata.models import Source
 class SourceViewSet(CompressedCacheResponseMixin, viewsets.ReadOnlyModelViewSet):
     """ Source resource. """
 
+    cache_resource = 'source'
     permission_classes = (IsAuthenticated, IsCourseRunEditorOrDjangoOrReadOnly)
     serializer_class = serializers.SourceSerializer
     lookup_field = 'slug'
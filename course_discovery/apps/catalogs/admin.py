@@ -7,7 +7,7 @@ from course_discovery.apps.catalogs.models import Catalog
 @admin.register(Catalog)
 class CatalogAdmin(GuardedModelAdmin):
     list_display = ('id', 'name',)
-    readonly_fields = ('created', 'modified',)
+    readonly_fields = ('created', 'modified', 'memberships_refreshed',)
     search_fields = ('id', 'name')
 
     class Media:
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class CatalogsConfig(AppConfig):
+    name = 'course_discovery.apps.catalogs'
+    verbose_name = 'Catalogs'
+
+    def ready(self):
+        super().ready()
+        # noinspection PyUnresolvedReferences
+        import course_discovery.apps.catalogs.signals  # pylint: disable=import-outside-toplevel,unused-import
@@ -0,0 +1,40 @@
+import datetime
+import logging
+
+import pytz
+from django.core.management import BaseCommand
+from django.db.models import Q
+
+from course_discovery.apps.catalogs.models import Catalog
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuilds the course and course run memberships of catalogs from the search index. Memberships follow the '
+        'document updates of courses and course runs, so running this periodically bounds how long they can stay '
+        'stale when an update task fails or an index is changed without sending the update signals.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-age',
+            type=int,
+            default=None,
+            help='Only rebuild the memberships of catalogs refreshed longer ago than this number of seconds.',
+        )
+
+    def handle(self, *args, **options):
+        catalogs = Catalog.objects.order_by('pk')
+        if options['max_age'] is not None:
+            refreshed_before = datetime.datetime.now(pytz.UTC) - datetime.timedelta(seconds=options['max_age'])
+            catalogs = catalogs.filter(
+                Q(memberships_refreshed__isnull=True) | Q(memberships_refreshed__lt=refreshed_before)
+            )
+
+        count = 0
+        for catalog in catalogs:
+            catalog.refresh_memberships()
+            count += 1
+        logger.info('Rebuilt the memberships of %d catalogs.', count)
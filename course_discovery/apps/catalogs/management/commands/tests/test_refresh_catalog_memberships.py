@@ -0,0 +1,39 @@
+import datetime
+
+import pytz
+from django.core.management import call_command
+from django.test import TestCase
+
+from course_discovery.apps.catalogs.models import Catalog, CatalogCourseMembership
+from course_discovery.apps.catalogs.tests.factories import CatalogFactory
+from course_discovery.apps.core.tests.mixins import ElasticsearchTestMixin
+from course_discovery.apps.course_metadata.tests.factories import CourseFactory
+
+
+class RefreshCatalogMembershipsCommandTests(ElasticsearchTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.course = CourseFactory(title='ABCs of testing')
+        self.refresh_index()
+        self.catalog = CatalogFactory(query='title:abc*')
+        self.fresh_catalog = CatalogFactory(query='title:abc*')
+        self.fresh_catalog.refresh_memberships()
+
+    def test_refresh_all(self):
+        call_command('refresh_catalog_memberships')
+
+        assert set(CatalogCourseMembership.objects.values_list('catalog_id', 'course_id')) == {
+            (self.catalog.id, self.course.id),
+            (self.fresh_catalog.id, self.course.id),
+        }
+
+    def test_refresh_older_than_max_age(self):
+        refreshed = datetime.datetime.now(pytz.UTC) - datetime.timedelta(hours=1)
+        Catalog.objects.filter(pk=self.fresh_catalog.pk).update(memberships_refreshed=refreshed)
+
+        call_command('refresh_catalog_memberships', '--max-age=7200')
+        assert list(CatalogCourseMembership.objects.values_list('catalog_id', flat=True)) == [self.fresh_catalog.id]
+        assert Catalog.objects.get(pk=self.fresh_catalog.pk).memberships_refreshed == refreshed
+
+        call_command('refresh_catalog_memberships', '--max-age=60')
+        assert Catalog.objects.get(pk=self.fresh_catalog.pk).memberships_refreshed > refreshed
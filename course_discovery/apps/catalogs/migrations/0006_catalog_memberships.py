@@ -0,0 +1,42 @@
+# Generated by Django 3.2.20 on 2026-10-18 03:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_metadata', '0331_auto_20230810_0748'),
+        ('catalogs', '0005_auto_20200804_1401'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='catalog',
+            name='memberships_refreshed',
+            field=models.DateTimeField(blank=True, help_text='When the materialized course and course run memberships of this catalog were last rebuilt. Until they are built, catalog contents are retrieved by searching the index.', null=True),
+        ),
+        migrations.CreateModel(
+            name='CatalogCourseRunMembership',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('catalog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='catalogs.catalog')),
+                ('course_run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='catalog_memberships', to='course_metadata.courserun')),
+            ],
+            options={
+                'unique_together': {('catalog', 'course_run')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CatalogCourseMembership',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('catalog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='catalogs.catalog')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='catalog_memberships', to='course_metadata.course')),
+            ],
+            options={
+                'unique_together': {('catalog', 'course')},
+            },
+        ),
+    ]
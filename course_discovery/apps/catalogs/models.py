@@ -1,15 +1,24 @@
+import logging
 from collections import Iterable  # lint-amnesty, pylint: disable=deprecated-class, no-name-in-module
 
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from django_elasticsearch_dsl.registries import registry
 from django_extensions.db.models import TimeStampedModel
 from elasticsearch.exceptions import RequestError
+from elasticsearch_dsl import MultiSearch
 from elasticsearch_dsl.query import Q as ESDSLQ
 from guardian.shortcuts import get_users_with_perms
+from model_utils import FieldTracker
 
 from course_discovery.apps.core.mixins import ModelPermissionsMixin
 from course_discovery.apps.course_metadata.models import Course, CourseRun, Program
 from course_discovery.apps.course_metadata.search_indexes.documents import CourseDocument
+from course_discovery.apps.course_metadata.utils import clean_query
+from course_discovery.apps.edx_elasticsearch_dsl_extensions.cache import get_search_pks
+
+logger = logging.getLogger(__name__)
 
 
 class Catalog(ModelPermissionsMixin, TimeStampedModel):
@@ -23,10 +32,27 @@ class Catalog(ModelPermissionsMixin, TimeStampedModel):
         default=''
     )
     include_archived = models.BooleanField(default=False, help_text=_('Include archived courses'))
+    memberships_refreshed = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_('When the materialized course and course run memberships of this catalog were last rebuilt. '
+                    'Until they are built, catalog contents are retrieved by searching the index.')
+    )
+
+    field_tracker = FieldTracker(fields=['query'])
 
     def __str__(self):
         return f'Catalog #{self.id}: {self.name}'
 
+    def save(self, *args, **kwargs):
+        if self.pk and self.field_tracker.has_changed('query'):
+            # The memberships were built from the previous query. Search the index until they are rebuilt.
+            self.memberships_refreshed = None
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'memberships_refreshed'}
+        super().save(*args, **kwargs)
+
     def _get_query_results(self):
         """
         Returns the results of this Catalog's query.
@@ -43,8 +69,84 @@ class Catalog(ModelPermissionsMixin, TimeStampedModel):
         Returns:
             QuerySet
         """
+        if self.memberships_refreshed:
+            return Course.objects.filter(catalog_memberships__catalog=self)
         return Course.search(self.query)
 
+    def _search_pks(self, model):
+        """
+        Returns the primary keys of all indexed objects of the given model matching this Catalog's query.
+        """
+        query = clean_query(self.query)
+        if query == '(*)':
+            # Mirror the wildcard shortcut in Course.search, which skips Elasticsearch entirely.
+            return set(model.objects.values_list('pk', flat=True))
+
+        es_document, *_ = registry.get_documents(models=(model,))
+        try:
+            return set(get_search_pks(es_document, query))
+        except RequestError as exp:
+            logger.warning('Elasticsearch request for catalog [%s] failed. Got exception: %r', self.id, exp)
+            return set()
+
+    def refresh_memberships(self):
+        """
+        Rebuilds the materialized course and course run memberships of this catalog from the search index.
+        """
+        course_ids = self._search_pks(Course)
+        course_run_ids = self._search_pks(CourseRun)
+
+        with transaction.atomic():
+            CatalogCourseMembership.sync(self, course_ids)
+            CatalogCourseRunMembership.sync(self, course_run_ids)
+            self.memberships_refreshed = timezone.now()
+            # Memberships built from a query edited meanwhile are rebuilt again, so they aren't marked as refreshed.
+            Catalog.objects.filter(pk=self.pk, query=self.query).update(
+                memberships_refreshed=self.memberships_refreshed
+            )
+
+        logger.info(
+            'Refreshed memberships of catalog [%s]: %d courses, %d course runs',
+            self.id, len(course_ids), len(course_run_ids)
+        )
+
+    @classmethod
+    def update_memberships(cls, course_ids=(), course_run_ids=()):
+        """
+        Updates the materialized memberships of the given courses and course runs in every catalog
+        whose memberships have been built, checking all catalog queries in one multi-search request.
+        """
+        catalogs = list(cls.objects.filter(memberships_refreshed__isnull=False))
+        if not catalogs:
+            return
+
+        for model, membership_model, ids in ((Course, CatalogCourseMembership, set(course_ids)),
+                                             (CourseRun, CatalogCourseRunMembership, set(course_run_ids))):
+            if not ids:
+                continue
+
+            es_document, *_ = registry.get_documents(models=(model,))
+            multi_search = MultiSearch(index=es_document._index._name)  # pylint: disable=protected-access
+            for catalog in catalogs:
+                dsl_query = ESDSLQ('query_string', query=clean_query(catalog.query), analyze_wildcard=True)
+                search = es_document.search().query(dsl_query).filter('terms', pk=list(ids)).source(['pk'])
+                multi_search = multi_search.add(search[:len(ids)])
+
+            # Failing queries come back as None, so one broken catalog query doesn't block the others.
+            responses = multi_search.execute(raise_on_error=False)
+
+            existing_ids = set(model.objects.filter(pk__in=ids).values_list('pk', flat=True))
+            with transaction.atomic():
+                for catalog, response in zip(catalogs, responses):
+                    if clean_query(catalog.query) == '(*)':
+                        matching_ids = existing_ids
+                    elif response is None or not response.success():
+                        # Leave the memberships of catalogs with unparseable queries alone.
+                        continue
+                    else:
+                        matching_ids = {hit.pk for hit in response} & existing_ids
+                    membership_model.sync(catalog, matching_ids, scope=ids)
+
     def programs(self):
         """ Returns the list of Programs contained within this catalog.
 
@@ -55,6 +157,9 @@ class Catalog(ModelPermissionsMixin, TimeStampedModel):
 
     @property
     def courses_count(self):
+        if self.memberships_refreshed:
+            return self.catalogcoursemembership_set.count()
+
         try:
             result = self._get_query_results().count()
         except RequestError:
@@ -72,6 +177,11 @@ class Catalog(ModelPermissionsMixin, TimeStampedModel):
                   contained in this catalog.
         """
         contains = {course_id: False for course_id in course_ids}
+        if self.memberships_refreshed:
+            course_keys = self.courses().filter(key__in=course_ids).values_list('key', flat=True)
+            contains.update({key: True for key in course_keys})
+            return contains
+
         results = self._get_query_results().filter('terms', **{'key.raw': course_ids})
         for result in results:
             contains[result.key] = True
@@ -90,6 +200,13 @@ class Catalog(ModelPermissionsMixin, TimeStampedModel):
                   contained in this catalog.
         """
         contains = {course_run_id: False for course_run_id in course_run_ids}
+        if self.memberships_refreshed:
+            course_runs_keys = CourseRun.objects.filter(
+                catalog_memberships__catalog=self, key__in=course_run_ids
+            ).values_list('key', flat=True)
+            contains.update({key: True for key in course_runs_keys})
+            return contains
+
         course_runs = CourseRun.search(self.query).filter('terms', **{'key.raw': course_run_ids}).source(['key'])
         try:
             course_runs_keys = [i.key for i in course_runs]
@@ -153,3 +270,53 @@ class Catalog(ModelPermissionsMixin, TimeStampedModel):
         # The view permission was added in 2.1, as result two view permissions tries to insert into db and triggers
         # integrity error. Customize the default permission list and removed view from there
         default_permissions = ('add', 'change', 'delete',)
+
+
+class AbstractCatalogMembership(models.Model):
+    """
+    Materialized membership of an object in a catalog, as determined by the catalog's query.
+    """
+    catalog = models.ForeignKey(Catalog, models.CASCADE)
+    member_field = None
+
+    @classmethod
+    def sync(cls, catalog, member_ids, scope=None):
+        """
+        Makes the catalog's memberships match the given member ids.
+
+        Arguments:
+            catalog (Catalog): Catalog whose memberships are updated
+            member_ids (set): Primary keys of the members the catalog should contain
+            scope (set): If given, only memberships of these primary keys are added or removed
+        """
+        memberships = cls.objects.filter(catalog=catalog)
+        if scope is not None:
+            memberships = memberships.filter(**{f'{cls.member_field}__in': scope})
+
+        existing_ids = set(memberships.values_list(cls.member_field, flat=True))
+        memberships.filter(**{f'{cls.member_field}__in': existing_ids - member_ids}).delete()
+        cls.objects.bulk_create(
+            [cls(catalog=catalog, **{cls.member_field: member_id}) for member_id in member_ids - existing_ids],
+            batch_size=1000,
+        )
+
+    class Meta:
+        abstract = True
+
+
+class CatalogCourseMembership(AbstractCatalogMembership):
+    """ Course contained in a catalog. """
+    course = models.ForeignKey(Course, models.CASCADE, related_name='catalog_memberships')
+    member_field = 'course_id'
+
+    class Meta:
+        unique_together = ('catalog', 'course')
+
+
+class CatalogCourseRunMembership(AbstractCatalogMembership):
+    """ Course run contained in a catalog. """
+    course_run = models.ForeignKey(CourseRun, models.CASCADE, related_name='catalog_memberships')
+    member_field = 'course_run_id'
+
+    class Meta:
+        unique_together = ('catalog', 'course_run')
@@ -0,0 +1,60 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from course_discovery.apps.catalogs.models import Catalog
+from course_discovery.apps.catalogs.tasks import refresh_catalog_memberships, update_catalog_memberships
+from course_discovery.apps.course_metadata.models import Course, CourseRun
+from course_discovery.apps.edx_elasticsearch_dsl_extensions.signals import (
+    index_aliases_updated, index_documents_updated, search_documents_updated
+)
+
+# Number of objects whose memberships are updated by one task, which checks them with one multi-search request.
+MEMBERSHIP_UPDATE_BATCH_SIZE = 1000
+
+
+@receiver(post_save, sender=Catalog)
+def refresh_memberships_on_query_change(sender, instance, created, **kwargs):  # pylint: disable=unused-argument
+    """
+    Rebuild a catalog's memberships once it is created or its query changes.
+    """
+    if created or instance.field_tracker.has_changed('query'):
+        catalog_id = instance.id
+        transaction.on_commit(lambda: refresh_catalog_memberships.delay(catalog_ids=[catalog_id]))
+
+
+@receiver(index_aliases_updated)
+def refresh_memberships_on_reindex(sender, models, **kwargs):  # pylint: disable=unused-argument
+    """
+    Rebuild every catalog's memberships once the course or course run index has been rebuilt.
+    """
+    if Course in models or CourseRun in models:
+        transaction.on_commit(refresh_catalog_memberships.delay)
+
+
+@receiver(search_documents_updated, sender=Course)
+@receiver(search_documents_updated, sender=CourseRun)
+def update_memberships_on_document_update(sender, instance, **kwargs):
+    """
+    Update the memberships of a course or course run in every catalog once its document is updated.
+    """
+    ids_kwarg = 'course_ids' if sender is Course else 'course_run_ids'
+    ids = [instance.id]
+    transaction.on_commit(lambda: update_catalog_memberships.delay(**{ids_kwarg: ids}))
+
+
+@receiver(index_documents_updated, sender=Course)
+@receiver(index_documents_updated, sender=CourseRun)
+def update_memberships_on_incremental_update(sender, pks, **kwargs):
+    """
+    Update the memberships of the courses or course runs reindexed by an incremental update in every catalog.
+
+    This is also how changes to related objects, such as seats, organizations or subjects, reach the memberships,
+    since the course and course run documents embedding them are only reindexed by update_index. Anything else is
+    picked up by the periodic refresh_catalog_memberships command.
+    """
+    ids_kwarg = 'course_ids' if sender is Course else 'course_run_ids'
+    pks = list(pks)
+    for start in range(0, len(pks), MEMBERSHIP_UPDATE_BATCH_SIZE):
+        ids = pks[start:start + MEMBERSHIP_UPDATE_BATCH_SIZE]
+        transaction.on_commit(lambda ids=ids: update_catalog_memberships.delay(**{ids_kwarg: ids}))
@@ -0,0 +1,39 @@
+"""
+Celery tasks for catalogs.
+"""
+import logging
+
+from celery import shared_task
+
+from course_discovery.apps.catalogs.models import Catalog
+
+LOGGER = logging.getLogger(__name__)
+
+
+@shared_task()
+def refresh_catalog_memberships(catalog_ids=None):
+    """
+    Task to rebuild the materialized course and course run memberships of catalogs from the search index.
+    Arguments:
+        catalog_ids (list): primary keys of the catalogs to rebuild, defaults to all catalogs
+    """
+    catalogs = Catalog.objects.all()
+    if catalog_ids is not None:
+        catalogs = catalogs.filter(pk__in=catalog_ids)
+
+    for catalog in catalogs:
+        catalog.refresh_memberships()
+
+
+@shared_task()
+def update_catalog_memberships(course_ids=(), course_run_ids=()):
+    """
+    Task to update the materialized catalog memberships of courses and course runs whose documents changed.
+    Arguments:
+        course_ids (list): primary keys of the changed courses
+        course_run_ids (list): primary keys of the changed course runs
+    """
+    LOGGER.info(
+        'Updating catalog memberships of %d courses and %d course runs', len(course_ids), len(course_run_ids)
+    )
+    Catalog.update_memberships(course_ids=course_ids, course_run_ids=course_run_ids)
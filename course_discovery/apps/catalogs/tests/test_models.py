@@ -3,7 +3,7 @@ import pytest
 from django.contrib.auth.models import ContentType, Permission
 from django.test import TestCase
 
-from course_discovery.apps.catalogs.models import Catalog
+from course_discovery.apps.catalogs.models import Catalog, CatalogCourseMembership, CatalogCourseRunMembership
 from course_discovery.apps.catalogs.tests import factories
 from course_discovery.apps.core.tests.factories import UserFactory
 from course_discovery.apps.core.tests.mixins import ElasticsearchTestMixin
@@ -74,6 +74,74 @@ class CatalogTests(ElasticsearchTestMixin, TestCase):
         CourseFactory(title='ABCDEF')
         assert self.catalog_with_incorrect_query.courses_count == 0
 
+    def test_refresh_memberships(self):
+        """ Verify the materialized memberships match the catalog query and are used once built. """
+        course_run = CourseRunFactory(course=self.course)
+        CourseRunFactory(title_override='ABD')
+        self.refresh_index()
+        assert self.catalog.memberships_refreshed is None
+
+        self.catalog.refresh_memberships()
+
+        assert self.catalog.memberships_refreshed is not None
+        assert list(CatalogCourseMembership.objects.values_list('course_id', flat=True)) == [self.course.id]
+        assert list(CatalogCourseRunMembership.objects.values_list('course_run_id', flat=True)) == [course_run.id]
+
+        # Courses matching the query which aren't in the membership table yet aren't returned.
+        CourseFactory(title='ABCDEF')
+        self.refresh_index()
+        assert list(self.catalog.courses()) == [self.course]
+        assert self.catalog.courses_count == 1
+        assert self.catalog.contains([self.course.key, 'd/e/f']) == {self.course.key: True, 'd/e/f': False}
+        assert self.catalog.contains_course_runs([course_run.key]) == {course_run.key: True}
+
+    def test_update_memberships(self):
+        """ Verify memberships of changed courses and course runs are updated in built catalogs only. """
+        self.catalog.refresh_memberships()
+        unbuilt_catalog = factories.CatalogFactory(query='title:abc*')
+        new_course = CourseFactory(title='ABCDEF')
+        course_run = CourseRunFactory(course=new_course, title_override='ABCDEF')
+        self.refresh_index()
+
+        Catalog.update_memberships(course_ids=[new_course.id], course_run_ids=[course_run.id])
+
+        assert set(self.catalog.courses()) == {self.course, new_course}
+        assert self.catalog.contains_course_runs([course_run.key]) == {course_run.key: True}
+        assert not CatalogCourseMembership.objects.filter(catalog=unbuilt_catalog).exists()
+
+        # Courses which no longer match the query are removed.
+        new_course.title = 'Something else'
+        new_course.save()
+        self.refresh_index()
+        Catalog.update_memberships(course_ids=[new_course.id])
+        assert list(self.catalog.courses()) == [self.course]
+
+    def test_query_change_refreshes_memberships(self):
+        """ Verify editing the query of a catalog rebuilds its memberships. """
+        with self.captureOnCommitCallbacks(execute=True):
+            self.catalog.query = 'title:nothing*'
+            self.catalog.save()
+
+        self.catalog.refresh_from_db()
+        assert self.catalog.memberships_refreshed is not None
+        assert not self.catalog.courses().exists()
+
+    def test_query_change_searches_until_rebuilt(self):
+        """ Verify a catalog whose query was edited searches the index until its memberships are rebuilt. """
+        self.catalog.refresh_memberships()
+        other_course = CourseFactory(key='d/e/f', title='DEF')
+        self.refresh_index()
+
+        self.catalog.query = 'title:def*'
+        self.catalog.save()
+
+        assert self.catalog.memberships_refreshed is None
+        assert self.catalog.contains([self.course.key, other_course.key]) == {
+            self.course.key: False, other_course.key: True
+        }
+        self.catalog.refresh_from_db()
+        assert self.catalog.memberships_refreshed is None
+
     def test_get_viewers(self):
         """ Verify the method returns a QuerySet of individuals with explicit permission to view a Catalog. """
         catalog = self.catalog
@@ -0,0 +1,96 @@
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.test import TestCase
+
+from course_discovery.apps.catalogs.tests.factories import CatalogFactory
+from course_discovery.apps.catalogs.utils import get_catalogs_contains, get_contained_keys
+from course_discovery.apps.core.tests.mixins import ElasticsearchTestMixin
+from course_discovery.apps.course_metadata.models import Course, CourseRun
+from course_discovery.apps.course_metadata.tests.factories import CourseFactory, CourseRunFactory
+from course_discovery.apps.edx_elasticsearch_dsl_extensions.exceptions import SearchUnavailable
+
+MULTI_SEARCH_EXECUTE_PATH = 'elasticsearch_dsl.MultiSearch.execute'
+
+
+class GetContainedKeysTests(ElasticsearchTestMixin, TestCase):
+    """ Tests for get_contained_keys. """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.course = CourseFactory(title='ABC Test Course')
+        self.other_course = CourseFactory(title='Something else')
+        self.refresh_index()
+        self.keys = [self.course.key, self.other_course.key]
+
+    def test_contained_keys(self):
+        """ Verify each query maps to the keys its results contain. """
+        contained_keys = get_contained_keys(Course, ['title:abc*', '*'], self.keys)
+        assert contained_keys == {
+            'title:abc*': {self.course.key},
+            '*': set(self.keys),
+        }
+
+    def test_failed_query(self):
+        """ Verify a query Elasticsearch fails to evaluate raises an error, without failing the others. """
+        with pytest.raises(SearchUnavailable):
+            get_contained_keys(Course, ['title:abc*', 'title:'], self.keys)
+
+        with mock.patch(MULTI_SEARCH_EXECUTE_PATH) as execute:
+            assert get_contained_keys(Course, ['title:abc*'], self.keys) == {'title:abc*': {self.course.key}}
+        assert not execute.called
+
+    def test_queries_evaluated_once(self):
+        """ Verify identical queries share one search, which is cached for later calls. """
+        with mock.patch(MULTI_SEARCH_EXECUTE_PATH, return_value=[None]) as execute, \
+                pytest.raises(SearchUnavailable):
+            get_contained_keys(Course, ['title:Something', 'title:Something'], self.keys)
+        assert execute.call_count == 1
+
+        contained_keys = get_contained_keys(Course, ['title:Something'], self.keys)
+        assert contained_keys == {'title:Something': {self.other_course.key}}
+
+        with mock.patch(MULTI_SEARCH_EXECUTE_PATH) as execute:
+            assert get_contained_keys(Course, ['title:Something'], reversed(self.keys)) == contained_keys
+        assert not execute.called
+
+    def test_partner(self):
+        """ Verify only documents of the given partner are matched. """
+        contained_keys = get_contained_keys(Course, ['*'], self.keys, partner=self.course.partner)
+        assert contained_keys == {'*': {self.course.key}}
+
+
+class GetCatalogsContainsTests(ElasticsearchTestMixin, TestCase):
+    """ Tests for get_catalogs_contains. """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.course_run = CourseRunFactory(course__title='ABC Test Course')
+        self.other_course_run = CourseRunFactory(course__title='Something else')
+        self.refresh_index()
+
+    def test_catalogs_contains(self):
+        """ Verify searched and materialized catalogs both report their contents. """
+        searched_catalog = CatalogFactory(query='title:abc*')
+        materialized_catalog = CatalogFactory(query='title:something*')
+        materialized_catalog.refresh_memberships()
+        course_keys = [self.course_run.course.key, self.other_course_run.course.key]
+        course_run_keys = [self.course_run.key, self.other_course_run.key]
+
+        with self.assertNumQueries(2):
+            contains = get_catalogs_contains([searched_catalog, materialized_catalog], course_keys, course_run_keys)
+
+        assert contains == {
+            searched_catalog.id: {
+                'courses': {self.course_run.course.key: True, self.other_course_run.course.key: False},
+                'course_runs': {self.course_run.key: True, self.other_course_run.key: False},
+            },
+            materialized_catalog.id: {
+                'courses': {self.course_run.course.key: False, self.other_course_run.course.key: True},
+                'course_runs': {self.course_run.key: False, self.other_course_run.key: True},
+            },
+        }
+        assert get_contained_keys(CourseRun, ['title:abc*'], course_run_keys) == {'title:abc*': {self.course_run.key}}
@@ -0,0 +1,171 @@
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django_elasticsearch_dsl.registries import registry
+from elasticsearch_dsl import MultiSearch
+from elasticsearch_dsl.query import Q as ESDSLQ
+
+from course_discovery.apps.catalogs.models import CatalogCourseMembership, CatalogCourseRunMembership
+from course_discovery.apps.course_metadata.models import Course, CourseRun
+from course_discovery.apps.course_metadata.utils import clean_query
+from course_discovery.apps.edx_elasticsearch_dsl_extensions.cache import get_search_results_version
+from course_discovery.apps.edx_elasticsearch_dsl_extensions.exceptions import SearchUnavailable
+
+logger = logging.getLogger(__name__)
+QUERY_CONTAINS_CACHE_KEY_PREFIX = 'query_contains'
+
+# Maximum number of keys whose membership can be checked at once. Elasticsearch returns at most
+# index.max_result_window (10,000 by default) hits per search, and all matching keys are read in one page.
+MAX_CONTAINED_KEYS = 10000
+
+
+def get_query_contains_cache_key(index_name, version, query, keys, partner=None):
+    """
+    Returns the key under which the membership bitset of the given keys in a query's results is cached.
+    """
+    key_data = '|'.join((partner.short_code if partner else '', query, ','.join(keys)))
+    return '{prefix}:{index_name}:{version}:{digest}'.format(
+        prefix=QUERY_CONTAINS_CACHE_KEY_PREFIX,
+        index_name=index_name,
+        version=version,
+        digest=hashlib.md5(key_data.encode('utf-8')).hexdigest()
+    )
+
+
+def _search_contained_keys(es_document, queries, keys, partner=None):
+    """
+    Searches which of the given keys are matched by each query, sending all queries in one multi-search request.
+
+    Returns:
+        dict: Mapping of each query to the set of matching keys, or None if the query failed.
+    """
+    multi_search = MultiSearch(index=es_document._index._name)  # pylint: disable=protected-access
+    for query in queries:
+        if query == '(*)':
+            dsl_query = ESDSLQ('match_all')
+        else:
+            dsl_query = ESDSLQ('query_string', query=query, analyze_wildcard=True)
+        search = es_document.search().query(dsl_query).filter('terms', **{'key.raw': keys}).source(['key'])
+        if partner:
+            search = search.filter('term', partner=partner.short_code)
+        multi_search = multi_search.add(search[:len(keys)])
+
+    # Failing queries come back as None, so one broken query doesn't fail the others.
+    responses = multi_search.execute(raise_on_error=False)
+
+    results = {}
+    for query, response in zip(queries, responses):
+        if response is None or not response.success():
+            logger.warning('Elasticsearch request for query [%s] failed.', query)
+            results[query] = None
+        else:
+            results[query] = {hit.key for hit in response}
+    return results
+
+
+def get_contained_keys(model, queries, keys, partner=None):
+    """
+    Determines which of the given course or course run keys are contained in the results of each query.
+
+    Queries are normalized with clean_query, so identical queries are only evaluated once. The membership
+    of the keys in each query's results is cached as a bitset over the sorted keys until the index
+    changes, and the uncached queries are evaluated together in one multi-search request.
+
+    Arguments:
+        model (Course or CourseRun): Model whose documents are searched
+        queries (str[]): Elasticsearch query strings
+        keys (str[]): Course or course run keys
+        partner (Partner): If given, only documents of this partner are matched
+
+    Returns:
+        dict: Mapping of each query to the set of contained keys.
+
+    Raises:
+        SearchUnavailable: If Elasticsearch fails to evaluate any of the queries. The results of the other
+            queries are still cached.
+    """
+    keys = sorted(set(keys))
+    cleaned_queries = {query: clean_query(query) for query in queries}
+    if not keys:
+        return {query: set() for query in queries}
+
+    es_document, *_ = registry.get_documents(models=(model,))
+    index_name = es_document._index._name  # pylint: disable=protected-access
+    version = get_search_results_version(index_name)
+    cache_keys = {
+        cleaned_query: get_query_contains_cache_key(index_name, version, cleaned_query, keys, partner)
+        for cleaned_query in set(cleaned_queries.values())
+    }
+    cached_bitsets = cache.get_many(list(cache_keys.values()))
+
+    contained_keys = {}
+    for cleaned_query, cache_key in cache_keys.items():
+        bitset = cached_bitsets.get(cache_key)
+        if bitset is not None:
+            contained_keys[cleaned_query] = {key for index, key in enumerate(keys) if bitset >> index & 1}
+
+    uncached_queries = [cleaned_query for cleaned_query in cache_keys if cleaned_query not in contained_keys]
+    if uncached_queries:
+        bitsets = {}
+        failed_queries = []
+        search_results = _search_contained_keys(es_document, uncached_queries, keys, partner)
+        for cleaned_query, matching_keys in search_results.items():
+            if matching_keys is None:
+                failed_queries.append(cleaned_query)
+                continue
+            contained_keys[cleaned_query] = matching_keys
+            bitsets[cache_keys[cleaned_query]] = sum(
+                1 << index for index, key in enumerate(keys) if key in matching_keys
+            )
+        cache.set_many(bitsets, settings.QUERY_CONTAINS_CACHE_TIMEOUT)
+
+        # A failed query says nothing about which keys it contains, so it isn't reported as containing none.
+        if failed_queries:
+            raise SearchUnavailable(f'Elasticsearch failed to evaluate the queries {sorted(failed_queries)}.')
+
+    return {query: contained_keys[cleaned_query] for query, cleaned_query in cleaned_queries.items()}
+
+
+def get_catalogs_contains(catalogs, course_keys=(), course_run_keys=()):
+    """
+    Determines which of the given courses and course runs are contained in each catalog.
+
+    Catalogs whose memberships have been materialized are answered from the database. The
+    queries of the others are evaluated together with get_contained_keys, which raises
+    SearchUnavailable if any of them fails.
+
+    Returns:
+        dict: Mapping of each catalog id to a dict with a `courses` and a `course_runs` mapping of keys to booleans.
+    """
+    result = {
+        catalog.id: {
+            'courses': {key: False for key in course_keys},
+            'course_runs': {key: False for key in course_run_keys},
+        }
+        for catalog in catalogs
+    }
+
+    materialized_ids = [catalog.id for catalog in catalogs if catalog.memberships_refreshed]
+    searched_catalogs = [catalog for catalog in catalogs if not catalog.memberships_refreshed]
+
+    for model, membership_model, member, result_field, keys in (
+            (Course, CatalogCourseMembership, 'course', 'courses', course_keys),
+            (CourseRun, CatalogCourseRunMembership, 'course_run', 'course_runs', course_run_keys)):
+        if not keys:
+            continue
+
+        if materialized_ids:
+            memberships = membership_model.objects.filter(
+                catalog_id__in=materialized_ids, **{f'{member}__key__in': keys}
+            ).values_list('catalog_id', f'{member}__key')
+            for catalog_id, key in memberships:
+                result[catalog_id][result_field][key] = True
+
+        if searched_catalogs:
+            contained_keys = get_contained_keys(model, [catalog.query for catalog in searched_catalogs], keys)
+            for catalog in searched_catalogs:
+                result[catalog.id][result_field].update({key: True for key in contained_keys[catalog.query]})
+
+    return result
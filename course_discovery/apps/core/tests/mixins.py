@@ -8,6 +8,7 @@ from django_elasticsearch_dsl.registries import registry
 from elasticsearch_dsl.connections import get_connection
 
 from course_discovery.apps.core.utils import ElasticsearchUtils
+from course_discovery.apps.edx_elasticsearch_dsl_extensions.cache import invalidate_search_results
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,8 @@ class ElasticsearchTestMixin:
         """
         for index in registry.get_indices():
             ElasticsearchUtils.refresh_index(self.es, index._name)  # pylint: disable=protected-access
+        # Results cached before the refresh may be missing documents which are only now searchable.
+        invalidate_search_results()
 
     def reindex_course_runs(self, course):
         for course_run in course.course_runs.all():
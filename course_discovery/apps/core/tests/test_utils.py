@@ -1,11 +1,12 @@
 from ddt import data, ddt, unpack
-from django.db import models
+from django.db import models, transaction
 from django.test import TestCase
 
 from course_discovery.apps.core.utils import (
-    SearchQuerySetWrapper, delete_orphans, get_all_related_field_names, update_instance
+    OnCommitBatch, SearchQuerySetWrapper, delete_orphans, get_all_related_field_names, get_on_commit_batch,
+    iterate_in_chunks, update_instance
 )
-from course_discovery.apps.course_metadata.models import Video
+from course_discovery.apps.course_metadata.models import CourseRun, Video
 from course_discovery.apps.course_metadata.search_indexes.documents import CourseRunDocument
 from course_discovery.apps.course_metadata.tests.factories import CourseRunFactory, ImageFactory, VideoFactory
 
@@ -101,6 +102,77 @@ class ModelUtilTests(TestCase):
         assert instance is None
         assert not changed
 
+    def test_iterate_in_chunks(self):
+        """ Verify every object is returned with its prefetches, which are done once per chunk. """
+        course_runs = CourseRunFactory.create_batch(3)
+        queryset = CourseRun.objects.prefetch_related('staff')
+
+        with self.assertNumQueries(5):
+            iterated = list(iterate_in_chunks(queryset, chunk_size=2))
+            for course_run in iterated:
+                list(course_run.staff.all())
+
+        assert iterated == sorted(course_runs, key=lambda course_run: course_run.pk)
+
+
+class ListBatch(OnCommitBatch):
+    handled = []
+
+    def __init__(self):
+        super().__init__()
+        self.items = []
+
+    def handle(self):
+        self.handled.append(self.items)
+
+
+class GetOnCommitBatchTests(TestCase):
+    """ Tests for get_on_commit_batch. """
+
+    def setUp(self):
+        super().setUp()
+        ListBatch.handled = []
+
+    def add(self, item):
+        get_on_commit_batch('items', ListBatch).items.append(item)
+
+    def test_handled_once_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add(1)
+            self.add(2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add(3)
+
+        assert ListBatch.handled == [[1, 2], [3]]
+
+    def test_rolled_back_batch_discarded(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.add(1)
+                    raise ValueError
+            except ValueError:
+                pass
+        assert not ListBatch.handled
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add(2)
+
+        assert ListBatch.handled == [[2]]
+
+    def test_batch_registered_before_rolled_back_savepoint_kept(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add(1)
+            try:
+                with transaction.atomic():
+                    self.add(2)
+                    raise ValueError
+            except ValueError:
+                pass
+            self.add(3)
+
+        assert ListBatch.handled == [[1, 2, 3]]
+
 
 class SearchQuerySetWrapperTests(TestCase):
     def setUp(self):
@@ -1,14 +1,19 @@
 import datetime
 import logging
 import re
+import threading
+from abc import ABC, abstractmethod
 from collections import namedtuple
 
 from django.conf import settings
+from django.db import transaction
 from django_elasticsearch_dsl import Index
 
 IndexMeta = namedtuple("IndexMeta", "name alias")
 logger = logging.getLogger(__name__)
 
+_on_commit_batches = threading.local()
+
 INDEX_ALIAS_REGEX = re.compile(r'^(\w+)(?=[_]\d{8}[_]\d{6})')
 INDEX_ALIAS_SLICE = slice(0, -16)
 # Any elasticsearch index name for a django model has two parts:
@@ -182,6 +187,74 @@ def use_read_replica_if_available(queryset):
     return queryset.using("read_replica") if "read_replica" in settings.DATABASES else queryset
 
 
+def get_pk_chunks(queryset, chunk_size):
+    """
+    Returns the primary keys of the objects of a queryset, split into chunks of the given size.
+    """
+    pks = list(queryset.prefetch_related(None).order_by('pk').values_list('pk', flat=True))
+    return [pks[start:start + chunk_size] for start in range(0, len(pks), chunk_size)]
+
+
+def iterate_in_chunks(queryset, chunk_size):
+    """
+    Iterates over a queryset one chunk of primary keys at a time, so its prefetches are only done for one chunk.
+    """
+    for pks in get_pk_chunks(queryset, chunk_size):
+        yield from queryset.filter(pk__in=pks).order_by('pk')
+
+
+class OnCommitBatch(ABC):
+    """
+    Objects changed in a transaction, which are handled together once it commits.
+
+    Batches are collected with get_on_commit_batch. Subclasses implement handle.
+    """
+
+    def __init__(self):
+        self.done = False
+        # The connection's list of on_commit hooks when the batch was last registered in it
+        self.hooks = None
+
+    def __call__(self):
+        # A batch is registered as an on_commit hook for every object added to it, and handles them on the first call.
+        if self.done:
+            return
+        self.done = True
+        self.handle()
+
+    @abstractmethod
+    def handle(self):
+        pass
+
+
+def get_on_commit_batch(key, factory):
+    """
+    Returns the batch stored under key for the current transaction, creating it with factory if needed, and
+    registers it to be called once the transaction commits.
+
+    A rolled back savepoint discards the hooks registered in it, which is why the batch is registered again on
+    every call instead of once. Django replaces its list of hooks whenever a transaction ends or a savepoint is
+    rolled back, so only then is the list searched for the batch. A batch none of whose hooks survived was
+    rolled back along with everything added to it, and is discarded. Objects added in a rolled back savepoint
+    to a batch registered before it are still handled, so handle has to work from the committed state of the
+    objects.
+    """
+    connection = transaction.get_connection()
+    batches = getattr(_on_commit_batches, 'batches', None)
+    if batches is None:
+        batches = _on_commit_batches.batches = {}
+
+    batch = batches.get(key)
+    if batch is not None and not batch.done and batch.hooks is not connection.run_on_commit:
+        if not any(hook[1] is batch for hook in connection.run_on_commit):
+            batch = None
+    if batch is None or batch.done:
+        batch = batches[key] = factory()
+    transaction.on_commit(batch)
+    batch.hooks = connection.run_on_commit
+    return batch
+
+
 def update_instance(instance, data, should_commit=False, **kwargs):
     """
     Utility method to set any number of fields dynamically on a model instance and commit the changes
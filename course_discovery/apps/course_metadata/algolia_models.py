@@ -19,6 +19,12 @@ from course_discovery.apps.course_metadata.utils import transform_skills_data
 # Algolia can't filter on an empty list, provide a value we can still filter on
 ALGOLIA_EMPTY_LIST = ['null']
 
+# Algolia fields whose values depend on the language a product is indexed in. The values of all the other
+# fields are the same in every language index.
+ALGOLIA_TRANSLATED_FIELDS = {
+    'availability_level', 'subject_names', 'levels', 'active_languages', 'program_types', 'learning_type',
+}
+
 # Every record needs geolocation data to show up in results after we turn on georanking.
 # These are the coordinates of the  North Atlantic
 ALGOLIA_DEFAULT_GEO_COORDINATES = 34.921696, -40.839980
@@ -79,15 +85,26 @@ def delegate_attributes(cls):
     for field in fields:
         def _closure(name):
             def _wrap(self, *args, **kwargs):
+                shared = self.shared_values is not None and name not in ALGOLIA_TRANSLATED_FIELDS
+                if shared and name in self.shared_values:
+                    return self.shared_values[name]
                 with override(getattr(self.product, 'language', 'en')):
-                    return getattr(self.product, name, None)
+                    value = getattr(self.product, name, None)
+                if shared:
+                    self.shared_values[name] = value
+                return value
             return _wrap
         setattr(cls, field, _closure(field))
     return cls
 
 
 def get_course_availability(course):
-    all_runs = course.course_runs.filter(status=CourseRunStatus.Published)
+    snapshot = course.get_availability_snapshot()
+    if snapshot:
+        return snapshot.availability_levels
+
+    # Filter in python so prefetched course runs are used
+    all_runs = [course_run for course_run in course.course_runs.all() if course_run.status == CourseRunStatus.Published]
     availability = set()
 
     for course_run in all_runs:
@@ -124,10 +141,17 @@ class AlgoliaProxyProduct(Program):
     class Meta:
         proxy = True
 
-    def __init__(self, product, language='en', contentful_data=None):
+    def __init__(self, product, language='en', contentful_data=None, shared_values=None):
+        """
+        Wraps a course or program for the index of the given language.
+
+        Products wrapping the same course or program for different languages can share a shared_values dict,
+        so the values of fields which don't depend on the language are only computed once.
+        """
         super().__init__()
         self.product = product
         self.product.language = language
+        self.shared_values = shared_values
         product_uuid = str(product.uuid)
 
         if contentful_data and product_uuid in contentful_data:
@@ -232,6 +256,14 @@ class AlgoliaProxyCourse(Course, AlgoliaBasicModelFieldsMixin):
     def custom_object_id(self):
         return f'course-{self.uuid}'
 
+    @property
+    def active_url_slug(self):
+        if self.draft:
+            return super().active_url_slug
+        # Look through the slug history in python so a prefetched history is used
+        active_urls = [url_slug for url_slug in self.url_slug_history.all() if url_slug.is_active]
+        return min(active_urls, key=lambda url_slug: url_slug.pk).url_slug if active_urls else None
+
     @property
     def primary_description(self):
         return self.short_description
@@ -318,7 +350,14 @@ class AlgoliaProxyCourse(Course, AlgoliaBasicModelFieldsMixin):
 
     @property
     def staff_slugs(self):
-        staff = [course_run.staff.all() for course_run in self.active_course_runs]
+        # Same runs as active_course_runs, filtered in python so prefetched course runs are used
+        now = datetime.datetime.now(pytz.UTC)
+        active_course_runs = [
+            course_run for course_run in self.course_runs.all()
+            if course_run.end and course_run.end > now and
+            (course_run.enrollment_end is None or course_run.enrollment_end > now)
+        ]
+        staff = [course_run.staff.all() for course_run in active_course_runs]
         staff = itertools.chain.from_iterable(staff)
         return list({person.slug for person in staff})
 
@@ -331,7 +370,7 @@ class AlgoliaProxyCourse(Course, AlgoliaBasicModelFieldsMixin):
 
     @property
     def tags(self):
-        return list(self.topics.names())
+        return [topic.name for topic in self.topics.all()]
 
     @property
     def product_allowed_in(self):
@@ -665,3 +704,18 @@ class SearchDefaultResultsConfiguration(models.Model):
     index_name = models.CharField(max_length=32, unique=True)
     programs = SortedManyToManyField(Program, blank=True, null=True, limit_choices_to={'status': ProgramStatus.Active})
     courses = SortedManyToManyField(Course, blank=True, null=True, limit_choices_to={'draft': 0})
+
+
+class AlgoliaRecordHash(models.Model):
+    """
+    Content hash of a record as last sent to an Algolia index, so delta reindexing can skip unchanged records.
+    """
+    index_name = models.CharField(max_length=255)
+    object_id = models.CharField(max_length=255)
+    content_hash = models.CharField(max_length=32, blank=True)
+
+    class Meta:
+        unique_together = ('index_name', 'object_id')
+
+    def __str__(self):
+        return f'{self.index_name}: {self.object_id}'
@@ -4,11 +4,22 @@ Contains all utility functions for Contentful.
 import logging
 
 from contentful import Client
+from contentful.resource_builder import ResourceBuilder
+from contentful.utils import snake_case
 from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
+
+from course_discovery.apps.course_metadata.models import ContentfulEntry, ContentfulEntryProduct, ContentfulSyncState
 
 logger = logging.getLogger(__name__)
 
+CONTENTFUL_LOCALE = 'en-US'
+CONTENTFUL_INCLUDE_DEPTH = 5  # the depth of linked entries resolved for each entry
+CONTENTFUL_BATCH_SIZE = 500
+CONTENTFUL_CACHE_TIMEOUT = 60 * 60 * 24
+CONTENTFUL_SYNCED_CACHE_KEY = 'contentful_entries_synced'
+
 
 def get_contentful_cache_key(content_type):
     """
@@ -22,15 +33,184 @@ def get_contentful_cache_key(content_type):
         return None
 
 
-def get_data_from_contentful(content_type):
+def get_contentful_client():
+    """
+    Returns a client of the Contentful Content Delivery API.
+    """
+    return Client(
+        settings.CONTENTFUL_SPACE_ID,
+        settings.CONTENTFUL_CONTENT_DELIVERY_API_KEY,
+        environment=settings.CONTENTFUL_ENVIRONMENT,
+        default_locale=CONTENTFUL_LOCALE,
+        timeout_s=30  # increases read timeout
+    )
+
+
+def localize_contentful_item(item, locale=CONTENTFUL_LOCALE):
+    """
+    Given an item from the Sync API, which holds the values of all locales, returns it
+    with only the values of the given locale, the way the Content Delivery API returns it.
+    """
+    return {
+        **item,
+        'sys': {**item['sys'], 'locale': locale},
+        'fields': {name: values[locale] for name, values in item.get('fields', {}).items() if locale in values},
+    }
+
+
+def get_product_uuids(fields):
+    """
+    Returns the uuids of the products a Contentful page entry is about, which is none for other entries.
+    """
+    fields = {snake_case(name): value for name, value in fields.items()}
+    uuids = [fields.get('uuid')] + list(fields.get('uuid_list') or [])
+    return list(dict.fromkeys(uuid for uuid in uuids if uuid))
+
+
+def get_linked_entry_ids(value):
+    """
+    Returns the ids of all the entries linked from a (nested) Contentful value.
+    """
+    linked_ids = set()
+    if isinstance(value, dict):
+        sys = value.get('sys', {})
+        if sys.get('type') == 'Link' and sys.get('linkType') == 'Entry':
+            linked_ids.add(sys['id'])
+        for nested_value in value.values():
+            linked_ids |= get_linked_entry_ids(nested_value)
+    elif isinstance(value, list):
+        for nested_value in value:
+            linked_ids |= get_linked_entry_ids(nested_value)
+    return linked_ids
+
+
+def save_synced_items(items):
+    """
+    Applies the entries created, updated or deleted in a sync to the local Contentful entries.
+    """
+    entries = {}
+    products = {}
+    deleted_ids = set()
+    for item in items:
+        entry_id = item['sys']['id']
+        if item['sys']['type'] == 'DeletedEntry':
+            entries.pop(entry_id, None)
+            products.pop(entry_id, None)
+            deleted_ids.add(entry_id)
+        elif item['sys']['type'] == 'Entry':
+            deleted_ids.discard(entry_id)
+            data = localize_contentful_item(item)
+            entries[entry_id] = ContentfulEntry(
+                entry_id=entry_id,
+                content_type=item['sys']['contentType']['sys']['id'],
+                data=data,
+            )
+            products[entry_id] = [
+                ContentfulEntryProduct(entry_id=entry_id, product_uuid=product_uuid)
+                for product_uuid in get_product_uuids(data['fields'])
+            ]
+
+    changed_ids = list(deleted_ids | entries.keys())
+    for start in range(0, len(changed_ids), CONTENTFUL_BATCH_SIZE):
+        ContentfulEntry.objects.filter(entry_id__in=changed_ids[start:start + CONTENTFUL_BATCH_SIZE]).delete()
+    ContentfulEntry.objects.bulk_create(entries.values(), batch_size=CONTENTFUL_BATCH_SIZE)
+    ContentfulEntryProduct.objects.bulk_create(
+        [product for entry_products in products.values() for product in entry_products],
+        batch_size=CONTENTFUL_BATCH_SIZE,
+    )
+
+
+def sync_contentful_entries():
+    """
+    Brings the local copy of the Contentful entries up to date using the Contentful Sync API.
+
+    The first sync fetches every entry of the space. Later syncs continue from the stored sync token
+    and only fetch the entries created, updated or deleted since the previous one.
+    """
+    client = get_contentful_client()
+    state = ContentfulSyncState.objects.filter(
+        space_id=settings.CONTENTFUL_SPACE_ID, environment=settings.CONTENTFUL_ENVIRONMENT
+    ).first()
+    if state:
+        sync_page = client.sync({'sync_token': state.sync_token})
+    else:
+        logger.info('Starting initial sync of Contentful entries')
+        sync_page = client.sync({'initial': True, 'type': 'Entry'})
+
+    items = list(sync_page.raw['items'])
+    while sync_page.next_page_url:
+        sync_page = client.sync({'sync_token': sync_page.next_sync_token})
+        items.extend(sync_page.raw['items'])
+
+    with transaction.atomic():
+        if not state:
+            ContentfulEntry.objects.all().delete()
+        save_synced_items(items)
+        ContentfulSyncState.objects.update_or_create(
+            space_id=settings.CONTENTFUL_SPACE_ID,
+            environment=settings.CONTENTFUL_ENVIRONMENT,
+            defaults={'sync_token': sync_page.next_sync_token},
+        )
+    logger.info(f'Synced {len(items)} changed Contentful entries')
+    cache.set(CONTENTFUL_SYNCED_CACHE_KEY, True, timeout=CONTENTFUL_CACHE_TIMEOUT)
+
+
+def sync_stale_contentful_entries():
+    """
+    Syncs the local Contentful entries, unless they were synced within the time the entries returned by
+    get_data_from_contentful are cached for.
+    """
+    if not cache.get(CONTENTFUL_SYNCED_CACHE_KEY):
+        sync_contentful_entries()
+
+
+def get_synced_entries(content_type, product_uuids=None):
+    """
+    Returns the local Contentful entries of a content type, with their linked entries resolved.
+
+    Only the entries of the content type, optionally about the given products, and the entries
+    they link to are read.
+    """
+    queryset = ContentfulEntry.objects.filter(content_type=content_type).order_by('id')
+    if product_uuids is not None:
+        queryset = queryset.filter(entry_id__in=ContentfulEntryProduct.objects.filter(
+            product_uuid__in=product_uuids
+        ).values('entry_id'))
+    items = list(queryset.values_list('data', flat=True))
+
+    linked_items = {}
+    linked_ids = get_linked_entry_ids([item['fields'] for item in items])
+    for __ in range(CONTENTFUL_INCLUDE_DEPTH):
+        linked_ids -= linked_items.keys()
+        if not linked_ids:
+            break
+        queryset = ContentfulEntry.objects.filter(entry_id__in=linked_ids)
+        new_items = dict(queryset.values_list('entry_id', 'data'))
+        linked_items.update(new_items)
+        linked_ids = get_linked_entry_ids([item['fields'] for item in new_items.values()])
+
+    return ResourceBuilder(CONTENTFUL_LOCALE, False, {
+        'sys': {'type': 'Array'},
+        'items': items,
+        'includes': {'Entry': list(linked_items.values())},
+    }).build().items
+
+
+def get_data_from_contentful(content_type, product_uuids=None):
     """
     Utility function to get data from Contentful. Returns contentful entries of the content_type.
-    Since fetching all objects results in a large amount of data, it gives us `Response size too big` error.
-    We're fetching 10 objects per Contentful Client call and returning an appended response.
+
+    The entries are read from the local copy of Contentful, which is first brought up to date with
+    the changes made since the last sync, rather than paging through every entry of the content type.
 
     Args:
         content_type (str): Contentful table-like instance comprised of fields.
+        product_uuids (list): If given, only the entries about these products are read. They aren't cached,
+            and the local copy is only synced if the cached entries of all products would have expired.
     """
+    if product_uuids is not None:
+        sync_stale_contentful_entries()
+        return get_synced_entries(content_type, product_uuids)
 
     cache_key = get_contentful_cache_key(content_type)
     cached_entries = cache.get(cache_key)
@@ -38,41 +218,12 @@ def get_data_from_contentful(content_type):
         logger.info(f"Using cached Contentful entries data and skipping API call for {content_type}")
         return cached_entries
 
-    client = Client(
-        settings.CONTENTFUL_SPACE_ID,
-        settings.CONTENTFUL_CONTENT_DELIVERY_API_KEY,
-        environment=settings.CONTENTFUL_ENVIRONMENT,
-        timeout_s=30  # increases read timeout
-    )
-    limit = 10
-    skip = 10
-    include = 5  # the depth of linked entries to be fetched from contentful
-    total_entries = []
-    contentful_entries = client.entries({
-        'content_type': content_type,
-        'limit': limit,
-        'include': include
-    })
-    total_entries.extend(contentful_entries.items)
-    total_count = contentful_entries.total
-    logger.info(f'Fetching a total of {total_count} Contentful Entries for Content Type [{content_type}]')
-    logger.info(f'Successfully fetched Contentful Entries from 1 to {skip}')
-
-    while skip < total_count:
-        contentful_entries = client.entries({
-            'content_type': content_type,
-            'limit': limit,
-            'skip': skip,
-            'include': include
-        })
-        if contentful_entries:
-            total_entries.extend(contentful_entries.items)
-            logger.info(f'Successfully fetched Contentful Entries from {skip + 1} to '
-                        f'{skip + limit if skip + limit < total_count else total_count}')
-            skip += limit
+    sync_contentful_entries()
+    total_entries = get_synced_entries(content_type)
+    logger.info(f'Fetched a total of {len(total_entries)} Contentful Entries for Content Type [{content_type}]')
 
-    # cache contentful API response for one day
-    cache.set(cache_key, total_entries, timeout=60 * 60 * 24)
+    # cache contentful entries for one day
+    cache.set(cache_key, total_entries, timeout=CONTENTFUL_CACHE_TIMEOUT)
 
     return total_entries
 
@@ -285,14 +436,17 @@ def get_placement_about_section_module(placement_about_section_module):
     }
 
 
-def fetch_and_transform_bootcamp_contentful_data():
+def fetch_and_transform_bootcamp_contentful_data(product_uuids=None):
     """
     Transforms incoming bootcamp data from contentful to algolia-usable form.
 
     Each Contentful entry has seo, hero and modules list.
     Each rich text content field has been transformed into plain text using `rich_text_to_plain_text`.
+    If product_uuids are given, only the data of those courses is transformed.
     """
-    contentful_bootcamp_page_entries = get_data_from_contentful(settings.BOOTCAMP_CONTENTFUL_CONTENT_TYPE)
+    contentful_bootcamp_page_entries = get_data_from_contentful(
+        settings.BOOTCAMP_CONTENTFUL_CONTENT_TYPE, product_uuids=product_uuids
+    )
     transformed_bootcamp_data = {}
     for bootcamp_entry in contentful_bootcamp_page_entries:
         product_uuid = bootcamp_entry.uuid
@@ -389,14 +543,17 @@ def aggregate_contentful_data(data, product_uuid):
     return aggregated_text
 
 
-def fetch_and_transform_degree_contentful_data():
+def fetch_and_transform_degree_contentful_data(product_uuids=None):
     """
     Transforms incoming degree data from contentful to algolia-usable form.
 
     Each Contentful entry has seo, hero and modules list.
+    If product_uuids are given, only the data of those programs is transformed.
     """
 
-    contentful_degree_page_entries = get_data_from_contentful(settings.DEGREE_CONTENTFUL_CONTENT_TYPE)
+    contentful_degree_page_entries = get_data_from_contentful(
+        settings.DEGREE_CONTENTFUL_CONTENT_TYPE, product_uuids=product_uuids
+    )
 
     transformed_degree_data = {}
 
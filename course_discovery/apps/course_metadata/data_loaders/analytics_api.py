@@ -1,25 +1,35 @@
 import datetime
 import logging
+from collections import defaultdict
 
 import pytz
 from analyticsclient.client import Client
+from django.db import transaction
 
 from course_discovery.apps.course_metadata.data_loaders import AbstractDataLoader
-from course_discovery.apps.course_metadata.models import CourseRun
+from course_discovery.apps.course_metadata.models import Course, CourseRun, Program
 
 logger = logging.getLogger(__name__)
 
 
 class AnalyticsAPIDataLoader(AbstractDataLoader):
+    """
+    Loads the enrollment counts of course runs from the Analytics API, and rolls them up into their courses and
+    programs.
+
+    Only the counter columns are written, with bulk updates. This deliberately skips saving the course runs, courses
+    and programs, so no history is recorded, no signal is sent and their modified timestamps stay as they are.
+    """
 
     API_TIMEOUT = 120  # time in seconds
+    BATCH_SIZE = 500
 
     def __init__(self, partner, api_url, max_workers=None, is_threadsafe=False):
         super().__init__(partner, api_url, max_workers, is_threadsafe)
 
-        # uuid: {course, count, recent_count}
+        # id: {count, recent_count}
         self.course_dictionary = {}
-        # uuid: {program, count, recent_count}
+        # id: {uuid, count, recent_count}
         self.program_dictionary = {}
 
         if not (self.partner.analytics_url and self.partner.analytics_token):
@@ -45,61 +55,101 @@ class AnalyticsAPIDataLoader(AbstractDataLoader):
                                                                                   'count',
                                                                                   'recent_count_change'])
 
+        # Course run keys are matched case-insensitively.
+        course_run_ids = {}
+        for course_run_id, key, course_id in CourseRun.objects.values_list('id', 'key', 'course_id'):
+            course_run_ids.setdefault(key.lower(), (course_run_id, course_id))
+
+        course_runs = {}
         for course_run_summary in course_run_summaries:
-            self._process_course_run_summary(course_run_summary=course_run_summary)
-
-        for course_dict in self.course_dictionary.values():
-            self._process_course_enrollment_count(course_dict['course'],
-                                                  course_dict['count'],
-                                                  course_dict['recent_count'])
-
-        for program_dict in self.program_dictionary.values():
-            # Update program count
-            program = program_dict['program']
-            program.enrollment_count = program_dict['count']
-            program.recent_enrollment_count = program_dict['recent_count']
-            program.save(suppress_publication=True)
-            logger.info('Updating program: %s', program.uuid)
-
-    def _process_course_run_summary(self, course_run_summary):
+            course_run = self._process_course_run_summary(course_run_summary, course_run_ids)
+            if course_run:
+                course_runs[course_run.id] = course_run
+
+        with transaction.atomic():
+            CourseRun.everything.bulk_update(
+                course_runs.values(), ['enrollment_count', 'recent_enrollment_count'], batch_size=self.BATCH_SIZE
+            )
+
+            course_programs = self._get_course_programs()
+            courses = [
+                self._process_course_enrollment_count(
+                    course_id, course_dict['count'], course_dict['recent_count'], course_programs.get(course_id, ())
+                )
+                for course_id, course_dict in self.course_dictionary.items()
+            ]
+            Course.everything.bulk_update(
+                courses, ['enrollment_count', 'recent_enrollment_count'], batch_size=self.BATCH_SIZE
+            )
+
+            programs = []
+            for program_id, program_dict in self.program_dictionary.items():
+                # Update program count
+                programs.append(Program(
+                    id=program_id,
+                    enrollment_count=program_dict['count'],
+                    recent_enrollment_count=program_dict['recent_count'],
+                ))
+                logger.info('Updating program: %s', program_dict['uuid'])
+            Program.objects.bulk_update(
+                programs, ['enrollment_count', 'recent_enrollment_count'], batch_size=self.BATCH_SIZE
+            )
+
+    def _process_course_run_summary(self, course_run_summary, course_run_ids):
+        """
+        Returns a course run holding the enrollment counts of a summary, and adds them to its course's counts.
+        Returns None if the summary's course run doesn't exist.
+        """
         # Get course run object from course run key
         course_run_key = course_run_summary['course_id']
         course_run_count = int(course_run_summary['count'])
         course_run_recent_count = int(course_run_summary['recent_count_change'])
         try:
-            course_run = CourseRun.objects.get(key__iexact=course_run_key)
-        except CourseRun.DoesNotExist:
+            course_run_id, course_id = course_run_ids[course_run_key.lower()]
+        except KeyError:
             logger.info('Course run: [%s] not found in DB.', course_run_key)
-            return
-
-        course = course_run.course
-        # Update course run counts
-        course_run.enrollment_count = course_run_count
-        course_run.recent_enrollment_count = course_run_recent_count
-        course_run.save(suppress_publication=True)
+            return None
 
         # Add course run total to course total in dictionary
-        if course.uuid in self.course_dictionary:
-            self.course_dictionary[course.uuid]['count'] += course_run_count
-            self.course_dictionary[course.uuid]['recent_count'] += course_run_recent_count
+        if course_id in self.course_dictionary:
+            self.course_dictionary[course_id]['count'] += course_run_count
+            self.course_dictionary[course_id]['recent_count'] += course_run_recent_count
         else:
-            self.course_dictionary[course.uuid] = {'course': course,
-                                                   'count': course_run_count,
-                                                   'recent_count': course_run_recent_count}
-
-    def _process_course_enrollment_count(self, course, count, recent_count):
-        # update course count
-        course.enrollment_count = count
-        course.recent_enrollment_count = recent_count
-        course.save()
-
+            self.course_dictionary[course_id] = {'count': course_run_count,
+                                                 'recent_count': course_run_recent_count}
+
+        return CourseRun(
+            id=course_run_id,
+            enrollment_count=course_run_count,
+            recent_enrollment_count=course_run_recent_count,
+        )
+
+    def _process_course_enrollment_count(self, course_id, count, recent_count, programs):
+        """
+        Returns a course holding its enrollment counts, and adds them to the counts of its programs, given as
+        (id, uuid) pairs.
+        """
         # Add course count to program dictionary for all programs
-        for program in course.programs.all():
+        for program_id, program_uuid in programs:
             # add course total to program total in dictionary
-            if program.uuid in self.program_dictionary:
-                self.program_dictionary[program.uuid]['count'] += count
-                self.program_dictionary[program.uuid]['recent_count'] += recent_count
+            if program_id in self.program_dictionary:
+                self.program_dictionary[program_id]['count'] += count
+                self.program_dictionary[program_id]['recent_count'] += recent_count
             else:
-                self.program_dictionary[program.uuid] = {'program': program,
-                                                         'count': count,
-                                                         'recent_count': recent_count}
+                self.program_dictionary[program_id] = {'uuid': program_uuid,
+                                                       'count': count,
+                                                       'recent_count': recent_count}
+
+        return Course(id=course_id, enrollment_count=count, recent_enrollment_count=recent_count)
+
+    def _get_course_programs(self):
+        """
+        Returns the ids and uuids of the programs of each course with enrollments, by course id.
+        """
+        course_programs = defaultdict(list)
+        memberships = Program.courses.through.objects.filter(course_id__in=self.course_dictionary)
+        for course_id, program_id, program_uuid in memberships.values_list(
+            'course_id', 'program_id', 'program__uuid'
+        ):
+            course_programs[course_id].append((program_id, program_uuid))
+        return course_programs
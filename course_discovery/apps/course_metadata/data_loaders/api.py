@@ -1,26 +1,35 @@
 import concurrent.futures
+import datetime
 import logging
 import math
+import operator
 import threading
-import time
+from collections import defaultdict
 from decimal import Decimal
+from functools import reduce
 from io import BytesIO
+from uuid import UUID
 
 import backoff
+import pytz
 import requests
 from django.conf import settings
 from django.core.files import File
 from django.core.management import CommandError
+from django.db import transaction
 from django.db.models import Q
 from opaque_keys.edx.keys import CourseKey
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
 
 from course_discovery.apps.core.models import Currency
 from course_discovery.apps.course_metadata.choices import CourseRunPacing, CourseRunStatus
 from course_discovery.apps.course_metadata.data_loaders import AbstractDataLoader
 from course_discovery.apps.course_metadata.data_loaders.course_type import calculate_course_type
+from course_discovery.apps.course_metadata.data_loaders.fetching import RateLimiter, fetch_concurrently
+from course_discovery.apps.course_metadata.data_loaders.incremental import RecordHashes, StoredResponses
 from course_discovery.apps.course_metadata.models import (
-    Course, CourseEntitlement, CourseRun, CourseRunType, CourseType, Organization, Program, ProgramType, Seat, SeatType,
-    Source, Video
+    Course, CourseAvailability, CourseEntitlement, CourseRun, CourseRunType, CourseType, DataLoaderConfig, Organization,
+    Program, ProgramType, Seat, SeatType, Source, Video
 )
 from course_discovery.apps.course_metadata.toggles import BYPASS_LMS_DATA_LOADER__END_DATE_UPDATED_CHECK
 from course_discovery.apps.course_metadata.utils import push_to_ecommerce_for_course_run, subtract_deadline_delta
@@ -45,16 +54,28 @@ class CoursesApiDataLoader(AbstractDataLoader):
     """ Loads course runs from the Courses API. """
 
     PAGE_SIZE = 50
+    # The courses endpoint has a 40 requests/minute rate limit. Pages are requested no faster than this, and
+    # slower whenever the API answers with a 429 or its rate limit headers ask for it.
+    MAX_REQUESTS_PER_MINUTE = 40
+    # Number of requests which may be sent at once after the rate limiter has been idle.
+    REQUEST_BURST = 5
+    # Number of fetched pages which may wait to be written to the database before fetching pauses.
+    PROCESSING_QUEUE_SIZE = 10
 
     def __init__(self, partner, api_url=None, max_workers=None, is_threadsafe=False, enable_api=True):
         super().__init__(partner, api_url, max_workers, is_threadsafe, enable_api)
         self.default_product_source = Source.objects.get(slug=settings.DEFAULT_PRODUCT_SOURCE_SLUG)
+        self.rate_limiter = RateLimiter(self.MAX_REQUESTS_PER_MINUTE / 60, burst=self.REQUEST_BURST)
+        # Course runs received from the event bus aren't shaped like the API's, so they are never skipped.
+        self.incremental_refresh = enable_api and DataLoaderConfig.get_solo().incremental_refresh
+        self.record_hashes = RecordHashes(partner, 'courses', enabled=self.incremental_refresh)
+        self.stored_responses = StoredResponses(partner, enabled=self.incremental_refresh)
 
     def ingest(self):
         logger.info('Refreshing Courses and CourseRuns from %s...', self.partner.courses_api_url)
 
         initial_page = 1
-        response = self._make_request(initial_page)
+        response = self.stored_responses.load(self._make_request(initial_page))
         count = response['pagination']['count']
         pages = response['pagination']['num_pages']
         self._process_response(response)
@@ -62,46 +83,31 @@ class CoursesApiDataLoader(AbstractDataLoader):
         pagerange = range(initial_page + 1, pages + 1)
         logger.info('Looping to request all %d pages...', pages)
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:  # pragma: no cover
-            if self.is_threadsafe:
-                for page in pagerange:
-                    # This time.sleep is to make it very likely that this method does not encounter a 429 status
-                    # code by increasing the amount of time between each code. More details at LEARNER-5560
-                    # The current crude estimation is for ~3000 courses with a PAGE_SIZE=50 which means this method
-                    # will take ~30 minutes.
-                    # TODO Ticket to gracefully handle 429 https://openedx.atlassian.net/browse/LEARNER-5565
-                    time.sleep(30)
-                    executor.submit(self._load_data, page)
-            else:
-                for future in [executor.submit(self._make_request, page) for page in pagerange]:
-                    response = future.result()
-                    self._process_response(response)
+        # Pages are requested by max_workers threads as fast as the rate limiter allows, while this thread writes
+        # them to the database, along with the responses the next refresh makes its requests conditional on, so
+        # the database is only used by this thread.
+        fetched_pages = fetch_concurrently(self._make_request, pagerange, self.max_workers, self.PROCESSING_QUEUE_SIZE)
+        for __, response in fetched_pages:
+            self._process_response(self.stored_responses.load(response))
 
         logger.info('Retrieved %d course runs from %s.', count, self.partner.courses_api_url)
 
-    def _load_data(self, page):  # pragma: no cover
-        """Make a request for the given page and process the response."""
-        response = self._make_request(page)
-        self._process_response(response)
-
-    # The courses endpoint has 40 requests/minute rate limit.
-    # This will back off at a rate of 60/120/240 seconds (from the factor 60 and default value of base 2).
-    # This backoff code can still fail because of the concurrent requests all requesting at the same time.
-    # So even in the case of entering into the next minute, if we still exceed our limit for that min,
-    # any requests that failed in both limits are still approaching their max_tries limit.
+    # The rate limiter holds requests after a 429 until the API allows them again, so retries don't need to
+    # wait long themselves.
     @backoff.on_exception(
         backoff.expo,
-        factor=60,
-        max_tries=4,
+        max_tries=8,
         exception=requests.exceptions.RequestException,
         giveup=_fatal_code,
     )
     def _make_request(self, page):
+        self.rate_limiter.acquire()
         logger.info('Requesting course run page %d...', page)
         params = {'page': page, 'page_size': self.PAGE_SIZE, 'username': self.username, 'active_only': True}
-        response = self.api_client.get(self.api_url + '/courses/', params=params)
-        response.raise_for_status()
-        return response.json()
+        conditional_response = self.stored_responses.get(self.api_client, self.api_url + '/courses/', params)
+        self.rate_limiter.update(conditional_response.response)
+        conditional_response.response.raise_for_status()
+        return conditional_response
 
     def _process_response(self, response):
         results = response['results']
@@ -117,6 +123,10 @@ class CoursesApiDataLoader(AbstractDataLoader):
         try:
             body = self.clean_strings(body)
             official_run, draft_run = self.get_course_run(body)
+            if (official_run or draft_run) and self.record_hashes.is_unchanged(course_run_id, body):
+                logger.info(f"Skipping course run {course_run_id}, which did not change since it was last loaded")
+                return
+
             if official_run or draft_run:
                 self.update_course_run(official_run, draft_run, body)
                 if not self.partner.uses_publisher:
@@ -133,6 +143,7 @@ class CoursesApiDataLoader(AbstractDataLoader):
                     logger.info(f"Course run created with uuid {course_run.uuid} and key {course_run.key}")
                     course.canonical_course_run = course_run
                     course.save()
+            self.record_hashes.save(course_run_id, body)
         except Exception:  # pylint: disable=broad-except
             if self.enable_api:
                 msg = 'An error occurred while updating {course_run} from {api_url}'.format(
@@ -334,6 +345,17 @@ class EcommerceApiDataLoader(AbstractDataLoader):
         self.course_run_count = 0
         self.entitlement_count = 0
         self.enrollment_code_count = 0
+        # Every currency and seat type, by code and slug, read once per ingest.
+        self.currencies = {}
+        self.seat_types = {}
+
+        self.incremental_refresh = DataLoaderConfig.get_solo().incremental_refresh
+        self.course_run_hashes = RecordHashes(partner, 'ecommerce_course_runs', enabled=self.incremental_refresh)
+        self.entitlement_hashes = RecordHashes(partner, 'ecommerce_entitlements', enabled=self.incremental_refresh)
+        self.enrollment_code_hashes = RecordHashes(
+            partner, 'ecommerce_enrollment_codes', enabled=self.incremental_refresh
+        )
+        self.stored_responses = StoredResponses(partner, enabled=self.incremental_refresh)
 
         # Thread locks to protect access to the counts
         self.course_run_count_lock = threading.Lock()
@@ -353,12 +375,14 @@ class EcommerceApiDataLoader(AbstractDataLoader):
         self._delete_entitlements()
 
     def _load_ecommerce_data(self):
-        course_runs = self._request_course_runs(self.initial_page)
-        entitlements = self._request_entitlements(self.initial_page)
-        enrollment_codes = self._request_enrollment_codes(self.initial_page)
+        course_runs = self.stored_responses.load(self._request_course_runs(self.initial_page))
+        entitlements = self.stored_responses.load(self._request_entitlements(self.initial_page))
+        enrollment_codes = self.stored_responses.load(self._request_enrollment_codes(self.initial_page))
 
         self.entitlement_skus = []
         self.enrollment_skus = []
+        self.currencies = Currency.objects.in_bulk()
+        self.seat_types = SeatType.objects.in_bulk(field_name='slug')
 
         self.processing_failure_occurred = False
         self.course_run_count = 0
@@ -453,7 +477,7 @@ class EcommerceApiDataLoader(AbstractDataLoader):
     )
     def _request_course_runs(self, page):
         params = {'page': page, 'page_size': self.PAGE_SIZE, 'include_products': True}
-        return self.api_client.get(self.api_url + '/courses/', params=params).json()
+        return self._request(self.api_url + '/courses/', params)
 
     @backoff.on_exception(
         backoff.expo,
@@ -462,7 +486,7 @@ class EcommerceApiDataLoader(AbstractDataLoader):
     )
     def _request_entitlements(self, page):
         params = {'page': page, 'page_size': self.PAGE_SIZE, 'product_class': 'Course Entitlement'}
-        return self.api_client.get(self.api_url + '/products/', params=params).json()
+        return self._request(self.api_url + '/products/', params)
 
     @backoff.on_exception(
         backoff.expo,
@@ -471,7 +495,12 @@ class EcommerceApiDataLoader(AbstractDataLoader):
     )
     def _request_enrollment_codes(self, page):
         params = {'page': page, 'page_size': self.PAGE_SIZE, 'product_class': 'Enrollment Code'}
-        return self.api_client.get(self.api_url + '/products/', params=params).json()
+        return self._request(self.api_url + '/products/', params)
+
+    def _request(self, url, params):
+        conditional_response = self.stored_responses.get(self.api_client, url, params)
+        conditional_response.response.raise_for_status()
+        return conditional_response
 
     def _process_course_runs(self, response):
         results = response['results']
@@ -480,9 +509,9 @@ class EcommerceApiDataLoader(AbstractDataLoader):
         self.course_run_count_lock.acquire()  # lint-amnesty, pylint: disable=consider-using-with
         self.course_run_count += len(results)
         self.course_run_count_lock.release()
-        for body in results:
-            body = self.clean_strings(body)
-            self.update_seats(body)
+
+        with transaction.atomic():
+            self.update_seats([self.clean_strings(body) for body in results])
 
     def _process_entitlements(self, response):
         results = response['results']
@@ -492,9 +521,8 @@ class EcommerceApiDataLoader(AbstractDataLoader):
         self.entitlement_count += len(results)
         self.entitlement_count_lock.release()
 
-        for body in results:
-            body = self.clean_strings(body)
-            self.entitlement_skus.append(self.update_entitlement(body))
+        with transaction.atomic():
+            self.entitlement_skus.extend(self.update_entitlements([self.clean_strings(body) for body in results]))
 
     def _process_enrollment_codes(self, response):
         results = response['results']
@@ -510,7 +538,7 @@ class EcommerceApiDataLoader(AbstractDataLoader):
     def _delete_entitlements(self):
         entitlements_to_delete = CourseEntitlement.objects.filter(
             partner=self.partner
-        ).exclude(sku__in=self.entitlement_skus)
+        ).exclude(sku__in=self.entitlement_skus).select_related('course', 'partner')
 
         for entitlement in entitlements_to_delete:
             msg = 'Deleting entitlement for course {course_title} with sku {sku} for partner {partner}'.format(
@@ -522,71 +550,145 @@ class EcommerceApiDataLoader(AbstractDataLoader):
     def _check_future_and_process(self, future, process_fn):
         check_exception = future.exception()
         if check_exception is None:
-            response = future.result()
+            response = self.stored_responses.load(future.result())
             process_fn(response)
         else:
             logger.exception(check_exception)
             # Protect against deletes if exceptions occurred
             self.processing_failure_occurred = True
 
-    def update_seats(self, body):
-        course_run_key = body['id']
-        try:
-            course_run = CourseRun.objects.get(key__iexact=course_run_key)
-        except CourseRun.DoesNotExist:
-            logger.warning('Could not find course run [%s]', course_run_key)
+    def update_seats(self, bodies):
+        """
+        Creates, updates and removes the seats of a page of course runs from the ecommerce courses API.
+
+        The course runs, course run type tracks and seats the page refers to are read with a query each, and the seats
+        are written in bulk, along with their history.
+        """
+        changed_bodies = []
+        for body in bodies:
+            if self.course_run_hashes.is_unchanged(body['id'], body):
+                logger.info('Skipping seats of course run [%s], which did not change since they were last loaded.',
+                            body['id'])
+            else:
+                changed_bodies.append(body)
+        if not changed_bodies:
             return
 
-        for product_body in body['products']:
-            if product_body['structure'] != 'child':
+        course_run_keys = [body['id'] for body in changed_bodies]
+        course_runs = {}
+        for course_run in CourseRun.objects.filter(
+            reduce(operator.or_, (Q(key__iexact=key) for key in course_run_keys))
+        ).select_related('type'):
+            course_runs.setdefault(course_run.key.lower(), course_run)
+
+        seats = {}
+        run_seats = defaultdict(list)
+        for seat in Seat.everything.filter(course_run__in=course_runs.values()):
+            seats.setdefault((seat.course_run_id, seat.type_id, seat.currency_id, seat.credit_provider), seat)
+            run_seats[seat.course_run_id].append(seat)
+        lookups = {
+            'seats': seats,
+            'tracks': set(CourseRunType.tracks.through.objects.filter(
+                courseruntype__in={course_run.type_id for course_run in course_runs.values()}
+            ).values_list('courseruntype_id', 'track__seat_type_id')),
+        }
+
+        loaded_bodies = []
+        seats_to_remove = []
+        for body in changed_bodies:
+            course_run_key = body['id']
+            course_run = course_runs.get(course_run_key.lower())
+            if not course_run:
+                logger.warning('Could not find course run [%s]', course_run_key)
                 continue
-            product_body = self.clean_strings(product_body)
-            self.update_seat(course_run, product_body)
-
-        # Remove seats which no longer exist for that course run
-        certificate_types = [self.get_certificate_type(product) for product in body['products']
-                             if product['structure'] == 'child']
-
-        seats_to_remove = course_run.seats.exclude(type__slug__in=certificate_types)
-        if seats_to_remove.count() > 0:
-            logger.info(
-                'Removing seats [%s] for course run with key [%s].',
-                ', '.join(s.type.slug for s in seats_to_remove),
-                course_run_key,
+
+            loaded = True
+            for product_body in body['products']:
+                if product_body['structure'] != 'child':
+                    continue
+                product_body = self.clean_strings(product_body)
+                loaded = self.update_seat(course_run, product_body, lookups) is not None and loaded
+
+            # Remove seats which no longer exist for that course run
+            certificate_types = [self.get_certificate_type(product) for product in body['products']
+                                 if product['structure'] == 'child']
+            removed = [seat for seat in run_seats[course_run.id] if seat.type_id not in certificate_types]
+            if removed:
+                logger.info(
+                    'Removing seats [%s] for course run with key [%s].',
+                    ', '.join(seat.type_id for seat in removed),
+                    course_run_key,
+                )
+                seats_to_remove.extend(removed)
+
+            if loaded:
+                loaded_bodies.append(body)
+
+        now = datetime.datetime.now(pytz.UTC)
+        seats_to_create = [seat for seat in seats.values() if seat.pk is None]
+        seats_to_update = [seat for seat in seats.values() if seat.has_changed]
+        for seat in seats_to_update:
+            seat.modified = now
+        if seats_to_create:
+            bulk_create_with_history(seats_to_create, Seat)
+        if seats_to_update:
+            bulk_update_with_history(
+                seats_to_update, Seat, ['price', 'sku', '_upgrade_deadline', 'credit_hours', 'modified']
             )
-        seats_to_remove.delete()
+        if seats_to_remove:
+            Seat.everything.filter(id__in=[seat.id for seat in seats_to_remove]).delete()
+
+        # Bulk writes don't send the signals through which saved seats refresh their course runs' date states and
+        # their courses' availability snapshots.
+        written_course_runs = {seat.course_run for seat in seats_to_create + seats_to_update}
+        if written_course_runs:
+            CourseRun.refresh_date_states([course_run.id for course_run in written_course_runs])
+            CourseAvailability.refresh({course_run.course_id for course_run in written_course_runs})
 
-    def update_seat(self, course_run, product_body):
+        for body in loaded_bodies:
+            self.course_run_hashes.save(body['id'], body)
+
+    def update_seat(self, course_run, product_body, lookups):
+        """
+        Applies an ecommerce product to the matching seat of a course run, or to a new one, without saving it.
+
+        Arguments:
+            course_run (CourseRun): Course run the product is a seat of
+            product_body (dict): Product data from ecommerce
+            lookups (dict): The tracks of the page's course run types, as (course run type id, seat type id) pairs, and
+                the page's seats, by course run id, seat type slug, currency code and credit provider
+
+        Returns:
+            The seat, or None if the product can't be loaded
+        """
         stock_record = product_body['stockrecords'][0]
         currency_code = stock_record['price_currency']
         price = Decimal(stock_record['price_excl_tax'])
         sku = stock_record['partner_sku']
 
-        try:
-            currency = Currency.objects.get(code=currency_code)
-        except Currency.DoesNotExist:
+        currency = self.currencies.get(currency_code)
+        if not currency:
             logger.warning("Could not find currency [%s]", currency_code)
-            return
+            return None
 
         attributes = {attribute['name']: attribute['value'] for attribute in product_body['attribute_values']}
 
         certificate_type = attributes.get('certificate_type', Seat.AUDIT)
-        try:
-            seat_type = SeatType.objects.get(slug=certificate_type)
-        except SeatType.DoesNotExist:
+        seat_type = self.seat_types.get(certificate_type)
+        if not seat_type:
             msg = ('Could not find seat type {seat_type} while loading seat with sku {sku} for course run with key '
                    '{key}'.format(seat_type=certificate_type, sku=sku, key=course_run.key))
             logger.warning(msg)
             self.processing_failure_occurred = True
-            return
-        if not course_run.type.empty and not course_run.type.tracks.filter(seat_type=seat_type).exists():
+            return None
+        if not course_run.type.empty and (course_run.type_id, seat_type.id) not in lookups['tracks']:
             logger.warning(
                 'Seat type {seat_type} is not compatible with course run type {run_type} for course run {key}'.format(  # lint-amnesty, pylint: disable=logging-format-interpolation
                     seat_type=seat_type.slug, run_type=course_run.type.slug, key=course_run.key,
                 )
             )
             self.processing_failure_occurred = True
-            return
+            return None
 
         credit_provider = attributes.get('credit_provider')
 
@@ -594,23 +696,20 @@ class EcommerceApiDataLoader(AbstractDataLoader):
         if credit_hours:
             credit_hours = int(credit_hours)
 
-        defaults = {
-            'price': price,
-            'sku': sku,
-            'upgrade_deadline': self.parse_date(product_body.get('expires')),
-            'credit_hours': credit_hours,
-        }
-
-        _, created = course_run.seats.update_or_create(
-            type=seat_type,
-            credit_provider=credit_provider,
-            currency=currency,
-            defaults=defaults
-        )
-
-        if created:
+        seat_key = (course_run.id, seat_type.slug, currency.code, credit_provider)
+        seat = lookups['seats'].get(seat_key)
+        if seat is None:
+            seat = lookups['seats'][seat_key] = Seat(
+                course_run=course_run, type=seat_type, currency=currency, credit_provider=credit_provider
+            )
             logger.info('Created seat for course with key [%s] and sku [%s].', course_run.key, sku)
 
+        seat.price = price
+        seat.sku = sku
+        seat.upgrade_deadline = self.parse_date(product_body.get('expires'))
+        seat.credit_hours = credit_hours
+        return seat
+
     def validate_stockrecord(self, stockrecords, title, product_class):
         """
         Argument:
@@ -661,9 +760,7 @@ class EcommerceApiDataLoader(AbstractDataLoader):
             logger.warning(msg)
             return None
 
-        try:
-            Currency.objects.get(code=currency_code)
-        except Currency.DoesNotExist:
+        if currency_code not in self.currencies:
             msg = 'Could not find currency {code} while loading {product} {title} with sku {sku}'.format(
                 product=product_class['value'], code=currency_code, title=title, sku=sku
             )
@@ -673,12 +770,80 @@ class EcommerceApiDataLoader(AbstractDataLoader):
         # All validation checks passed!
         return True
 
-    def update_entitlement(self, body):
+    def update_entitlements(self, bodies):
         """
-        Argument:
+        Creates or updates the entitlements of a page of entitlement products from ecommerce.
+
+        The courses and entitlements the page refers to are read with a query each, and the entitlements are written
+        in bulk, along with their history.
+
+        Returns:
+            list: The sku of each product, or None if it couldn't be loaded
+        """
+        course_uuids = set()
+        for body in bodies:
+            course_uuid = self._get_entitlement_course_uuid(body)
+            if course_uuid:
+                course_uuids.add(course_uuid)
+
+        courses = {
+            course.uuid: course
+            for course in Course.objects.filter(uuid__in=course_uuids).select_related('type').prefetch_related(
+                'type__entitlement_types'
+            )
+        }
+        entitlements = {
+            (entitlement.course_id, entitlement.mode_id): entitlement
+            for entitlement in CourseEntitlement.everything.filter(course__in=courses.values())
+        }
+
+        skus = []
+        loaded_bodies = []
+        for body in bodies:
+            if self.entitlement_hashes.is_unchanged(body.get('id'), body):
+                skus.append(body['stockrecords'][0]['partner_sku'])
+                continue
+
+            entitlement = self.update_entitlement(body, courses, entitlements)
+            skus.append(entitlement.sku if entitlement else None)
+            if entitlement:
+                loaded_bodies.append(body)
+
+        now = datetime.datetime.now(pytz.UTC)
+        entitlements_to_create = [entitlement for entitlement in entitlements.values() if entitlement.pk is None]
+        entitlements_to_update = [entitlement for entitlement in entitlements.values() if entitlement.has_changed]
+        for entitlement in entitlements_to_update:
+            entitlement.modified = now
+        if entitlements_to_create:
+            bulk_create_with_history(entitlements_to_create, CourseEntitlement)
+        if entitlements_to_update:
+            bulk_update_with_history(
+                entitlements_to_update, CourseEntitlement, ['partner', 'price', 'currency', 'sku', 'modified']
+            )
+
+        for body in loaded_bodies:
+            self.entitlement_hashes.save(body.get('id'), body)
+        return skus
+
+    @staticmethod
+    def _get_entitlement_course_uuid(body):
+        attributes = {attribute['name']: attribute['value'] for attribute in body['attribute_values']}
+        try:
+            return UUID(str(attributes.get('UUID')))
+        except ValueError:
+            return None
+
+    def update_entitlement(self, body, courses, entitlements):
+        """
+        Applies an entitlement product from ecommerce to the matching entitlement of a course, or to a new one,
+        without saving it.
+
+        Arguments:
             body (dict): entitlement product data from ecommerce
+            courses (dict): The page's courses, by uuid
+            entitlements (dict): The entitlements of the page's courses, by course id and mode id
         Returns:
-            entitlement product sku if no exceptions, else None
+            The entitlement, or None if the product can't be loaded
         """
         attributes = {attribute['name']: attribute['value'] for attribute in body['attribute_values']}
         course_uuid = attributes.get('UUID')
@@ -693,28 +858,19 @@ class EcommerceApiDataLoader(AbstractDataLoader):
         price = Decimal(stock_record['price_excl_tax'])
         sku = stock_record['partner_sku']
 
-        try:
-            course = Course.objects.get(uuid=course_uuid)
-        except Course.DoesNotExist:
+        course = courses.get(self._get_entitlement_course_uuid(body))
+        if not course:
             msg = 'Could not find course {uuid} while loading entitlement {title} with sku {sku}'.format(
                 uuid=course_uuid, title=title, sku=sku
             )
             logger.warning(msg)
             return None
 
-        try:
-            currency = Currency.objects.get(code=currency_code)
-        except Currency.DoesNotExist:
-            msg = 'Could not find currency {code} while loading entitlement {title} with sku {sku}'.format(
-                code=currency_code, title=title, sku=sku
-            )
-            logger.warning(msg)
-            return None
+        currency = self.currencies[currency_code]
 
         mode_name = attributes.get('certificate_type')
-        try:
-            mode = SeatType.objects.get(slug=mode_name)
-        except SeatType.DoesNotExist:
+        mode = self.seat_types.get(mode_name)
+        if not mode:
             msg = 'Could not find mode {mode} while loading entitlement {title} with sku {sku}'.format(
                 mode=mode_name, title=title, sku=sku
             )
@@ -730,18 +886,18 @@ class EcommerceApiDataLoader(AbstractDataLoader):
             self.processing_failure_occurred = True
             return None
 
-        defaults = {
-            'partner': self.partner,
-            'price': price,
-            'currency': currency,
-            'sku': sku,
-        }
         msg = 'Creating entitlement {title} with sku {sku} for partner {partner}'.format(
             title=title, sku=sku, partner=self.partner
         )
         logger.info(msg)
-        course.entitlements.update_or_create(mode=mode, defaults=defaults)
-        return sku
+        entitlement = entitlements.get((course.id, mode.id))
+        if entitlement is None:
+            entitlement = entitlements[(course.id, mode.id)] = CourseEntitlement(course=course, mode=mode)
+        entitlement.partner = self.partner
+        entitlement.price = price
+        entitlement.currency = currency
+        entitlement.sku = sku
+        return entitlement
 
     def update_enrollment_code(self, body):
         """
@@ -750,6 +906,9 @@ class EcommerceApiDataLoader(AbstractDataLoader):
         Returns:
             enrollment code product sku if no exceptions, else None
         """
+        if self.enrollment_code_hashes.is_unchanged(body.get('id'), body):
+            return body['stockrecords'][0]['partner_sku']
+
         attributes = {attribute['code']: attribute['value'] for attribute in body['attribute_values']}
         course_key = attributes.get('course_key')
         title = body['title']
@@ -789,6 +948,7 @@ class EcommerceApiDataLoader(AbstractDataLoader):
         logger.info(msg)
 
         course_run.seats.update_or_create(type=seat_type, defaults=defaults)
+        self.enrollment_code_hashes.save(body.get('id'), body)
         return sku
 
     def get_certificate_type(self, product):
@@ -807,6 +967,9 @@ class ProgramsApiDataLoader(AbstractDataLoader):
     def __init__(self, partner, api_url, max_workers=None, is_threadsafe=False):
         super().__init__(partner, api_url, max_workers, is_threadsafe)
         self.XSERIES = ProgramType.objects.get(translations__name_t='XSeries')
+        self.incremental_refresh = DataLoaderConfig.get_solo().incremental_refresh
+        self.record_hashes = RecordHashes(partner, 'programs', enabled=self.incremental_refresh)
+        self.stored_responses = StoredResponses(partner, enabled=self.incremental_refresh)
 
     def ingest(self):
         api_url = self.partner.programs_api_url
@@ -817,9 +980,9 @@ class ProgramsApiDataLoader(AbstractDataLoader):
 
         while page:
             params = {'page': page, 'page_size': self.PAGE_SIZE}
-            response = self.api_client.get(self.api_url + '/programs/', params=params)
-            response.raise_for_status()
-            response_json = response.json()
+            conditional_response = self.stored_responses.get(self.api_client, self.api_url + '/programs/', params)
+            conditional_response.response.raise_for_status()
+            response_json = self.stored_responses.load(conditional_response)
             count = response_json['count']
             results = response_json['results']
             logger.info('Retrieved %d programs...', len(results))
@@ -840,6 +1003,9 @@ class ProgramsApiDataLoader(AbstractDataLoader):
 
     def update_program(self, body):
         uuid = self._get_uuid(body)
+        if self.record_hashes.is_unchanged(uuid, body):
+            logger.info('Skipping program %s, which did not change since it was last loaded.', uuid)
+            return
 
         try:
             defaults = {
@@ -860,6 +1026,7 @@ class ProgramsApiDataLoader(AbstractDataLoader):
             self._update_program_courses_and_runs(body, program)
             self._update_program_banner_image(body, program)
             program.save()
+            self.record_hashes.save(uuid, body)
         except Exception:  # pylint: disable=broad-except
             logger.exception('Failed to load program %s', uuid)
 
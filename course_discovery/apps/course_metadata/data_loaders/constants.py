@@ -16,6 +16,7 @@ class CSVIngestionErrors:
     LOGO_IMAGE_DOWNLOAD_FAILURE = 'LOGO_IMAGE_DOWNLOAD_FAILURE'
     COURSE_UPDATE_ERROR = 'COURSE_UPDATE_ERROR'
     COURSE_RUN_UPDATE_ERROR = 'COURSE_RUN_UPDATE_ERROR'
+    COURSE_INGESTION_ERROR = 'COURSE_INGESTION_ERROR'
 
 
 class CSVIngestionErrorMessages:
@@ -43,6 +44,9 @@ class CSVIngestionErrorMessages:
     COURSE_RUN_UPDATE_ERROR = '[COURSE_RUN_UPDATE_ERROR] Unable to update course run of the course {course_title} ' \
                               'in the system. The update failed with the exception: {exception_message}'
 
+    COURSE_INGESTION_ERROR = '[COURSE_INGESTION_ERROR] Unable to ingest course {course_title}. The ingestion ' \
+                             'failed unexpectedly with the exception: {exception_message}'
+
     IMAGE_DOWNLOAD_FAILURE = '[IMAGE_DOWNLOAD_FAILURE] The course image download failed for the course' \
                              ' {course_title}.'
 
@@ -55,7 +59,7 @@ CSV_LOADER_ERROR_LOG_SEQUENCE = [
     CSVIngestionErrors.MISSING_COURSE_RUN_TYPE, CSVIngestionErrors.MISSING_REQUIRED_DATA,
     CSVIngestionErrors.IMAGE_DOWNLOAD_FAILURE, CSVIngestionErrors.LOGO_IMAGE_DOWNLOAD_FAILURE,
     CSVIngestionErrors.COURSE_CREATE_ERROR, CSVIngestionErrors.COURSE_UPDATE_ERROR,
-    CSVIngestionErrors.COURSE_RUN_UPDATE_ERROR
+    CSVIngestionErrors.COURSE_RUN_UPDATE_ERROR, CSVIngestionErrors.COURSE_INGESTION_ERROR
 ]
 
 
@@ -3,13 +3,21 @@ Data loader responsible for creating course and course runs entries in discovery
 creating and updating related objects in Studio, and ecommerce, provided a csv containing the required information.
 """
 import csv
+import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import unicodecsv
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
 from django.db.models import Q
-from django.urls import reverse
 
+from course_discovery.apps.api.serializers import CourseRunWithProgramsSerializer
+from course_discovery.apps.api.services import (
+    create_course, create_course_run, update_course, update_course_run, update_course_run_image_in_studio
+)
+from course_discovery.apps.core.models import User
 from course_discovery.apps.core.utils import serialize_datetime
 from course_discovery.apps.course_metadata.choices import (
     CourseRunStatus, ExternalCourseMarketingType, ExternalProductStatus
@@ -18,18 +26,31 @@ from course_discovery.apps.course_metadata.data_loaders import AbstractDataLoade
 from course_discovery.apps.course_metadata.data_loaders.constants import (
     CSV_LOADER_ERROR_LOG_SEQUENCE, CSVIngestionErrorMessages, CSVIngestionErrors
 )
+from course_discovery.apps.course_metadata.data_loaders.incremental import RecordHashes
 from course_discovery.apps.course_metadata.gspread_client import GspreadClient
 from course_discovery.apps.course_metadata.models import (
-    AdditionalMetadata, Collaborator, Course, CourseRun, CourseRunPacing, CourseRunType, CourseType, Organization,
-    Person, ProgramType, Source, Subject
+    AdditionalMetadata, Collaborator, Course, CourseRun, CourseRunPacing, CourseRunType, CourseType, DataLoaderConfig,
+    Organization, Person, ProgramType, Source, Subject
 )
-from course_discovery.apps.course_metadata.utils import download_and_save_course_image
+from course_discovery.apps.course_metadata.utils import download_course_image, ensure_draft_world, save_course_image
 from course_discovery.apps.ietf_language_tags.models import LanguageTag
 
 logger = logging.getLogger(__name__)
 
 
 class CSVDataLoader(AbstractDataLoader):
+    """
+    Ingests the rows of the CSV in batches. The organizations, types and existing courses of all rows are loaded
+    up front, and the images of a batch are downloaded by a pool of threads while the previous batch is written.
+
+    Courses and course runs are written with the same services as the course and course run api, each row in
+    its own transaction.
+    """
+
+    # Number of rows whose images are downloaded while the previous rows are written
+    BATCH_SIZE = 50
+    # Number of images downloaded at the same time
+    IMAGE_DOWNLOAD_WORKERS = 8
 
     PROGRAM_TYPES = [
         ProgramType.XSERIES,
@@ -85,6 +106,18 @@ class CSVDataLoader(AbstractDataLoader):
             'archived_products': []
         }
         self.course_uuids = {}  # to show the discovery course ids for each processed course
+        self.language_codes = {}
+        self.subject_slugs = {}
+        # Loaded for all rows when the ingestion starts
+        self.organization_keys = set()
+        self.course_types = {}
+        self.course_run_types = {}
+        self.courses = {}
+        # User the courses are written as, made an editor of the courses created
+        self.user = None
+        self.image_hashes = RecordHashes(
+            partner, 'csv_course_images', enabled=DataLoaderConfig.get_solo().incremental_refresh
+        )
         self.product_type = product_type
         try:
             self.product_source = Source.objects.get(slug=product_source)
@@ -115,159 +148,281 @@ class CSVDataLoader(AbstractDataLoader):
         self.reader = list(self.reader)
         self.ingestion_summary['total_products_count'] = len(self.reader)
 
-    def ingest(self):  # pylint: disable=too-many-statements
+    def ingest(self):
         logger.info("Initiating CSV data loader flow.")
-        course_external_identifiers = set()  # store external course ids for each course present in sheet
+        rows = [self.transform_dict_keys(row) for row in self.reader]
+        # store all external identifiers present in sheet, irrespective of ingestion status
+        course_external_identifiers = {row['external_identifier'] for row in rows if 'external_identifier' in row}
+        self.user = self._get_user()
+        self._load_related_objects(rows)
+
+        batches = [rows[index:index + self.BATCH_SIZE] for index in range(0, len(rows), self.BATCH_SIZE)]
+        with ThreadPoolExecutor(max_workers=self.IMAGE_DOWNLOAD_WORKERS) as executor:
+            next_batch = self._prepare_batch(executor, batches[0]) if batches else None
+            for index in range(len(batches)):
+                valid_rows, images = next_batch
+                # Start downloading the images of the next batch while this one is written.
+                if index + 1 < len(batches):
+                    next_batch = self._prepare_batch(executor, batches[index + 1])
+                self._ingest_batch(valid_rows, images)
 
-        for row in self.reader:
-            row = self.transform_dict_keys(row)
-            course_title = row['title']
-            org_key = row['organization']
+        self._archive_stale_products(course_external_identifiers)
+        logger.info("CSV loader ingest pipeline has completed.")
 
-            # store all external identifiers present in sheet, irrespective of ingestion status
-            if 'external_identifier' in row:
-                course_external_identifiers.add(row['external_identifier'])
+        self._render_error_logs()
+        self._render_course_uuids()
 
-            logger.info('Starting data import flow for {}'.format(course_title))  # lint-amnesty, pylint: disable=logging-format-interpolation
-            if not Organization.objects.filter(key=org_key).exists():
-                error_message = CSVIngestionErrorMessages.MISSING_ORGANIZATION.format(
-                    org_key=org_key,
-                    course_title=course_title,
-                )
-                logger.error(error_message)
-                self._register_ingestion_error(CSVIngestionErrors.MISSING_ORGANIZATION, error_message)
+    def _get_user(self):
+        """
+        Return the user the courses and course runs are written as, which must already exist.
+        """
+        try:
+            return User.objects.get(username=self.username)
+        except User.DoesNotExist:
+            raise ImproperlyConfigured(  # pylint: disable=raise-missing-from
+                'Unable to locate the user [{}] of the API client to ingest the CSV as.'.format(self.username)
+            )
+
+    def _load_related_objects(self, rows):
+        """
+        Load the organizations, course types, course run types and existing courses referenced by the rows
+        with one query each, instead of looking them up row by row.
+        """
+        self.organization_keys = set(Organization.objects.filter(
+            key__in={row['organization'] for row in rows}
+        ).values_list('key', flat=True))
+        self.course_types = {
+            course_type.name: course_type
+            for course_type in CourseType.objects.filter(
+                name__in={row.get('course_enrollment_track') for row in rows}
+            ).prefetch_related('entitlement_types')
+        }
+        self.course_run_types = {
+            course_run_type.name: course_run_type
+            for course_run_type in CourseRunType.objects.filter(
+                name__in={row.get('course_run_enrollment_track') for row in rows}
+            )
+        }
+        course_keys = {self.get_course_key(row['organization'], row.get('number')) for row in rows}
+        self.courses = {
+            course.key: course
+            for course in Course.objects.filter_drafts(key__in=course_keys, partner=self.partner)
+        }
+
+    def _validate_row(self, row):
+        """
+        Return the course type and course run type of a row, or None after registering the error if the row
+        can't be ingested.
+        """
+        course_title = row['title']
+        org_key = row['organization']
+
+        logger.info('Starting data import flow for {}'.format(course_title))  # lint-amnesty, pylint: disable=logging-format-interpolation
+        if org_key not in self.organization_keys:
+            error_message = CSVIngestionErrorMessages.MISSING_ORGANIZATION.format(
+                org_key=org_key,
+                course_title=course_title,
+            )
+            logger.error(error_message)
+            self._register_ingestion_error(CSVIngestionErrors.MISSING_ORGANIZATION, error_message)
+            return None
+
+        course_type = self.course_types.get(row['course_enrollment_track'])
+        if not course_type:
+            error_message = CSVIngestionErrorMessages.MISSING_COURSE_TYPE.format(
+                course_title=course_title, course_type=row['course_enrollment_track']
+            )
+            logger.error(error_message)
+            self._register_ingestion_error(CSVIngestionErrors.MISSING_COURSE_TYPE, error_message)
+            return None
+
+        course_run_type = self.course_run_types.get(row['course_run_enrollment_track'])
+        if not course_run_type:
+            error_message = CSVIngestionErrorMessages.MISSING_COURSE_RUN_TYPE.format(
+                course_title=course_title, course_run_type=row['course_run_enrollment_track']
+            )
+            logger.error(error_message)
+            self._register_ingestion_error(CSVIngestionErrors.MISSING_COURSE_RUN_TYPE, error_message)
+            return None
+
+        missing_fields = self.validate_course_data(course_type, row)
+        if missing_fields:
+            error_message = CSVIngestionErrorMessages.MISSING_REQUIRED_DATA.format(
+                course_title=course_title, missing_data=missing_fields
+            )
+            logger.error(error_message)
+            self._register_ingestion_error(CSVIngestionErrors.MISSING_REQUIRED_DATA, error_message)
+            return None
+
+        return course_type, course_run_type
+
+    def _prepare_batch(self, executor, rows):
+        """
+        Validate a batch of rows, and start downloading the images of the valid ones.
+
+        Returns the valid rows along with their course type and course run type, and a dict mapping each image
+        url to the future of its download. Images shared by several rows are only downloaded once.
+        """
+        valid_rows = []
+        images = {}
+        for row in rows:
+            types = self._validate_row(row)
+            if not types:
                 continue
 
+            valid_rows.append((row, *types))
+            course_key = self.get_course_key(row['organization'], row['number'])
+            for image_url in (row['image'], row.get('organization_logo_override')):
+                if image_url and image_url not in images:
+                    images[image_url] = executor.submit(self._download_image, course_key, image_url)
+        return valid_rows, images
+
+    def _download_image(self, course_key, image_url):
+        try:
+            return download_course_image(course_key, image_url, headers=self.REQUEST_USER_AGENT_HEADERS)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('An unknown exception occurred while downloading image for course [%s]', course_key)
+            return None
+
+    def _save_image(self, course, image_url, image, data_field='image'):
+        """
+        Save a downloaded image in a data field of the course. Saving is skipped if the field already holds
+        the same image, as its variations would otherwise be rendered again for nothing.
+        """
+        if not image:
+            return False
+
+        content_type, content = image
+        object_id = f'{course.uuid}:{data_field}'
+        content_hash = hashlib.md5(content).hexdigest()
+        if getattr(course, data_field) and self.image_hashes.is_unchanged(object_id, content_hash):
+            logger.info(f'Image for course {course.key} is unchanged in {data_field} field')
+            return True
+
+        try:
+            is_saved = save_course_image(course, image_url, content_type, content, data_field)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('An unknown exception occurred while downloading image for course [%s]', course.key)
+            return False
+
+        if is_saved:
+            self.image_hashes.save(object_id, content_hash)
+        return is_saved
+
+    def _ingest_batch(self, valid_rows, images):
+        """
+        Write the rows of a batch, each in its own transaction, so that no locks are held across the Studio
+        and ecommerce calls of other rows, and a row failing unexpectedly is rolled back on its own.
+        """
+        for row, course_type, course_run_type in valid_rows:
             try:
-                course_type = CourseType.objects.get(name=row['course_enrollment_track'])
-                course_run_type = CourseRunType.objects.get(name=row['course_run_enrollment_track'])
-            except CourseType.DoesNotExist:
-                error_message = CSVIngestionErrorMessages.MISSING_COURSE_TYPE.format(
-                    course_title=course_title, course_type=row['course_enrollment_track']
-                )
-                logger.exception(error_message)
-                self._register_ingestion_error(CSVIngestionErrors.MISSING_COURSE_TYPE, error_message)
-                continue
-            except CourseRunType.DoesNotExist:
-                error_message = CSVIngestionErrorMessages.MISSING_COURSE_RUN_TYPE.format(
-                    course_title=course_title, course_run_type=row['course_run_enrollment_track']
+                with transaction.atomic():
+                    self._ingest_row(row, course_type, course_run_type, images)
+            except Exception as exc:  # pylint: disable=broad-except
+                error_message = CSVIngestionErrorMessages.COURSE_INGESTION_ERROR.format(
+                    course_title=row['title'],
+                    exception_message=exc
                 )
                 logger.exception(error_message)
-                self._register_ingestion_error(CSVIngestionErrors.MISSING_COURSE_RUN_TYPE, error_message)
-                continue
-
-            missing_fields = self.validate_course_data(course_type, row)
-            if missing_fields:
-                error_message = CSVIngestionErrorMessages.MISSING_REQUIRED_DATA.format(
-                    course_title=course_title, missing_data=missing_fields
-                )
-                logger.error(error_message)
-                self._register_ingestion_error(CSVIngestionErrors.MISSING_REQUIRED_DATA, error_message)
-                continue
+                self._register_ingestion_error(CSVIngestionErrors.COURSE_INGESTION_ERROR, error_message)
 
-            course_key = self.get_course_key(org_key, row['number'])
+    def _ingest_row(self, row, course_type, course_run_type, images):  # pylint: disable=too-many-statements
+        """
+        Create or update the course and course run of a validated row.
+        """
+        course_title = row['title']
+        course_key = self.get_course_key(row['organization'], row['number'])
+        # Courses appearing more than once in the sheet are looked up again, as they may have been created
+        # or updated by a previous row.
+        if course_key in self.courses:
+            course = self.courses.pop(course_key)
+        else:
             course = Course.objects.filter_drafts(key=course_key, partner=self.partner).first()
-            is_course_created = False
-
-            if course:
-                course_run = CourseRun.objects.filter_drafts(course=course).first()
-                logger.info("Course {} is located in the database.".format(course_key))  # lint-amnesty, pylint: disable=logging-format-interpolation
-            else:
-                logger.info("Course key {} could not be found in database, creating the course.".format(course_key))  # lint-amnesty, pylint: disable=logging-format-interpolation
-                try:
-                    _ = self._create_course(row, course_type, course_run_type.uuid)
-                except Exception as exc:  # pylint: disable=broad-except
-                    exception_message = exc
-                    if hasattr(exc, 'response'):
-                        exception_message = exc.response.content.decode('utf-8')
-                    error_message = CSVIngestionErrorMessages.COURSE_CREATE_ERROR.format(
-                        course_title=course_title,
-                        exception_message=exception_message
-                    )
-                    logger.exception(error_message)
-                    self._register_ingestion_error(CSVIngestionErrors.COURSE_CREATE_ERROR, error_message)
-                    continue
-
-                course = Course.everything.get(key=course_key, partner=self.partner)
-                course_run = CourseRun.everything.filter(course=course).first()
-                is_course_created = True
-
-            is_downloaded = download_and_save_course_image(
-                course,
-                row['image'],
-                headers=self.REQUEST_USER_AGENT_HEADERS)
-            if not is_downloaded:
-                error_message = CSVIngestionErrorMessages.IMAGE_DOWNLOAD_FAILURE.format(course_title=course_title)
-                logger.error(error_message)
-                self._register_ingestion_error(CSVIngestionErrors.IMAGE_DOWNLOAD_FAILURE, error_message)
-                continue
-            if not is_course_created:
-                self.add_product_source(course)
-
-            is_draft = self.get_draft_flag(course_run)
-            logger.info(f"Draft flag is set to {is_draft} for the course {course_title}")
+        is_course_created = False
 
+        if course:
+            course_run = CourseRun.objects.filter_drafts(course=course).first()
+            logger.info("Course {} is located in the database.".format(course_key))  # lint-amnesty, pylint: disable=logging-format-interpolation
+        else:
+            logger.info("Course key {} could not be found in database, creating the course.".format(course_key))  # lint-amnesty, pylint: disable=logging-format-interpolation
             try:
-                self._update_course(row, course, is_draft)
+                with transaction.atomic():
+                    course, course_run = self._create_course(row, course_type, course_run_type.uuid)
             except Exception as exc:  # pylint: disable=broad-except
-                exception_message = exc
-                if hasattr(exc, 'response'):
-                    exception_message = exc.response.content.decode('utf-8')
-                error_message = CSVIngestionErrorMessages.COURSE_UPDATE_ERROR.format(
+                error_message = CSVIngestionErrorMessages.COURSE_CREATE_ERROR.format(
                     course_title=course_title,
-                    exception_message=exception_message
+                    exception_message=exc
                 )
                 logger.exception(error_message)
-                self._register_ingestion_error(CSVIngestionErrors.COURSE_UPDATE_ERROR, error_message)
-                continue
+                self._register_ingestion_error(CSVIngestionErrors.COURSE_CREATE_ERROR, error_message)
+                return
 
-            if row.get('organization_logo_override'):
-                course.refresh_from_db()
-                is_logo_downloaded = download_and_save_course_image(
-                    course,
-                    row['organization_logo_override'],
-                    'organization_logo_override',
-                    headers=self.REQUEST_USER_AGENT_HEADERS
-                )
-                if not is_logo_downloaded:
-                    error_message = CSVIngestionErrorMessages.LOGO_IMAGE_DOWNLOAD_FAILURE.format(
-                        course_title=course_title
-                    )
-                    logger.error(error_message)
-                    self._register_ingestion_error(CSVIngestionErrors.LOGO_IMAGE_DOWNLOAD_FAILURE, error_message)
+            is_course_created = True
 
-            # No need to update the course run if the run is already in the review
-            if not course_run.in_review:
-                try:
-                    self._update_course_run(row, course_run, course_type, is_draft)
-                except Exception as exc:  # pylint: disable=broad-except
-                    exception_message = exc
-                    if hasattr(exc, 'response'):
-                        exception_message = exc.response.content.decode('utf-8')
-                    error_message = CSVIngestionErrorMessages.COURSE_RUN_UPDATE_ERROR.format(
-                        course_title=course_title,
-                        exception_message=exception_message
-                    )
-                    logger.exception(error_message)
-                    self._register_ingestion_error(CSVIngestionErrors.COURSE_RUN_UPDATE_ERROR, error_message)
-                    continue
+        # Each step is made in its own savepoint, so that a failing step is rolled back alone like a failing
+        # api request would be, and the steps preceding it are kept.
+        with transaction.atomic():
+            is_downloaded = self._save_image(course, row['image'], images[row['image']].result())
+            if is_downloaded and not is_course_created:
+                self.add_product_source(course)
+        if not is_downloaded:
+            error_message = CSVIngestionErrorMessages.IMAGE_DOWNLOAD_FAILURE.format(course_title=course_title)
+            logger.error(error_message)
+            self._register_ingestion_error(CSVIngestionErrors.IMAGE_DOWNLOAD_FAILURE, error_message)
+            return
 
-            if course_run.status == CourseRunStatus.Unpublished:
-                course_run.refresh_from_db()
-                course_run.status = CourseRunStatus.LegalReview
-                course_run.save(update_fields=['status'])
+        is_draft = self.get_draft_flag(course_run)
+        logger.info(f"Draft flag is set to {is_draft} for the course {course_title}")
 
-            logger.info("Course and course run updated successfully for course key {}".format(course_key))  # lint-amnesty, pylint: disable=logging-format-interpolation
-            self.course_uuids[str(course.uuid)] = course_title
-            self._register_successful_ingestion(
-                str(course.uuid), is_course_created, course.active_url_slug,
-                row.get('external_course_marketing_type', None))
+        try:
+            with transaction.atomic():
+                self._update_course(row, course, is_draft)
+        except Exception as exc:  # pylint: disable=broad-except
+            error_message = CSVIngestionErrorMessages.COURSE_UPDATE_ERROR.format(
+                course_title=course_title,
+                exception_message=exc
+            )
+            logger.exception(error_message)
+            self._register_ingestion_error(CSVIngestionErrors.COURSE_UPDATE_ERROR, error_message)
+            return
 
-        self._archive_stale_products(course_external_identifiers)
-        logger.info("CSV loader ingest pipeline has completed.")
+        logo_url = row.get('organization_logo_override')
+        if logo_url:
+            course.refresh_from_db()
+            is_logo_downloaded = self._save_image(
+                course, logo_url, images[logo_url].result(), 'organization_logo_override'
+            )
+            if not is_logo_downloaded:
+                error_message = CSVIngestionErrorMessages.LOGO_IMAGE_DOWNLOAD_FAILURE.format(
+                    course_title=course_title
+                )
+                logger.error(error_message)
+                self._register_ingestion_error(CSVIngestionErrors.LOGO_IMAGE_DOWNLOAD_FAILURE, error_message)
 
-        self._render_error_logs()
-        self._render_course_uuids()
+        # No need to update the course run if the run is already in the review
+        if not course_run.in_review:
+            try:
+                with transaction.atomic():
+                    self._update_course_run(row, course_run, course_type, is_draft)
+            except Exception as exc:  # pylint: disable=broad-except
+                error_message = CSVIngestionErrorMessages.COURSE_RUN_UPDATE_ERROR.format(
+                    course_title=course_title,
+                    exception_message=exc
+                )
+                logger.exception(error_message)
+                self._register_ingestion_error(CSVIngestionErrors.COURSE_RUN_UPDATE_ERROR, error_message)
+                return
+
+        if course_run.status == CourseRunStatus.Unpublished:
+            course_run.refresh_from_db()
+            course_run.status = CourseRunStatus.LegalReview
+            course_run.save(update_fields=['status'])
+
+        logger.info("Course and course run updated successfully for course key {}".format(course_key))  # lint-amnesty, pylint: disable=logging-format-interpolation
+        self.course_uuids[str(course.uuid)] = course_title
+        self._register_successful_ingestion(
+            str(course.uuid), is_course_created, course.active_url_slug,
+            row.get('external_course_marketing_type', None))
 
     def validate_course_data(self, course_type, data):
         """
@@ -514,70 +669,53 @@ class CSVDataLoader(AbstractDataLoader):
         languages_list = language_str.split(',')
         for language in languages_list:
             language = language.strip()
-            language_obj = LanguageTag.objects.filter(
-                Q(name=language) | Q(code=language)
-            ).first()
-            if not language_obj:
+            if language not in self.language_codes:
+                self.language_codes[language] = LanguageTag.objects.filter(
+                    Q(name=language) | Q(code=language)
+                ).values_list('code', flat=True).first()
+            if not self.language_codes[language]:
                 raise Exception(  # pylint: disable=broad-exception-raised
                     'Language {} from provided string {} is either missing or an invalid ietf language'.format(
                         language, language_str
                     )
                 )
-            languages_codes_list.append(language_obj.code)
+            languages_codes_list.append(self.language_codes[language])
         return languages_codes_list
 
-    def _call_course_api(self, method, url, data):
-        """
-        Helper method to make course and course run api calls.
-        """
-        response = self.api_client.request(
-            method,
-            url,
-            json=data,
-            headers={'content-type': 'application/json'}
-        )
-        if not response.ok:
-            logger.info("API request failed for url {} with response: {}".format(url, response.content.decode('utf-8')))  # lint-amnesty, pylint: disable=logging-format-interpolation
-        response.raise_for_status()
-        return response
-
     def _create_course(self, data, course_type, course_run_type_uuid):
         """
-        Make a course entry through course api.
+        Create a draft course and its course run.
         """
-        course_api_url = reverse('api:v1:course-list')
-        url = f"{settings.DISCOVERY_BASE_URL}{course_api_url}"
-
         request_data = self._create_course_api_request_data(data, course_type, course_run_type_uuid)
-        response = self._call_course_api('POST', url, request_data)
-        if response.status_code not in (200, 201):
-            logger.info("Course creation response: {}".format(response.content))  # lint-amnesty, pylint: disable=logging-format-interpolation
-        return response.json()
+        run_data = request_data.pop('course_run')
+        course, __ = create_course(self.partner, self.user, request_data)
+        run_data.update({'course': course.key, 'prices': request_data['prices']})
+        course_run, __ = create_course_run(self.user, run_data)
+        return course, course_run
 
     def _update_course(self, data, course, is_draft):
         """
         Update the course data.
         """
-        course_api_url = reverse('api:v1:course-detail', kwargs={'key': course.uuid})
-        url = f"{settings.DISCOVERY_BASE_URL}{course_api_url}?exclude_utm=1"
         request_data = self._update_course_api_request_data(data, course, is_draft)
-        response = self._call_course_api('PATCH', url, request_data)
-
-        if response.status_code not in (200, 201):
-            logger.info("Course update response: {}".format(response.content))  # lint-amnesty, pylint: disable=logging-format-interpolation
-        return response.json()
+        update_course(course, request_data, partial=True)
 
     def _update_course_run(self, data, course_run, course_type, is_draft):
         """
         Update the course run data.
         """
-        course_run_api_url = reverse('api:v1:course_run-detail', kwargs={'key': course_run.key})
-        url = f"{settings.DISCOVERY_BASE_URL}{course_run_api_url}?exclude_utm=1"
         request_data = self._update_course_run_request_data(data, course_run, course_type, is_draft)
-        response = self._call_course_api('PATCH', url, request_data)
-        if response.status_code not in (200, 201):
-            logger.info("Course run update response: {}".format(response.content))  # lint-amnesty, pylint: disable=logging-format-interpolation
-        return response.json()
+        draft = request_data.pop('draft')
+        prices = request_data.pop('prices')
+        upgrade_deadline_override = request_data.pop('upgrade_deadline_override')
+
+        # The course update may have changed the status of the run
+        course_run.refresh_from_db()
+        course_run = ensure_draft_world(course_run)
+        serializer = CourseRunWithProgramsSerializer(course_run, data=request_data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        update_course_run(course_run, serializer, self.user, draft, prices, upgrade_deadline_override)
+        update_course_run_image_in_studio(course_run)
 
     def _complete_run_review(self, data, course_run):
         """
@@ -630,8 +768,11 @@ class CSVDataLoader(AbstractDataLoader):
         subjects = [subject for subject in subjects if subject]
         for subject in subjects:
             try:
-                sub_obj = Subject.objects.get(translations__name=subject, translations__language_code='en')
-                subject_slugs.append(sub_obj.slug)
+                if subject not in self.subject_slugs:
+                    self.subject_slugs[subject] = Subject.objects.get(
+                        translations__name=subject, translations__language_code='en'
+                    ).slug
+                subject_slugs.append(self.subject_slugs[subject])
             except Subject.DoesNotExist:
                 logger.exception("Unable to locate subject {} in the database. Skipping subject association".format(  # lint-amnesty, pylint: disable=logging-format-interpolation
                     subject
@@ -0,0 +1,193 @@
+"""
+Helpers for fetching the pages of rate limited APIs concurrently, separately from processing them.
+"""
+import logging
+import queue
+import threading
+import time
+
+from django.utils.http import parse_http_date_safe
+
+logger = logging.getLogger(__name__)
+
+# Timestamps above this value in rate limit reset headers are epoch times rather than numbers of seconds.
+EPOCH_THRESHOLD = 10 ** 9
+
+
+def _parse_seconds(value):
+    """
+    Returns the number of seconds from now given by a Retry-After or rate limit reset header, which is either
+    a number of seconds, an epoch timestamp or an HTTP date. Returns None if the value can't be parsed.
+    """
+    if value is None:
+        return None
+
+    try:
+        seconds = float(value)
+    except ValueError:
+        timestamp = parse_http_date_safe(value)
+        if timestamp is None:
+            return None
+        seconds = timestamp - time.time()
+    else:
+        if seconds > EPOCH_THRESHOLD:
+            seconds -= time.time()
+
+    return max(seconds, 0)
+
+
+def _get_header(headers, *names):
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+class RateLimiter:
+    """
+    Token bucket spacing out the requests several threads send to a rate limited API.
+
+    The bucket refills at a rate which adapts to the API's responses:
+        * A 429 response halves the rate and holds every request until its Retry-After has passed.
+        * RateLimit-Remaining / RateLimit-Reset headers (or their X- prefixed variants) spread the remaining
+          requests of the current window over the time left in it, and hold requests until the window resets
+          once none remain.
+        * Other successful responses raise the rate back up towards the maximum.
+    """
+
+    # Lowest fraction of the maximum rate 429 responses can bring the rate down to.
+    MIN_RATE_FACTOR = 1 / 16
+    # Fraction of the maximum rate added back after each successful response.
+    RECOVERY_FACTOR = 1 / 10
+
+    def __init__(self, max_rate, burst=1, clock=time.monotonic, sleep=time.sleep):
+        """
+        Arguments:
+            max_rate (float): Maximum number of requests per second
+            burst (int): Number of requests which may be sent at once after the limiter has been idle
+            clock (callable): Monotonic clock, in seconds
+            sleep (callable): Function blocking the calling thread for a number of seconds
+        """
+        self.max_rate = max_rate
+        self.rate = max_rate
+        self.capacity = max(burst, 1)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.paused_until = self.updated
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """
+        Blocks until a request may be sent.
+        """
+        while True:
+            with self.lock:
+                now = self.clock()
+                self._refill(now)
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            self.sleep(wait)
+
+    def pause(self, seconds):
+        """
+        Holds every request for the given number of seconds.
+        """
+        with self.lock:
+            self.paused_until = max(self.paused_until, self.clock() + seconds)
+            self.tokens = 0
+
+    def update(self, response):
+        """
+        Adapts the rate to a response of the API.
+        """
+        headers = response.headers
+
+        if response.status_code == 429:
+            with self.lock:
+                self.rate = max(self.rate / 2, self.max_rate * self.MIN_RATE_FACTOR)
+            retry_after = _parse_seconds(headers.get('Retry-After'))
+            self.pause(retry_after if retry_after is not None else 1 / self.rate)
+            logger.info('Rate limited, slowing down to %.2f requests per second.', self.rate)
+            return
+
+        remaining = _get_header(headers, 'RateLimit-Remaining', 'X-RateLimit-Remaining')
+        reset = _parse_seconds(_get_header(headers, 'RateLimit-Reset', 'X-RateLimit-Reset'))
+        if remaining is not None and remaining.isdigit() and reset is not None:
+            remaining = int(remaining)
+            if remaining == 0:
+                self.pause(reset)
+            else:
+                with self.lock:
+                    self.rate = min(self.max_rate, remaining / max(reset, 1))
+            return
+
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * self.RECOVERY_FACTOR)
+
+
+def fetch_concurrently(fetch, items, max_workers, queue_size):
+    """
+    Fetches items with a pool of threads, yielding each item and its result in the order they are fetched.
+
+    Fetching is decoupled from processing the results: the caller processes them in its own thread while the
+    pool keeps fetching, but at most queue_size fetched results wait to be processed. Once that many are
+    waiting, the pool stops fetching until the caller catches up.
+
+    If fetching an item raises an exception, the exception is raised to the caller and the remaining items
+    aren't fetched.
+
+    Arguments:
+        fetch (callable): Function fetching one item
+        items (iterable): Items to fetch
+        max_workers (int): Number of items fetched at the same time
+        queue_size (int): Number of fetched results which may wait to be processed
+    """
+    items = list(items)
+    pending = queue.Queue()
+    for item in items:
+        pending.put(item)
+    results = queue.Queue(maxsize=queue_size)
+    stopped = threading.Event()
+
+    def work():
+        while not stopped.is_set():
+            try:
+                item = pending.get_nowait()
+            except queue.Empty:
+                return
+
+            try:
+                result = (item, fetch(item), None)
+            except Exception as exc:  # pylint: disable=broad-except
+                result = (item, None, exc)
+
+            while not stopped.is_set():
+                try:
+                    results.put(result, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    threads = [threading.Thread(target=work, daemon=True) for __ in range(min(max_workers or 1, len(items)))]
+    for thread in threads:
+        thread.start()
+
+    try:
+        for __ in items:
+            item, result, exc = results.get()
+            if exc is not None:
+                raise exc
+            yield item, result
+    finally:
+        stopped.set()
+        for thread in threads:
+            thread.join()
@@ -0,0 +1,184 @@
+"""
+Helpers for refreshing data incrementally: conditional requests which reuse the stored body of unchanged
+responses, and content hashes of the records loaded from each API endpoint.
+"""
+import hashlib
+import json
+import logging
+import threading
+from collections import namedtuple
+
+import requests
+
+from course_discovery.apps.course_metadata.models import DataLoaderRecordHash, DataLoaderResponse
+
+logger = logging.getLogger(__name__)
+
+
+def get_content_hash(record):
+    """
+    Returns a digest of a record as returned by an API, which only changes when the content of the record does.
+    """
+    content = json.dumps(record, sort_keys=True)
+    return hashlib.md5(content.encode('utf-8')).hexdigest()
+
+
+def get_url_hash(url):
+    """
+    Returns a digest of a request URL, by which the last response to the request is stored.
+    """
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+ConditionalResponse = namedtuple('ConditionalResponse', ['response', 'url', 'content'])
+
+
+class StoredResponses:
+    """
+    Validators (ETag and Last-Modified) and bodies of the last responses to the GET requests a data loader sends to
+    a partner's API, which make the next requests conditional.
+
+    Requests may be sent from worker threads: the validators are read once, when the responses are created, so get()
+    doesn't use the database. Responses are stored by load(), in the thread processing them, which also reads the
+    stored body of responses which weren't modified. Responses without validators aren't stored, since no request can
+    be made conditional on them. When disabled, plain GET requests are sent.
+    """
+
+    def __init__(self, partner, enabled=True):
+        """
+        Arguments:
+            partner (Partner): Partner whose API the requests are sent to
+            enabled (bool): Whether requests are made conditional
+        """
+        self.partner = partner
+        self.enabled = enabled
+        self.validators = {}
+        if enabled:
+            self.validators = {
+                url: (etag, last_modified)
+                for url, etag, last_modified in DataLoaderResponse.objects.filter(
+                    partner=partner
+                ).values_list('url', 'etag', 'last_modified')
+            }
+
+    def get(self, client, url, params=None):
+        """
+        Sends a GET request along with the validators of the last response to the same request.
+
+        Returns a ConditionalResponse, whose content is the JSON body of the response, or None if the response is an
+        error or wasn't modified. Pass it to load() to get its body.
+        """
+        request_url = requests.Request('GET', url, params=params).prepare().url
+        if not self.enabled:
+            response = client.get(url, params=params)
+            return ConditionalResponse(response, request_url, response.json() if response.ok else None)
+
+        etag, last_modified = self.validators.get(request_url, ('', ''))
+
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        response = client.get(url, params=params, headers=headers)
+        content = response.json() if response.ok and response.status_code != 304 else None
+        return ConditionalResponse(response, request_url, content)
+
+    def load(self, conditional_response):
+        """
+        Returns the JSON body of a response returned by get(), storing it along with its validators.
+
+        If the API answered 304 Not Modified, the stored body of the last response is returned instead. The body is
+        None if the response is an error.
+        """
+        response, request_url, content = conditional_response
+        if not self.enabled:
+            return content
+
+        url_hash = get_url_hash(request_url)
+        if response.status_code == 304:
+            previous = DataLoaderResponse.objects.filter(partner=self.partner, url_hash=url_hash).first()
+            if not previous:
+                return None
+            logger.info('%s was not modified since it was last requested.', request_url)
+            return previous.content
+        if not response.ok:
+            return None
+
+        etag = response.headers.get('ETag', '')
+        last_modified = response.headers.get('Last-Modified', '')
+        if etag or last_modified:
+            DataLoaderResponse.objects.update_or_create(
+                partner=self.partner,
+                url_hash=url_hash,
+                defaults={'url': request_url, 'etag': etag, 'last_modified': last_modified, 'content': content},
+            )
+            self.validators[request_url] = (etag, last_modified)
+        elif self.validators.pop(request_url, None):
+            DataLoaderResponse.objects.filter(partner=self.partner, url_hash=url_hash).delete()
+
+        return content
+
+
+class RecordHashes:
+    """
+    Content hashes of the records a data loader last loaded from an endpoint of a partner's API.
+
+    The hashes are read once, when they are first needed. A record's hash is saved once the record has been loaded
+    successfully, so records which failed to load are loaded again by the next refresh even if they didn't change.
+    Records without an id, or all records when disabled, are considered changed and their hashes aren't saved.
+    """
+
+    def __init__(self, partner, endpoint, enabled=True):
+        """
+        Arguments:
+            partner (Partner): Partner whose API the records are loaded from
+            endpoint (str): Name of the endpoint the records are loaded from
+            enabled (bool): Whether unchanged records may be skipped
+        """
+        self.partner = partner
+        self.endpoint = endpoint
+        self.enabled = enabled
+        self._hashes = None
+        self.lock = threading.Lock()
+
+    @property
+    def hashes(self):
+        with self.lock:
+            if self._hashes is None:
+                self._hashes = dict(
+                    DataLoaderRecordHash.objects.filter(
+                        partner=self.partner, endpoint=self.endpoint
+                    ).values_list('object_id', 'content_hash')
+                )
+            return self._hashes
+
+    def is_unchanged(self, object_id, record):
+        """
+        Returns True if the record was loaded successfully before, and its content didn't change since then.
+        """
+        if not self.enabled or object_id is None:
+            return False
+        return self.hashes.get(str(object_id)) == get_content_hash(record)
+
+    def save(self, object_id, record):
+        """
+        Records that the record was loaded successfully.
+        """
+        if not self.enabled or object_id is None:
+            return
+
+        object_id = str(object_id)
+        content_hash = get_content_hash(record)
+        if self.hashes.get(object_id) == content_hash:
+            return
+
+        with self.lock:
+            self._hashes[object_id] = content_hash
+        DataLoaderRecordHash.objects.update_or_create(
+            partner=self.partner,
+            endpoint=self.endpoint,
+            object_id=object_id,
+            defaults={'content_hash': content_hash},
+        )
@@ -3,8 +3,9 @@ from unittest import mock
 import responses
 
 from course_discovery.apps.api.v1.tests.test_views.mixins import OAuth2Mixin
+from course_discovery.apps.core.tests.factories import UserFactory
 from course_discovery.apps.course_metadata.models import (
-    CourseEntitlement, CourseRunStatus, CourseRunType, CourseType, ProgramType, Seat
+    CourseEntitlement, CourseRunStatus, CourseRunType, CourseType, DataLoaderConfig, ProgramType, Seat
 )
 from course_discovery.apps.course_metadata.tests.factories import (
     CourseFactory, CourseRunTypeFactory, CourseTypeFactory, LevelTypeFactory, ModeFactory, OrganizationFactory,
@@ -22,11 +23,21 @@ class DataLoaderTestMixin(OAuth2Mixin):
         super().setUp()
         self.partner = PartnerFactory(lms_url='http://127.0.0.1:8000')
         self.mock_access_token()
+        self.loader = self.create_loader()
+
+    def create_loader(self):
         with mock.patch(
             'course_discovery.apps.course_metadata.data_loaders.configured_jwt_decode_handler',
             return_value={'preferred_username': 'test_username'},
         ):
-            self.loader = self.loader_class(self.partner, self.api_url)
+            return self.loader_class(self.partner, self.api_url)
+
+    def enable_incremental_refresh(self):
+        """ Turns incremental refreshes on, and replaces the loader with one refreshing incrementally. """
+        config = DataLoaderConfig.get_solo()
+        config.incremental_refresh = True
+        config.save()
+        self.loader = self.create_loader()
 
     @property
     def api_url(self):  # pragma: no cover
@@ -410,6 +421,8 @@ class CSVLoaderMixin:
             entitlement_types=[seat_type]
         )
         self.source = SourceFactory(slug='ext_source')
+        # User of the API client, which the courses and course runs are written as
+        self.loader_user = UserFactory(username='test_username')
 
     def _write_csv(self, csv, lines_dict_list, headers=None):
         """
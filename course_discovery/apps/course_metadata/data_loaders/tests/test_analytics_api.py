@@ -92,3 +92,32 @@ class AnalyticsAPIDataLoaderTests(DataLoaderTestMixin, TestCase):
         programs = Program.objects.all()
         assert programs[0].enrollment_count == expected_program_enrollment_count
         assert programs[0].recent_enrollment_count == expected_program_recent_enrollment_count
+
+    @responses.activate
+    def test_ingest_writes_counters_in_bulk(self):
+        """
+        Verify course run keys are matched case-insensitively, and only the counters are written, with a bulk update
+        per model and without saving the objects.
+        """
+        self._define_course_metadata()
+        summaries = [dict(summary, course_id=summary['course_id'].upper()) for summary in self.mocked_data]
+        responses.add(
+            method=responses.GET,
+            url=f'{self.api_url}course_summaries/',
+            body=json.dumps(summaries),
+            match_querystring=False,
+            content_type=JSON
+        )
+        course_run = CourseRun.objects.first()
+        history_count = course_run.history.count()
+
+        # Course runs, savepoint, course runs update, course programs, courses update, programs update, release
+        with self.assertNumQueries(7):
+            self.loader.ingest()
+
+        updated_course_run = CourseRun.objects.get(id=course_run.id)
+        assert updated_course_run.enrollment_count > 0
+        assert updated_course_run.modified == course_run.modified
+        assert updated_course_run.history.count() == history_count
+        enrollment_counts = CourseRun.objects.values_list('enrollment_count', flat=True)
+        assert Program.objects.get().enrollment_count == sum(enrollment_counts)
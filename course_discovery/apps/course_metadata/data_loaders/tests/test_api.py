@@ -1,5 +1,7 @@
 import datetime
 import json
+import threading
+import time
 from decimal import Decimal
 from unittest import mock
 
@@ -21,6 +23,7 @@ from course_discovery.apps.course_metadata.choices import CourseRunPacing, Cours
 from course_discovery.apps.course_metadata.data_loaders.api import (
     AbstractDataLoader, CoursesApiDataLoader, EcommerceApiDataLoader, ProgramsApiDataLoader, _fatal_code
 )
+from course_discovery.apps.course_metadata.data_loaders.fetching import RateLimiter
 from course_discovery.apps.course_metadata.data_loaders.tests import JPEG, JSON, mock_data
 from course_discovery.apps.course_metadata.data_loaders.tests.mixins import DataLoaderTestMixin
 from course_discovery.apps.course_metadata.models import (
@@ -359,6 +362,92 @@ class CoursesApiDataLoaderTests(DataLoaderTestMixin, TestCase):
         assert original_run1_deadline == updated_run1_upgrade_deadline
         assert run3.seats.first().upgrade_deadline is None
 
+    @responses.activate
+    @mock.patch.object(CoursesApiDataLoader, 'PAGE_SIZE', 1)
+    def test_ingest_pages(self):
+        """ Verify every page is requested, including pages the API first answers with a 429. """
+        url = self.api_url + 'courses/'
+        responses.add(responses.GET, url, status=429, headers={'Retry-After': '0'})
+        api_data = self.mock_api()
+
+        self.loader.ingest()
+
+        # The rate limited request, then one request per page of one course run
+        course_requests = [call for call in responses.calls if call.request.url.startswith(url)]
+        assert len(course_requests) == 1 + len(api_data)
+        assert CourseRun.objects.count() == len(api_data)
+        assert self.loader.rate_limiter.rate < self.loader.rate_limiter.max_rate
+
+    @responses.activate
+    @mock.patch.object(CoursesApiDataLoader, 'PAGE_SIZE', 1)
+    def test_ingest_pages_concurrently(self):
+        """ Verify pages are requested by several threads at once, at the pace of the rate limiter. """
+        url = self.api_url + 'courses/'
+        bodies = mock_data.COURSES_API_BODIES
+        api_callback = mock_api_callback(url, bodies, pagination=True)
+        lock = threading.Lock()
+        in_flight = []
+        max_in_flight = 0
+
+        def callback(request):
+            nonlocal max_in_flight
+            with lock:
+                in_flight.append(request)
+                max_in_flight = max(max_in_flight, len(in_flight))
+            time.sleep(0.2)
+            with lock:
+                in_flight.remove(request)
+            return api_callback(request)
+
+        responses.add_callback(responses.GET, url, callback=callback, content_type=JSON)
+        with mock.patch(
+            'course_discovery.apps.course_metadata.data_loaders.configured_jwt_decode_handler',
+            return_value={'preferred_username': 'test_username'},
+        ):
+            loader = CoursesApiDataLoader(self.partner, self.api_url, max_workers=3)
+
+        # Requests are spaced out by less than they take, so they overlap.
+        rate = 10
+        loader.rate_limiter = RateLimiter(rate)
+        acquired = []
+        acquire = loader.rate_limiter.acquire
+
+        def record_acquire():
+            acquire()
+            with lock:
+                acquired.append(time.monotonic())
+
+        with mock.patch.object(loader.rate_limiter, 'acquire', side_effect=record_acquire):
+            loader.ingest()
+
+        assert CourseRun.objects.count() == len(bodies)
+        # The first page is requested alone, then the other pages at once, spaced out by the rate.
+        assert max_in_flight > 1
+        assert len(acquired) == len(bodies)
+        for previous, current in zip(acquired[1:], acquired[2:]):
+            assert current - previous >= 1 / rate * 0.9
+
+    @responses.activate
+    def test_ingest_incremental(self):
+        """ Verify course runs which didn't change since they were last loaded are skipped, and others are updated. """
+        self.enable_incremental_refresh()
+        bodies = self.mock_api(list(mock_data.COURSES_API_BODIES))
+        self.loader.ingest()
+
+        unchanged_key, changed_key = bodies[0]['id'], bodies[1]['id']
+        CourseRun.everything.filter(key__in=[unchanged_key, changed_key]).update(title_override='Edited')
+        bodies[1] = dict(bodies[1], name='Renamed')
+
+        self.enable_incremental_refresh()
+        with mock.patch(LOGGER_PATH) as mock_logger:
+            self.loader.ingest()
+
+        mock_logger.info.assert_any_call(
+            f"Skipping course run {unchanged_key}, which did not change since it was last loaded"
+        )
+        assert CourseRun.objects.get(key=unchanged_key).title_override == 'Edited'
+        assert CourseRun.objects.get(key=changed_key).title_override == 'Renamed'
+
     @responses.activate
     def test_ingest_exception_handling(self):
         """ Verify the data loader properly handles exceptions during processing of the data from the API. """
@@ -652,6 +741,7 @@ class EcommerceApiDataLoaderTests(DataLoaderTestMixin, TestCase):
                 "current_page": 1,
                 "results": [
                     {
+                        "id": 21,
                         "structure": "child",
                         "product_class": "Course Entitlement",
                         "title": "Course Intro to Everything",
@@ -681,6 +771,7 @@ class EcommerceApiDataLoaderTests(DataLoaderTestMixin, TestCase):
                 "current_page": 1,
                 "results": [
                     {
+                        "id": 22,
                         "structure": "standalone",
                         "product_class": "Enrollment Code",
                         "title": "Course Intro to Everything",
@@ -892,6 +983,52 @@ class EcommerceApiDataLoaderTests(DataLoaderTestMixin, TestCase):
         # Verify multiple calls to ingest data do NOT result in data integrity errors.
         self.loader.ingest()
 
+    @responses.activate
+    def test_ingest_writes_in_bulk(self):
+        """ Verify seats and entitlements are written in bulk with their history, and only when they changed. """
+        self.mock_courses_api()
+        products_api_data = self.mock_products_api()
+        self.loader.ingest()
+
+        seat = Seat.everything.get(sku='sku001')
+        entitlement = CourseEntitlement.objects.get(sku='sku132')
+        assert seat.history.count() == 1
+        assert entitlement.history.count() == 1
+
+        # Reloading unchanged products only reads the page's course runs, course run type tracks and seats, or its
+        # courses, their entitlement types and their entitlements.
+        course_run_bodies = [self.loader.clean_strings(body) for body in mock_data.ECOMMERCE_API_BODIES]
+        entitlement_bodies = [
+            self.loader.clean_strings(body) for body in products_api_data
+            if body['product_class'] == 'Course Entitlement'
+        ]
+        with self.assertNumQueries(3):
+            self.loader.update_seats(course_run_bodies)
+        with self.assertNumQueries(3):
+            assert self.loader.update_entitlements(entitlement_bodies) == ['sku132']
+
+        Seat.everything.filter(id=seat.id).update(price=10)
+        self.loader.update_seats(course_run_bodies)
+        seat.refresh_from_db()
+        assert seat.price == 0
+        assert seat.history.count() == 2
+
+    @responses.activate
+    def test_ingest_incremental(self):
+        """ Verify products which didn't change since they were last loaded are skipped, but not deleted. """
+        self.enable_incremental_refresh()
+        self.mock_courses_api()
+        products_api_data = self.mock_products_api()
+        self.loader.ingest()
+        Seat.everything.update(price=1)
+
+        self.enable_incremental_refresh()
+        self.loader.ingest()
+
+        assert set(Seat.everything.values_list('price', flat=True)) == {1}
+        self.assert_entitlements_loaded(products_api_data)
+        self.assert_enrollment_codes_loaded(products_api_data)
+
     @responses.activate
     @mock.patch(LOGGER_PATH)
     def test_ingest_deletes(self, mock_logger):
@@ -4,17 +4,22 @@ Unit tests for CSV Data loader.
 from tempfile import NamedTemporaryFile
 from unittest import mock
 
+import pytest
 import responses
 from ddt import data, ddt, unpack
+from django.core.exceptions import ImproperlyConfigured
 from testfixtures import LogCapture
 
 from course_discovery.apps.api.v1.tests.test_views.mixins import APITestCase, OAuth2Mixin
-from course_discovery.apps.core.tests.factories import USER_PASSWORD, UserFactory
+from course_discovery.apps.core.models import User
 from course_discovery.apps.course_metadata.choices import ExternalCourseMarketingType, ExternalProductStatus
+from course_discovery.apps.course_metadata.data_loaders.constants import CSVIngestionErrorMessages, CSVIngestionErrors
 from course_discovery.apps.course_metadata.data_loaders.csv_loader import CSVDataLoader
 from course_discovery.apps.course_metadata.data_loaders.tests import mock_data
 from course_discovery.apps.course_metadata.data_loaders.tests.mixins import CSVLoaderMixin
-from course_discovery.apps.course_metadata.models import AdditionalMetadata, Course, CourseRun, CourseType, Source
+from course_discovery.apps.course_metadata.models import (
+    AdditionalMetadata, Course, CourseRun, CourseType, DataLoaderConfig, Source
+)
 from course_discovery.apps.course_metadata.tests.factories import (
     AdditionalMetadataFactory, CourseFactory, CourseRunFactory, CourseTypeFactory, OrganizationFactory, SourceFactory
 )
@@ -34,27 +39,6 @@ class TestCSVDataLoader(CSVLoaderMixin, OAuth2Mixin, APITestCase):
     def setUp(self) -> None:
         super().setUp()
         self.mock_access_token()
-        self.user = UserFactory.create(username="test_user", password=USER_PASSWORD, is_staff=True)
-        self.client.login(username=self.user.username, password=USER_PASSWORD)
-
-    def mock_call_course_api(self, method, url, payload):
-        """
-        Helper method to make api calls using test client.
-        """
-        response = None
-        if method == 'POST':
-            response = self.client.post(
-                url,
-                data=payload,
-                format='json'
-            )
-        elif method == 'PATCH':
-            response = self.client.patch(
-                url,
-                data=payload,
-                format='json'
-            )
-        return response
 
     def _assert_default_logs(self, log_capture):
         """
@@ -95,6 +79,22 @@ class TestCSVDataLoader(CSVLoaderMixin, OAuth2Mixin, APITestCase):
                 assert Course.objects.count() == 0
                 assert CourseRun.objects.count() == 0
 
+    def test_missing_user(self, jwt_decode_patch):  # pylint: disable=unused-argument
+        """
+        Verify that nothing is ingested, and no user is created, if the user of the API client doesn't exist.
+        """
+        self.loader_user.delete()
+        self._setup_organization(self.partner)
+        with NamedTemporaryFile() as csv:
+            csv = self._write_csv(csv, [mock_data.VALID_COURSE_AND_COURSE_RUN_CSV_DICT])
+            loader = CSVDataLoader(self.partner, csv_path=csv.name, product_source=self.source.slug)
+            with pytest.raises(ImproperlyConfigured):
+                loader.ingest()
+
+        assert not User.objects.filter(username='test_username').exists()
+        assert Course.objects.count() == 0
+        assert CourseRun.objects.count() == 0
+
     def test_invalid_course_type(self, jwt_decode_patch):  # pylint: disable=unused-argument
         """
         Verify that no course and course run are created for an invalid course track type.
@@ -159,34 +159,29 @@ class TestCSVDataLoader(CSVLoaderMixin, OAuth2Mixin, APITestCase):
             csv = self._write_csv(csv, [mock_data.VALID_COURSE_AND_COURSE_RUN_CSV_DICT])
 
             with LogCapture(LOGGER_PATH) as log_capture:
-                with mock.patch.object(
-                        CSVDataLoader,
-                        '_call_course_api',
-                        self.mock_call_course_api
-                ):
-                    loader = CSVDataLoader(self.partner, csv_path=csv.name, product_source=self.source.slug)
-                    loader.ingest()
-
-                    self._assert_default_logs(log_capture)
-                    log_capture.check_present(
-                        (
-                            LOGGER_PATH,
-                            'INFO',
-                            'Course key edx+csv_123 could not be found in database, creating the course.'
-                        )
+                loader = CSVDataLoader(self.partner, csv_path=csv.name, product_source=self.source.slug)
+                loader.ingest()
+
+                self._assert_default_logs(log_capture)
+                log_capture.check_present(
+                    (
+                        LOGGER_PATH,
+                        'INFO',
+                        'Course key edx+csv_123 could not be found in database, creating the course.'
                     )
+                )
 
-                    # Creation call results in creating course and course run objects
-                    assert Course.everything.count() == 1
-                    assert CourseRun.everything.count() == 1
+                # Creation call results in creating course and course run objects
+                assert Course.everything.count() == 1
+                assert CourseRun.everything.count() == 1
 
-                    log_capture.check_present(
-                        (
-                            LOGGER_PATH,
-                            'ERROR',
-                            '[IMAGE_DOWNLOAD_FAILURE] The course image download failed for the course CSV Course.'
-                        )
+                log_capture.check_present(
+                    (
+                        LOGGER_PATH,
+                        'ERROR',
+                        '[IMAGE_DOWNLOAD_FAILURE] The course image download failed for the course CSV Course.'
                     )
+                )
 
     @data(
         ('csv-course-custom-slug', 'csv-course'),
@@ -214,54 +209,49 @@ class TestCSVDataLoader(CSVLoaderMixin, OAuth2Mixin, APITestCase):
             csv = self._write_csv(csv, [csv_data])
 
             with LogCapture(LOGGER_PATH) as log_capture:
-                with mock.patch.object(
-                        CSVDataLoader,
-                        '_call_course_api',
-                        self.mock_call_course_api
-                ):
-                    loader = CSVDataLoader(
-                        self.partner, csv_path=csv.name,
-                        product_type=self.course_type.slug,
-                        product_source=self.source.slug
-                    )
-                    loader.ingest()
-
-                    self._assert_default_logs(log_capture)
-                    log_capture.check_present(
-                        (
-                            LOGGER_PATH,
-                            'INFO',
-                            'Course key edx+csv_123 could not be found in database, creating the course.'
-                        )
+                loader = CSVDataLoader(
+                    self.partner, csv_path=csv.name,
+                    product_type=self.course_type.slug,
+                    product_source=self.source.slug
+                )
+                loader.ingest()
+
+                self._assert_default_logs(log_capture)
+                log_capture.check_present(
+                    (
+                        LOGGER_PATH,
+                        'INFO',
+                        'Course key edx+csv_123 could not be found in database, creating the course.'
                     )
+                )
 
-                    assert Course.everything.count() == 1
-                    assert CourseRun.everything.count() == 1
-
-                    course = Course.everything.get(key=self.COURSE_KEY, partner=self.partner)
-                    course_run = CourseRun.everything.get(course=course)
-
-                    assert course.image.read() == image_content
-                    assert course.organization_logo_override.read() == image_content
-                    self._assert_course_data(course, self.BASE_EXPECTED_COURSE_DATA)
-                    self._assert_course_run_data(course_run, self.BASE_EXPECTED_COURSE_RUN_DATA)
-
-                    assert course.active_url_slug == expected_slug
-                    assert loader.get_ingestion_stats() == {
-                        'total_products_count': 1,
-                        'success_count': 1,
-                        'failure_count': 0,
-                        'updated_products_count': 0,
-                        'created_products_count': 1,
-                        'created_products': [{
-                            'uuid': str(course.uuid),
-                            'external_course_marketing_type': 'short_course',
-                            'url_slug': expected_slug
-                        }],
-                        'archived_products_count': 0,
-                        'archived_products': [],
-                        'errors': loader.error_logs
-                    }
+                assert Course.everything.count() == 1
+                assert CourseRun.everything.count() == 1
+
+                course = Course.everything.get(key=self.COURSE_KEY, partner=self.partner)
+                course_run = CourseRun.everything.get(course=course)
+
+                assert course.image.read() == image_content
+                assert course.organization_logo_override.read() == image_content
+                self._assert_course_data(course, self.BASE_EXPECTED_COURSE_DATA)
+                self._assert_course_run_data(course_run, self.BASE_EXPECTED_COURSE_RUN_DATA)
+
+                assert course.active_url_slug == expected_slug
+                assert loader.get_ingestion_stats() == {
+                    'total_products_count': 1,
+                    'success_count': 1,
+                    'failure_count': 0,
+                    'updated_products_count': 0,
+                    'created_products_count': 1,
+                    'created_products': [{
+                        'uuid': str(course.uuid),
+                        'external_course_marketing_type': 'short_course',
+                        'url_slug': expected_slug
+                    }],
+                    'archived_products_count': 0,
+                    'archived_products': [],
+                    'errors': loader.error_logs
+                }
 
     @responses.activate
     def test_archived_flow_published_course(self, jwt_decode_patch):  # pylint: disable=unused-argument
@@ -298,58 +288,53 @@ class TestCSVDataLoader(CSVLoaderMixin, OAuth2Mixin, APITestCase):
             csv = self._write_csv(csv, [mock_data.VALID_COURSE_AND_COURSE_RUN_CSV_DICT])
 
             with LogCapture(LOGGER_PATH) as log_capture:
-                with mock.patch.object(
-                        CSVDataLoader,
-                        '_call_course_api',
-                        self.mock_call_course_api
-                ):
-                    loader = CSVDataLoader(
-                        self.partner,
-                        csv_path=csv.name,
-                        product_type=CourseType.EXECUTIVE_EDUCATION_2U,
-                        product_source=self.source.slug
-                    )
-                    loader.ingest()
-
-                    self._assert_default_logs(log_capture)
-                    log_capture.check_present(
-                        (
-                            LOGGER_PATH,
-                            'INFO',
-                            f'Archived 2 products in CSV Ingestion for source {self.source.slug} and product type '
-                            f'{CourseType.EXECUTIVE_EDUCATION_2U}.'
-                        ),
-                    )
+                loader = CSVDataLoader(
+                    self.partner,
+                    csv_path=csv.name,
+                    product_type=CourseType.EXECUTIVE_EDUCATION_2U,
+                    product_source=self.source.slug
+                )
+                loader.ingest()
+
+                self._assert_default_logs(log_capture)
+                log_capture.check_present(
+                    (
+                        LOGGER_PATH,
+                        'INFO',
+                        f'Archived 2 products in CSV Ingestion for source {self.source.slug} and product type '
+                        f'{CourseType.EXECUTIVE_EDUCATION_2U}.'
+                    ),
+                )
 
-                    # Verify the existence of both draft and non-draft versions
-                    assert Course.everything.count() == 4
-                    assert AdditionalMetadata.objects.count() == 4
-
-                    course = Course.everything.get(key=self.COURSE_KEY)
-                    stats = loader.get_ingestion_stats()
-                    archived_products = stats.pop('archived_products')
-                    assert stats == {
-                        'total_products_count': 1,
-                        'success_count': 1,
-                        'failure_count': 0,
-                        'updated_products_count': 0,
-                        'created_products_count': 1,
-                        'created_products': [{
-                            'uuid': str(course.uuid),
-                            'external_course_marketing_type': 'short_course',
-                            'url_slug': 'csv-course'
-                        }],
-                        'archived_products_count': 2,
-                        'errors': loader.error_logs
-                    }
-
-                    # asserting separately due to random sort order
-                    assert set(archived_products) == {additional_metadata_one.external_identifier,
-                                                      additional_metadata_two.external_identifier}
-
-                    # Assert that a product status with different product source is not affected in Archive flow.
-                    additional_metadata__source_2.refresh_from_db()
-                    assert additional_metadata__source_2.product_status == ExternalProductStatus.Published
+                # Verify the existence of both draft and non-draft versions
+                assert Course.everything.count() == 4
+                assert AdditionalMetadata.objects.count() == 4
+
+                course = Course.everything.get(key=self.COURSE_KEY)
+                stats = loader.get_ingestion_stats()
+                archived_products = stats.pop('archived_products')
+                assert stats == {
+                    'total_products_count': 1,
+                    'success_count': 1,
+                    'failure_count': 0,
+                    'updated_products_count': 0,
+                    'created_products_count': 1,
+                    'created_products': [{
+                        'uuid': str(course.uuid),
+                        'external_course_marketing_type': 'short_course',
+                        'url_slug': 'csv-course'
+                    }],
+                    'archived_products_count': 2,
+                    'errors': loader.error_logs
+                }
+
+                # asserting separately due to random sort order
+                assert set(archived_products) == {additional_metadata_one.external_identifier,
+                                                  additional_metadata_two.external_identifier}
+
+                # Assert that a product status with different product source is not affected in Archive flow.
+                additional_metadata__source_2.refresh_from_db()
+                assert additional_metadata__source_2.product_status == ExternalProductStatus.Published
 
     @responses.activate
     def test_ingest_flow_for_preexisting_published_course(self, jwt_decode_patch):  # pylint: disable=unused-argument
@@ -383,52 +368,47 @@ class TestCSVDataLoader(CSVLoaderMixin, OAuth2Mixin, APITestCase):
             csv = self._write_csv(csv, [mock_data.VALID_COURSE_AND_COURSE_RUN_CSV_DICT])
 
             with LogCapture(LOGGER_PATH) as log_capture:
-                with mock.patch.object(
-                        CSVDataLoader,
-                        '_call_course_api',
-                        self.mock_call_course_api
-                ):
-                    loader = CSVDataLoader(self.partner, csv_path=csv.name, product_source=self.source.slug)
-                    loader.ingest()
-
-                    self._assert_default_logs(log_capture)
-                    log_capture.check_present(
-                        (
-                            LOGGER_PATH,
-                            'INFO',
-                            'Course edx+csv_123 is located in the database.'
-                        ),
-                        (
-                            LOGGER_PATH,
-                            'INFO',
-                            'Draft flag is set to False for the course CSV Course'
-                        )
+                loader = CSVDataLoader(self.partner, csv_path=csv.name, product_source=self.source.slug)
+                loader.ingest()
+
+                self._assert_default_logs(log_capture)
+                log_capture.check_present(
+                    (
+                        LOGGER_PATH,
+                        'INFO',
+                        'Course edx+csv_123 is located in the database.'
+                    ),
+                    (
+                        LOGGER_PATH,
+                        'INFO',
+                        'Draft flag is set to False for the course CSV Course'
                     )
+                )
 
-                    # Verify the existence of both draft and non-draft versions
-                    assert Course.everything.count() == 2
-                    assert CourseRun.everything.count() == 2
+                # Verify the existence of both draft and non-draft versions
+                assert Course.everything.count() == 2
+                assert CourseRun.everything.count() == 2
 
-                    course = Course.objects.get(key=self.COURSE_KEY, partner=self.partner)
-                    course_run = CourseRun.objects.get(course=course)
+                course = Course.objects.get(key=self.COURSE_KEY, partner=self.partner)
+                course_run = CourseRun.objects.get(course=course)
 
-                    self._assert_course_data(course, expected_course_data)
-                    self._assert_course_run_data(course_run, expected_course_run_data)
+                self._assert_course_data(course, expected_course_data)
+                self._assert_course_run_data(course_run, expected_course_run_data)
 
-                    assert course.product_source == self.source
-                    assert course.draft_version.product_source == self.source
+                assert course.product_source == self.source
+                assert course.draft_version.product_source == self.source
 
-                    assert loader.get_ingestion_stats() == {
-                        'total_products_count': 1,
-                        'success_count': 1,
-                        'failure_count': 0,
-                        'updated_products_count': 1,
-                        'created_products_count': 0,
-                        'created_products': [],
-                        'archived_products_count': 0,
-                        'archived_products': [],
-                        'errors': loader.error_logs
-                    }
+                assert loader.get_ingestion_stats() == {
+                    'total_products_count': 1,
+                    'success_count': 1,
+                    'failure_count': 0,
+                    'updated_products_count': 1,
+                    'created_products_count': 0,
+                    'created_products': [],
+                    'archived_products_count': 0,
+                    'archived_products': [],
+                    'errors': loader.error_logs
+                }
 
     @responses.activate
     def test_invalid_language(self, jwt_decode_patch):  # pylint: disable=unused-argument
@@ -444,47 +424,42 @@ class TestCSVDataLoader(CSVLoaderMixin, OAuth2Mixin, APITestCase):
             csv = self._write_csv(csv, [mock_data.INVALID_LANGUAGE])
 
             with LogCapture(LOGGER_PATH) as log_capture:
-                with mock.patch.object(
-                        CSVDataLoader,
-                        '_call_course_api',
-                        self.mock_call_course_api
-                ):
-                    loader = CSVDataLoader(self.partner, csv_path=csv.name, product_source=self.source.slug)
-                    loader.ingest()
-
-                    self._assert_default_logs(log_capture)
-
-                    log_capture.check_present(
-                        (
-                            LOGGER_PATH,
-                            'INFO',
-                            'Course key edx+csv_123 could not be found in database, creating the course.'
-                        ),
-                        (
-                            LOGGER_PATH,
-                            'INFO',
-                            'Draft flag is set to True for the course CSV Course'
-                        )
+                loader = CSVDataLoader(self.partner, csv_path=csv.name, product_source=self.source.slug)
+                loader.ingest()
+
+                self._assert_default_logs(log_capture)
+
+                log_capture.check_present(
+                    (
+                        LOGGER_PATH,
+                        'INFO',
+                        'Course key edx+csv_123 could not be found in database, creating the course.'
+                    ),
+                    (
+                        LOGGER_PATH,
+                        'INFO',
+                        'Draft flag is set to True for the course CSV Course'
                     )
-                    log_capture.check_present(
-                        (
-                            LOGGER_PATH,
-                            'ERROR',
-                            '[COURSE_RUN_UPDATE_ERROR] Unable to update course run of the course CSV Course '
-                            'in the system. The update failed with the exception: '
-                            'Language gibberish-language from provided string gibberish-language'
-                            ' is either missing or an invalid ietf language'
-                        )
+                )
+                log_capture.check_present(
+                    (
+                        LOGGER_PATH,
+                        'ERROR',
+                        '[COURSE_RUN_UPDATE_ERROR] Unable to update course run of the course CSV Course '
+                        'in the system. The update failed with the exception: '
+                        'Language gibberish-language from provided string gibberish-language'
+                        ' is either missing or an invalid ietf language'
                     )
+                )
 
-                    assert Course.everything.count() == 1
-                    assert CourseRun.everything.count() == 1
+                assert Course.everything.count() == 1
+                assert CourseRun.everything.count() == 1
 
-                    course = Course.everything.get(key=self.COURSE_KEY, partner=self.partner)
+                course = Course.everything.get(key=self.COURSE_KEY, partner=self.partner)
 
-                    assert course.image.read() == image_content
-                    assert course.organization_logo_override.read() == image_content
-                    self._assert_course_data(course, self.BASE_EXPECTED_COURSE_DATA)
+                assert course.image.read() == image_content
+                assert course.organization_logo_override.read() == image_content
+                self._assert_course_data(course, self.BASE_EXPECTED_COURSE_DATA)
 
     @responses.activate
     def test_ingest_flow_for_preexisting_unpublished_course(self, jwt_decode_patch):  # pylint: disable=unused-argument
@@ -508,37 +483,32 @@ class TestCSVDataLoader(CSVLoaderMixin, OAuth2Mixin, APITestCase):
         with NamedTemporaryFile() as csv:
             csv = self._write_csv(csv, [mock_data.VALID_COURSE_AND_COURSE_RUN_CSV_DICT])
             with LogCapture(LOGGER_PATH) as log_capture:
-                with mock.patch.object(
-                        CSVDataLoader,
-                        '_call_course_api',
-                        self.mock_call_course_api
-                ):
-
-                    loader = CSVDataLoader(self.partner, csv_path=csv.name, product_source=self.source.slug)
-                    loader.ingest()
-
-                    log_capture.check_present(
-                        (
-                            LOGGER_PATH,
-                            'INFO',
-                            'Course edx+csv_123 is located in the database.'
-                        ),
-                        (
-                            LOGGER_PATH,
-                            'INFO',
-                            'Draft flag is set to True for the course CSV Course'
-                        )
+
+                loader = CSVDataLoader(self.partner, csv_path=csv.name, product_source=self.source.slug)
+                loader.ingest()
+
+                log_capture.check_present(
+                    (
+                        LOGGER_PATH,
+                        'INFO',
+                        'Course edx+csv_123 is located in the database.'
+                    ),
+                    (
+                        LOGGER_PATH,
+                        'INFO',
+                        'Draft flag is set to True for the course CSV Course'
                     )
+                )
 
-                    # Verify the existence of draft only
-                    assert Course.everything.count() == 1
-                    assert CourseRun.everything.count() == 1
+                # Verify the existence of draft only
+                assert Course.everything.count() == 1
+                assert CourseRun.everything.count() == 1
 
-                    course = Course.everything.get(key=self.COURSE_KEY, partner=self.partner)
-                    course_run = CourseRun.everything.get(course=course)
+                course = Course.everything.get(key=self.COURSE_KEY, partner=self.partner)
+                course_run = CourseRun.everything.get(course=course)
 
-                    self._assert_course_data(course, self.BASE_EXPECTED_COURSE_DATA)
-                    self._assert_course_run_data(course_run, self.BASE_EXPECTED_COURSE_RUN_DATA)
+                self._assert_course_data(course, self.BASE_EXPECTED_COURSE_DATA)
+                self._assert_course_run_data(course_run, self.BASE_EXPECTED_COURSE_RUN_DATA)
 
     @responses.activate
     def test_active_slug(self, jwt_decode_patch):  # pylint: disable=unused-argument
@@ -548,6 +518,7 @@ class TestCSVDataLoader(CSVLoaderMixin, OAuth2Mixin, APITestCase):
         test_org = OrganizationFactory(name='testOrg', key='testOrg', partner=self.partner)
         self._setup_prerequisites(self.partner)
         self.mock_studio_calls(self.partner)
+        self.mock_studio_calls(self.partner, run_key='course-v1:testOrg+csv_123+1T2020a')
         self.mock_image_response()
 
         with NamedTemporaryFile() as csv:
@@ -558,50 +529,45 @@ class TestCSVDataLoader(CSVLoaderMixin, OAuth2Mixin, APITestCase):
                 ]
             )
             with LogCapture(LOGGER_PATH) as log_capture:
-                with mock.patch.object(
-                        CSVDataLoader,
-                        '_call_course_api',
-                        self.mock_call_course_api
-                ):
-                    loader = CSVDataLoader(self.partner, csv_path=csv.name, product_source=self.source.slug)
-                    loader.ingest()
-
-                    self._assert_default_logs(log_capture)
-
-                    log_capture.check_present(
-                        (
-                            LOGGER_PATH,
-                            'INFO',
-                            'Course key edx+csv_123 could not be found in database, creating the course.'
-                        ),
-                        (
-                            LOGGER_PATH,
-                            'INFO',
-                            'Draft flag is set to True for the course CSV Course'
-                        )
+                loader = CSVDataLoader(self.partner, csv_path=csv.name, product_source=self.source.slug)
+                loader.ingest()
+
+                self._assert_default_logs(log_capture)
+
+                log_capture.check_present(
+                    (
+                        LOGGER_PATH,
+                        'INFO',
+                        'Course key edx+csv_123 could not be found in database, creating the course.'
+                    ),
+                    (
+                        LOGGER_PATH,
+                        'INFO',
+                        'Draft flag is set to True for the course CSV Course'
                     )
+                )
+
+                assert Course.everything.count() == 2
+                assert CourseRun.everything.count() == 2
+
+                course1 = Course.everything.get(key=self.COURSE_KEY, partner=self.partner)
+                course2 = Course.everything.get(key='testOrg+csv_123', partner=self.partner)
 
-                    assert Course.everything.count() == 2
-                    assert CourseRun.everything.count() == 2
-
-                    course1 = Course.everything.get(key=self.COURSE_KEY, partner=self.partner)
-                    course2 = Course.everything.get(key='testOrg+csv_123', partner=self.partner)
-
-                    assert course1.active_url_slug == 'csv-course'
-                    assert course2.active_url_slug == 'csv-course-2'
-
-                    log_capture.check_present(
-                        (
-                            LOGGER_PATH,
-                            'INFO',
-                            '{}:CSV Course'.format(course1.uuid)
-                        ),
-                        (
-                            LOGGER_PATH,
-                            'INFO',
-                            '{}:CSV Course'.format(course2.uuid)
-                        )
+                assert course1.active_url_slug == 'csv-course'
+                assert course2.active_url_slug == 'csv-course-2'
+
+                log_capture.check_present(
+                    (
+                        LOGGER_PATH,
+                        'INFO',
+                        '{}:CSV Course'.format(course1.uuid)
+                    ),
+                    (
+                        LOGGER_PATH,
+                        'INFO',
+                        '{}:CSV Course'.format(course2.uuid)
                     )
+                )
 
     @responses.activate
     def test_ingest_flow_for_minimal_course_data(self, jwt_decode_patch):  # pylint: disable=unused-argument
@@ -617,45 +583,40 @@ class TestCSVDataLoader(CSVLoaderMixin, OAuth2Mixin, APITestCase):
             )
 
             with LogCapture(LOGGER_PATH) as log_capture:
-                with mock.patch.object(
-                        CSVDataLoader,
-                        '_call_course_api',
-                        self.mock_call_course_api
-                ):
-                    loader = CSVDataLoader(self.partner, csv_path=csv.name, product_source=self.source.slug)
-                    loader.ingest()
-
-                    self._assert_default_logs(log_capture)
-                    log_capture.check_present(
-                        (
-                            LOGGER_PATH,
-                            'INFO',
-                            'Course key edx+csv_123 could not be found in database, creating the course.'
-                        ),
-                        (
-                            LOGGER_PATH,
-                            'INFO',
-                            'Draft flag is set to True for the course CSV Course'
-                        )
+                loader = CSVDataLoader(self.partner, csv_path=csv.name, product_source=self.source.slug)
+                loader.ingest()
+
+                self._assert_default_logs(log_capture)
+                log_capture.check_present(
+                    (
+                        LOGGER_PATH,
+                        'INFO',
+                        'Course key edx+csv_123 could not be found in database, creating the course.'
+                    ),
+                    (
+                        LOGGER_PATH,
+                        'INFO',
+                        'Draft flag is set to True for the course CSV Course'
                     )
+                )
 
-                    assert Course.everything.count() == 1
-                    assert CourseRun.everything.count() == 1
+                assert Course.everything.count() == 1
+                assert CourseRun.everything.count() == 1
 
-                    course = Course.everything.get(key=self.COURSE_KEY, partner=self.partner)
-                    course_run = CourseRun.everything.get(course=course)
+                course = Course.everything.get(key=self.COURSE_KEY, partner=self.partner)
+                course_run = CourseRun.everything.get(course=course)
 
-                    # Asserting some required and optional values to verify the correctnesss
-                    assert course.title == 'CSV Course'
-                    assert course.short_description == '<p>Very short description</p>'
-                    assert course.full_description == (
-                        '<p>Organization,Title,Number,Course Enrollment track,Image,Short Description,Long Description,'
-                        'Organization,Title,Number,Course Enrollment track,Image,'
-                        'Short Description,Long Description,</p>'
-                    )
-                    assert course.syllabus_raw == '<p>Introduction to Algorithms</p>'
-                    assert course.subjects.first().slug == "computer-science"
-                    assert course_run.staff.exists() is False
+                # Asserting some required and optional values to verify the correctnesss
+                assert course.title == 'CSV Course'
+                assert course.short_description == '<p>Very short description</p>'
+                assert course.full_description == (
+                    '<p>Organization,Title,Number,Course Enrollment track,Image,Short Description,Long Description,'
+                    'Organization,Title,Number,Course Enrollment track,Image,'
+                    'Short Description,Long Description,</p>'
+                )
+                assert course.syllabus_raw == '<p>Introduction to Algorithms</p>'
+                assert course.subjects.first().slug == "computer-science"
+                assert course_run.staff.exists() is False
 
     @responses.activate
     def test_ingest_product_metadata_flow_for_non_exec_ed(self, jwt_decode_patch):  # pylint: disable=unused-argument
@@ -673,44 +634,39 @@ class TestCSVDataLoader(CSVLoaderMixin, OAuth2Mixin, APITestCase):
         with NamedTemporaryFile() as csv:
             csv = self._write_csv(csv, [csv_data], self.CSV_DATA_KEYS_ORDER)
             with LogCapture(LOGGER_PATH) as log_capture:
-                with mock.patch.object(
-                        CSVDataLoader,
-                        '_call_course_api',
-                        self.mock_call_course_api
-                ):
-                    loader = CSVDataLoader(self.partner, csv_path=csv.name, product_source=self.source.slug)
-                    loader.ingest()
-
-                    self._assert_default_logs(log_capture)
-                    log_capture.check_present(
-                        (
-                            LOGGER_PATH,
-                            'INFO',
-                            'Course key edx+csv_123 could not be found in database, creating the course.'
-                        ),
-                        (
-                            LOGGER_PATH,
-                            'INFO',
-                            'Draft flag is set to True for the course CSV Course'
-                        )
+                loader = CSVDataLoader(self.partner, csv_path=csv.name, product_source=self.source.slug)
+                loader.ingest()
+
+                self._assert_default_logs(log_capture)
+                log_capture.check_present(
+                    (
+                        LOGGER_PATH,
+                        'INFO',
+                        'Course key edx+csv_123 could not be found in database, creating the course.'
+                    ),
+                    (
+                        LOGGER_PATH,
+                        'INFO',
+                        'Draft flag is set to True for the course CSV Course'
                     )
+                )
 
-                    assert Course.everything.count() == 1
-                    assert CourseRun.everything.count() == 1
+                assert Course.everything.count() == 1
+                assert CourseRun.everything.count() == 1
 
-                    course = Course.everything.get(key=self.COURSE_KEY, partner=self.partner)
+                course = Course.everything.get(key=self.COURSE_KEY, partner=self.partner)
 
-                    # Asserting some required and optional values to verify the correctness
-                    assert course.title == 'CSV Course'
-                    assert course.short_description == '<p>Very short description</p>'
-                    assert course.full_description == (
-                        '<p>Organization,Title,Number,Course Enrollment track,Image,Short Description,Long Description,'
-                        'Organization,Title,Number,Course Enrollment track,Image,'
-                        'Short Description,Long Description,</p>'
-                    )
-                    assert course.syllabus_raw == '<p>Introduction to Algorithms</p>'
-                    assert course.subjects.first().slug == "computer-science"
-                    assert course.additional_metadata.product_meta is None
+                # Asserting some required and optional values to verify the correctness
+                assert course.title == 'CSV Course'
+                assert course.short_description == '<p>Very short description</p>'
+                assert course.full_description == (
+                    '<p>Organization,Title,Number,Course Enrollment track,Image,Short Description,Long Description,'
+                    'Organization,Title,Number,Course Enrollment track,Image,'
+                    'Short Description,Long Description,</p>'
+                )
+                assert course.syllabus_raw == '<p>Introduction to Algorithms</p>'
+                assert course.subjects.first().slug == "computer-science"
+                assert course.additional_metadata.product_meta is None
 
     @data(
         (['certificate_header', 'certificate_text', 'stat1_text'],
@@ -851,3 +807,67 @@ class TestCSVDataLoader(CSVLoaderMixin, OAuth2Mixin, APITestCase):
 
                 assert Course.everything.count() == 0
                 assert CourseRun.everything.count() == 0
+
+    @responses.activate
+    def test_ingest_downloads_images_once(self, jwt_decode_patch):  # pylint: disable=unused-argument
+        """
+        Verify an image used for several fields is downloaded once, and unchanged images aren't saved again on the
+        next ingestion.
+        """
+        self._setup_prerequisites(self.partner)
+        self.mock_studio_calls(self.partner)
+        self.mock_image_response()
+        config = DataLoaderConfig.get_solo()
+        config.incremental_refresh = True
+        config.save()
+
+        with NamedTemporaryFile() as csv:
+            csv = self._write_csv(csv, [mock_data.VALID_COURSE_AND_COURSE_RUN_CSV_DICT])
+            loader = CSVDataLoader(self.partner, csv_path=csv.name, product_source=self.source.slug)
+            loader.ingest()
+
+            assert loader.get_ingestion_stats()['created_products_count'] == 1
+            course = Course.everything.get(key=self.COURSE_KEY, partner=self.partner)
+            assert course.image and course.organization_logo_override
+            image_calls = [call for call in responses.calls if call.request.url == 'https://example.com/image.jpg']
+            assert len(image_calls) == 1
+
+            with mock.patch(f'{LOGGER_PATH}.save_course_image') as save_course_image:
+                loader = CSVDataLoader(self.partner, csv_path=csv.name, product_source=self.source.slug)
+                loader.ingest()
+
+            assert loader.get_ingestion_stats()['updated_products_count'] == 1
+            save_course_image.assert_not_called()
+
+    @responses.activate
+    def test_failing_row_rolled_back(self, jwt_decode_patch):  # pylint: disable=unused-argument
+        """
+        Verify a row failing unexpectedly is rolled back, without the other rows of its batch.
+        """
+        test_org = OrganizationFactory(name='testOrg', key='testOrg', partner=self.partner)
+        self._setup_prerequisites(self.partner)
+        self.mock_studio_calls(self.partner)
+        self.mock_studio_calls(self.partner, run_key='course-v1:testOrg+csv_123+1T2020')
+        self.mock_image_response()
+
+        with NamedTemporaryFile() as csv:
+            csv = self._write_csv(
+                csv, [
+                    mock_data.VALID_COURSE_AND_COURSE_RUN_CSV_DICT,
+                    {**mock_data.VALID_COURSE_AND_COURSE_RUN_CSV_DICT, 'organization': test_org.key}
+                ]
+            )
+            loader = CSVDataLoader(self.partner, csv_path=csv.name, product_source=self.source.slug)
+            with mock.patch.object(CSVDataLoader, 'get_draft_flag', side_effect=[Exception('Nope'), True]):
+                loader.ingest()
+
+        assert loader.ingestion_summary['failure_count'] == 1
+        assert loader.ingestion_summary['success_count'] == 1
+        assert loader.error_logs[CSVIngestionErrors.COURSE_INGESTION_ERROR] == [
+            CSVIngestionErrorMessages.COURSE_INGESTION_ERROR.format(
+                course_title=mock_data.VALID_COURSE_AND_COURSE_RUN_CSV_DICT['title'],
+                exception_message='Nope'
+            )
+        ]
+        assert list(Course.everything.values_list('key', flat=True)) == ['testOrg+csv_123']
+        assert CourseRun.everything.count() == 1
@@ -0,0 +1,129 @@
+import threading
+import time
+
+import ddt
+import pytest
+import requests
+from django.test import SimpleTestCase
+from django.utils.http import http_date
+
+from course_discovery.apps.course_metadata.data_loaders.fetching import RateLimiter, _parse_seconds, fetch_concurrently
+
+
+class FakeClock:
+    """ Clock whose time only passes when something sleeps. """
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_response(status_code=200, **headers):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update({name.replace('_', '-'): value for name, value in headers.items()})
+    return response
+
+
+@ddt.ddt
+class RateLimiterTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(2, burst=2, clock=self.clock, sleep=self.clock.sleep)
+
+    def acquire(self, times=1):
+        for __ in range(times):
+            self.limiter.acquire()
+
+    def test_acquire(self):
+        """ Verify a burst of requests is sent at once, then requests are spaced out by the rate. """
+        self.acquire(2)
+        assert not self.clock.sleeps
+
+        self.acquire(2)
+        assert self.clock.now == pytest.approx(1)
+
+    def test_retry_after(self):
+        """ Verify a 429 holds requests until its Retry-After has passed and halves the rate. """
+        self.limiter.update(make_response(429, Retry_After='30'))
+        assert self.limiter.rate == 1
+
+        self.acquire()
+        assert self.clock.now == pytest.approx(30)
+
+    def test_retry_after_date(self):
+        """ Verify Retry-After may be an HTTP date. """
+        assert _parse_seconds(http_date(time.time() + 120)) == pytest.approx(120, abs=2)
+        assert _parse_seconds('garbage') is None
+
+    def test_rate_floor(self):
+        """ Verify repeated 429s without Retry-After don't bring the rate below its floor. """
+        for __ in range(10):
+            self.limiter.update(make_response(429))
+        assert self.limiter.rate == 2 * RateLimiter.MIN_RATE_FACTOR
+
+    def test_recovery(self):
+        """ Verify successful responses raise the rate back up to the maximum. """
+        self.limiter.update(make_response(429))
+        for __ in range(4):
+            self.limiter.update(make_response())
+        assert self.limiter.rate == pytest.approx(1.8)
+
+        self.limiter.update(make_response())
+        self.limiter.update(make_response())
+        assert self.limiter.rate == 2
+
+    @ddt.data('RateLimit', 'X-RateLimit')
+    def test_rate_limit_headers(self, prefix):
+        """ Verify the remaining requests of a window are spread over it, and requests wait for it to reset. """
+        self.limiter.update(make_response(**{f'{prefix}-Remaining': '5', f'{prefix}-Reset': '10'}))
+        assert self.limiter.rate == 0.5
+
+        self.limiter.update(make_response(**{f'{prefix}-Remaining': '0', f'{prefix}-Reset': '10'}))
+        self.acquire()
+        assert self.clock.now == pytest.approx(10)
+
+
+class FetchConcurrentlyTests(SimpleTestCase):
+    def test_fetch(self):
+        """ Verify every item is fetched and yielded with its result. """
+        results = dict(fetch_concurrently(lambda item: item * 2, range(20), max_workers=4, queue_size=2))
+        assert results == {item: item * 2 for item in range(20)}
+
+    def test_exception(self):
+        """ Verify an exception raised while fetching is raised to the caller, which stops fetching. """
+        def fetch(item):
+            if item == 3:
+                raise ValueError(item)
+            return item
+
+        with pytest.raises(ValueError):
+            list(fetch_concurrently(fetch, range(100), max_workers=1, queue_size=1))
+
+    def test_bounded_queue(self):
+        """ Verify fetching pauses while the caller hasn't processed the results waiting in the queue. """
+        lock = threading.Lock()
+        fetched = []
+
+        def fetch(item):
+            with lock:
+                fetched.append(item)
+            return item
+
+        max_ahead = 0
+        for processed, __ in enumerate(fetch_concurrently(fetch, range(30), max_workers=3, queue_size=2), 1):
+            time.sleep(0.01)
+            with lock:
+                max_ahead = max(max_ahead, len(fetched) - processed)
+
+        # Besides the queued results, each worker may hold one fetched result it is waiting to queue.
+        assert len(fetched) == 30
+        assert max_ahead <= 2 + 3
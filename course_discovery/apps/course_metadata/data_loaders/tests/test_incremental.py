@@ -0,0 +1,128 @@
+import requests
+import responses
+from django.test import TestCase
+
+from course_discovery.apps.core.tests.factories import PartnerFactory
+from course_discovery.apps.course_metadata.data_loaders.incremental import RecordHashes, StoredResponses, get_url_hash
+from course_discovery.apps.course_metadata.models import DataLoaderRecordHash, DataLoaderResponse
+
+URL = 'https://api.example.com/courses/'
+
+
+class StoredResponsesTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.partner = PartnerFactory()
+        self.client = requests.Session()
+
+    def get(self, enabled=True):
+        stored_responses = StoredResponses(self.partner, enabled=enabled)
+        conditional_response = stored_responses.get(self.client, URL, {'page': 2})
+        return conditional_response.response, stored_responses.load(conditional_response)
+
+    @responses.activate
+    def test_not_modified(self):
+        """ Verify the validators of the last response are sent, and its body is reused when the API answers 304. """
+        body = {'results': [{'id': 1}]}
+        responses.add(responses.GET, URL, json=body, headers={'ETag': '"v1"', 'Last-Modified': 'Sun, 18 Oct 2026'})
+        responses.add(responses.GET, URL, status=304)
+
+        assert self.get()[1] == body
+        response, data = self.get()
+
+        assert response.status_code == 304
+        assert data == body
+        request_headers = responses.calls[1].request.headers
+        assert request_headers['If-None-Match'] == '"v1"'
+        assert request_headers['If-Modified-Since'] == 'Sun, 18 Oct 2026'
+        stored_response = DataLoaderResponse.objects.get()
+        assert stored_response.url == URL + '?page=2'
+        assert stored_response.url_hash == get_url_hash(URL + '?page=2')
+
+    @responses.activate
+    def test_modified(self):
+        """ Verify a new response replaces the stored one, which is dropped once the API stops sending validators. """
+        responses.add(responses.GET, URL, json={'results': []}, headers={'ETag': '"v1"'})
+        responses.add(responses.GET, URL, json={'results': [{'id': 1}]}, headers={'ETag': '"v2"'})
+        responses.add(responses.GET, URL, json={'results': [{'id': 2}]})
+
+        self.get()
+        assert self.get()[1] == {'results': [{'id': 1}]}
+        assert DataLoaderResponse.objects.get().etag == '"v2"'
+
+        assert self.get()[1] == {'results': [{'id': 2}]}
+        assert not DataLoaderResponse.objects.exists()
+
+    @responses.activate
+    def test_error(self):
+        """ Verify error responses have no body and aren't stored. """
+        responses.add(responses.GET, URL, status=500, headers={'ETag': '"v1"'})
+
+        response, data = self.get()
+
+        assert response.status_code == 500
+        assert data is None
+        assert not DataLoaderResponse.objects.exists()
+
+    @responses.activate
+    def test_get_without_queries(self):
+        """ Verify requests are sent without using the database, so they can be sent from worker threads. """
+        responses.add(responses.GET, URL, json={'results': []}, headers={'ETag': '"v1"'})
+        responses.add(responses.GET, URL, status=304)
+        self.get()
+
+        stored_responses = StoredResponses(self.partner)
+        with self.assertNumQueries(0):
+            conditional_response = stored_responses.get(self.client, URL, {'page': 2})
+
+        assert conditional_response.content is None
+        assert responses.calls[1].request.headers['If-None-Match'] == '"v1"'
+        assert stored_responses.load(conditional_response) == {'results': []}
+
+    @responses.activate
+    def test_disabled(self):
+        """ Verify no validators are sent nor responses stored when disabled. """
+        responses.add(responses.GET, URL, json={'results': []}, headers={'ETag': '"v1"'})
+
+        self.get(enabled=False)
+        self.get(enabled=False)
+
+        assert 'If-None-Match' not in responses.calls[1].request.headers
+        assert not DataLoaderResponse.objects.exists()
+
+
+class RecordHashesTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.partner = PartnerFactory()
+
+    def test_is_unchanged(self):
+        """ Verify records are unchanged once saved with the same content, by any loader of the same endpoint. """
+        record = {'id': 1, 'name': 'Course', 'tags': ['a', 'b']}
+        hashes = RecordHashes(self.partner, 'courses')
+        assert not hashes.is_unchanged(1, record)
+
+        hashes.save(1, record)
+        assert hashes.is_unchanged(1, record)
+        assert not hashes.is_unchanged(1, {**record, 'name': 'Other course'})
+
+        with self.assertNumQueries(1):
+            assert RecordHashes(self.partner, 'courses').is_unchanged('1', dict(reversed(record.items())))
+        assert not RecordHashes(self.partner, 'programs').is_unchanged(1, record)
+
+    def test_save_unchanged(self):
+        """ Verify saving a record whose hash is already stored doesn't write it again. """
+        hashes = RecordHashes(self.partner, 'courses')
+        hashes.save(1, {'id': 1})
+
+        with self.assertNumQueries(0):
+            hashes.save(1, {'id': 1})
+        assert DataLoaderRecordHash.objects.count() == 1
+
+    def test_disabled(self):
+        """ Verify every record is considered changed and no hash is saved when disabled. """
+        hashes = RecordHashes(self.partner, 'courses', enabled=False)
+        hashes.save(1, {'id': 1})
+
+        assert not hashes.is_unchanged(1, {'id': 1})
+        assert not DataLoaderRecordHash.objects.exists()
@@ -1,19 +1,217 @@
-from algoliasearch_django import AlgoliaIndex, register
+import hashlib
+import json
+import logging
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
+from algoliasearch_django import AlgoliaIndex, get_adapter, register
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Prefetch
+
+from course_discovery.apps.core.utils import get_pk_chunks
 from course_discovery.apps.course_metadata.algolia_models import (
-    AlgoliaProxyCourse, AlgoliaProxyProduct, AlgoliaProxyProgram, SearchDefaultResultsConfiguration
+    AlgoliaProxyCourse, AlgoliaProxyProduct, AlgoliaProxyProgram, AlgoliaRecordHash, SearchDefaultResultsConfiguration
 )
 from course_discovery.apps.course_metadata.contentful_utils import (
     fetch_and_transform_bootcamp_contentful_data, fetch_and_transform_degree_contentful_data
 )
+from course_discovery.apps.course_metadata.models import Course, CourseRun, Seat
+
+logger = logging.getLogger(__name__)
+
+
+def get_record_hash(record):
+    """
+    Returns a digest of a raw Algolia record, which only changes when the content of the record does.
+    """
+    content = json.dumps(record, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.md5(content.encode('utf-8')).hexdigest()
+
+
+def prefetch_course_runs(lookup):
+    """
+    Returns a Prefetch of the course runs of courses, with everything their products need to pick the advertised run.
+    """
+    course_runs = CourseRun.everything.select_related('type', 'language').prefetch_related(
+        'language__translations',
+        'staff',
+        Prefetch('seats', queryset=Seat.everything.select_related('type')),
+    )
+    return Prefetch(lookup, queryset=course_runs)
+
+
+def get_contentful_data(queryset, pks, fetch_contentful_data):
+    """
+    Returns the Contentful data of the courses or programs of a queryset with the given primary keys.
+    """
+    uuids = queryset.prefetch_related(None).filter(pk__in=pks).values_list('uuid', flat=True)
+    return fetch_contentful_data(product_uuids=[str(uuid) for uuid in uuids])
+
+
+def serialize_products(product_indexes, queryset_name, pks, contentful_data):
+    """
+    Serializes the courses or programs with the given primary keys for each of the given language indexes.
+
+    Each course or program is loaded once, and the fields that don't depend on the language are only
+    computed for the first index that indexes it.
+
+    Arguments:
+        product_indexes (BaseProductIndex[]): Language indexes to serialize the products for
+        queryset_name (str): Name of the method of the indexes returning the queryset to load the products from
+        pks (int[]): Primary keys of the products
+        contentful_data (dict): Contentful data of the products
+
+    Returns:
+        dict: Mapping of each index name to the records of the products the index should contain.
+    """
+    records = {product_index.index_name: [] for product_index in product_indexes}
+    queryset = getattr(product_indexes[0], queryset_name)()
+    for product in queryset.filter(pk__in=pks).order_by('pk'):
+        shared_values = {}
+        for product_index in product_indexes:
+            instance = AlgoliaProxyProduct(
+                product, product_index.language, contentful_data=contentful_data, shared_values=shared_values
+            )
+            if product_index._should_index(instance):  # pylint: disable=protected-access
+                records[product_index.index_name].append(product_index.get_raw_record(instance))
+    return records
+
+
+def serialize_products_in_process(queryset_name, pks, contentful_data):
+    """
+    Serializes products for the registered product indexes in a process of the pool ProductMetaIndex uses.
+
+    Like execute_parallel_loader, it closes the database connection copied from the parent process, so the
+    process opens its own.
+    """
+    connection.close()
+    product_indexes = get_adapter(AlgoliaProxyProduct).model_index
+    return serialize_products(product_indexes, queryset_name, pks, contentful_data)
+
+
+class RecordDelta:
+    """
+    Updates an index with the records whose content changed since they were last sent by a delta reindex.
+
+    Records are added one at a time and changed ones are saved in batches. Finishing the delta deletes the
+    records that weren't added, and replaces the rules of the index if they changed.
+    """
+
+    def __init__(self, product_index, batch_size):
+        self.product_index = product_index
+        self.index_name = product_index.index_name
+        self.index = product_index._AlgoliaIndex__index
+        self.batch_size = batch_size
+        self.current_hashes = {}
+        self.changed_records = []
+        self.saved_count = 0
+        self.stored_hashes = dict(
+            AlgoliaRecordHash.objects.filter(index_name=self.index_name).values_list('object_id', 'content_hash')
+        )
+        if not self.stored_hashes:
+            # Without hashes nothing is known about the records in the index. Browse it for their ids, so every
+            # record is sent once and the ones that shouldn't be indexed anymore are still deleted.
+            self.stored_hashes = {
+                record['objectID']: '' for record in self.index.browse_all({'attributesToRetrieve': ['objectID']})
+            }
+
+    def add(self, record):
+        object_id = record['objectID']
+        self.current_hashes[object_id] = get_record_hash(record)
+        if self.current_hashes[object_id] != self.stored_hashes.get(object_id):
+            self.changed_records.append(record)
+        if len(self.changed_records) >= self.batch_size:
+            self._save_changed_records()
+
+    def finish(self):
+        """
+        Returns:
+            tuple: The number of saved and deleted records.
+        """
+        if self.changed_records:
+            self._save_changed_records()
+
+        removed_object_ids = [object_id for object_id in self.stored_hashes if object_id not in self.current_hashes]
+        for start in range(0, len(removed_object_ids), self.batch_size):
+            self._delete_removed_records(removed_object_ids[start:start + self.batch_size])
+
+        existing_rules = list(self.index.iter_rules())
+        final_rules = self.product_index.get_final_rules(existing_rules)
+        if {rule['objectID']: rule for rule in final_rules} != {rule['objectID']: rule for rule in existing_rules}:
+            self.index.replace_all_rules(final_rules)
+            logger.info('Replaced the rules of index %s.', self.index_name)
+
+        logger.info(
+            'Delta reindex of %s saved %d and deleted %d of %d records.',
+            self.index_name, self.saved_count, len(removed_object_ids), len(self.current_hashes)
+        )
+        return self.saved_count, len(removed_object_ids)
+
+    def _save_changed_records(self):
+        self.index.save_objects(self.changed_records)
+        object_ids = [record['objectID'] for record in self.changed_records]
+        with transaction.atomic():
+            AlgoliaRecordHash.objects.filter(index_name=self.index_name, object_id__in=object_ids).delete()
+            AlgoliaRecordHash.objects.bulk_create([
+                AlgoliaRecordHash(
+                    index_name=self.index_name, object_id=object_id, content_hash=self.current_hashes[object_id]
+                )
+                for object_id in object_ids
+            ])
+        self.saved_count += len(self.changed_records)
+        self.changed_records = []
+
+    def _delete_removed_records(self, object_ids):
+        self.index.delete_objects(object_ids)
+        AlgoliaRecordHash.objects.filter(index_name=self.index_name, object_id__in=object_ids).delete()
 
 
 class BaseProductIndex(AlgoliaIndex):
     language = None
+    # Number of courses or programs fetched, with their related objects, at a time.
+    queryset_chunk_size = 500
+
+    def get_course_queryset(self):
+        return AlgoliaProxyCourse.objects.select_related(
+            'partner', 'type', 'level_type', 'product_source', 'video', 'additional_metadata__product_meta',
+            'location_restriction', 'in_year_value', 'geolocation', 'availability_snapshot',
+        ).prefetch_related(
+            'authoring_organizations',
+            'subjects__translations',
+            'level_type__translations',
+            'programs__type__translations',
+            'url_slug_history',
+            'topics',
+            prefetch_course_runs('course_runs'),
+        )
+
+    def get_program_queryset(self):
+        courses = Course.everything.select_related('partner', 'type', 'level_type').prefetch_related(
+            'subjects__translations',
+            'level_type__translations',
+            'topics',
+            prefetch_course_runs('course_runs'),
+        )
+        return AlgoliaProxyProgram.objects.select_related(
+            'partner', 'type', 'product_source', 'primary_subject_override', 'level_type_override',
+            'language_override', 'location_restriction', 'in_year_value', 'geolocation', 'subscription',
+            'degree__additional_metadata',
+        ).prefetch_related(
+            'type__translations',
+            'primary_subject_override__translations',
+            'level_type_override__translations',
+            'language_override__translations',
+            'authoring_organizations',
+            'expected_learning_items',
+            'labels',
+            'subscription__prices__currency',
+            Prefetch('courses', queryset=courses),
+        )
 
     # Bit of a hack: Override get_queryset to return all wrapped versions of all courses and programs rather than an
     # actual queryset to get around the fact that courses and programs have different fields and therefore cannot be
-    # combined in a union of querysets. AlgoliaIndex only uses get_queryset as an iterable, so an array works as well.
+    # combined in a union of querysets. AlgoliaIndex only uses get_queryset as an iterable, so a generator works as
+    # well. Courses and programs are streamed in chunks, which keeps the memory used by reindexing bounded.
 
     def get_queryset(self):  # pragma: no cover
         if not self.language:
@@ -21,15 +219,14 @@ class BaseProductIndex(AlgoliaIndex):
                 'Cannot update Algolia index \'{index_name}\'. No language set'.format(index_name=self.index_name)
             )
 
-        bootcamp_contentful_data = fetch_and_transform_bootcamp_contentful_data()
-        qs1 = [AlgoliaProxyProduct(course, self.language, contentful_data=bootcamp_contentful_data)
-               for course in AlgoliaProxyCourse.objects.all()]
-
-        degree_contentful_data = fetch_and_transform_degree_contentful_data()
-        qs2 = [AlgoliaProxyProduct(program, self.language, contentful_data=degree_contentful_data)
-               for program in AlgoliaProxyProgram.objects.all()]
-
-        return qs1 + qs2
+        for queryset, fetch_contentful_data in (
+            (self.get_course_queryset(), fetch_and_transform_bootcamp_contentful_data),
+            (self.get_program_queryset(), fetch_and_transform_degree_contentful_data),
+        ):
+            for pks in get_pk_chunks(queryset, self.queryset_chunk_size):
+                contentful_data = get_contentful_data(queryset, pks, fetch_contentful_data)
+                for product in queryset.filter(pk__in=pks).order_by('pk'):
+                    yield AlgoliaProxyProduct(product, self.language, contentful_data=contentful_data)
 
     def generate_empty_query_rule(self, rule_object_id, product_type, results):
         promoted_results = [{'objectID': f'{product_type}-{result.uuid}',
@@ -57,18 +254,54 @@ class BaseProductIndex(AlgoliaIndex):
             return [course_rule, program_rule]
         return []
 
-    # Rules aren't automatically set in regular reindex_all, so set them explicitly
-    def reindex_all(self, batch_size=1000):
-        # Since reindexing removes all the rules, we will need to recreate the 2U rules after reindexing
+    def get_final_rules(self, existing_rules):
+        """
+        Returns the rules the index should have: the 2U rules, plus any other rules it already has.
+        """
         rules_to_create = self.get_rules()
         rules_to_create_ids = {rule['objectID'] for rule in rules_to_create}
         existing_rules_to_keep = [
-            rule for rule in self._AlgoliaIndex__index.iter_rules()
+            rule for rule in existing_rules
             if rule['objectID'] not in rules_to_create_ids
         ]
-        final_rules = rules_to_create + existing_rules_to_keep
+        return rules_to_create + existing_rules_to_keep
+
+    def clear_index(self):
+        super().clear_index()
+        # The records are gone, so the next delta reindex must send every record again.
+        AlgoliaRecordHash.objects.filter(index_name=self.index_name).delete()
+
+    # Rules aren't automatically set in regular reindex_all, so set them explicitly
+    def reindex_all(self, batch_size=1000):
+        # Since reindexing removes all the rules, we will need to recreate the 2U rules after reindexing
+        final_rules = self.get_final_rules(self._AlgoliaIndex__index.iter_rules())
         super().reindex_all(batch_size)
         self._AlgoliaIndex__index.replace_all_rules(final_rules)
+        # The index was rebuilt without computing hashes, so the stored ones no longer describe its records.
+        AlgoliaRecordHash.objects.filter(index_name=self.index_name).delete()
+
+    def reindex_delta(self, batch_size=1000):
+        """
+        Saves the records whose content changed since they were last sent by a delta reindex, and deletes the
+        records that should no longer be indexed. Unlike reindex_all, the index is updated in place, so records
+        and rules that haven't changed are left alone.
+
+        Returns:
+            tuple: The number of saved and deleted records.
+        """
+        delta = RecordDelta(self, batch_size)
+        for instance in self.get_queryset():
+            if self._should_index(instance):
+                delta.add(self.get_raw_record(instance))
+        return delta.finish()
+
+    def save_record(self, instance, update_fields=None, **kwargs):
+        # The record is sent outside of delta reindexing, so forget its hash. The next delta reindex then sends
+        # it again, or deletes it if it shouldn't be indexed by then.
+        AlgoliaRecordHash.objects.update_or_create(
+            index_name=self.index_name, object_id=self.objectID(instance), defaults={'content_hash': ''}
+        )
+        return super().save_record(instance, update_fields=update_fields, **kwargs)
 
 
 class EnglishProductIndex(BaseProductIndex):
@@ -217,5 +450,61 @@ class ProductMetaIndex(AlgoliaIndex):
         for indexer in self.model_index:
             indexer.reindex_all(batch_size)
 
+    def reindex_delta(self, batch_size=1000, processes=1):
+        """
+        Runs a delta reindex of every language index, serializing each course and program once for all of them.
+        """
+        deltas = [RecordDelta(indexer, batch_size) for indexer in self.model_index]
+        for records in self.iter_product_records(processes):
+            for delta in deltas:
+                for record in records[delta.index_name]:
+                    delta.add(record)
+        return {delta.index_name: delta.finish() for delta in deltas}
+
+    def get_product_tasks(self):
+        """
+        Yields the arguments of serialize_products for each chunk of courses or programs.
+
+        The Contentful data of each chunk is read here rather than in the processes, so they don't all sync it.
+        """
+        indexer = self.model_index[0]
+        for queryset_name, fetch_contentful_data in (
+            ('get_course_queryset', fetch_and_transform_bootcamp_contentful_data),
+            ('get_program_queryset', fetch_and_transform_degree_contentful_data),
+        ):
+            queryset = getattr(indexer, queryset_name)()
+            for pks in get_pk_chunks(queryset, indexer.queryset_chunk_size):
+                yield queryset_name, pks, get_contentful_data(queryset, pks, fetch_contentful_data)
+
+    def iter_product_records(self, processes=1):
+        """
+        Yields the records of every language index for one chunk of courses or programs at a time.
+
+        With more than one process, the chunks are serialized in a pool of processes. At most two chunks per
+        process are in flight, so serialization doesn't run far ahead of the uploads.
+        """
+        tasks = list(self.get_product_tasks())
+
+        if processes < 2:
+            for task in tasks:
+                yield serialize_products(self.model_index, *task)
+            return
+
+        # Close the connection before forking, so the processes don't share it with this one.
+        connection.close()
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            pending = set()
+            for task in tasks:
+                pending.add(executor.submit(serialize_products_in_process, *task))
+                if len(pending) >= processes * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
 
 register(AlgoliaProxyProduct, index_cls=ProductMetaIndex)
@@ -0,0 +1,33 @@
+import logging
+
+from algoliasearch_django import get_adapter
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from course_discovery.apps.course_metadata.algolia_models import AlgoliaProxyProduct
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Updates the Algolia product indexes with the records that changed since the last delta reindex.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batchsize',
+            type=int,
+            default=1000,
+            help='Number of records to send to Algolia per request.',
+        )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=settings.ALGOLIA_REINDEX_PROCESSES,
+            help='Number of processes to serialize courses and programs in.',
+        )
+
+    def handle(self, *args, **options):
+        product_index = get_adapter(AlgoliaProxyProduct)
+        counts = product_index.reindex_delta(options['batchsize'], options['processes'])
+        for index_name, (saved_count, deleted_count) in counts.items():
+            logger.info('Saved %d and deleted %d records of Algolia index %s.', saved_count, deleted_count, index_name)
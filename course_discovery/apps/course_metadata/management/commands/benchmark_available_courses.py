@@ -0,0 +1,157 @@
+import datetime
+import random
+import time
+
+import pytz
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.management import BaseCommand, CommandError
+from django.db import models, transaction
+from django.db.models import Q
+
+from course_discovery.apps.core.models import Currency, Partner
+from course_discovery.apps.course_metadata.choices import CourseRunStatus
+from course_discovery.apps.course_metadata.models import Course, CourseRun, Seat, SeatType
+
+BENCHMARK_KEY_PREFIX = 'benchmark'
+
+
+def get_join_available_queryset(queryset):
+    """
+    Returns the available courses of a queryset as CourseQuerySet.available() used to select them: by joining
+    every run and seat of every course, then deduplicating the matching course ids.
+    """
+    now = datetime.datetime.now(pytz.UTC)
+    enrollable = (
+        (Q(course_runs__enrollment_start__lte=now) | Q(course_runs__enrollment_start__isnull=True)) &
+        (Q(course_runs__enrollment_end__gt=now) | Q(course_runs__enrollment_end__isnull=True))
+    )
+    not_ended = Q(course_runs__end__gt=now) | Q(course_runs__end__isnull=True)
+    marketable = (
+        ~Q(course_runs__slug='') &
+        Q(course_runs__seats__isnull=False) &
+        Q(course_runs__draft=models.Value(0)) &
+        ~Q(course_runs__type__is_marketable=False) &
+        Q(course_runs__status=CourseRunStatus.Published)
+    )
+    ids = queryset.filter(enrollable & not_ended & marketable).values('id').distinct()
+    return queryset.filter(id__in=ids)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares the query plan and wall time of CourseQuerySet.available() with the former join-based query, '
+        'on a synthetic dataset which is rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=100000,
+            help='Number of synthetic course runs to create.',
+        )
+        parser.add_argument(
+            '--runs-per-course',
+            type=int,
+            default=4,
+            help='Number of synthetic course runs per course.',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Number of times each query is timed.',
+        )
+        parser.add_argument(
+            '--allow-writes',
+            action='store_true',
+            help='Run the benchmark even though DEBUG is off. The dataset is written to the configured database.',
+        )
+
+    def handle(self, *args, **options):
+        if not (settings.DEBUG or options['allow_writes']):
+            raise CommandError(
+                'This command inserts a synthetic dataset into the configured database. '
+                'Run it with DEBUG enabled or pass --allow-writes.'
+            )
+
+        with transaction.atomic():
+            partner = self.create_dataset(options['runs'], options['runs_per_course'])
+            queryset = Course.everything.filter(partner=partner)
+
+            results = {}
+            for name, available in (
+                    ('join', get_join_available_queryset(queryset)),
+                    ('exists', queryset.available())):
+                self.stdout.write(f'== {name} ==')
+                self.stdout.write(available.explain())
+
+                timings = []
+                for __ in range(options['repeat']):
+                    start = time.perf_counter()
+                    results[name] = set(available.values_list('id', flat=True))
+                    timings.append(time.perf_counter() - start)
+                self.stdout.write(
+                    f'{len(results[name])} available courses, best of {len(timings)}: {min(timings) * 1000:.1f} ms, '
+                    f'mean: {sum(timings) / len(timings) * 1000:.1f} ms'
+                )
+
+            if results['join'] == results['exists']:
+                self.stdout.write('Both queries select the same courses.')
+            else:
+                self.stderr.write('The queries select different courses.')
+
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def create_dataset(run_count, runs_per_course):
+        """
+        Creates a partner with courses whose runs are past, current or upcoming, published or not, and mostly have
+        a seat. Returns the partner.
+        """
+        rng = random.Random(0)
+        now = datetime.datetime.now(pytz.UTC)
+        day = datetime.timedelta(days=1)
+
+        site = Site.objects.create(domain=f'{BENCHMARK_KEY_PREFIX}.invalid', name=BENCHMARK_KEY_PREFIX)
+        partner = Partner.objects.create(name=BENCHMARK_KEY_PREFIX, short_code='bench', site=site)
+        seat_type, __ = SeatType.objects.get_or_create(slug=Seat.VERIFIED, defaults={'name': 'Verified'})
+        currency, __ = Currency.objects.get_or_create(code='USD', defaults={'name': 'US Dollar'})
+
+        course_count = max(run_count // runs_per_course, 1)
+        Course.everything.bulk_create([
+            Course(
+                partner=partner,
+                key=f'{BENCHMARK_KEY_PREFIX}+course{index}',
+                title=f'Benchmark course {index}',
+                url_slug=f'{BENCHMARK_KEY_PREFIX}-course-{index}',
+            )
+            for index in range(course_count)
+        ], batch_size=1000)
+        course_ids = list(Course.everything.filter(partner=partner).values_list('id', flat=True))
+
+        course_runs = []
+        for index in range(run_count):
+            start = now + rng.randint(-720, 180) * day
+            course_run = CourseRun(
+                course_id=course_ids[index % len(course_ids)],
+                key=f'course-v1:{BENCHMARK_KEY_PREFIX}+run{index}+run',
+                slug=f'{BENCHMARK_KEY_PREFIX}-run-{index}',
+                status=rng.choice([CourseRunStatus.Published, CourseRunStatus.Published, CourseRunStatus.Unpublished]),
+                start=start,
+                end=start + rng.randint(30, 120) * day,
+                enrollment_start=start - rng.randint(0, 60) * day,
+                enrollment_end=rng.choice([None, start + rng.randint(0, 30) * day]),
+            )
+            course_run.set_date_state(now, ())
+            course_runs.append(course_run)
+        CourseRun.everything.bulk_create(course_runs, batch_size=1000)
+
+        course_run_ids = CourseRun.everything.filter(course__partner=partner).values_list('id', flat=True)
+        Seat.everything.bulk_create([
+            Seat(course_run_id=course_run_id, type=seat_type, currency=currency, price=rng.randint(10, 300))
+            for course_run_id in course_run_ids
+            if rng.random() < 0.9
+        ], batch_size=1000)
+        return partner
@@ -0,0 +1,35 @@
+import logging
+
+from django.core.management import BaseCommand
+
+from course_discovery.apps.api.affiliate_window import generate_feeds
+from course_discovery.apps.catalogs.models import Catalog
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Pre-generates the compressed Affiliate Window feeds of catalogs into the default storage.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--catalog-id',
+            action='append',
+            dest='catalog_ids',
+            type=int,
+            help='Catalog to generate the feeds of. May be given several times. Defaults to all catalogs.',
+        )
+
+    def handle(self, *args, **options):
+        catalogs = Catalog.objects.order_by('pk')
+        if options['catalog_ids']:
+            catalogs = catalogs.filter(pk__in=options['catalog_ids'])
+
+        failed = 0
+        for catalog in catalogs:
+            try:
+                generate_feeds(catalog)
+            except Exception:  # pylint: disable=broad-except
+                failed += 1
+                logger.exception('Failed to generate the Affiliate Window feeds of catalog [%d].', catalog.id)
+        logger.info('Generated the Affiliate Window feeds of %d catalogs.', len(catalogs) - failed)
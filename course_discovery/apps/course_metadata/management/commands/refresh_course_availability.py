@@ -0,0 +1,41 @@
+import datetime
+import logging
+
+import pytz
+from django.core.management import BaseCommand
+from django.db.models import Q
+
+from course_discovery.apps.course_metadata.models import Course, CourseAvailability
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Refreshes the availability snapshots of courses which are missing or expired.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Refresh the snapshots of all courses, rather than only the missing and expired ones.',
+        )
+        parser.add_argument(
+            '--batchsize',
+            type=int,
+            default=500,
+            help='Number of courses to refresh at a time.',
+        )
+
+    def handle(self, *args, **options):
+        queryset = Course.everything.order_by('pk')
+        if not options['all']:
+            now = datetime.datetime.now(pytz.UTC)
+            queryset = queryset.filter(
+                Q(availability_snapshot__isnull=True) | Q(availability_snapshot__valid_until__lte=now)
+            )
+
+        course_ids = list(queryset.values_list('pk', flat=True))
+        batch_size = options['batchsize']
+        for start in range(0, len(course_ids), batch_size):
+            CourseAvailability.refresh(course_ids[start:start + batch_size])
+        logger.info('Refreshed the availability snapshots of %d courses.', len(course_ids))
@@ -5,7 +5,8 @@ import logging
 import backoff
 import waffle  # lint-amnesty, pylint: disable=invalid-django-waffle-import
 from django.apps import apps
-from django.core.management import BaseCommand, CommandError
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError, call_command
 from django.db import connection
 from django.db.models.signals import post_delete, post_save
 
@@ -137,7 +138,7 @@ class Command(BaseCommand):
 
             pipeline = (
                 (
-                    (CoursesApiDataLoader, partner.courses_api_url, 1),
+                    (CoursesApiDataLoader, partner.courses_api_url, max_workers),
                 ),
                 (
                     (EcommerceApiDataLoader, partner.ecommerce_api_url, 1),
@@ -197,5 +198,8 @@ class Command(BaseCommand):
         # Re-connect back the api_change_receiver receiver to post_save and post_delete signals
         connect_api_change_receiver()
 
+        if settings.AFFILIATE_WINDOW_PREGENERATED_FEEDS:
+            call_command('generate_affiliate_window_feeds')
+
         if not success:
             raise CommandError('One or more of the data loaders above failed.')
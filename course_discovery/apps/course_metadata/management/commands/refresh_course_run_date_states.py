@@ -0,0 +1,97 @@
+import datetime
+import logging
+import time
+
+import pytz
+from django.core.management import BaseCommand
+from django.db.models import Min
+
+from course_discovery.apps.api.cache import get_instance_cache_tags, invalidate_api_cache_tags
+from course_discovery.apps.course_metadata.models import CourseAvailability, CourseRun
+from course_discovery.apps.course_metadata.search_indexes.signals import IndexUpdateBatch
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Refreshes the precomputed date states of course runs whose state expired, then invalidates the cached API '
+        'responses, search documents and availability snapshots of the refreshed runs and their courses.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Refresh the date states of all course runs, rather than only the expired ones.',
+        )
+        parser.add_argument(
+            '--batchsize',
+            type=int,
+            default=500,
+            help='Number of course runs to refresh at a time.',
+        )
+        parser.add_argument(
+            '--watch',
+            action='store_true',
+            help='Keep running, and refresh the date states as soon as they expire.',
+        )
+        parser.add_argument(
+            '--max-sleep',
+            type=int,
+            default=60,
+            help='When watching, the maximum number of seconds to wait for the next expiry. Bounds the delay for '
+                 'states that a save made expire earlier in the meantime.',
+        )
+
+    def handle(self, *args, **options):
+        refresh_all = options['all']
+        while True:
+            queryset = CourseRun.everything.order_by('pk')
+            if not refresh_all:
+                queryset = queryset.date_state_expired()
+            course_run_ids = list(queryset.values_list('pk', flat=True))
+
+            batch_size = options['batchsize']
+            for start in range(0, len(course_run_ids), batch_size):
+                self.refresh(course_run_ids[start:start + batch_size])
+            logger.info('Refreshed the date states of %d course runs.', len(course_run_ids))
+
+            if not options['watch']:
+                break
+            refresh_all = False
+            time.sleep(self.get_sleep_seconds(options['max_sleep']))
+
+    @staticmethod
+    def get_sleep_seconds(max_sleep):
+        """
+        Returns the number of seconds until the next course run date state expires, at most max_sleep.
+        """
+        now = datetime.datetime.now(pytz.UTC)
+        next_expiry = CourseRun.everything.filter(
+            date_state_expires__gt=now
+        ).aggregate(next_expiry=Min('date_state_expires'))['next_expiry']
+        if next_expiry is None:
+            return max_sleep
+        return min(max_sleep, (next_expiry - now).total_seconds())
+
+    @staticmethod
+    def refresh(course_run_ids):
+        course_runs = CourseRun.refresh_date_states(course_run_ids)
+
+        # The states were updated without signals, so only the objects embedding the refreshed runs are touched.
+        tags = set()
+        for course_run in course_runs:
+            tags |= get_instance_cache_tags(CourseRun, course_run)
+        invalidate_api_cache_tags(tags)
+
+        batch = IndexUpdateBatch()
+        for course_run in course_runs:
+            if course_run.draft or not course_run.type or not course_run.type.is_marketable:
+                continue
+            batch.add(course_run)
+            if not course_run.course.draft:
+                batch.add(course_run.course)
+        batch.flush()
+
+        CourseAvailability.refresh({course_run.course_id for course_run in course_runs})
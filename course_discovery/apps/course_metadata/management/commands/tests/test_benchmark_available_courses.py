@@ -0,0 +1,33 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from course_discovery.apps.course_metadata.models import Course, CourseRun
+
+
+class BenchmarkAvailableCoursesCommandTests(TestCase):
+    def test_refuses_without_debug(self):
+        with pytest.raises(CommandError):
+            call_command('benchmark_available_courses', '--runs=40', '--repeat=1')
+        assert not Course.everything.exists()
+
+    @override_settings(DEBUG=True)
+    def test_benchmark(self):
+        stdout = StringIO()
+        call_command('benchmark_available_courses', '--runs=40', '--repeat=1', stdout=stdout)
+
+        output = stdout.getvalue()
+        assert '== join ==' in output
+        assert '== exists ==' in output
+        assert 'Both queries select the same courses.' in output
+        assert not Course.everything.exists()
+        assert not CourseRun.everything.exists()
+
+    def test_benchmark_allow_writes(self):
+        stdout = StringIO()
+        call_command('benchmark_available_courses', '--runs=40', '--repeat=1', '--allow-writes', stdout=stdout)
+
+        assert 'Both queries select the same courses.' in stdout.getvalue()
+        assert not Course.everything.exists()
@@ -0,0 +1,35 @@
+import datetime
+
+import pytz
+from django.core.management import call_command
+from django.test import TestCase
+
+from course_discovery.apps.course_metadata.models import CourseAvailability
+from course_discovery.apps.course_metadata.tests.factories import CourseRunFactory
+
+
+class RefreshCourseAvailabilityCommandTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.missing_run = CourseRunFactory()
+        self.expired_run = CourseRunFactory()
+        self.valid_run = CourseRunFactory()
+        CourseAvailability.refresh([self.expired_run.course_id, self.valid_run.course_id])
+        CourseAvailability.objects.filter(course_id=self.expired_run.course_id).update(
+            valid_until=datetime.datetime.now(pytz.UTC) - datetime.timedelta(minutes=1)
+        )
+        self.valid_computed_at = CourseAvailability.objects.get(course_id=self.valid_run.course_id).computed_at
+
+    def test_refresh_missing_and_expired(self):
+        call_command('refresh_course_availability')
+
+        snapshots = {snapshot.course_id: snapshot for snapshot in CourseAvailability.objects.all()}
+        assert set(snapshots) == {self.missing_run.course_id, self.expired_run.course_id, self.valid_run.course_id}
+        assert snapshots[self.expired_run.course_id].is_valid()
+        assert snapshots[self.valid_run.course_id].computed_at == self.valid_computed_at
+
+    def test_refresh_all(self):
+        call_command('refresh_course_availability', '--all', '--batchsize=1')
+
+        assert CourseAvailability.objects.count() == 3
+        assert CourseAvailability.objects.get(course_id=self.valid_run.course_id).computed_at > self.valid_computed_at
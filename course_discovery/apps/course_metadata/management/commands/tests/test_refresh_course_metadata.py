@@ -5,7 +5,7 @@ import ddt
 import pytest
 import responses
 from django.core.management import CommandError, call_command
-from django.test import TransactionTestCase
+from django.test import TransactionTestCase, override_settings
 from waffle.testutils import override_switch
 
 from course_discovery.apps.api.v1.tests.test_views.mixins import OAuth2Mixin
@@ -30,7 +30,7 @@ class RefreshCourseMetadataCommandTests(OAuth2Mixin, TransactionTestCase):
         self.partner = PartnerFactory()
         partner = self.partner
         self.pipeline = [
-            (CoursesApiDataLoader, partner.courses_api_url, 1),
+            (CoursesApiDataLoader, partner.courses_api_url, None),
             (EcommerceApiDataLoader, partner.ecommerce_api_url, 1),
             (ProgramsApiDataLoader, partner.programs_api_url, None),
             (AnalyticsAPIDataLoader, partner.analytics_url, 1),
@@ -105,7 +105,7 @@ class RefreshCourseMetadataCommandTests(OAuth2Mixin, TransactionTestCase):
         )
         return bodies
 
-    @mock.patch('course_discovery.apps.api.cache.set_api_timestamp')
+    @mock.patch('course_discovery.apps.api.cache.invalidate_api_cache_tags')
     @mock.patch('course_discovery.apps.course_metadata.management.commands.refresh_course_metadata.set_api_timestamp')
     def test_refresh_course_metadata_serial(self, mock_set_api_timestamp, mock_receiver):
         self.mock_apis()
@@ -124,7 +124,7 @@ class RefreshCourseMetadataCommandTests(OAuth2Mixin, TransactionTestCase):
         assert mock_set_api_timestamp.call_count == 1
         assert not mock_receiver.called
 
-    @mock.patch('course_discovery.apps.api.cache.set_api_timestamp')
+    @mock.patch('course_discovery.apps.api.cache.invalidate_api_cache_tags')
     @mock.patch('course_discovery.apps.course_metadata.management.commands.refresh_course_metadata.set_api_timestamp')
     @override_switch('threaded_metadata_write', True)
     @override_switch('parallel_refresh_pipeline', True)
@@ -194,3 +194,19 @@ class RefreshCourseMetadataCommandTests(OAuth2Mixin, TransactionTestCase):
 
         assert mock_delete_orphans.call_count == 2
         assert {x[0][0] for x in mock_delete_orphans.call_args_list} == {Image, Video}
+
+    @ddt.data(True, False)
+    def test_generates_affiliate_window_feeds(self, pregenerated):
+        """ Verify the Affiliate Window feeds are regenerated after a refresh if they are pre-generated. """
+        self.mock_apis()
+        command_path = 'course_discovery.apps.course_metadata.management.commands.refresh_course_metadata'
+
+        with override_settings(AFFILIATE_WINDOW_PREGENERATED_FEEDS=pregenerated), \
+                mock.patch(f'{command_path}.execute_loader', return_value=True), \
+                mock.patch(f'{command_path}.call_command') as mock_call_command:
+            call_command('refresh_course_metadata')
+
+        if pregenerated:
+            mock_call_command.assert_called_once_with('generate_affiliate_window_feeds')
+        else:
+            assert not mock_call_command.called
@@ -0,0 +1,62 @@
+import datetime
+from unittest import mock
+
+import pytz
+from django.core.management import call_command
+from django.test import TestCase
+
+from course_discovery.apps.api.cache import get_object_cache_tag
+from course_discovery.apps.course_metadata.management.commands.refresh_course_run_date_states import Command
+from course_discovery.apps.course_metadata.models import Course, CourseAvailability, CourseRun
+from course_discovery.apps.course_metadata.search_indexes.signals import IndexUpdateBatch
+from course_discovery.apps.course_metadata.tests.factories import CourseRunFactory
+
+COMMAND_PATH = 'course_discovery.apps.course_metadata.management.commands.refresh_course_run_date_states'
+
+
+class RefreshCourseRunDateStatesCommandTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = datetime.datetime.now(pytz.UTC)
+        self.expired_run = CourseRunFactory(enrollment_start=None, enrollment_end=None, end=None)
+        self.valid_run = CourseRunFactory(enrollment_start=None, enrollment_end=None, end=None)
+        CourseRun.everything.filter(pk=self.expired_run.pk).update(
+            enrollment_open=False, date_state_expires=self.now - datetime.timedelta(minutes=1)
+        )
+
+    def call_command(self, *args):
+        with mock.patch.object(IndexUpdateBatch, 'flush', autospec=True) as flush:
+            with mock.patch(f'{COMMAND_PATH}.invalidate_api_cache_tags') as invalidate_api_cache_tags:
+                call_command('refresh_course_run_date_states', *args)
+        indexed = set()
+        for call in flush.call_args_list:
+            indexed |= set(call[0][0].instances)
+        tags = set().union(*(call[0][0] for call in invalidate_api_cache_tags.call_args_list))
+        return indexed, tags
+
+    def test_refresh_expired(self):
+        indexed, tags = self.call_command()
+
+        self.expired_run.refresh_from_db()
+        assert self.expired_run.enrollment_open
+        assert self.expired_run.date_state_expires is None
+        assert indexed == {(CourseRun, self.expired_run.pk), (Course, self.expired_run.course_id)}
+        assert get_object_cache_tag('course_metadata.course', self.expired_run.course.uuid) in tags
+        assert get_object_cache_tag('course_metadata.course', self.valid_run.course.uuid) not in tags
+        assert CourseAvailability.objects.filter(course_id=self.expired_run.course_id).exists()
+        assert not CourseAvailability.objects.filter(course_id=self.valid_run.course_id).exists()
+
+    def test_refresh_all(self):
+        indexed, __ = self.call_command('--all', '--batchsize=1')
+
+        assert {pk for model, pk in indexed if model is CourseRun} == {self.expired_run.pk, self.valid_run.pk}
+        assert CourseAvailability.objects.count() == 2
+
+    def test_get_sleep_seconds(self):
+        assert Command.get_sleep_seconds(60) == 60
+
+        CourseRun.everything.filter(pk=self.valid_run.pk).update(
+            date_state_expires=self.now + datetime.timedelta(seconds=30)
+        )
+        assert 0 < Command.get_sleep_seconds(60) <= 30
+        assert Command.get_sleep_seconds(10) == 10
@@ -0,0 +1,25 @@
+# Generated by Django 3.2.20 on 2026-10-18 04:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_metadata', '0331_auto_20230810_0748'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlgoliaRecordHash',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index_name', models.CharField(max_length=255)),
+                ('object_id', models.CharField(max_length=255)),
+                ('content_hash', models.CharField(blank=True, max_length=32)),
+            ],
+            options={
+                'unique_together': {('index_name', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 3.2.20 on 2026-10-18 05:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_metadata', '0332_algoliarecordhash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentfulEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entry_id', models.CharField(max_length=64, unique=True)),
+                ('content_type', models.CharField(db_index=True, max_length=255)),
+                ('product_uuid', models.CharField(blank=True, db_index=True, max_length=36)),
+                ('data', models.JSONField(help_text='Entry as returned by the Content Delivery API, in the default locale.')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ContentfulSyncState',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('space_id', models.CharField(max_length=255)),
+                ('environment', models.CharField(max_length=255)),
+                ('sync_token', models.TextField()),
+                ('modified', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('space_id', 'environment')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.20 on 2026-10-18 05:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_metadata', '0333_contentful_entries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseAvailability',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('has_current_run', models.BooleanField(default=False)),
+                ('has_upcoming_run', models.BooleanField(default=False)),
+                ('has_archived_run', models.BooleanField(default=False)),
+                ('end_date', models.DateTimeField(blank=True, null=True)),
+                ('first_enrollable_paid_seat_price', models.IntegerField(blank=True, null=True)),
+                ('has_marketable_run', models.BooleanField(default=False)),
+                ('computed_at', models.DateTimeField()),
+                ('valid_until', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('advertised_course_run', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='course_metadata.courserun')),
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='availability_snapshot', to='course_metadata.course')),
+            ],
+            options={
+                'verbose_name_plural': 'course availabilities',
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.20 on 2026-10-18 05:58
+
+import datetime
+from django.db import migrations, models
+from django.utils.timezone import utc
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_metadata', '0334_courseavailability'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='courserun',
+            name='date_state_expires',
+            field=models.DateTimeField(blank=True, db_index=True, default=datetime.datetime(1970, 1, 1, 0, 0, tzinfo=utc), editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='courserun',
+            name='ended',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='courserun',
+            name='enrollment_ended',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='courserun',
+            name='enrollment_open',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+    ]
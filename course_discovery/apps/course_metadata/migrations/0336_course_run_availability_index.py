@@ -0,0 +1,17 @@
+# Generated by Django 3.2.20 on 2026-10-18 06:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_metadata', '0335_course_run_date_states'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='courserun',
+            index=models.Index(fields=['course', 'status', 'draft', 'enrollment_open', 'ended', 'date_state_expires'], name='course_meta_course__f709d5_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 3.2.20 on 2026-10-18 07:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_alter_user_first_name'),
+        ('course_metadata', '0336_course_run_availability_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataloaderconfig',
+            name='incremental_refresh',
+            field=models.BooleanField(default=False, help_text='Send conditional requests to the course, ecommerce and program APIs and skip writing the records whose content did not change since they were last loaded.'),
+        ),
+        migrations.CreateModel(
+            name='DataLoaderResponse',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.TextField(help_text='Request URL, including its query string.')),
+                ('url_hash', models.CharField(max_length=40)),
+                ('etag', models.CharField(blank=True, max_length=255)),
+                ('last_modified', models.CharField(blank=True, max_length=64)),
+                ('content', models.JSONField()),
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('partner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.partner')),
+            ],
+            options={
+                'unique_together': {('partner', 'url_hash')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DataLoaderRecordHash',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('endpoint', models.CharField(max_length=255)),
+                ('object_id', models.CharField(max_length=255)),
+                ('content_hash', models.CharField(max_length=32)),
+                ('partner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.partner')),
+            ],
+            options={
+                'unique_together': {('partner', 'endpoint', 'object_id')},
+            },
+        ),
+    ]
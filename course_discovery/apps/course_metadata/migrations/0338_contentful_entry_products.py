@@ -0,0 +1,36 @@
+# Generated by Django 3.2.20 on 2026-10-18 09:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def reset_contentful_sync(apps, schema_editor):
+    # The next sync starts over with every entry, which fills in the products of the existing entries.
+    ContentfulSyncState = apps.get_model('course_metadata', 'ContentfulSyncState')
+    ContentfulSyncState.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_metadata', '0337_data_loader_incremental_refresh'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='contentfulentry',
+            name='product_uuid',
+        ),
+        migrations.CreateModel(
+            name='ContentfulEntryProduct',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product_uuid', models.CharField(db_index=True, max_length=36)),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='products', to='course_metadata.contentfulentry', to_field='entry_id')),
+            ],
+            options={
+                'unique_together': {('entry', 'product_uuid')},
+            },
+        ),
+        migrations.RunPython(reset_contentful_sync, migrations.RunPython.noop),
+    ]
@@ -18,6 +18,7 @@ from django.db import IntegrityError, models, transaction
 from django.db.models import F, Q, UniqueConstraint
 from django.db.models.query import Prefetch
 from django.utils.functional import cached_property
+from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 from django_countries import countries as COUNTRIES
 from django_elasticsearch_dsl.registries import registry
@@ -58,13 +59,17 @@ from course_discovery.apps.course_metadata.toggles import (
     IS_SUBDIRECTORY_SLUG_FORMAT_ENABLED, IS_SUBDIRECTORY_SLUG_FORMAT_FOR_EXEC_ED_ENABLED
 )
 from course_discovery.apps.course_metadata.utils import (
-    UploadToFieldNamePath, clean_query, custom_render_variations, get_slug_for_course, is_ocm_course,
+    UploadToFieldNamePath, clean_query, custom_render_variations, get_pk_filter, get_slug_for_course, is_ocm_course,
     push_to_ecommerce_for_course_run, push_tracks_to_lms_for_course_run, set_official_state, subtract_deadline_delta
 )
+from course_discovery.apps.edx_elasticsearch_dsl_extensions.cache import get_search_pks
 from course_discovery.apps.ietf_language_tags.models import LanguageTag
 from course_discovery.apps.publisher.utils import VALID_CHARS_IN_COURSE_NUM_AND_ORG_KEY
 
 logger = logging.getLogger(__name__)
+# Precomputed date state columns of course runs, and the expiry date of runs whose state was never computed.
+DATE_STATE_FIELDS = ('ended', 'enrollment_ended', 'enrollment_open')
+DATE_STATE_EXPIRED = datetime.datetime(1970, 1, 1, tzinfo=pytz.UTC)
 
 
 class DraftModelMixin(models.Model):
@@ -1062,17 +1067,13 @@ class PkSearchableMixin:
 
         logger.info(f"Attempting Elasticsearch document search against query: {query}")
         es_document, *_ = registry.get_documents(models=(cls,))
-        dsl_query = ESDSLQ('query_string', query=query, analyze_wildcard=True)
         try:
-            results = es_document.search().query(dsl_query).execute()
+            ids = get_search_pks(es_document, query)
         except RequestError as exp:
             logger.warning('Elasticsearch request is failed. Got exception: %r', exp)
-            results = []
-        ids = {result.pk for result in results}
+            ids = []
         logger.info(f'{len(ids)} records extracted from Elasticsearch query "{query}"')
-        filtered_queryset = queryset.filter(pk__in=ids)
-        logger.info(f'Filtered queryset of length {len(filtered_queryset)} extracted against query "{query}"')
-        return filtered_queryset
+        return queryset.filter(get_pk_filter(ids))
 
 
 class Collaborator(TimeStampedModel):
@@ -1531,7 +1532,12 @@ class Course(DraftModelMixin, PkSearchableMixin, CachedMixin, TimeStampedModel):
         """ Official rows just return whatever slug is active, draft rows will first look for an associated active
          slug and, if they fail to find one, take the slug associated with the official course that has
          is_active_on_draft: True."""
-        active_url = self.url_slug_history.filter(is_active=True).first()
+        # Filter in python, so a prefetched slug history doesn't hit the database again
+        active_url = min(
+            (url_slug for url_slug in self.url_slug_history.all() if url_slug.is_active),
+            key=lambda url_slug: url_slug.pk,
+            default=None,
+        )
         if not active_url and self.draft and self.official_version:
             # current draft url slug has already been published at least once, so get it from the official course
             active_url = self.official_version.url_slug_history.filter(is_active_on_draft=True).first()
@@ -1576,12 +1582,31 @@ class Course(DraftModelMixin, PkSearchableMixin, CachedMixin, TimeStampedModel):
             )
         )
 
+    def get_availability_snapshot(self):
+        """
+        Returns the availability snapshot of the course if it was fetched along with the course and is still valid.
+
+        Snapshots are only read when they were loaded with select_related or prefetch_related, so the properties
+        falling back to deriving availability from the course runs never cost an extra query.
+        """
+        descriptor = Course.availability_snapshot  # pylint: disable=no-member
+        if not descriptor.is_cached(self):
+            return None
+        snapshot = descriptor.related.get_cached_value(self)
+        return snapshot if snapshot is not None and snapshot.is_valid() else None
+
     @property
     def end_date(self):
         """
         Returns the "end" date of the course run falling at the last. Every course run has an end date and this property
         returns the max value of those end dates.
         """
+        snapshot = self.get_availability_snapshot()
+        if snapshot:
+            return snapshot.end_date
+        return self.get_end_date()
+
+    def get_end_date(self):
         course_runs = self.course_runs.all()
         last_course_run_end = None
         if course_runs:
@@ -1609,12 +1634,26 @@ class Course(DraftModelMixin, PkSearchableMixin, CachedMixin, TimeStampedModel):
 
     @property
     def first_enrollable_paid_seat_price(self):
+        snapshot = self.get_availability_snapshot()
+        if snapshot:
+            return snapshot.first_enrollable_paid_seat_price
+        # Filter the runs like active_course_runs does, in python, so prefetched runs don't hit the database again
+        now = datetime.datetime.now(pytz.UTC)
+        active_course_runs = [
+            course_run for course_run in self.course_runs.all()
+            if course_run.end and course_run.end > now and (
+                not course_run.enrollment_end or course_run.enrollment_end > now
+            )
+        ]
+        return self.get_first_enrollable_paid_seat_price(active_course_runs)
+
+    def get_first_enrollable_paid_seat_price(self, active_course_runs):
         """
         Sort the course runs with sorted rather than order_by to avoid
         additional calls to the database
         """
         for course_run in sorted(
-            self.active_course_runs,
+            active_course_runs,
             key=lambda active_course_run: active_course_run.key.lower(),
         ):
             if course_run.has_enrollable_paid_seats():
@@ -1776,6 +1815,18 @@ class Course(DraftModelMixin, PkSearchableMixin, CachedMixin, TimeStampedModel):
 
     @cached_property
     def advertised_course_run(self):
+        snapshot = self.get_availability_snapshot()
+        if snapshot:
+            if snapshot.advertised_course_run_id is None:
+                return None
+            # The run is looked up among the course runs, which are usually prefetched. If they were prefetched
+            # with a filter leaving it out, the advertised run is picked among the remaining ones instead.
+            for course_run in self.course_runs.all():
+                if course_run.id == snapshot.advertised_course_run_id:
+                    return course_run
+        return self.get_advertised_course_run()
+
+    def get_advertised_course_run(self):
         now = datetime.datetime.now(pytz.UTC)
         min_date = datetime.datetime.min.replace(tzinfo=pytz.UTC)
         max_date = datetime.datetime.max.replace(tzinfo=pytz.UTC)
@@ -1808,6 +1859,9 @@ class Course(DraftModelMixin, PkSearchableMixin, CachedMixin, TimeStampedModel):
         return advertised_course_run
 
     def has_marketable_run(self):
+        snapshot = self.get_availability_snapshot()
+        if snapshot:
+            return snapshot.has_marketable_run
         return any(run.is_marketable for run in self.course_runs.all())
 
     def recommendations(self):
@@ -2091,7 +2145,7 @@ class CourseRun(DraftModelMixin, CachedMixin, TimeStampedModel):
 
     # Do not record the slug field in the history table because AutoSlugField is not compatible with
     # django-simple-history.  Background: https://github.com/openedx/course-discovery/pull/332
-    history = HistoricalRecords(excluded_fields=['slug'])
+    history = HistoricalRecords(excluded_fields=['slug', *DATE_STATE_FIELDS, 'date_state_expires'])
 
     salesforce_id = models.CharField(max_length=255, null=True, blank=True)  # Course_Run__c in Salesforce
 
@@ -2100,6 +2154,16 @@ class CourseRun(DraftModelMixin, CachedMixin, TimeStampedModel):
         help_text=_('This calculated field signifies if this course run is in the enterprise subscription catalog'),
     )
 
+    # Date-driven state, precomputed so that the active(), enrollable() and available() queries filter on columns.
+    # It holds until date_state_expires, the next date of the run or its seats, when the
+    # refresh_course_run_date_states command recomputes it. Runs bulk created without a state start out expired.
+    ended = models.BooleanField(default=False, editable=False)
+    enrollment_ended = models.BooleanField(default=False, editable=False)
+    enrollment_open = models.BooleanField(default=False, editable=False)
+    date_state_expires = models.DateTimeField(
+        null=True, blank=True, editable=False, db_index=True, default=DATE_STATE_EXPIRED
+    )
+
     STATUS_CHANGE_EXEMPT_FIELDS = [
         'start',
         'end',
@@ -2125,7 +2189,9 @@ class CourseRun(DraftModelMixin, CachedMixin, TimeStampedModel):
     def has_changed(self):
         if not self.pk:
             return False
-        return has_model_changed(self.field_tracker)
+        return has_model_changed(
+            self.field_tracker, excluded_fields=[*DATE_STATE_FIELDS, 'date_state_expires']
+        )
 
     def update_product_data_modified_timestamp(self):
         """
@@ -2147,6 +2213,11 @@ class CourseRun(DraftModelMixin, CachedMixin, TimeStampedModel):
             ('key', 'draft'),
             ('uuid', 'draft'),
         )
+        indexes = [
+            # Serves the per-course EXISTS subqueries of CourseQuerySet.available(): runs with a fresh date state
+            # are matched on the state columns, and runs whose state expired on the status and draft prefix.
+            models.Index(fields=['course', 'status', 'draft', 'enrollment_open', 'ended', 'date_state_expires']),
+        ]
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -2277,9 +2348,8 @@ class CourseRun(DraftModelMixin, CachedMixin, TimeStampedModel):
             return []
 
         enrollable_seats = []
-        types = types or SeatType.objects.all()
         for seat in self.seats.all():
-            if seat.type in types and (not seat.upgrade_deadline or now < seat.upgrade_deadline):
+            if (not types or seat.type in types) and (not seat.upgrade_deadline or now < seat.upgrade_deadline):
                 enrollable_seats.append(seat)
 
         return enrollable_seats
@@ -2303,8 +2373,9 @@ class CourseRun(DraftModelMixin, CachedMixin, TimeStampedModel):
         """
         program_statuses_to_exclude = (ProgramStatus.Unpublished, ProgramStatus.Deleted)
         associated_programs = []
-        for program in self.programs.exclude(status__in=program_statuses_to_exclude):
-            if self not in program.excluded_course_runs.all():
+        # Filter in python, so programs prefetched with their excluded runs don't hit the database again
+        for program in self.programs.all():
+            if program.status not in program_statuses_to_exclude and self not in program.excluded_course_runs.all():
                 associated_programs.append(program)
         return [program.type.name for program in associated_programs]
 
@@ -2619,6 +2690,63 @@ class CourseRun(DraftModelMixin, CachedMixin, TimeStampedModel):
             return False
         return True
 
+    def get_date_state(self, now):
+        """
+        Returns the values of the date state columns at the given time.
+        """
+        return {
+            'ended': bool(self.end and self.end <= now),
+            'enrollment_ended': bool(self.enrollment_end and self.enrollment_end <= now),
+            'enrollment_open': (
+                (not self.enrollment_start or self.enrollment_start <= now) and
+                (not self.enrollment_end or self.enrollment_end > now)
+            ),
+        }
+
+    def get_date_state_expiry(self, now, seats):
+        """
+        Returns the first date after now at which the run starts, ends, opens or closes enrollment, or one of the
+        given seats stops being upgradeable. Besides the date state columns, the run's availability and
+        upgradeability, and so its documents and API responses, change at these dates.
+        """
+        dates = [self.start, self.end, self.enrollment_start, self.enrollment_end]
+        dates += [seat.upgrade_deadline for seat in seats]
+        return min((date for date in dates if date and date > now), default=None)
+
+    def set_date_state(self, now, seats=None):
+        """
+        Computes the date state columns at the given time.
+
+        Without the seats, a pending expiry is kept if it comes first, as it may be an upgrade deadline. At worst
+        the state is then refreshed early.
+        """
+        for name, value in self.get_date_state(now).items():
+            setattr(self, name, value)
+        expiry = self.get_date_state_expiry(now, seats or ())
+        if seats is None and self.date_state_expires and self.date_state_expires > now:
+            expiry = min(self.date_state_expires, expiry or self.date_state_expires)
+        self.date_state_expires = expiry
+
+    @classmethod
+    def refresh_date_states(cls, course_run_ids):
+        """
+        Recomputes the date states of the given course runs, without sending any signals.
+
+        Returns:
+            list: The refreshed course runs, with their types and courses
+        """
+        now = datetime.datetime.now(pytz.UTC)
+        seats = Seat.everything.only('course_run_id', '_upgrade_deadline', 'upgrade_deadline_override')
+        course_runs = list(
+            cls.everything.filter(pk__in=course_run_ids).select_related('course', 'type').prefetch_related(
+                Prefetch('seats', queryset=seats)
+            )
+        )
+        for course_run in course_runs:
+            course_run.set_date_state(now, course_run.seats.all())
+        cls.everything.bulk_update(course_runs, [*DATE_STATE_FIELDS, 'date_state_expires'])
+        return course_runs
+
     # there have to be two saves because in order to check for if this is included in the
     # subscription catalog, we need the id that is created on save to access the many-to-many fields
     # and then need to update the boolean in the record based on conditional logic
@@ -2633,6 +2761,8 @@ class CourseRun(DraftModelMixin, CachedMixin, TimeStampedModel):
                              waffle.switch_is_active('publish_course_runs_to_marketing_site') and
                              self.could_be_marketable)
 
+        self.set_date_state(datetime.datetime.now(pytz.UTC))
+
         with transaction.atomic():
             if push_to_marketing:
                 previous_obj = CourseRun.objects.get(id=self.id) if self.id else None
@@ -2905,6 +3035,125 @@ class Seat(DraftModelMixin, TimeStampedModel):
         self._upgrade_deadline = value
 
 
+class CourseAvailability(models.Model):
+    """
+    Snapshot of the availability of a course, as derived from its course runs and their seats.
+
+    A snapshot is refreshed whenever a course run or seat of its course changes. It holds until `valid_until`,
+    the next date at which any of its values could change, after which the refresh_course_availability
+    command refreshes it.
+    """
+    course = models.OneToOneField(Course, models.CASCADE, related_name='availability_snapshot')
+    advertised_course_run = models.ForeignKey(
+        CourseRun, models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    has_current_run = models.BooleanField(default=False)
+    has_upcoming_run = models.BooleanField(default=False)
+    has_archived_run = models.BooleanField(default=False)
+    end_date = models.DateTimeField(null=True, blank=True)
+    first_enrollable_paid_seat_price = models.IntegerField(null=True, blank=True)
+    has_marketable_run = models.BooleanField(default=False)
+    computed_at = models.DateTimeField()
+    valid_until = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        verbose_name_plural = 'course availabilities'
+
+    def __str__(self):
+        return f'Availability of {self.course_id}'
+
+    def is_valid(self):
+        now = datetime.datetime.now(pytz.UTC)
+        return self.computed_at <= now and (self.valid_until is None or now < self.valid_until)
+
+    @property
+    def availability_levels(self):
+        """
+        Availability levels of the published course runs, as returned by get_course_availability.
+
+        The levels are translated eagerly, in the language active when they are read, like the ones
+        get_course_availability derives from the course runs.
+        """
+        levels = [
+            (self.has_current_run, gettext('Available now')),
+            (self.has_upcoming_run, gettext('Upcoming')),
+            (self.has_archived_run, gettext('Archived')),
+        ]
+        return [level for has_level, level in levels if has_level]
+
+    @staticmethod
+    def get_next_change(course_runs, now):
+        """
+        Returns the first date after now at which the availability of the given course runs could change.
+        """
+        dates = []
+        for course_run in course_runs:
+            dates += [course_run.start, course_run.end, course_run.enrollment_start, course_run.enrollment_end]
+            dates += [seat.upgrade_deadline for seat in course_run.seats.all()]
+            if course_run.end:
+                # A run stops being current on the day two weeks before its end.
+                dates.append(datetime.datetime.combine(
+                    course_run.end.date() - datetime.timedelta(days=13), datetime.time.min, tzinfo=pytz.UTC
+                ))
+        return min((date for date in dates if date and date > now), default=None)
+
+    @classmethod
+    def compute(cls, course, now):
+        """
+        Returns an unsaved snapshot of the availability of a course, whose runs and seats should be prefetched.
+        """
+        course_runs = course.course_runs.all()
+        active_runs = [
+            course_run for course_run in course_runs
+            if course_run.end and course_run.end > now and (
+                not course_run.enrollment_end or course_run.enrollment_end > now
+            )
+        ]
+        snapshot = cls(
+            course=course,
+            advertised_course_run=course.get_advertised_course_run(),
+            end_date=course.get_end_date(),
+            first_enrollable_paid_seat_price=course.get_first_enrollable_paid_seat_price(active_runs),
+            has_marketable_run=any(course_run.is_marketable for course_run in course_runs),
+            computed_at=now,
+            valid_until=cls.get_next_change(course_runs, now),
+        )
+        for course_run in course_runs:
+            if course_run.status != CourseRunStatus.Published:
+                continue
+            if course_run.is_current():
+                snapshot.has_current_run = True
+            elif course_run.is_upcoming():
+                snapshot.has_upcoming_run = True
+            else:
+                snapshot.has_archived_run = True
+        return snapshot
+
+    @classmethod
+    def refresh(cls, course_ids):
+        """
+        Recomputes the availability snapshots of the given courses.
+        """
+        now = datetime.datetime.now(pytz.UTC)
+        courses = Course.everything.filter(pk__in=course_ids).select_related('partner').prefetch_related(
+            Prefetch('course_runs', queryset=CourseRun.everything.select_related('type').prefetch_related(
+                Prefetch('seats', queryset=Seat.everything.select_related('type'))
+            ))
+        )
+        snapshots = [cls.compute(course, now) for course in courses]
+        snapshot_ids = dict(cls.objects.filter(course_id__in=course_ids).values_list('course_id', 'id'))
+        for snapshot in snapshots:
+            snapshot.id = snapshot_ids.get(snapshot.course_id)
+
+        cls.objects.bulk_update(
+            [snapshot for snapshot in snapshots if snapshot.id],
+            [field.name for field in cls._meta.concrete_fields if field.name not in ('id', 'course')],
+        )
+        # Skip the snapshots a concurrent refresh created in the meantime.
+        cls.objects.bulk_create([snapshot for snapshot in snapshots if not snapshot.id], ignore_conflicts=True)
+        return len(snapshots)
+
+
 class CourseEntitlement(DraftModelMixin, TimeStampedModel):
     """ Model storing product metadata for a Course. """
     PRICE_FIELD_CONFIG = {
@@ -4271,6 +4520,13 @@ class DataLoaderConfig(SingletonModel):
     Configuration for data loaders used in the refresh_course_metadata command.
     """
     max_workers = models.PositiveSmallIntegerField(default=7)
+    incremental_refresh = models.BooleanField(
+        default=False,
+        help_text=_(
+            'Send conditional requests to the course, ecommerce and program APIs and skip writing the records whose '
+            'content did not change since they were last loaded.'
+        ),
+    )
 
 
 class DeletePersonDupsConfig(SingletonModel):
@@ -4368,3 +4624,82 @@ class DeduplicateHistoryConfig(SingletonModel):
 
     def __str__(self):
         return self.arguments
+
+
+class ContentfulEntry(models.Model):
+    """
+    Local copy of a Contentful entry, kept up to date with the Contentful Sync API.
+    """
+    entry_id = models.CharField(max_length=64, unique=True)
+    content_type = models.CharField(max_length=255, db_index=True)
+    data = models.JSONField(help_text=_('Entry as returned by the Content Delivery API, in the default locale.'))
+
+    def __str__(self):
+        return f'{self.content_type}: {self.entry_id}'
+
+
+class ContentfulEntryProduct(models.Model):
+    """
+    Product a local Contentful entry is about. Degree pages can be about several programs.
+    """
+    entry = models.ForeignKey(ContentfulEntry, models.CASCADE, to_field='entry_id', related_name='products')
+    product_uuid = models.CharField(max_length=36, db_index=True)
+
+    class Meta:
+        unique_together = ('entry', 'product_uuid')
+
+    def __str__(self):
+        return f'{self.entry_id}: {self.product_uuid}'
+
+
+class ContentfulSyncState(models.Model):
+    """
+    Sync token from which the next sync of the local Contentful entries continues.
+    """
+    space_id = models.CharField(max_length=255)
+    environment = models.CharField(max_length=255)
+    sync_token = models.TextField()
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('space_id', 'environment')
+
+    def __str__(self):
+        return f'{self.space_id}: {self.environment}'
+
+
+class DataLoaderResponse(models.Model):
+    """
+    Last response of an API to a data loader request, kept with its validators so the next identical request
+    can be made conditional.
+    """
+    partner = models.ForeignKey(Partner, models.CASCADE)
+    url = models.TextField(help_text=_('Request URL, including its query string.'))
+    # URLs are too long to be indexed, so responses are looked up by a digest of their URL instead.
+    url_hash = models.CharField(max_length=40)
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=64, blank=True)
+    content = models.JSONField()
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('partner', 'url_hash')
+
+    def __str__(self):
+        return self.url
+
+
+class DataLoaderRecordHash(models.Model):
+    """
+    Content hash of a record as last loaded from an API endpoint, so incremental refreshes can skip unchanged records.
+    """
+    partner = models.ForeignKey(Partner, models.CASCADE)
+    endpoint = models.CharField(max_length=255)
+    object_id = models.CharField(max_length=255)
+    content_hash = models.CharField(max_length=32)
+
+    class Meta:
+        unique_together = ('partner', 'endpoint', 'object_id')
+
+    def __str__(self):
+        return f'{self.endpoint}: {self.object_id}'
@@ -2,11 +2,55 @@ import datetime
 
 import pytz
 from django.db import models
-from django.db.models.query_utils import Q
+from django.db.models import Exists, OuterRef, Q
 
 from course_discovery.apps.course_metadata.choices import CourseRunStatus, ProgramStatus
 
 
+def get_live_date_state_q(now):
+    """
+    Returns the filters matching the course runs in each precomputed date state, evaluated on their dates.
+    """
+    return {
+        ('ended', True): Q(end__lte=now),
+        ('ended', False): Q(end__gt=now) | Q(end__isnull=True),
+        ('enrollment_ended', True): Q(enrollment_end__lte=now),
+        ('enrollment_ended', False): Q(enrollment_end__gt=now) | Q(enrollment_end__isnull=True),
+        ('enrollment_open', True): (
+            (Q(enrollment_start__lte=now) | Q(enrollment_start__isnull=True)) &
+            (Q(enrollment_end__gt=now) | Q(enrollment_end__isnull=True))
+        ),
+        ('enrollment_open', False): Q(enrollment_start__gt=now) | Q(enrollment_end__lte=now),
+    }
+
+
+def get_date_state_qs(now, **states):
+    """
+    Returns the filters matching the course runs in the given date states, e.g. ended=False, as a pair: one
+    for the runs whose precomputed state is fresh and one for the runs whose state expired.
+
+    Fresh states are matched on the indexed state columns. Expired states are evaluated on the dates instead,
+    so results stay correct while the refresh_course_run_date_states command catches up with them. Queries
+    that need the index to be used should filter on each separately, since OR-ing them rules it out.
+    """
+    live_q = get_live_date_state_q(now)
+    fresh = (Q(date_state_expires__gt=now) | Q(date_state_expires__isnull=True)) & Q(**states)
+
+    expired = Q(date_state_expires__lte=now)
+    for name, value in states.items():
+        expired &= live_q[(name, value)]
+
+    return fresh, expired
+
+
+def get_date_state_q(now, **states):
+    """
+    Returns a filter matching the course runs in the given date states, see get_date_state_qs.
+    """
+    fresh, expired = get_date_state_qs(now, **states)
+    return fresh | expired
+
+
 class CourseQuerySet(models.QuerySet):
     def available(self):
         """
@@ -15,49 +59,36 @@ class CourseQuerySet(models.QuerySet):
         on the marketing site.
         """
         now = datetime.datetime.now(pytz.UTC)
-
-        # A CourseRun is "enrollable" if its enrollment start date has passed,
-        # is now, or is None, and its enrollment end date is in the future or is None.
-        enrollable = (
-            (
-                Q(course_runs__enrollment_start__lte=now) |
-                Q(course_runs__enrollment_start__isnull=True)
-            ) &
-            (
-                Q(course_runs__enrollment_end__gt=now) |
-                Q(course_runs__enrollment_end__isnull=True)
-            )
-        )
-
-        # A CourseRun is "not ended" if its end date is in the future or is None.
-        not_ended = (
-            Q(course_runs__end__gt=now) | Q(course_runs__end__isnull=True)
-        )
+        course_run_model = self.model._meta.get_field('course_runs').related_model
+        seat_model = course_run_model._meta.get_field('seats').related_model
 
         # A CourseRun is "marketable" if it has a non-empty slug, has seats, and
         # is has a "published" status.
-        marketable = (
-            ~Q(course_runs__slug='') &
-            Q(course_runs__seats__isnull=False) &
-            Q(course_runs__draft=models.Value(0)) &
-            ~Q(course_runs__type__is_marketable=False) &
-            Q(course_runs__status=CourseRunStatus.Published)
+        # It must also be "enrollable": its enrollment start date has passed,
+        # is now, or is None, and its enrollment end date is in the future or is None.
+        # And it must be "not ended": its end date is in the future or is None.
+        marketable_course_runs = course_run_model.everything.filter(
+            course=OuterRef('pk'),
+            status=CourseRunStatus.Published,
+            draft=False,
+        ).exclude(
+            slug=''
+        ).exclude(
+            type__is_marketable=False
+        ).filter(
+            Exists(seat_model.everything.filter(course_run=OuterRef('pk')))
+        )
+        fresh, expired = get_date_state_qs(now, enrollment_open=True, ended=False)
+
+        # Correlated EXISTS subqueries include a Course as soon as one of its runs matches, without
+        # joining every run and seat of every course and deduplicating the result. exclude() can't be
+        # used on the relation for the same reason: a Course with one published and one unpublished
+        # run would be dropped from the queryset even though one of its runs is available.
+        # Runs with a fresh and an expired date state are looked up by separate subqueries, so the one
+        # for fresh states can use the index on the state columns.
+        return self.filter(
+            Exists(marketable_course_runs.filter(fresh)) | Exists(marketable_course_runs.filter(expired))
         )
-
-        # exclude() is intentionally avoided here. We want Courses to be included
-        # in the resulting queryset if at least one of their runs matches our availability
-        # criteria. For example, consider a Course with two CourseRuns; one of the
-        # runs is published while the other is not. If you used exclude(), the Course
-        # would be dropped from the queryset even though it has one run which matches
-        # our availability criteria.
-
-        # By itself, the query performs a join across several tables and would return
-        # the id of the same course multiple times (a separate copy for each available
-        # seat in each available run).
-        ids = self.filter(enrollable & not_ended & marketable).values('id').distinct()
-
-        # Now return the full object for each of the selected ids
-        return self.filter(id__in=ids)
 
 
 class CourseRunQuerySet(models.QuerySet):
@@ -71,15 +102,7 @@ class CourseRunQuerySet(models.QuerySet):
             QuerySet
         """
         now = datetime.datetime.now(pytz.UTC)
-        return self.filter(
-            (
-                Q(end__gt=now) |
-                Q(end__isnull=True)
-            ) & (
-                Q(enrollment_end__gt=now) |
-                Q(enrollment_end__isnull=True)
-            )
-        )
+        return self.filter(get_date_state_q(now, ended=False, enrollment_ended=False))
 
     def enrollable(self):
         """ Returns course runs that are currently open for enrollment.
@@ -91,16 +114,16 @@ class CourseRunQuerySet(models.QuerySet):
             QuerySet
         """
         now = datetime.datetime.now(pytz.UTC)
-        return self.filter(
-            (
-                Q(enrollment_end__gt=now) |
-                Q(enrollment_end__isnull=True)
-            ) & (
-                Q(enrollment_start__lte=now) |
-                Q(enrollment_start__isnull=True)
-            )
+        return self.filter(get_date_state_q(now, enrollment_open=True))
 
-        )
+    def date_state_expired(self, now=None):
+        """ Returns CourseRuns whose precomputed date state expired and should be refreshed.
+
+        Returns:
+            QuerySet
+        """
+        now = now or datetime.datetime.now(pytz.UTC)
+        return self.filter(date_state_expires__lte=now)
 
     def marketable(self):
         """ Returns CourseRuns that can be marketed to learners.
@@ -1,14 +1,23 @@
 import json
 from fnmatch import fnmatch
+from itertools import islice
 
 import waffle  # lint-amnesty, pylint: disable=invalid-django-waffle-import
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
+from django.db.models import Prefetch
 from django.template import loader
 from django.template.exceptions import TemplateDoesNotExist
 from django_elasticsearch_dsl import Document as OriginDocument
 from django_elasticsearch_dsl import fields
+from taxonomy.choices import ProductTypes
+from taxonomy.serializers import SkillSerializer
+from taxonomy.utils import (
+    get_product_skill_model_and_identifier, get_whitelisted_product_skills, get_whitelisted_serialized_skills
+)
 
+from course_discovery.apps.course_metadata.models import Organization
 from course_discovery.apps.edx_elasticsearch_dsl_extensions.search import Search
 
 from .analyzers import case_insensitive_keyword, edge_ngram_completion, html_strip, synonym_text
@@ -23,6 +32,13 @@ def filter_visible_runs(course_runs):
     return course_runs.exclude(type__is_marketable=False)
 
 
+def prefetch_organizations(lookup):
+    """
+    Prefetches organizations with the relations their serialized bodies read.
+    """
+    return Prefetch(lookup, queryset=Organization.objects.select_related('partner').prefetch_related('tags'))
+
+
 class OrganizationsMixin:
     """
     OrganizationsMixin to be able prepare a set specific fields for es index.
@@ -52,6 +68,50 @@ class OrganizationsMixin:
         return self.prepare_authoring_organizations(obj)
 
 
+class SkillsMixin:
+    """
+    SkillsMixin to be able prepare the skills of products, loading those of a batch of objects with one query.
+    """
+
+    skill_product_type = ProductTypes.Course
+
+    def get_skill_product_key(self, obj):
+        """
+        Returns the course key or program uuid the skills of an object are stored under. Defaults to the key
+        of a course.
+        """
+        return obj.key
+
+    def prefetch_batch(self, objects):
+        super().prefetch_batch(objects)
+        skill_model, identifier = get_product_skill_model_and_identifier(self.skill_product_type)
+        self._batch_skills = {self.get_skill_product_key(obj): [] for obj in objects}
+        product_skills = skill_model.objects.filter(
+            is_blacklisted=False, **{f'{identifier}__in': list(self._batch_skills)}
+        ).select_related('skill')
+        for product_skill in product_skills:
+            self._batch_skills[getattr(product_skill, identifier)].append(product_skill.skill)
+
+    def prepare_skill_names(self, obj):
+        key = self.get_skill_product_key(obj)
+        batch_skills = getattr(self, '_batch_skills', {})
+        if key in batch_skills:
+            skills = batch_skills[key]
+        else:
+            skills = [
+                product_skill.skill
+                for product_skill in get_whitelisted_product_skills(key, product_type=self.skill_product_type)
+            ]
+        return list(set(skill.name for skill in skills))
+
+    def prepare_skills(self, obj):
+        key = self.get_skill_product_key(obj)
+        batch_skills = getattr(self, '_batch_skills', {})
+        if key in batch_skills:
+            return SkillSerializer(batch_skills[key], many=True).data
+        return get_whitelisted_serialized_skills(key, product_type=self.skill_product_type)
+
+
 class Document(OriginDocument):
     """
     Extended Document class.
@@ -115,6 +175,14 @@ class BaseDocument(Document, metaclass=DocumentMeta):
         super().__init__(*args, **kwargs)
         self._object = None
 
+    # Lookups of the timestamps of the objects whose data a document contains. An object's document is
+    # reindexed by an incremental update_index run when any of them changed since the previous run.
+    modified_lookups = ('modified',)
+
+    # Prefetch plan of the relations the prepare methods walk. Both bulk indexing and the updates of single
+    # objects load them along with the objects, rather than with a few queries per object.
+    select_related_lookups = ()
+
     aggregation_key = fields.KeywordField()
     content_type = fields.KeywordField()
     id = fields.KeywordField()
@@ -123,8 +191,69 @@ class BaseDocument(Document, metaclass=DocumentMeta):
     text = fields.TextField(analyzer=synonym_text)
     uuid = fields.KeywordField()
 
+    def get_prefetch_lookups(self):
+        """
+        Returns the lookups and Prefetch objects of the related objects the prepare methods read.
+        """
+        return ()
+
+    def apply_prefetch_plan(self, queryset):
+        if self.select_related_lookups:
+            queryset = queryset.select_related(*self.select_related_lookups)
+        return queryset.prefetch_related(*self.get_prefetch_lookups())
+
     def get_queryset(self):
-        return self.django.model.objects.all()
+        return self.apply_prefetch_plan(self.django.model.objects.all())
+
+    def get_indexing_queryset(self):
+        """
+        Iterates over the objects to index in chunks of primary keys.
+
+        Unlike QuerySet.iterator(), which ignores prefetch_related, this loads each chunk with the prefetch plan.
+        """
+        queryset = self.get_queryset()
+        pks = list(queryset.prefetch_related(None).order_by('pk').values_list('pk', flat=True))
+        chunk_size = self.django.queryset_pagination or len(pks) or 1
+        for start in range(0, len(pks), chunk_size):
+            yield from queryset.filter(pk__in=pks[start:start + chunk_size]).order_by('pk')
+
+    def get_index_actions(self, objects):
+        """
+        Returns the bulk actions indexing the documents of the given objects.
+        """
+        return self._get_actions(objects, 'index')
+
+    def prefetch_batch(self, objects):
+        """
+        Loads the data the prepare methods read for a batch of objects which the prefetch plan can't load along
+        with them, e.g. rows which aren't related to the objects by foreign keys.
+        """
+
+    def _get_actions(self, object_list, action):
+        if action == 'delete':
+            yield from super()._get_actions(object_list, action)
+            return
+
+        objects = iter(object_list)
+        batch = list(islice(objects, settings.ELASTICSEARCH_DSL_PREPARE_SLICE_SIZE))
+        while batch:
+            self.prefetch_batch(batch)
+            yield from super()._get_actions(batch, action)
+            batch = list(islice(objects, settings.ELASTICSEARCH_DSL_PREPARE_SLICE_SIZE))
+
+    def update(self, thing, refresh=None, action='index', parallel=False, **kwargs):
+        """
+        Updates the documents of a model instance, an iterable of instances or a queryset.
+
+        A single instance, like those the signal processor updates, is fetched again with the prefetch plan
+        before its document is prepared.
+        """
+        if isinstance(thing, models.Model) and action != 'delete':
+            queryset = self.apply_prefetch_plan(
+                self.django.model._base_manager.filter(pk=thing.pk)  # pylint: disable=protected-access
+            )
+            thing = next(iter(queryset), thing)
+        return super().update(thing, refresh=refresh, action=action, parallel=parallel, **kwargs)
 
     @classmethod
     def _matches(cls, hit):
@@ -1,13 +1,12 @@
 from django.conf import settings
+from django.db.models import Prefetch
 from django_elasticsearch_dsl import Index, fields
 from opaque_keys.edx.keys import CourseKey
-from taxonomy.choices import ProductTypes
-from taxonomy.utils import get_whitelisted_product_skills, get_whitelisted_serialized_skills
 
-from course_discovery.apps.course_metadata.models import Course
+from course_discovery.apps.course_metadata.models import Course, CourseRun, Seat
 
 from .analyzers import case_insensitive_keyword
-from .common import BaseCourseDocument, filter_visible_runs
+from .common import BaseCourseDocument, SkillsMixin, filter_visible_runs, prefetch_organizations
 
 __all__ = ('CourseDocument',)
 
@@ -21,11 +20,20 @@ COURSE_INDEX.settings(
 
 
 @COURSE_INDEX.doc_type
-class CourseDocument(BaseCourseDocument):
+class CourseDocument(SkillsMixin, BaseCourseDocument):
     """
     Course Elasticsearch document.
     """
 
+    modified_lookups = (
+        'modified', 'data_modified_timestamp', 'course_runs__modified', 'course_runs__seats__modified',
+        'course_runs__type__modified', 'course_runs__seats__type__modified', 'authoring_organizations__modified',
+        'sponsoring_organizations__modified', 'subjects__modified', 'programs__modified', 'partner__modified',
+        'type__modified', 'level_type__modified', 'prerequisites__modified', 'expected_learning_items__modified',
+        'additional_metadata__modified', 'product_source__modified', 'url_slug_history__modified',
+    )
+    select_related_lookups = ('partner', 'type', 'level_type', 'additional_metadata', 'product_source')
+
     availability = fields.TextField(
         fields={'raw': fields.KeywordField(), 'lower': fields.TextField(analyzer=case_insensitive_keyword)},
         multi=True
@@ -57,14 +65,20 @@ class CourseDocument(BaseCourseDocument):
     external_course_marketing_type = fields.KeywordField(multi=True)
     product_source = fields.KeywordField(multi=True)
 
+    def _get_visible_runs(self, obj):
+        try:
+            return obj.visible_course_runs
+        except AttributeError:
+            return list(filter_visible_runs(obj.course_runs).order_by('pk'))
+
     def prepare_aggregation_key(self, obj):
         return 'course:{}'.format(obj.key)
 
     def prepare_availability(self, obj):
-        return [str(course_run.availability) for course_run in filter_visible_runs(obj.course_runs)]
+        return [str(course_run.availability) for course_run in self._get_visible_runs(obj)]
 
     def prepare_course_runs(self, obj):
-        return [course_run.key for course_run in filter_visible_runs(obj.course_runs)]
+        return [course_run.key for course_run in self._get_visible_runs(obj)]
 
     def prepare_expected_learning_items(self, obj):
         return [item.value for item in obj.expected_learning_items.all()]
@@ -73,13 +87,13 @@ class CourseDocument(BaseCourseDocument):
         return list(
             {
                 self._prepare_language(course_run.language)
-                for course_run in filter_visible_runs(obj.course_runs)
+                for course_run in self._get_visible_runs(obj)
                 if course_run.language
             }
         )
 
     def prepare_end(self, obj):
-        return [course_run.end for course_run in filter_visible_runs(obj.course_runs)]
+        return [course_run.end for course_run in self._get_visible_runs(obj)]
 
     def prepare_end_date(self, obj):
         return obj.end_date
@@ -88,33 +102,26 @@ class CourseDocument(BaseCourseDocument):
         return str(obj.course_ends)
 
     def prepare_enrollment_start(self, obj):
-        return [course_run.enrollment_start for course_run in filter_visible_runs(obj.course_runs)]
+        return [course_run.enrollment_start for course_run in self._get_visible_runs(obj)]
 
     def prepare_enrollment_end(self, obj):
-        return [course_run.enrollment_end for course_run in filter_visible_runs(obj.course_runs)]
+        return [course_run.enrollment_end for course_run in self._get_visible_runs(obj)]
 
     def prepare_org(self, obj):
-        course_run = filter_visible_runs(obj.course_runs).first()
-        if course_run:
-            return CourseKey.from_string(course_run.key).org
+        course_runs = self._get_visible_runs(obj)
+        if course_runs:
+            return CourseKey.from_string(course_runs[0].key).org
         return None
 
     def prepare_seat_types(self, obj):
-        seat_types = [seat.slug for run in filter_visible_runs(obj.course_runs) for seat in run.seat_types]
+        seat_types = [seat.slug for run in self._get_visible_runs(obj) for seat in run.seat_types]
         return list(set(seat_types))
 
-    def prepare_skill_names(self, obj):
-        course_skills = get_whitelisted_product_skills(obj.key, product_type=ProductTypes.Course)
-        return list(set(course_skill.skill.name for course_skill in course_skills))
-
-    def prepare_skills(self, obj):
-        return get_whitelisted_serialized_skills(obj.key, product_type=ProductTypes.Course)
-
     def prepare_status(self, obj):
-        return [course_run.status for course_run in filter_visible_runs(obj.course_runs)]
+        return [course_run.status for course_run in self._get_visible_runs(obj)]
 
     def prepare_start(self, obj):
-        return [course_run.start for course_run in filter_visible_runs(obj.course_runs)]
+        return [course_run.start for course_run in self._get_visible_runs(obj)]
 
     def prepare_partner(self, obj):
         return obj.partner.short_code
@@ -122,8 +129,20 @@ class CourseDocument(BaseCourseDocument):
     def prepare_prerequisites(self, obj):
         return [prerequisite.name for prerequisite in obj.prerequisites.all()]
 
-    def get_queryset(self):
-        return super().get_queryset().prefetch_related('course_runs__seats__type')
+    def get_prefetch_lookups(self):
+        course_runs = CourseRun.everything.select_related('type', 'language').prefetch_related(
+            Prefetch('seats', queryset=Seat.everything.select_related('type'))
+        )
+        return (
+            'expected_learning_items', 'prerequisites', 'programs', 'subjects__translations',
+            'level_type__translations', 'url_slug_history', 'availability_snapshot',
+            prefetch_organizations('authoring_organizations'),
+            prefetch_organizations('sponsoring_organizations'),
+            Prefetch('course_runs', queryset=course_runs),
+            Prefetch(
+                'course_runs', queryset=filter_visible_runs(course_runs).order_by('pk'), to_attr='visible_course_runs'
+            ),
+        )
 
     def prepare_course_type(self, obj):
         return obj.type.slug
@@ -1,14 +1,13 @@
 from django.conf import settings
+from django.db.models import Prefetch
 from django_elasticsearch_dsl import Index, fields
 from opaque_keys.edx.keys import CourseKey
-from taxonomy.choices import ProductTypes
-from taxonomy.utils import get_whitelisted_product_skills, get_whitelisted_serialized_skills
 
 from course_discovery.apps.course_metadata.choices import CourseRunStatus
-from course_discovery.apps.course_metadata.models import CourseRun
+from course_discovery.apps.course_metadata.models import CourseRun, Seat
 
 from .analyzers import case_insensitive_keyword, html_strip
-from .common import BaseCourseDocument, filter_visible_runs
+from .common import BaseCourseDocument, SkillsMixin, filter_visible_runs, prefetch_organizations
 
 __all__ = ('CourseRunDocument',)
 
@@ -22,11 +21,22 @@ COURSE_RUN_INDEX.settings(
 
 
 @COURSE_RUN_INDEX.doc_type
-class CourseRunDocument(BaseCourseDocument):
+class CourseRunDocument(SkillsMixin, BaseCourseDocument):
     """
     Course run Elasticsearch document.
     """
 
+    modified_lookups = (
+        'modified', 'course__modified', 'seats__modified', 'seats__type__modified', 'type__modified',
+        'staff__modified', 'course__authoring_organizations__modified', 'course__sponsoring_organizations__modified',
+        'course__subjects__modified', 'course__programs__modified', 'course__partner__modified',
+        'course__level_type__modified', 'course__prerequisites__modified', 'course__expected_learning_items__modified',
+        'course__additional_metadata__modified', 'course__url_slug_history__modified',
+    )
+    select_related_lookups = (
+        'course__partner', 'course__level_type', 'course__additional_metadata', 'type', 'language',
+    )
+
     announcement = fields.DateField()
     availability = fields.TextField(
         fields={'raw': fields.KeywordField(), 'lower': fields.TextField(analyzer=case_insensitive_keyword)}
@@ -78,6 +88,9 @@ class CourseRunDocument(BaseCourseDocument):
     )
     weeks_to_complete = fields.IntegerField()
 
+    def get_skill_product_key(self, obj):
+        return obj.course.key
+
     def prepare_aggregation_key(self, obj):
         # Aggregate CourseRuns by Course key since that is how we plan to dedup CourseRuns on the marketing site.
         return 'courserun:{}'.format(obj.course.key)
@@ -117,13 +130,6 @@ class CourseRunDocument(BaseCourseDocument):
     def prepare_seat_types(self, obj):
         return [seat_type.slug for seat_type in obj.seat_types]
 
-    def prepare_skill_names(self, obj):
-        course_skills = get_whitelisted_product_skills(obj.course.key, product_type=ProductTypes.Course)
-        return list(set(course_skill.skill.name for course_skill in course_skills))
-
-    def prepare_skills(self, obj):
-        return get_whitelisted_serialized_skills(obj.course.key, product_type=ProductTypes.Course)
-
     def prepare_staff_uuids(self, obj):
         return [str(staff.uuid) for staff in obj.staff.all()]
 
@@ -133,14 +139,20 @@ class CourseRunDocument(BaseCourseDocument):
             for language in obj.transcript_languages.all()
         ]
 
-    def get_queryset(self):
-        return filter_visible_runs(
-            super().get_queryset()
-                   .select_related('course')
-                   .prefetch_related('seats__type')
-                   .prefetch_related('transcript_languages')
+    def get_prefetch_lookups(self):
+        return (
+            'transcript_languages', 'staff', 'course__expected_learning_items', 'course__prerequisites',
+            'course__programs__type', 'course__programs__excluded_course_runs', 'course__subjects__translations',
+            'course__level_type__translations',
+            'course__url_slug_history',
+            prefetch_organizations('course__authoring_organizations'),
+            prefetch_organizations('course__sponsoring_organizations'),
+            Prefetch('seats', queryset=Seat.everything.select_related('type')),
         )
 
+    def get_queryset(self):
+        return filter_visible_runs(super().get_queryset())
+
     class Django:
         """
         Django Elasticsearch DSL ORM Meta.
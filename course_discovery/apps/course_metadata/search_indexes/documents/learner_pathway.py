@@ -19,6 +19,9 @@ class LearnerPathwayDocument(BaseDocument, OrganizationsMixin):
     """
     LearnerPathway Elasticsearch document.
     """
+
+    select_related_lookups = ('partner',)
+
     created = fields.DateField()
     title = fields.TextField(
         analyzer=synonym_text,
@@ -50,10 +53,10 @@ class LearnerPathwayDocument(BaseDocument, OrganizationsMixin):
     def prepare_published(self, obj):
         return obj.status == PathwayStatus.Active
 
-    def get_queryset(self):
-        return super().get_queryset().prefetch_related(
-            'steps', 'steps__learnerpathwaycourse_set', 'steps__learnerpathwayprogram_set',
-            'steps__learnerpathwayblock_set'
+    def get_prefetch_lookups(self):
+        return (
+            'steps__learnerpathwaycourse_set__course', 'steps__learnerpathwayprogram_set__program__courses',
+            'steps__learnerpathwayblock_set',
         )
 
     def prepare_skill_names(self, obj):
@@ -1,7 +1,8 @@
 from django.conf import settings
+from django.db.models import Prefetch
 from django_elasticsearch_dsl import Index, fields
 
-from course_discovery.apps.course_metadata.models import Person, Position
+from course_discovery.apps.course_metadata.models import CourseRun, Person, Position
 
 from .common import BaseDocument
 
@@ -18,6 +19,12 @@ class PersonDocument(BaseDocument):
     Person Elasticsearch document.
     """
 
+    modified_lookups = (
+        'modified', 'position__modified', 'partner__modified', 'courses_staffed__modified',
+        'courses_staffed__course__authoring_organizations__modified',
+    )
+    select_related_lookups = ('bio_language', 'partner', 'position')
+
     bio = fields.TextField()
     bio_language = fields.TextField()
     full_name = fields.TextField()
@@ -42,13 +49,14 @@ class PersonDocument(BaseDocument):
 
     def prepare_position(self, obj):
         try:
-            position = Position.objects.get(person=obj)
+            position = obj.position
         except Position.DoesNotExist:
             return []
         return [position.title, position.organization_override]
 
-    def get_queryset(self):
-        return super().get_queryset().select_related('bio_language')
+    def get_prefetch_lookups(self):
+        course_runs = CourseRun.everything.select_related('course').prefetch_related('course__authoring_organizations')
+        return (Prefetch('courses_staffed', queryset=course_runs),)
 
     class Django:
         """
@@ -1,13 +1,13 @@
 from django.conf import settings
+from django.db.models import Prefetch
 from django_elasticsearch_dsl import Index, fields
 from taxonomy.choices import ProductTypes
-from taxonomy.utils import get_whitelisted_product_skills, get_whitelisted_serialized_skills
 
 from course_discovery.apps.course_metadata.choices import ProgramStatus
-from course_discovery.apps.course_metadata.models import Degree, Program
+from course_discovery.apps.course_metadata.models import Course, CourseRun, Degree, Program, Seat
 
 from .analyzers import case_insensitive_keyword, edge_ngram_completion, html_strip, synonym_text
-from .common import BaseDocument, OrganizationsMixin
+from .common import BaseDocument, OrganizationsMixin, SkillsMixin, prefetch_organizations
 
 __all__ = ('ProgramDocument',)
 
@@ -17,11 +17,21 @@ PROGRAM_INDEX.settings(number_of_shards=1, number_of_replicas=1, blocks={'read_o
 
 
 @PROGRAM_INDEX.doc_type
-class ProgramDocument(BaseDocument, OrganizationsMixin):
+class ProgramDocument(SkillsMixin, BaseDocument, OrganizationsMixin):
     """
     Program Elasticsearch document.
     """
 
+    modified_lookups = (
+        'modified', 'courses__modified', 'courses__course_runs__modified', 'courses__course_runs__seats__modified',
+        'courses__course_runs__seats__type__modified', 'courses__course_runs__staff__modified',
+        'courses__subjects__modified', 'courses__entitlements__modified', 'authoring_organizations__modified',
+        'credit_backing_organizations__modified', 'excluded_course_runs__modified', 'partner__modified',
+        'type__modified', 'degree__additional_metadata__modified',
+    )
+    select_related_lookups = ('type', 'partner', 'degree__additional_metadata')
+    skill_product_type = ProductTypes.Program
+
     authoring_organization_uuids = fields.KeywordField(multi=True)
     authoring_organizations = fields.TextField(
         multi=True,
@@ -75,6 +85,9 @@ class ProgramDocument(BaseDocument, OrganizationsMixin):
     excluded_from_seo = fields.BooleanField()
     excluded_from_search = fields.BooleanField()
 
+    def get_skill_product_key(self, obj):
+        return obj.uuid
+
     def prepare_aggregation_key(self, obj):
         return 'program:{}'.format(obj.uuid)
 
@@ -96,18 +109,10 @@ class ProgramDocument(BaseDocument, OrganizationsMixin):
     def prepare_seat_types(self, obj):
         return [seat_type.slug for seat_type in obj.seat_types]
 
-    def prepare_skill_names(self, obj):
-        program_skills = get_whitelisted_product_skills(obj.uuid, product_type=ProductTypes.Program)
-        return list(set(program_skill.skill.name for program_skill in program_skills))
-
-    def prepare_skills(self, obj):
-        return get_whitelisted_serialized_skills(obj.uuid, product_type=ProductTypes.Program)
-
     def prepare_search_card_display(self, obj):
         try:
-            degree = Degree.objects.get(uuid=obj.uuid)
+            degree = obj.degree
         except Degree.DoesNotExist:
-
             return []
         return [degree.search_card_ranking, degree.search_card_cost, degree.search_card_courses]
 
@@ -120,8 +125,20 @@ class ProgramDocument(BaseDocument, OrganizationsMixin):
     def prepare_type(self, obj):
         return obj.type.name_t
 
-    def get_queryset(self):
-        return super().get_queryset().select_related('type').select_related('partner')
+    def get_prefetch_lookups(self):
+        course_runs = CourseRun.everything.select_related('type', 'language').prefetch_related(
+            'transcript_languages', 'staff', Prefetch('seats', queryset=Seat.everything.select_related('type'))
+        )
+        courses = Course.everything.select_related('canonical_course_run', 'partner').prefetch_related(
+            'entitlements', 'subjects__translations', Prefetch('course_runs', queryset=course_runs)
+        )
+        return (
+            'type__applicable_seat_types', 'type__translations', 'excluded_course_runs', 'faq',
+            'expected_learning_items', 'job_outlook_items', 'individual_endorsements__endorser',
+            'corporate_endorsements__individual_endorsements__endorser',
+            prefetch_organizations('authoring_organizations'), prefetch_organizations('credit_backing_organizations'),
+            Prefetch('courses', queryset=courses),
+        )
 
     class Django:
         """
@@ -1,7 +1,20 @@
+import itertools
 from abc import ABC, abstractmethod, abstractproperty
+from collections import defaultdict
 
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import models, transaction
+from django_elasticsearch_dsl.apps import DEDConfig
 from django_elasticsearch_dsl.registries import registry
 from django_elasticsearch_dsl.signals import RealTimeSignalProcessor as OriginRealTimeSignalProcessor
+from elasticsearch.helpers import bulk
+from elasticsearch_dsl.connections import get_connection
+
+from course_discovery.apps.core.utils import OnCommitBatch, get_on_commit_batch
+from course_discovery.apps.edx_elasticsearch_dsl_extensions.signals import (
+    index_documents_updated, search_documents_updated
+)
 
 
 class IndexForbiddenException(Exception):
@@ -10,6 +23,104 @@ class IndexForbiddenException(Exception):
     """
 
 
+class IndexUpdateBatch(OnCommitBatch):
+    """
+    Objects saved in a transaction, whose documents are updated with one bulk request once it commits.
+
+    The documents of the objects depending on the saved ones go in the same request. An object saved several
+    times, or depending on several saved objects, is indexed once, as it is stored when the transaction commits.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.instances = {}
+
+    def add(self, instance):
+        self.instances[(instance.__class__, instance.pk)] = instance
+
+    def handle(self):
+        self.flush()
+
+    def flush(self):
+        if not DEDConfig.autosync_enabled():
+            return
+
+        pks_by_model = defaultdict(list)
+        for model, pk in self.instances:
+            pks_by_model[model].append(pk)
+
+        related_keys = set()
+        for instance in self.instances.values():
+            related_keys.update(get_related_keys(instance))
+        for model, pk in related_keys - set(self.instances):
+            pks_by_model[model].append(pk)
+
+        actions = []
+        refresh = False
+        for model, pks in pks_by_model.items():
+            for document in registry.get_documents(models=[model]):
+                if document.django.ignore_signals:
+                    continue
+                doc = document()
+                queryset = model._base_manager.filter(pk__in=pks)  # pylint: disable=protected-access
+                actions.append(doc.get_index_actions(doc.apply_prefetch_plan(queryset)))
+                refresh = refresh or document.django.auto_refresh
+
+        if actions:
+            bulk(get_connection(), itertools.chain.from_iterable(actions), refresh=refresh)
+
+        for instance in self.instances.values():
+            search_documents_updated.send(sender=instance.__class__, instance=instance)
+        for model, pks in pks_by_model.items():
+            index_documents_updated.send(sender=model, pks=pks)
+
+
+def get_related_keys(instance):
+    """
+    Returns the (model, pk) keys of the objects whose documents embed the given object, as found by
+    registry.update_related.
+    """
+    keys = set()
+    for document in registry._get_related_doc(instance):  # pylint: disable=protected-access
+        try:
+            related = document().get_instances_from_related(instance)
+        except ObjectDoesNotExist:
+            related = None
+
+        if related is None:
+            continue
+        if isinstance(related, models.Model):
+            related = [related]
+        if isinstance(related, models.QuerySet):
+            keys.update((related.model, pk) for pk in related.values_list('pk', flat=True))
+        else:
+            keys.update((obj.__class__, obj.pk) for obj in related)
+    return keys
+
+
+def get_index_update_batch():
+    """
+    Returns the batch of index updates of the current transaction, which is flushed when the transaction commits.
+    """
+    return get_on_commit_batch(IndexUpdateBatch, IndexUpdateBatch)
+
+
+def update_documents(sender, instance):
+    """
+    Updates the documents of a saved object.
+
+    Inside a transaction the update is deferred to a batch flushed when the transaction commits, so saving
+    many related objects costs one bulk request instead of one request per save.
+    """
+    if settings.ELASTICSEARCH_DSL_UPDATE_ON_COMMIT and transaction.get_connection().in_atomic_block:
+        get_index_update_batch().add(instance)
+        return
+
+    registry.update(instance)
+    registry.update_related(instance)
+    search_documents_updated.send(sender=sender, instance=instance)
+
+
 class RegistryUpdateHandler(ABC):
     """
     Abstract index update handler.
@@ -36,8 +147,7 @@ class RegistryUpdateHandler(ABC):
     def handle(self, sender, instance, **kwargs):
         if self.__next_handler:
             return self.__next_handler.handle(sender, instance, **kwargs)
-        registry.update(instance)
-        registry.update_related(instance)
+        update_documents(sender, instance)
 
 
 class MarketableHandler(RegistryUpdateHandler):
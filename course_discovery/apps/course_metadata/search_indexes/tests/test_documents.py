@@ -0,0 +1,124 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from course_discovery.apps.course_metadata.search_indexes.documents import (
+    CourseDocument, CourseRunDocument, LearnerPathwayDocument, PersonDocument, ProgramDocument
+)
+from course_discovery.apps.course_metadata.tests.factories import (
+    CourseFactory, CourseRunFactory, OrganizationFactory, PositionFactory, ProgramFactory, SeatFactory, SubjectFactory
+)
+from course_discovery.apps.edx_elasticsearch_dsl_extensions.management.commands.update_index import prepare_documents
+from course_discovery.apps.learner_pathway.tests.factories import (
+    LearnerPathwayCourseFactory, LearnerPathwayProgramFactory, LearnerPathwayStepFactory
+)
+
+BULK_PATH = 'django_elasticsearch_dsl.documents.DocType.bulk'
+UPDATE_INDEX_PATH = 'course_discovery.apps.edx_elasticsearch_dsl_extensions.management.commands.update_index'
+
+
+def consume_actions(actions, **kwargs):
+    """ Stands in for the bulk request, preparing the documents of the actions without sending them. """
+    return len(list(actions)), []
+
+
+class DocumentPrefetchPlanTests(TestCase):
+    """
+    Regression tests for the number of queries preparing search documents takes.
+
+    Bulk indexing twice as many objects must take as many queries, so relations walked once per object fail the
+    tests, while updating the document of a single object is checked against a fixed count.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.courses = []
+        self.programs = []
+        self.pathway_steps = []
+        self.create_objects(2)
+
+    def create_objects(self, count):
+        for __ in range(count):
+            course = CourseFactory()
+            course.authoring_organizations.add(OrganizationFactory())
+            course.sponsoring_organizations.add(OrganizationFactory())
+            course.subjects.add(SubjectFactory())
+            for course_run in CourseRunFactory.create_batch(2, course=course):
+                SeatFactory(course_run=course_run)
+                course_run.staff.add(PositionFactory().person)
+            program = ProgramFactory(courses=[course])
+            step = LearnerPathwayStepFactory()
+            LearnerPathwayCourseFactory(step=step, course=course)
+            LearnerPathwayProgramFactory(step=step, program=program)
+            self.courses.append(course)
+            self.programs.append(program)
+            self.pathway_steps.append(step)
+
+    def count_bulk_queries(self, doc):
+        """
+        Returns the number of queries bulk indexing all objects of a document type takes.
+        """
+        cache.clear()
+        # Warm the caches of switches and the like, so only the queries of the objects are counted.
+        doc.update(doc.get_indexing_queryset())
+
+        with CaptureQueriesContext(connection) as queries:
+            indexed, __ = doc.update(doc.get_indexing_queryset())
+        assert indexed == doc.get_queryset().count()
+        return len(queries)
+
+    def assert_num_queries(self, document, instance, instance_queries):
+        """
+        Asserts bulk indexing all objects of a document type takes the same number of queries for twice as many
+        objects, and updating the document of one object takes the given number of queries.
+        """
+        doc = document()
+        with mock.patch(BULK_PATH, side_effect=consume_actions):
+            cache.clear()
+            doc.update(doc.get_indexing_queryset())
+            with self.assertNumQueries(instance_queries):
+                indexed, __ = doc.update(instance)
+            assert indexed == 1
+
+            queries = self.count_bulk_queries(doc)
+            self.create_objects(2)
+            assert self.count_bulk_queries(doc) == queries
+
+    def count_prepare_queries(self, document):
+        """
+        Returns the number of queries preparing the documents of all objects of a document type takes in the
+        processes update_index populates the indexes with.
+        """
+        cache.clear()
+        pks = list(document().get_queryset().values_list('pk', flat=True))
+        prepare_documents(document, 'index', pks)
+
+        with CaptureQueriesContext(connection) as queries:
+            actions = prepare_documents(document, 'index', pks)
+        assert len(actions) == len(pks)
+        return len(queries)
+
+    @mock.patch(UPDATE_INDEX_PATH + '.connection')
+    def test_prepare_documents(self, __):
+        for document in (CourseDocument, CourseRunDocument, ProgramDocument):
+            queries = self.count_prepare_queries(document)
+            self.create_objects(2)
+            assert self.count_prepare_queries(document) == queries
+
+    def test_course_document(self):
+        self.assert_num_queries(CourseDocument, self.courses[0], 18)
+
+    def test_course_run_document(self):
+        self.assert_num_queries(CourseRunDocument, self.courses[0].course_runs.first(), 18)
+
+    def test_program_document(self):
+        self.assert_num_queries(ProgramDocument, self.programs[0], 20)
+
+    def test_person_document(self):
+        self.assert_num_queries(PersonDocument, self.courses[0].course_runs.first().staff.first(), 3)
+
+    def test_learner_pathway_document(self):
+        self.assert_num_queries(LearnerPathwayDocument, self.pathway_steps[0].pathway, 8)
@@ -0,0 +1,102 @@
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django_elasticsearch_dsl.registries import registry
+
+from course_discovery.apps.course_metadata.models import CourseRun, Person
+from course_discovery.apps.course_metadata.tests.factories import CourseRunFactory, PersonFactory
+from course_discovery.apps.edx_elasticsearch_dsl_extensions.signals import (
+    index_documents_updated, search_documents_updated
+)
+
+BULK_PATH = 'course_discovery.apps.course_metadata.search_indexes.signals.bulk'
+
+
+@override_settings(ELASTICSEARCH_DSL_UPDATE_ON_COMMIT=True)
+class RealTimeSignalProcessorTests(TestCase):
+    """ Tests for the document updates of the realtime signal processor. """
+
+    def setUp(self):
+        super().setUp()
+        with override_settings(ELASTICSEARCH_DSL_UPDATE_ON_COMMIT=False):
+            self.course_run = CourseRunFactory()
+            self.person = PersonFactory()
+        self.sent_actions = []
+
+    def bulk(self, client, actions, **kwargs):  # pylint: disable=unused-argument
+        """ Stands in for the bulk request, recording the actions it would send. """
+        self.sent_actions.append(list(actions))
+
+    def test_updates_batched_on_commit(self):
+        """ Verify objects saved in a transaction are indexed once, together, when it commits. """
+        receiver = mock.Mock()
+        index_documents_updated.connect(receiver, sender=CourseRun, weak=False)
+        self.addCleanup(index_documents_updated.disconnect, receiver, sender=CourseRun)
+        search_receiver = mock.Mock()
+        search_documents_updated.connect(search_receiver, sender=CourseRun, weak=False)
+        self.addCleanup(search_documents_updated.disconnect, search_receiver, sender=CourseRun)
+
+        with mock.patch(BULK_PATH, side_effect=self.bulk) as mock_bulk:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.course_run.title = 'First title'
+                self.course_run.save()
+                self.course_run.title = 'Second title'
+                self.course_run.save()
+                self.course_run.course.save()
+                assert not mock_bulk.called
+
+        assert mock_bulk.call_count == 1
+        actions = self.sent_actions[0]
+        course_run_actions = [action for action in actions if action['_id'] == self.course_run.pk and
+                              action['_source']['content_type'] == 'courserun']
+        assert len(course_run_actions) == 1
+        assert course_run_actions[0]['_source']['title'] == 'Second title'
+        assert {action['_source']['content_type'] for action in actions} == {'course', 'courserun'}
+        receiver.assert_called_once_with(signal=index_documents_updated, sender=CourseRun, pks=[self.course_run.pk])
+        search_receiver.assert_called_once_with(
+            signal=search_documents_updated, sender=CourseRun, instance=self.course_run
+        )
+
+    def test_related_documents_in_same_bulk_request(self):
+        """ Verify the documents depending on saved objects are sent once, in the same bulk request. """
+        other_person = PersonFactory()
+        related_document = mock.Mock()
+        related_document.return_value.get_instances_from_related.return_value = self.course_run
+
+        def get_related_doc(instance):
+            return [related_document] if isinstance(instance, Person) else []
+
+        with mock.patch(BULK_PATH, side_effect=self.bulk) as mock_bulk, \
+                mock.patch.object(registry, '_get_related_doc', side_effect=get_related_doc), \
+                mock.patch.object(registry, 'update_related') as mock_update_related:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.person.save()
+                other_person.save()
+
+        assert mock_bulk.call_count == 1
+        assert not mock_update_related.called
+        sent_keys = [(action['_source']['content_type'], action['_id']) for action in self.sent_actions[0]]
+        assert sent_keys.count(('courserun', self.course_run.pk)) == 1
+        assert ('person', self.person.pk) in sent_keys
+        assert ('person', other_person.pk) in sent_keys
+
+    def test_rolled_back_updates_discarded(self):
+        """ Verify the objects created in a rolled back savepoint are not indexed. """
+        with mock.patch(BULK_PATH, side_effect=self.bulk) as mock_bulk:
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        rolled_back_run = CourseRunFactory(course=self.course_run.course)
+                        raise ValueError
+                except ValueError:
+                    pass
+            assert not mock_bulk.called
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self.person.save()
+
+        assert mock_bulk.call_count == 1
+        sent_ids = {action['_id'] for action in self.sent_actions[0]}
+        assert self.person.pk in sent_ids
+        assert rolled_back_run.pk not in sent_ids
@@ -7,21 +7,25 @@ from celery import shared_task
 from django.apps import apps
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.exceptions import ValidationError
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db import transaction
 from django.db.models import Q
 from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 from openedx_events.content_authoring.data import CourseCatalogData
 from openedx_events.content_authoring.signals import COURSE_CATALOG_INFO_CHANGED
 
-from course_discovery.apps.api.cache import api_change_receiver
+from course_discovery.apps.api.cache import api_change_receiver, partner_change_receiver
 from course_discovery.apps.core.models import Partner
+from course_discovery.apps.core.utils import OnCommitBatch, get_on_commit_batch
+from course_discovery.apps.course_metadata.algolia_models import AlgoliaRecordHash
 from course_discovery.apps.course_metadata.constants import MASTERS_PROGRAM_TYPE_SLUG
 from course_discovery.apps.course_metadata.data_loaders.api import CoursesApiDataLoader
 from course_discovery.apps.course_metadata.models import (
-    AdditionalMetadata, CertificateInfo, Course, CourseEditor, CourseEntitlement, CourseLocationRestriction, CourseRun,
-    Curriculum, CurriculumCourseMembership, CurriculumProgramMembership, Fact, GeoLocation, Organization, ProductMeta,
-    ProductValue, Program, Seat
+    AdditionalMetadata, CertificateInfo, ContentfulEntry, ContentfulEntryProduct, ContentfulSyncState, Course,
+    CourseAvailability, CourseEditor, CourseEntitlement, CourseLocationRestriction, CourseRun, Curriculum,
+    CurriculumCourseMembership, CurriculumProgramMembership, DataLoaderRecordHash, DataLoaderResponse, Fact,
+    GeoLocation, Organization, Position, ProductMeta, ProductValue, Program, Seat
 )
 from course_discovery.apps.course_metadata.publishers import ProgramMarketingSitePublisher
 from course_discovery.apps.course_metadata.salesforce import (
@@ -32,6 +36,11 @@ from course_discovery.apps.course_metadata.utils import data_modified_timestamp_
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
+# Models no API response is built from, so changing them doesn't invalidate the API cache.
+API_CACHE_IGNORED_MODELS = (
+    AlgoliaRecordHash, ContentfulEntry, ContentfulEntryProduct, ContentfulSyncState, CourseAvailability,
+    DataLoaderRecordHash, DataLoaderResponse,
+)
 
 
 @receiver(pre_delete, sender=Program)
@@ -110,11 +119,14 @@ def connect_api_change_receiver():
     of the API while providing closer-to-optimal cache TTLs.
     """
     for model in apps.get_app_config('course_metadata').get_models():
+        if model in API_CACHE_IGNORED_MODELS:
+            continue
         for signal in (post_save, post_delete):
             signal.connect(api_change_receiver, sender=model)
 
 
 connect_api_change_receiver()
+post_save.connect(partner_change_receiver, sender=Partner)
 
 
 @receiver(pre_save, sender=CourseRun)
@@ -599,4 +611,81 @@ def handle_organization_group_removal(sender, instance, action, pk_set, reverse,
             )
 
 
+class OnCommitRefresh(OnCommitBatch):
+    """
+    Ids of the objects changed in a transaction, which are refreshed together once it commits.
+    """
+
+    def __init__(self, refresh):
+        super().__init__()
+        self.refresh = refresh
+        self.ids = set()
+
+    def handle(self):
+        self.refresh(self.ids)
+
+
+def refresh_on_commit(refresh, pk):
+    """
+    Calls refresh with the ids passed for it in the current transaction once it commits, so changing several
+    related objects refreshes each id once. Outside a transaction it is called right away.
+    """
+    if not transaction.get_connection().in_atomic_block:
+        refresh([pk])
+        return
+
+    get_on_commit_batch(refresh, lambda: OnCommitRefresh(refresh)).ids.add(pk)
+
+
+def refresh_course_availability(course_id):
+    """
+    Refreshes the availability snapshot of a course once the current transaction commits.
+    """
+    refresh_on_commit(CourseAvailability.refresh, course_id)
+
+
+@receiver(post_save, sender=CourseRun)
+@receiver(post_delete, sender=CourseRun)
+def course_run_availability_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    refresh_course_availability(instance.course_id)
+
+
+@receiver(post_save, sender=Seat)
+@receiver(post_delete, sender=Seat)
+def seat_availability_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    try:
+        course_run = instance.course_run
+    except ObjectDoesNotExist:
+        # The run is being deleted along with the seat.
+        return
+    refresh_course_availability(course_run.course_id)
+
+
+@receiver(post_delete, sender=Seat)
+@receiver(post_delete, sender=CourseRun)
+@receiver(post_delete, sender=Position)
+def touch_parent_on_delete(sender, instance, **kwargs):
+    """
+    Marks the object whose search document embeds a deleted object as modified. Incremental index updates find
+    changed objects through the modification times of their related objects, which a deleted object no longer has.
+    """
+    parent_field = {Seat: 'course_run', CourseRun: 'course', Position: 'person'}[sender]
+    parent_model = sender._meta.get_field(parent_field).related_model
+    # The parent may be deleted along with the object, in which case there is nothing to update.
+    parent_model._base_manager.filter(  # pylint: disable=protected-access
+        pk=getattr(instance, f'{parent_field}_id')
+    ).update(modified=datetime.now(timezone.utc))
+
+
+@receiver(post_save, sender=Seat)
+def seat_date_state_changed(sender, instance, created, **kwargs):  # pylint: disable=unused-argument
+    """
+    Refreshes the date state of the seat's course run once the transaction commits, so its expiry accounts for the
+    seat's upgrade deadline. Saves that leave the upgrade deadline as it was are ignored.
+    """
+    if created or instance.field_tracker.has_changed('_upgrade_deadline') or \
+            instance.field_tracker.has_changed('upgrade_deadline_override'):
+        refresh_on_commit(CourseRun.refresh_date_states, instance.course_run_id)
+
+
 connect_course_data_modified_timestamp_related_models()
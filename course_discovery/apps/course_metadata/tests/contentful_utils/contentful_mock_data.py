@@ -6,6 +6,7 @@ import random
 import string
 
 from contentful import Entry
+from contentful.resource_builder import ResourceBuilder
 
 
 def create_contentful_entry(entry_name, fields):
@@ -23,10 +24,65 @@ def create_contentful_entry(entry_name, fields):
                 'sys': {'type': 'Link', 'linkType': 'ContentType', 'id': entry_name}},
             'locale': 'en-US'
         },
-        'fields': fields
+        'fields': dict(fields)
     })
 
 
+def create_sync_items(entries, locale='en-US'):
+    """
+    Flattens mock entries and the entries they link to into items as returned by the Contentful Sync API.
+    """
+    items = {}
+
+    def to_sync_value(value):
+        if isinstance(value, Entry):
+            add_item(value)
+            return {'sys': {'type': 'Link', 'linkType': 'Entry', 'id': value.sys['id']}}
+        if isinstance(value, list):
+            return [to_sync_value(item) for item in value]
+        return value
+
+    def add_item(entry):
+        if entry.sys['id'] in items:
+            return
+        item = items[entry.sys['id']] = {
+            'metadata': entry.raw['metadata'],
+            'sys': {key: value for key, value in entry.raw['sys'].items() if key != 'locale'},
+        }
+        item['fields'] = {name: {locale: to_sync_value(value)} for name, value in entry.raw['fields'].items()}
+
+    for entry in entries:
+        add_item(entry)
+    return list(items.values())
+
+
+def create_sync_page(items, sync_token, has_next_page=False):
+    """
+    Creates a page of a Contentful Sync API response, linking to the next page or to the next sync.
+    """
+    next_url = 'https://cdn.contentful.com/spaces/test_space_id/environments/master/sync?sync_token=' + sync_token
+    return ResourceBuilder('en-US', True, {
+        'sys': {'type': 'Array'},
+        'items': items,
+        'nextPageUrl' if has_next_page else 'nextSyncUrl': next_url,
+    }).build()
+
+
+def create_deleted_entry_item(entry_id):
+    return {
+        'sys': {
+            'space': {'sys': {'type': 'Link', 'linkType': 'Space', 'id': 'test_space_id'}},
+            'id': entry_id,
+            'type': 'DeletedEntry',
+            'createdAt': '2022-12-06T21:20:18.606Z',
+            'updatedAt': '2022-12-06T21:20:18.606Z',
+            'deletedAt': '2022-12-06T21:20:18.606Z',
+            'environment': {'sys': {'id': 'master', 'type': 'Link', 'linkType': 'Environment'}},
+            'revision': 1,
+        }
+    }
+
+
 class MockContenfulDegreeResponse:
     """
     Mock Contentful Degree Response
@@ -6,21 +6,25 @@ from unittest import mock
 import pytest
 from django.conf import settings
 from django.core.cache import cache
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from testfixtures import LogCapture
 
 from course_discovery.apps.course_metadata.contentful_utils import (
     aggregate_contentful_data, fetch_and_transform_bootcamp_contentful_data, fetch_and_transform_degree_contentful_data,
-    get_contentful_cache_key, get_data_from_contentful, rich_text_to_plain_text
+    get_contentful_cache_key, get_data_from_contentful, get_synced_entries, rich_text_to_plain_text,
+    sync_contentful_entries
 )
+from course_discovery.apps.course_metadata.models import ContentfulEntry, ContentfulSyncState
 from course_discovery.apps.course_metadata.tests.contentful_utils.contentful_mock_data import (
-    MockContenfulDegreeResponse, MockContentfulBootcampResponse, create_contentful_entry
+    MockContenfulDegreeResponse, MockContentfulBootcampResponse, create_contentful_entry, create_deleted_entry_item,
+    create_sync_items, create_sync_page
 )
 
 LOGGER_NAME = 'course_discovery.apps.course_metadata.contentful_utils'
 
 
 @pytest.mark.usefixtures('django_cache')
+@override_settings(CONTENTFUL_SPACE_ID='test_space_id', CONTENTFUL_ENVIRONMENT='master')
 class TestContentfulUtils(TestCase):
     """
     Test get_data_from_contentful.
@@ -32,14 +36,16 @@ class TestContentfulUtils(TestCase):
         Test get_data_from_contentful utility with mock data.
         """
         mock_response = MockContentfulBootcampResponse()
-        mock_client.return_value.entries.return_value = MockContentfulBootcampResponse
+        mock_client.return_value.sync.return_value = create_sync_page(
+            create_sync_items(mock_response.items), 'sync-token'
+        )
         contentful_data = get_data_from_contentful(
             settings.BOOTCAMP_CONTENTFUL_CONTENT_TYPE)
 
-        assert len(contentful_data) == 2
-        assert contentful_data[0] == mock_response.mock_contentful_bootcamp_entry
-        self.assertDictEqual(
-            contentful_data[0].raw, mock_response.mock_contentful_bootcamp_entry.raw)
+        assert len(contentful_data) == 1
+        assert contentful_data[0].id == mock_response.mock_contentful_bootcamp_entry.id
+        assert contentful_data[0].uuid == mock_response.mock_contentful_bootcamp_entry.uuid
+        assert contentful_data[0].seo.page_title == mock_response.mock_contentful_bootcamp_entry.seo.page_title
 
     @mock.patch('course_discovery.apps.course_metadata.contentful_utils.Client')
     def test_get_cached_data_from_contentful(self, mock_client):
@@ -47,7 +53,9 @@ class TestContentfulUtils(TestCase):
         Test get_data_from_contentful utility with mock data.
         """
         mock_response = MockContentfulBootcampResponse()
-        mock_client.return_value.entries.return_value = MockContentfulBootcampResponse
+        mock_client.return_value.sync.return_value = create_sync_page(
+            create_sync_items(mock_response.items), 'sync-token'
+        )
         cache_key = get_contentful_cache_key(
             settings.BOOTCAMP_CONTENTFUL_CONTENT_TYPE)
         assert cache.get(cache_key) is None
@@ -66,8 +74,9 @@ class TestContentfulUtils(TestCase):
                     f'{settings.BOOTCAMP_CONTENTFUL_CONTENT_TYPE}',
                 )
             )
-            assert len(contentful_data) == 2
+            assert len(contentful_data) == 1
             assert contentful_data[0].uuid == mock_response.mock_contentful_bootcamp_entry.uuid
+        assert mock_client.return_value.sync.call_count == 1
 
     def test_rich_text_to_plain_text(self):
         """
@@ -206,3 +215,109 @@ class TestContentfulUtils(TestCase):
         transformed_data = fetch_and_transform_degree_contentful_data()
         self.assertDictEqual(
             transformed_data, mock_degree_response.degree_transformed_data)
+
+
+@pytest.mark.usefixtures('django_cache')
+@override_settings(CONTENTFUL_SPACE_ID='test_space_id', CONTENTFUL_ENVIRONMENT='master')
+@mock.patch('course_discovery.apps.course_metadata.contentful_utils.Client')
+class TestContentfulSync(TestCase):
+    """
+    Test syncing the local Contentful entries with the Sync API.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.bootcamp_response = MockContentfulBootcampResponse()
+        self.degree_response = MockContenfulDegreeResponse(uuid='test-uuid')
+        self.bootcamp_items = create_sync_items(self.bootcamp_response.items)
+        self.degree_items = create_sync_items([self.degree_response.mock_contentful_degree_entry])
+
+    def test_initial_sync(self, mock_client):
+        """
+        Verify the first sync pages through every entry and stores the token to continue from.
+        """
+        mock_client.return_value.sync.side_effect = [
+            create_sync_page(self.bootcamp_items, 'page-token', has_next_page=True),
+            create_sync_page(self.degree_items, 'sync-token'),
+        ]
+        sync_contentful_entries()
+
+        assert mock_client.return_value.sync.call_args_list == [
+            mock.call({'initial': True, 'type': 'Entry'}),
+            mock.call({'sync_token': 'page-token'}),
+        ]
+        assert ContentfulSyncState.objects.get().sync_token == 'sync-token'
+        assert set(ContentfulEntry.objects.values_list('entry_id', flat=True)) == {
+            item['sys']['id'] for item in self.bootcamp_items + self.degree_items
+        }
+        bootcamp_entry = ContentfulEntry.objects.get(content_type=settings.BOOTCAMP_CONTENTFUL_CONTENT_TYPE)
+        assert list(bootcamp_entry.products.values_list('product_uuid', flat=True)) == ['test-uuid']
+
+    def test_delta_sync(self, mock_client):
+        """
+        Verify later syncs continue from the stored token and apply updated and deleted entries.
+        """
+        mock_client.return_value.sync.return_value = create_sync_page(
+            self.bootcamp_items + self.degree_items, 'sync-token'
+        )
+        sync_contentful_entries()
+        entry_count = ContentfulEntry.objects.count()
+
+        degree_page = self.degree_items[0]
+        updated_degree_page = {**degree_page, 'fields': {**degree_page['fields'], 'uuid': {'en-US': 'new-uuid'}}}
+        mock_client.return_value.sync.return_value = create_sync_page(
+            [create_deleted_entry_item(self.bootcamp_items[0]['sys']['id']), updated_degree_page], 'next-sync-token'
+        )
+        sync_contentful_entries()
+
+        mock_client.return_value.sync.assert_called_with({'sync_token': 'sync-token'})
+        assert ContentfulSyncState.objects.get().sync_token == 'next-sync-token'
+        assert ContentfulEntry.objects.count() == entry_count - 1
+        assert not get_synced_entries(settings.BOOTCAMP_CONTENTFUL_CONTENT_TYPE)
+        assert [entry.uuid for entry in get_synced_entries(settings.DEGREE_CONTENTFUL_CONTENT_TYPE)] == ['new-uuid']
+
+    def test_transform_synced_entries(self, mock_client):
+        """
+        Verify the entries read from the local copy transform the same as the ones fetched from Contentful.
+        """
+        mock_client.return_value.sync.return_value = create_sync_page(
+            self.bootcamp_items + self.degree_items, 'sync-token'
+        )
+        self.assertDictEqual(
+            fetch_and_transform_bootcamp_contentful_data(), self.bootcamp_response.bootcamp_transformed_data
+        )
+        self.assertDictEqual(
+            fetch_and_transform_degree_contentful_data(), self.degree_response.degree_transformed_data
+        )
+
+    def test_get_synced_entries_for_products(self, mock_client):
+        """
+        Verify only the entries about the given products are read.
+        """
+        mock_client.return_value.sync.return_value = create_sync_page(self.degree_items, 'sync-token')
+        sync_contentful_entries()
+
+        with self.assertNumQueries(1):
+            assert not get_synced_entries(settings.DEGREE_CONTENTFUL_CONTENT_TYPE, product_uuids=['other-uuid'])
+        entries = get_synced_entries(settings.DEGREE_CONTENTFUL_CONTENT_TYPE, product_uuids=['test-uuid'])
+        assert [entry.uuid for entry in entries] == ['test-uuid']
+        # Degree pages are also about the programs of their uuid list.
+        entries = get_synced_entries(settings.DEGREE_CONTENTFUL_CONTENT_TYPE, product_uuids=['test-uuid2'])
+        assert [entry.uuid for entry in entries] == ['test-uuid']
+
+    def test_transform_data_for_products(self, mock_client):
+        """
+        Verify the data of given products is read from the local copy, which is synced once for the cache timeout.
+        """
+        mock_client.return_value.sync.return_value = create_sync_page(
+            self.bootcamp_items + self.degree_items, 'sync-token'
+        )
+        assert not fetch_and_transform_degree_contentful_data(product_uuids=['other-uuid'])
+        transformed_data = fetch_and_transform_degree_contentful_data(product_uuids=['test-uuid3'])
+        self.assertDictEqual(transformed_data, self.degree_response.degree_transformed_data)
+        self.assertDictEqual(
+            fetch_and_transform_bootcamp_contentful_data(product_uuids=['test-uuid']),
+            self.bootcamp_response.bootcamp_transformed_data
+        )
+        assert mock_client.return_value.sync.call_count == 1
+        assert cache.get(get_contentful_cache_key(settings.DEGREE_CONTENTFUL_CONTENT_TYPE)) is None
@@ -0,0 +1,193 @@
+from concurrent.futures import Future
+from operator import itemgetter
+from unittest import mock
+
+from algoliasearch_django import AlgoliaIndex
+from django.test import TestCase
+
+from course_discovery.apps.course_metadata.algolia_models import (
+    AlgoliaProxyCourse, AlgoliaProxyProduct, AlgoliaProxyProgram, AlgoliaRecordHash
+)
+from course_discovery.apps.course_metadata.index import (
+    EnglishProductIndex, ProductMetaIndex, SpanishProductIndex, get_record_hash
+)
+from course_discovery.apps.course_metadata.models import CourseAvailability
+from course_discovery.apps.course_metadata.tests.factories import (
+    OrganizationFactory, PartnerFactory, PersonFactory, ProgramFactory, SubjectFactory
+)
+from course_discovery.apps.course_metadata.tests.test_algolia_models import TestAlgoliaDataMixin
+
+INDEX_PATH = 'course_discovery.apps.course_metadata.index'
+
+
+class SynchronousExecutor:
+    """ Stands in for a process pool, running the submitted functions in the test's database transaction. """
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+class ProductIndexReindexDeltaTests(TestCase):
+    """ Tests for BaseProductIndex.reindex_delta. """
+
+    def setUp(self):
+        super().setUp()
+        self.algolia_client = mock.MagicMock()
+        self.algolia_index = self.algolia_client.init_index.return_value
+        self.algolia_index.iter_rules.return_value = []
+        self.product_index = EnglishProductIndex(AlgoliaProxyProduct, self.algolia_client, {})
+        self.records = [
+            {'objectID': 'course-1', 'title': 'Course'},
+            {'objectID': 'program-1', 'title': 'Program'},
+        ]
+
+    def reindex_delta(self):
+        """ Runs a delta reindex of the records, serialized as they are. """
+        with mock.patch.object(EnglishProductIndex, 'get_queryset', return_value=[dict(r) for r in self.records]), \
+                mock.patch.object(EnglishProductIndex, '_should_index', return_value=True), \
+                mock.patch.object(EnglishProductIndex, 'get_raw_record', side_effect=dict):
+            return self.product_index.reindex_delta(batch_size=1)
+
+    def stored_hashes(self):
+        return dict(AlgoliaRecordHash.objects.values_list('object_id', 'content_hash'))
+
+    def test_first_reindex_delta(self):
+        """ Verify the first delta reindex sends every record and deletes the ones no longer indexed. """
+        self.algolia_index.browse_all.return_value = [{'objectID': 'course-1'}, {'objectID': 'course-2'}]
+
+        assert self.reindex_delta() == (2, 1)
+        assert self.algolia_index.save_objects.call_args_list == [mock.call([record]) for record in self.records]
+        self.algolia_index.delete_objects.assert_called_once_with(['course-2'])
+        assert self.stored_hashes() == {record['objectID']: get_record_hash(record) for record in self.records}
+
+    def test_unchanged_records_skipped(self):
+        """ Verify only changed and removed records are sent, and rules are only replaced when they change. """
+        self.algolia_index.browse_all.return_value = []
+        self.reindex_delta()
+        self.algolia_index.reset_mock()
+
+        assert self.reindex_delta() == (0, 0)
+        assert not self.algolia_index.save_objects.called
+        assert not self.algolia_index.delete_objects.called
+        assert not self.algolia_index.replace_all_rules.called
+        assert not self.algolia_index.browse_all.called
+
+        changed_record = {'objectID': 'course-1', 'title': 'New title'}
+        self.records = [changed_record]
+        rule = {'objectID': 'course-empty-query-rule'}
+        with mock.patch.object(EnglishProductIndex, 'get_rules', return_value=[rule]):
+            assert self.reindex_delta() == (1, 1)
+        self.algolia_index.save_objects.assert_called_once_with([changed_record])
+        self.algolia_index.delete_objects.assert_called_once_with(['program-1'])
+        self.algolia_index.replace_all_rules.assert_called_once_with([rule])
+        assert self.stored_hashes() == {'course-1': get_record_hash(changed_record)}
+
+    def test_clear_index_forgets_hashes(self):
+        """ Verify clearing the index deletes its stored hashes, so the next delta reindex sends every record. """
+        self.algolia_index.browse_all.return_value = []
+        self.reindex_delta()
+        AlgoliaRecordHash.objects.create(index_name='other', object_id='course-1', content_hash='hash')
+
+        ProductMetaIndex(AlgoliaProxyProduct, self.algolia_client, {}).clear_index()
+
+        assert list(AlgoliaRecordHash.objects.values_list('index_name', flat=True)) == ['other']
+        assert self.reindex_delta() == (2, 0)
+
+    def test_reindex_all_forgets_hashes(self):
+        """ Verify a full reindex deletes the stored hashes of the index. """
+        self.algolia_index.browse_all.return_value = []
+        self.reindex_delta()
+
+        with mock.patch.object(AlgoliaIndex, 'reindex_all'):
+            self.product_index.reindex_all()
+
+        assert self.stored_hashes() == {}
+
+
+@mock.patch(INDEX_PATH + '.fetch_and_transform_degree_contentful_data', return_value={})
+@mock.patch(INDEX_PATH + '.fetch_and_transform_bootcamp_contentful_data', return_value={})
+class ProductIndexQuerysetTests(TestCase, TestAlgoliaDataMixin):
+    """ Tests for the products streamed by BaseProductIndex.get_queryset. """
+
+    def setUp(self):
+        super().setUp()
+        self.__class__.edxPartner = PartnerFactory(name='edX')
+        self.product_index = EnglishProductIndex(AlgoliaProxyProduct, mock.MagicMock(), {})
+        self.product_index.queryset_chunk_size = 2
+
+    def create_products(self, count):
+        for __ in range(count):
+            course = self.create_course_with_basic_active_course_run()
+            course.authoring_organizations.add(OrganizationFactory())
+            course.subjects.add(SubjectFactory())
+            course.topics.add('topic')
+            for course_run in course.course_runs.all():
+                course_run.staff.add(PersonFactory())
+            program = ProgramFactory(partner=self.edxPartner, courses=[course])
+            program.authoring_organizations.add(OrganizationFactory())
+            program.labels.add('label')
+
+    def get_records(self):
+        return [self.product_index.get_raw_record(product) for product in self.product_index.get_queryset()]
+
+    def test_records_unchanged(self, *_mocks):
+        """ Verify the streamed products are serialized like products fetched one by one. """
+        self.create_products(3)
+        products = [AlgoliaProxyProduct(course) for course in AlgoliaProxyCourse.objects.order_by('pk')]
+        products += [AlgoliaProxyProduct(program) for program in AlgoliaProxyProgram.objects.order_by('pk')]
+
+        assert self.get_records() == [self.product_index.get_raw_record(product) for product in products]
+
+    def test_query_count_constant(self, *_mocks):
+        """ Verify the number of queries only depends on the number of chunks, not on the number of products. """
+        self.create_products(1)
+        with self.assertNumQueries(37):
+            assert len(self.get_records()) == 2
+
+        self.create_products(1)
+        with self.assertNumQueries(37):
+            assert len(self.get_records()) == 4
+
+    def test_snapshot_availability_translated(self, *_mocks):
+        """ Verify the availability read from a course's snapshot is translated for the Spanish index. """
+        course = self.create_course_with_basic_active_course_run()
+        CourseAvailability.refresh([course.pk])
+        product_index = SpanishProductIndex(AlgoliaProxyProduct, mock.MagicMock(), {})
+
+        records = [product_index.get_raw_record(product) for product in product_index.get_queryset()]
+        assert len(records) == 1
+        assert records[0]['availability'] == ['Archivado']
+        assert all(isinstance(level, str) for level in records[0]['availability'])
+
+    @mock.patch(INDEX_PATH + '.connection')
+    @mock.patch(INDEX_PATH + '.ProcessPoolExecutor', SynchronousExecutor)
+    def test_product_records(self, *_mocks):
+        """ Verify products serialized once for every language in a pool of processes match each index. """
+        self.create_products(3)
+        meta_index = ProductMetaIndex(AlgoliaProxyProduct, mock.MagicMock(), {})
+        records = {indexer.index_name: [] for indexer in meta_index.model_index}
+        for chunk_records in meta_index.iter_product_records(processes=2):
+            for index_name, index_records in chunk_records.items():
+                records[index_name].extend(index_records)
+
+        for indexer in meta_index.model_index:
+            expected_records = [
+                indexer.get_raw_record(product) for product in indexer.get_queryset()
+                if indexer._should_index(product)  # pylint: disable=protected-access
+            ]
+            assert len(expected_records) == 6
+            # Chunks are yielded in the order they finish serializing.
+            assert sorted(records[indexer.index_name], key=itemgetter('objectID')) == sorted(
+                expected_records, key=itemgetter('objectID')
+            )
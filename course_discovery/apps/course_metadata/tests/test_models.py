@@ -29,12 +29,14 @@ from course_discovery.apps.api.v1.tests.test_views.mixins import OAuth2Mixin
 from course_discovery.apps.core.models import Currency
 from course_discovery.apps.core.tests.helpers import make_image_file
 from course_discovery.apps.core.utils import SearchQuerySetWrapper
+from course_discovery.apps.course_metadata.algolia_models import get_course_availability
 from course_discovery.apps.course_metadata.choices import CourseRunStatus, ExternalProductStatus, ProgramStatus
 from course_discovery.apps.course_metadata.models import (
     FAQ, AbstractHeadingBlurbModel, AbstractMediaModel, AbstractNamedModel, AbstractTitleDescriptionModel,
-    AbstractValueModel, CorporateEndorsement, Course, CourseEditor, CourseRun, CourseRunType, CourseType, Curriculum,
-    CurriculumCourseMembership, CurriculumCourseRunExclusion, CurriculumProgramMembership, DegreeCost, DegreeDeadline,
-    Endorsement, Organization, OrganizationMapping, Program, ProgramType, Ranking, Seat, SeatType, Subject, Topic
+    AbstractValueModel, CorporateEndorsement, Course, CourseAvailability, CourseEditor, CourseRun, CourseRunType,
+    CourseType, Curriculum, CurriculumCourseMembership, CurriculumCourseRunExclusion, CurriculumProgramMembership,
+    DegreeCost, DegreeDeadline, Endorsement, Organization, OrganizationMapping, Program, ProgramType, Ranking, Seat,
+    SeatType, Subject, Topic
 )
 from course_discovery.apps.course_metadata.publishers import (
     CourseRunMarketingSitePublisher, ProgramMarketingSitePublisher
@@ -85,6 +87,14 @@ class TestCourse(TestCase):
         expected = set(factories.CourseFactory.create_batch(3))
         assert set(Course.search('*')) == expected
 
+    @override_settings(ELASTICSEARCH_DSL_PK_CHUNK_SIZE=2)
+    def test_search_beyond_chunk_size(self):
+        """ Verify every match is returned when the results span several search_after pages. """
+        title = 'Some random title'
+        expected = set(factories.CourseFactory.create_batch(5, title=title))
+        factories.CourseFactory(title='Unrelated')
+        assert set(Course.search('title:' + title)) == expected
+
     def test_image_url(self):
         course = factories.CourseFactory()
         assert course.image_url == course.image.small.url
@@ -514,6 +524,92 @@ class TestCourse(TestCase):
         assert non_draft_previous_data_modified_timestamp == non_draft_course.data_modified_timestamp
 
 
+class CourseAvailabilityTests(TestCase):
+    """ Tests for the CourseAvailability snapshots of courses. """
+
+    def setUp(self):
+        super().setUp()
+        now = datetime.datetime.now(pytz.UTC)
+        self.course = CourseFactory()
+        with self.captureOnCommitCallbacks(execute=True):
+            current_run = CourseRunFactory(
+                course=self.course, status=CourseRunStatus.Published, start=now - datetime.timedelta(days=10),
+                end=now + datetime.timedelta(days=60), enrollment_start=None, enrollment_end=None,
+            )
+            SeatFactory(course_run=current_run, type=SeatTypeFactory.verified(), price=100,
+                        upgrade_deadline=now + datetime.timedelta(days=30))
+            upcoming_run = CourseRunFactory(
+                course=self.course, status=CourseRunStatus.Published, start=now + datetime.timedelta(days=20),
+                end=now + datetime.timedelta(days=90), enrollment_start=None, enrollment_end=None,
+            )
+            SeatFactory(course_run=upcoming_run, type=SeatTypeFactory.audit(), price=0, upgrade_deadline=None)
+            CourseRunFactory(
+                course=self.course, status=CourseRunStatus.Published, start=now - datetime.timedelta(days=90),
+                end=now - datetime.timedelta(days=30), enrollment_start=None, enrollment_end=None,
+            )
+        self.next_change = upcoming_run.start
+
+    def get_course(self):
+        return Course.everything.select_related('availability_snapshot').get(pk=self.course.pk)
+
+    def test_snapshot_matches_derived_values(self):
+        """ Verify the properties read from the snapshot match the values derived from the course runs. """
+        course = Course.everything.get(pk=self.course.pk)
+        expected = {
+            'advertised_course_run': course.get_advertised_course_run(),
+            'end_date': course.get_end_date(),
+            'first_enrollable_paid_seat_price': course.get_first_enrollable_paid_seat_price(course.active_course_runs),
+            'has_marketable_run': any(run.is_marketable for run in course.course_runs.all()),
+            'availability': set(get_course_availability(course)),
+        }
+        assert expected['advertised_course_run'] is not None
+        assert expected['availability'] == {'Available now', 'Upcoming', 'Archived'}
+
+        CourseAvailability.refresh([self.course.pk])
+        course = self.get_course()
+        assert course.get_availability_snapshot() is not None
+        assert course.advertised_course_run == expected['advertised_course_run']
+        assert course.end_date == expected['end_date']
+        assert course.first_enrollable_paid_seat_price == expected['first_enrollable_paid_seat_price'] == 100
+        assert course.has_marketable_run() == expected['has_marketable_run']
+        assert set(get_course_availability(course)) == expected['availability']
+
+    def test_snapshot_expires(self):
+        """ Verify a snapshot holds until the next date its values could change. """
+        CourseAvailability.refresh([self.course.pk])
+        snapshot = CourseAvailability.objects.get(course=self.course)
+        assert snapshot.valid_until == self.next_change
+
+        with freeze_time(snapshot.valid_until - datetime.timedelta(seconds=1)):
+            assert self.get_course().get_availability_snapshot() is not None
+        with freeze_time(snapshot.valid_until):
+            assert self.get_course().get_availability_snapshot() is None
+        with freeze_time(snapshot.computed_at - datetime.timedelta(seconds=1)):
+            assert self.get_course().get_availability_snapshot() is None
+
+    def test_snapshot_only_read_when_loaded(self):
+        """ Verify a snapshot not loaded along with the course isn't queried. """
+        CourseAvailability.refresh([self.course.pk])
+        course = Course.everything.get(pk=self.course.pk)
+        with self.assertNumQueries(0):
+            assert course.get_availability_snapshot() is None
+
+    def test_refreshed_on_commit(self):
+        """ Verify changing the runs or seats of a course refreshes its snapshot once the transaction commits. """
+        computed_at = CourseAvailability.objects.get(course=self.course).computed_at
+        end = datetime.datetime.now(pytz.UTC) + datetime.timedelta(days=200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            course_run = CourseRunFactory(course=self.course, status=CourseRunStatus.Published, end=end)
+            SeatFactory(course_run=course_run)
+            assert CourseAvailability.objects.get(course=self.course).computed_at == computed_at
+        assert self.get_course().get_availability_snapshot().end_date == end
+
+        with self.captureOnCommitCallbacks(execute=True):
+            course_run.delete()
+        assert self.get_course().get_availability_snapshot().end_date == self.course.get_end_date()
+
+
 class TestCourseUpdateMarketingUnpublish(MarketingSitePublisherTestMixin, TestCase):
     @classmethod
     def setUpClass(cls):
@@ -1,10 +1,12 @@
 
 import datetime
+from unittest import mock
 
 import ddt
 import pytest
 import pytz
 from django.test import TestCase
+from freezegun import freeze_time
 
 from course_discovery.apps.course_metadata.choices import CourseRunStatus, ProgramStatus
 from course_discovery.apps.course_metadata.models import Course, CourseRun, Program
@@ -49,6 +51,55 @@ class CourseQuerySetTests(TestCase):
             else:
                 assert list(Course.objects.available()) == []  # lint-amnesty, pylint: disable=use-implicit-booleaness-not-comparison
 
+    def test_available_with_unavailable_runs(self):
+        """
+        Verify a Course is returned once if any of its CourseRuns is available, whatever its other runs are,
+        and that a Course with no available run is excluded.
+        """
+        now = datetime.datetime.now(pytz.UTC)
+        past = now - datetime.timedelta(days=10)
+        future = now + datetime.timedelta(days=10)
+
+        course_run = CourseRunFactory(start=past, enrollment_start=past, enrollment_end=future, end=future)
+        SeatFactory(course_run=course_run)
+        course = course_run.course
+
+        unpublished = CourseRunFactory(
+            course=course, status=CourseRunStatus.Unpublished,
+            start=past, enrollment_start=past, enrollment_end=future, end=future,
+        )
+        ended = CourseRunFactory(course=course, start=past, enrollment_start=None, enrollment_end=None, end=past)
+        other_course_run = CourseRunFactory(
+            status=CourseRunStatus.Unpublished, start=past, enrollment_start=past, enrollment_end=future, end=future,
+        )
+        for run in (unpublished, ended, other_course_run):
+            SeatFactory(course_run=run)
+
+        assert list(Course.objects.available()) == [course]
+
+        course_run.status = CourseRunStatus.Unpublished
+        course_run.save()
+        assert not Course.objects.available().exists()
+
+    def test_available_with_expired_date_state(self):
+        """ Verify a CourseRun whose precomputed date state expired makes its Course available on its dates. """
+        now = datetime.datetime.now(pytz.UTC)
+        course_run = CourseRunFactory(
+            start=now - datetime.timedelta(days=1),
+            enrollment_start=now + datetime.timedelta(days=1),
+            enrollment_end=now + datetime.timedelta(days=3),
+            end=now + datetime.timedelta(days=5),
+        )
+        SeatFactory(course_run=course_run)
+        assert not course_run.enrollment_open
+        assert not Course.objects.available().exists()
+
+        with freeze_time(now + datetime.timedelta(days=2)):
+            assert list(Course.objects.available()) == [course_run.course]
+
+        with freeze_time(now + datetime.timedelta(days=6)):
+            assert not Course.objects.available().exists()
+
 
 @ddt.ddt
 class CourseRunQuerySetTests(TestCase):
@@ -95,6 +146,55 @@ class CourseRunQuerySetTests(TestCase):
             enrollable, enrollable_no_enrollment_end, enrollable_no_enrollment_start
         ], key=lambda x: x.id)
 
+    def test_expired_date_state(self):
+        """ Verify course runs whose precomputed date state expired are matched on their dates until refreshed. """
+        now = datetime.datetime.now(pytz.UTC)
+        course_run = CourseRunFactory(
+            start=now - datetime.timedelta(days=1),
+            enrollment_start=now + datetime.timedelta(days=1),
+            enrollment_end=now + datetime.timedelta(days=3),
+            end=now + datetime.timedelta(days=5),
+        )
+        assert not course_run.enrollment_open
+        assert course_run.date_state_expires == course_run.enrollment_start
+
+        with freeze_time(now + datetime.timedelta(days=2)):
+            assert list(CourseRun.objects.enrollable()) == [course_run]
+            assert list(CourseRun.objects.active()) == [course_run]
+            CourseRun.refresh_date_states([course_run.id])
+
+        course_run.refresh_from_db()
+        assert course_run.enrollment_open
+        assert course_run.date_state_expires == course_run.enrollment_end
+
+        with freeze_time(now + datetime.timedelta(days=4)):
+            assert not CourseRun.objects.enrollable().exists()
+            assert not CourseRun.objects.active().exists()
+
+        # The columns are trusted until the state expires.
+        CourseRun.everything.filter(id=course_run.id).update(enrollment_open=False)
+        with freeze_time(now + datetime.timedelta(days=2)):
+            assert not CourseRun.objects.enrollable().exists()
+
+    def test_seat_upgrade_deadline_expires_date_state(self):
+        """ Verify saving a seat refreshes the date state of its run, which then expires at the upgrade deadline. """
+        now = datetime.datetime.now(pytz.UTC)
+        course_run = CourseRunFactory(start=None, enrollment_start=None, enrollment_end=None, end=None)
+        assert course_run.date_state_expires is None
+
+        with self.captureOnCommitCallbacks(execute=True):
+            seat = SeatFactory(course_run=course_run, upgrade_deadline=now + datetime.timedelta(days=2))
+            SeatFactory(course_run=course_run, upgrade_deadline=now + datetime.timedelta(days=3))
+        course_run.refresh_from_db()
+        assert course_run.date_state_expires == seat.upgrade_deadline
+
+        # Saves that leave the upgrade deadline as it was don't refresh the state.
+        with mock.patch.object(CourseRun, 'refresh_date_states') as refresh_date_states:
+            with self.captureOnCommitCallbacks(execute=True):
+                seat.price = 10
+                seat.save()
+        refresh_date_states.assert_not_called()
+
     def test_marketable(self):
         """ Verify the method filters CourseRuns to those with slugs. """
         course_run = CourseRunFactory()
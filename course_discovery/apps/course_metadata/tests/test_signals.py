@@ -29,10 +29,10 @@ from course_discovery.apps.course_metadata.models import (
     Curriculum, CurriculumProgramMembership, DataLoaderConfig, DeduplicateHistoryConfig, DeletePersonDupsConfig,
     DrupalPublishUuidConfig, LevelTypeTranslation, MigrateCourseSlugConfiguration,
     MigratePublisherToCourseMetadataConfig, ProductMeta, ProfileImageDownloadConfig, Program, ProgramTypeTranslation,
-    RemoveRedirectsConfig, SubjectTranslation, TagCourseUuidsConfig, TopicTranslation
+    RemoveRedirectsConfig, Seat, SubjectTranslation, TagCourseUuidsConfig, TopicTranslation
 )
 from course_discovery.apps.course_metadata.signals import (
-    _duplicate_external_key_message, additional_metadata_facts_changed,
+    API_CACHE_IGNORED_MODELS, _duplicate_external_key_message, additional_metadata_facts_changed,
     connect_course_data_modified_timestamp_signal_handlers, course_collaborators_changed, course_run_staff_changed,
     course_run_transcript_languages_changed, course_subjects_changed, course_topics_taggable_changed,
     disconnect_course_data_modified_timestamp_signal_handlers, product_meta_taggable_changed,
@@ -47,9 +47,9 @@ LOGGER_NAME = 'course_discovery.apps.course_metadata.signals'
 
 
 @pytest.mark.django_db
-@mock.patch('course_discovery.apps.api.cache.set_api_timestamp')
+@mock.patch('course_discovery.apps.api.cache.invalidate_api_cache_tags')
 class TestCacheInvalidation:
-    def test_model_change(self, mock_set_api_timestamp):
+    def test_model_change(self, mock_invalidate_api_cache_tags):
         """
         Verify that the API cache is invalidated after course_metadata models
         are saved or deleted.
@@ -77,6 +77,9 @@ class TestCacheInvalidation:
                 continue
             if 'abstract' in model.__name__.lower() or 'historical' in model.__name__.lower():
                 continue
+            # These models are deliberately not connected to the API cache invalidation.
+            if model in API_CACHE_IGNORED_MODELS:
+                continue
 
             factory = factory_map.get(model)
             if not factory:
@@ -85,13 +88,14 @@ class TestCacheInvalidation:
             # Verify that model creation and deletion invalidates the API cache.
             instance = factory()
 
-            assert mock_set_api_timestamp.called
-            mock_set_api_timestamp.reset_mock()
+            assert mock_invalidate_api_cache_tags.called
+            assert 'resource:default' in mock_invalidate_api_cache_tags.call_args[0][0]
+            mock_invalidate_api_cache_tags.reset_mock()
 
             instance.delete()
 
-            assert mock_set_api_timestamp.called
-            mock_set_api_timestamp.reset_mock()
+            assert mock_invalidate_api_cache_tags.called
+            mock_invalidate_api_cache_tags.reset_mock()
 
 
 @ddt.ddt
@@ -1319,3 +1323,33 @@ class DataModifiedTimestampUpdateSignalsTests(TestCase):
                 )
             )
         m2m_changed.disconnect(course_run_staff_changed, sender=CourseRun.staff.through)
+
+
+class TouchParentOnDeleteTests(TestCase):
+    """ Tests for touch_parent_on_delete, which lets incremental index updates pick up deleted related objects. """
+
+    def assert_touched_on_delete(self, instance, parent):
+        parent.__class__._base_manager.filter(pk=parent.pk).update(  # pylint: disable=protected-access
+            modified=datetime.datetime(2016, 6, 21, tzinfo=UTC)
+        )
+        instance.delete()
+        parent.refresh_from_db()
+        assert parent.modified > datetime.datetime(2016, 6, 21, tzinfo=UTC)
+
+    def test_seat_deleted(self):
+        seat = factories.SeatFactory()
+        self.assert_touched_on_delete(seat, seat.course_run)
+
+    def test_course_run_deleted(self):
+        course_run = factories.CourseRunFactory()
+        self.assert_touched_on_delete(course_run, course_run.course)
+
+    def test_position_deleted(self):
+        position = factories.PositionFactory()
+        self.assert_touched_on_delete(position, position.person)
+
+    def test_parent_deleted(self):
+        """ Verify deleting a course run along with its seats doesn't fail. """
+        seat = factories.SeatFactory()
+        seat.course_run.delete()
+        assert not Seat.objects.filter(pk=seat.pk).exists()
@@ -40,7 +40,7 @@ from course_discovery.apps.course_metadata.toggles import IS_SUBDIRECTORY_SLUG_F
 from course_discovery.apps.course_metadata.utils import (
     calculated_seat_upgrade_deadline, clean_html, convert_svg_to_png_from_url, create_missing_entitlement,
     download_and_save_course_image, download_and_save_program_image, ensure_draft_world, fetch_getsmarter_products,
-    is_google_drive_url, serialize_entitlement_for_ecommerce_api, serialize_seat_for_ecommerce_api,
+    get_pk_filter, is_google_drive_url, serialize_entitlement_for_ecommerce_api, serialize_seat_for_ecommerce_api,
     transform_skills_data, validate_slug_format
 )
 
@@ -747,6 +747,25 @@ class UtilsTests(TestCase):
         key = map_external_org_code_to_internal_org_code('ext-key', source.slug)
         assert key == org.key
 
+    @ddt.data(
+        [],
+        [3],
+        [1, 2],
+        [1, 2, 3, 4, 5],
+        [1, 3, 4, 5, 6, 9, 11, 12],
+    )
+    def test_get_pk_filter(self, pk_positions):
+        courses = CourseFactory.create_batch(12)
+        expected = [courses[position - 1] for position in pk_positions]
+        pk_filter = get_pk_filter(course.pk for course in reversed(expected))
+        assert list(Course.objects.filter(pk_filter).order_by('pk')) == sorted(expected, key=lambda c: c.pk)
+
+    def test_get_pk_filter_collapses_runs(self):
+        pk_filter = get_pk_filter([9, 1, 2, 3, 4, 7])
+        assert pk_filter.connector == 'OR'
+        assert ('pk__range', (1, 4)) in pk_filter.children
+        assert ('pk__in', [7, 9]) in pk_filter.children
+
 
 class TestConvertSvgToPngFromUrl(TestCase):
     """Test Convert SVG to PNG"""
@@ -40,6 +40,7 @@ from course_discovery.apps.publisher.utils import VALID_CHARS_IN_COURSE_NUM_AND_
 logger = logging.getLogger(__name__)
 
 RESERVED_ELASTICSEARCH_QUERY_OPERATORS = ('AND', 'OR', 'NOT', 'TO',)
+PK_FILTER_MIN_RANGE_LENGTH = 3
 
 
 def clean_query(query):
@@ -65,6 +66,39 @@ def clean_query(query):
     return query
 
 
+def get_pk_filter(pks, field='pk'):
+    """ Builds a filter matching the given primary keys.
+
+    Runs of consecutive keys are collapsed into range lookups, so the large and mostly contiguous
+    id sets returned by broad search queries don't turn into an equally large IN clause.
+
+    Args:
+        pks (iterable): primary keys to match.
+        field (str): name of the field to filter on.
+
+    Returns:
+        Q: filter matching exactly the given keys
+    """
+    pks = sorted(set(pks))
+    singles = []
+    ranges = []
+
+    start = 0
+    for end in range(1, len(pks) + 1):
+        if end < len(pks) and pks[end] == pks[end - 1] + 1:
+            continue
+        if end - start >= PK_FILTER_MIN_RANGE_LENGTH:
+            ranges.append((pks[start], pks[end - 1]))
+        else:
+            singles.extend(pks[start:end])
+        start = end
+
+    pk_filter = models.Q(**{f'{field}__in': singles}) if singles or not ranges else models.Q()
+    for pk_range in ranges:
+        pk_filter |= models.Q(**{f'{field}__range': pk_range})
+    return pk_filter
+
+
 def set_official_state(obj, model, attrs=None):
     """
     Given a draft object and the model of that object, ensure that an official version is created
@@ -740,50 +774,62 @@ def get_file_from_drive_link(image_url):
     return content_type, content
 
 
-def download_and_save_course_image(course, image_url, data_field='image', headers=None):
+def download_course_image(course_key, image_url, headers=None):
     """
-    Helper method to download an image from a provided image url and save it
-    in the data field mentioned, defaulting to course card image.
+    Helper method to download the image of a course from a provided image url.
+
+    Returns:
+        tuple -- content_type and content of the image, or None if the download failed
     """
-    try:
-        if is_google_drive_url(image_url):
-            content_type, content = get_file_from_drive_link(image_url)
-            extension = IMAGE_TYPES.get(content_type)
-        else:
-            response = requests.get(image_url, headers=headers)  # pylint: disable=missing-timeout
+    if is_google_drive_url(image_url):
+        return get_file_from_drive_link(image_url)
+
+    response = requests.get(image_url, headers=headers)  # pylint: disable=missing-timeout
+    if response.status_code == requests.codes.ok:  # pylint: disable=no-member
+        return response.headers['Content-Type'].lower(), response.content
+
+    msg = 'Failed to download image for course [%s] from [%s]! Response was [%d]:\n%s'
+    logger.error(msg, course_key, image_url, response.status_code, response.content)
+    return None
 
-            if response.status_code == requests.codes.ok:  # pylint: disable=no-member
-                content_type = response.headers['Content-Type'].lower()
-                extension = IMAGE_TYPES.get(content_type)
-                content = response.content
 
+def save_course_image(course, image_url, content_type, content, data_field='image'):
+    """
+    Helper method to save a downloaded image in the data field mentioned, defaulting to course card image.
+    """
+    extension = IMAGE_TYPES.get(content_type)
+    if extension:
+        filename = '{uuid}.{extension}'.format(uuid=str(course.uuid), extension=extension)
+        # TODO: Get field from _meta.get_field. Tried that approach initially but was getting
+        # field save errors for some reasons.
+        if data_field == 'image':
+            course.image.save(filename, ContentFile(content))
+        elif data_field == 'organization_logo_override':
+            image_file = ContentFile(content)
+            if extension == 'svg':
+                filename = '{uuid}.png'.format(uuid=str(course.uuid))
+                image_file = convert_svg_to_png_from_url(image_url)
+            if image_file:
+                course.organization_logo_override.save(filename, image_file)
             else:
-                msg = 'Failed to download image for course [%s] from [%s]! Response was [%d]:\n%s'
-                logger.error(msg, course.key, image_url, response.status_code, response.content)
+                logger.error('Update organization logo override failed for course [%s]', course.key)
                 return False
+        logger.info(f'Image for course {course.key} successfully updated in {data_field} field')
+        return True
+
+    msg = 'Image retrieved for course [%s] from [%s] has an unknown content type [%s] and will not be saved.'
+    logger.error(msg, course.key, image_url, content_type)
+    return False
 
-        if extension:
-            filename = '{uuid}.{extension}'.format(uuid=str(course.uuid), extension=extension)
-            # TODO: Get field from _meta.get_field. Tried that approach initially but was getting
-            # field save errors for some reasons.
-            if data_field == 'image':
-                course.image.save(filename, ContentFile(content))
-            elif data_field == 'organization_logo_override':
-                image_file = ContentFile(content)
-                if extension == 'svg':
-                    filename = '{uuid}.png'.format(uuid=str(course.uuid))
-                    image_file = convert_svg_to_png_from_url(image_url)
-                if image_file:
-                    course.organization_logo_override.save(filename, image_file)
-                else:
-                    logger.error('Update organization logo override failed for course [%s]', course.key)
-                    return False
-            logger.info(f'Image for course {course.key} successfully updated in {data_field} field')
-            return True
-        else:
-            msg = 'Image retrieved for course [%s] from [%s] has an unknown content type [%s] and will not be saved.'
-            logger.error(msg, course.key, image_url, content_type)
 
+def download_and_save_course_image(course, image_url, data_field='image', headers=None):
+    """
+    Helper method to download an image from a provided image url and save it
+    in the data field mentioned, defaulting to course card image.
+    """
+    try:
+        image = download_course_image(course.key, image_url, headers=headers)
+        return bool(image) and save_course_image(course, image_url, *image, data_field=data_field)
     except Exception:  # pylint: disable=broad-except
         logger.exception('An unknown exception occurred while downloading image for course [%s]', course.key)
     return False
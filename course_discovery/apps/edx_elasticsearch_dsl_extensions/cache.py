@@ -0,0 +1,99 @@
+import hashlib
+import itertools
+import uuid
+import zlib
+from array import array
+
+from django.conf import settings
+from django.core.cache import cache
+from elasticsearch_dsl.query import Q as ESDSLQ
+
+SEARCH_RESULTS_CACHE_KEY_PREFIX = 'search_results'
+SEARCH_RESULTS_VERSION_KEY_PREFIX = 'search_results_version'
+# Version shared by all indexes, which is changed whenever the documents of any index may have changed.
+SEARCH_RESULTS_GLOBAL_VERSION_KEY = f'{SEARCH_RESULTS_VERSION_KEY_PREFIX}:__all__'
+
+
+def _get_version_key(index_name):
+    return f'{SEARCH_RESULTS_VERSION_KEY_PREFIX}:{index_name}'
+
+
+def get_search_results_version(index_name):
+    """
+    Returns the current version of the search results of an index.
+
+    The version changes whenever the index is rebuilt or its documents are updated, which
+    invalidates every cached search result keyed with it.
+    """
+    version_keys = [_get_version_key(index_name), SEARCH_RESULTS_GLOBAL_VERSION_KEY]
+    versions = cache.get_many(version_keys)
+
+    missing_versions = {key: uuid.uuid4().hex for key in version_keys if key not in versions}
+    if missing_versions:
+        cache.set_many(missing_versions, None)
+        versions.update(missing_versions)
+
+    return '.'.join(versions[key] for key in version_keys)
+
+
+def invalidate_search_results(index_names=None):
+    """
+    Invalidates the cached search results of the given indexes, or of all indexes if none are given.
+    """
+    if index_names is None:
+        version_keys = [SEARCH_RESULTS_GLOBAL_VERSION_KEY]
+    else:
+        version_keys = [_get_version_key(index_name) for index_name in index_names]
+    cache.set_many({key: uuid.uuid4().hex for key in version_keys}, None)
+
+
+def get_search_results_cache_key(index_name, query):
+    """
+    Returns the key under which the results of a query against an index are cached.
+    """
+    return '{prefix}:{index_name}:{version}:{digest}'.format(
+        prefix=SEARCH_RESULTS_CACHE_KEY_PREFIX,
+        index_name=index_name,
+        version=get_search_results_version(index_name),
+        digest=hashlib.md5(query.encode('utf-8')).hexdigest(),
+    )
+
+
+def encode_pks(pks):
+    """
+    Packs sorted primary keys into compressed deltas, which take a few bits per key for dense id ranges.
+    """
+    deltas = array('q', (pk - previous for previous, pk in zip(itertools.chain((0,), pks), pks)))
+    return zlib.compress(deltas.tobytes())
+
+
+def decode_pks(data):
+    """
+    Unpacks primary keys packed by encode_pks.
+    """
+    deltas = array('q')
+    deltas.frombytes(zlib.decompress(data))
+    return list(itertools.accumulate(deltas))
+
+
+def get_search_pks(es_document, query):
+    """
+    Returns the sorted primary keys of the documents matching a query string.
+
+    Results are cached per index alias and query until the index is rebuilt or its documents
+    are updated. The query is expected to have been normalized with clean_query, so equivalent
+    queries share a cache entry.
+
+    Raises:
+        RequestError: If Elasticsearch can't evaluate the query.
+    """
+    index_name = es_document._index._name  # pylint: disable=protected-access
+    cache_key = get_search_results_cache_key(index_name, query)
+    data = cache.get(cache_key)
+    if data is not None:
+        return decode_pks(data)
+
+    dsl_query = ESDSLQ('query_string', query=query, analyze_wildcard=True)
+    pks = sorted({pk for chunk in es_document.search().query(dsl_query).iter_pk_chunks() for pk in chunk})
+    cache.set(cache_key, encode_pks(pks), settings.SEARCH_RESULTS_CACHE_TIMEOUT)
+    return pks
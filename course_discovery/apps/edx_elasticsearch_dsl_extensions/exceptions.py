@@ -17,3 +17,17 @@ class InvalidQuery(APIException):
         "Request could not be completed due to an incorrect ElasticSearch query parameters"
     )
     default_code = "invalid_query"
+
+
+class SearchUnavailable(APIException):
+    """
+    API exception.
+
+    Raised when Elasticsearch fails to evaluate a query whose results a response depends on,
+    so that the response isn't built as if the query matched nothing.
+    """
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _(
+        "Request could not be completed because ElasticSearch failed to evaluate a query"
+    )
+    default_code = "search_unavailable"
@@ -1,24 +1,63 @@
+import argparse
 import datetime
 import logging
 import time
 from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
 from django.conf import settings
 from django.core.management import CommandError
+from django.db import connection
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django_elasticsearch_dsl.management.commands.search_index import Command as DjangoESDSLCommand
 from django_elasticsearch_dsl.registries import registry
 from elasticsearch_dsl import Mapping
 from elasticsearch_dsl.connections import get_connection
 
 from course_discovery.apps.core.utils import ElasticsearchUtils
+from course_discovery.apps.edx_elasticsearch_dsl_extensions.signals import (
+    index_aliases_updated, index_documents_updated
+)
 
 OLD_AND_NEW_INDEX_NAMES = slice(2, 4)
+# Key of the index mapping metadata recording when the objects in the index were last read from the database.
+LAST_UPDATED_META_KEY = 'last_updated'
+DEFAULT_INCREMENTAL_BATCH_SIZE = 1000
 
 AliasMapper = namedtuple('AliasMapper',
                          'document registered_index new_index_name alias record_count')
 logger = logging.getLogger(__name__)
 
 
+def parse_since(value):
+    since = parse_datetime(value)
+    if since is None:
+        raise argparse.ArgumentTypeError(f'[{value}] is not an ISO 8601 datetime.')
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since, timezone.utc)
+    return since
+
+
+def prepare_documents(document, index_name, pks):
+    """
+    Prepares the bulk index actions of the documents of the objects with the given primary keys.
+
+    Runs in a process of the pool update_index prepares documents in. Like execute_parallel_loader,
+    it closes the database connection copied from the parent process, so the process opens its own.
+    """
+    connection.close()
+
+    doc = document()
+    # The actions are prepared like those of a bulk update, so the data of the objects the prefetch plan can't
+    # load is loaded for the whole slice. The index name is passed in, as the one the document was created
+    # with may not be the new index being populated.
+    actions = list(doc.get_index_actions(doc.get_queryset().filter(pk__in=pks)))
+    for action in actions:
+        action['_index'] = index_name
+    return actions
+
+
 class Command(DjangoESDSLCommand):
     help = 'Manage elasticsearch index.'
     backends = []
@@ -62,6 +101,26 @@ class Command(DjangoESDSLCommand):
             '--disable-change-limit', action='store_true', dest='disable_change_limit',
             help='Disables checks limiting the number of records modified.'
         )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            dest='processes',
+            default=settings.ELASTICSEARCH_DSL_PREPARE_PROCESSES,
+            help='Number of processes to prepare documents in when rebuilding the indexes.'
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            dest='incremental',
+            help='Update the documents of objects modified since the previous run in the live indexes, '
+                 'instead of rebuilding the indexes.'
+        )
+        parser.add_argument(
+            '--since',
+            type=parse_since,
+            help='With --incremental, update the documents of objects modified since this ISO 8601 datetime '
+                 'instead of since the previous run.'
+        )
         parser.add_argument(
             '-u',
             '--using',
@@ -84,7 +143,10 @@ class Command(DjangoESDSLCommand):
 
         self.backends = (specified_backend,) if specified_backend else supported_backends
         models = self._get_models(options['models'])
-        self._update(models, options)
+        if options.get('incremental'):
+            self._update_incremental(models, options)
+        else:
+            self._update(models, options)
 
     def _update(self, models, options):
         """
@@ -94,6 +156,7 @@ class Command(DjangoESDSLCommand):
         The index will be masked with previous one to prevent missing data.
         """
 
+        started = timezone.now()
         alias_mappings = []
         for document in registry.get_documents(models):
             # pylint: disable=protected-access
@@ -127,11 +190,138 @@ class Command(DjangoESDSLCommand):
         for index_alias_mapper in alias_mappings:
             index_alias_mapper.registered_index._name = index_alias_mapper.alias  # pylint: disable=protected-access
 
+        updated_mappings = [mapper for mapper in alias_mappings if mapper.new_index_name not in indexes_pending]
+        for mapper in updated_mappings:
+            self.set_last_updated(conn, mapper.new_index_name, started)
+
+        updated_models = [mapper.document.django.model for mapper in updated_mappings]
+        if updated_models:
+            index_aliases_updated.send(sender=self.__class__, models=updated_models)
+
         if indexes_pending:
             raise CommandError('Sanity check failed for the new index(es): {}'.format(indexes_pending))
 
         return True
 
+    def _populate(self, models, options):
+        """
+        Populate the indexes, preparing the documents in a pool of processes if more than one is requested.
+
+        The primary keys of each model are split into slices, whose documents are prepared by the
+        processes and streamed into a parallel bulk request as soon as they are ready.
+        """
+        processes = options.get('processes') or 1
+        if processes < 2:
+            super()._populate(models, options)
+            return
+
+        for document in registry.get_documents(models):
+            doc = document()
+            index_name = document._index._name  # pylint: disable=protected-access
+            pks = list(doc.get_queryset().prefetch_related(None).order_by('pk').values_list('pk', flat=True))
+            self.stdout.write("Indexing {} '{}' objects in {} processes".format(
+                len(pks), document.django.model.__name__, processes
+            ))
+
+            slice_size = settings.ELASTICSEARCH_DSL_PREPARE_SLICE_SIZE
+            pk_slices = [pks[start:start + slice_size] for start in range(0, len(pks), slice_size)]
+            # Close the connection before forking, so the processes don't share it with this one.
+            connection.close()
+            doc.parallel_bulk(self._prepare_in_processes(document, index_name, pk_slices, processes))
+            if options['refresh']:
+                document._index.refresh()  # pylint: disable=protected-access
+
+    @staticmethod
+    def _prepare_in_processes(document, index_name, pk_slices, processes):
+        """
+        Yields the bulk index actions of the given slices of objects as the processes prepare them.
+
+        At most two slices per process are in flight, so preparation doesn't run far ahead of indexing.
+        """
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            pending = set()
+            for pks in pk_slices:
+                pending.add(executor.submit(prepare_documents, document, index_name, pks))
+                if len(pending) >= processes * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+
+    def _update_incremental(self, models, options):
+        """
+        Update the documents of objects modified since the previous run in the live indexes.
+
+        An object is modified when any of the timestamps listed in the `modified_lookups` of its
+        document changed. Documents of objects which were deleted or are no longer indexed are
+        removed. The indexes keep their aliases, so no sanity check is needed.
+        """
+        conn = get_connection()
+        for document in registry.get_documents(models):
+            index_name = document._index._name  # pylint: disable=protected-access
+            model = document.django.model
+            doc = document()
+
+            started = timezone.now()
+            since = options.get('since') or self.get_last_updated(conn, index_name)
+            if since is None:
+                raise CommandError(
+                    'No previous update of the index [{}] is recorded. '
+                    'Run a full update or pass --since.'.format(index_name)
+                )
+
+            changed_pks = set()
+            for lookup in document.modified_lookups:
+                changed_pks.update(
+                    model.objects.filter(**{f'{lookup}__gte': since}).values_list('pk', flat=True)
+                )
+            indexed_pks = set(doc.get_queryset().prefetch_related(None).values_list('pk', flat=True))
+            document_pks = {pk for chunk in document.search().query('match_all').iter_pk_chunks() for pk in chunk}
+
+            updated_pks = sorted(changed_pks & indexed_pks)
+            deleted_pks = sorted(document_pks - indexed_pks)
+            self.stdout.write("Updating {} and deleting {} '{}' documents modified since {}".format(
+                len(updated_pks), len(deleted_pks), model.__name__, since.isoformat()
+            ))
+
+            batch_size = document.django.queryset_pagination or DEFAULT_INCREMENTAL_BATCH_SIZE
+            for start in range(0, len(updated_pks), batch_size):
+                queryset = doc.get_queryset().filter(pk__in=updated_pks[start:start + batch_size])
+                doc.update(queryset, parallel=options['parallel'], refresh=options['refresh'])
+            if deleted_pks:
+                doc.bulk(
+                    ({'_op_type': 'delete', '_index': index_name, '_id': pk} for pk in deleted_pks),
+                    raise_on_error=False,
+                )
+
+            self.set_last_updated(conn, index_name, started)
+            if updated_pks or deleted_pks:
+                # Receivers cache search results under a new version, so the changes must be searchable first.
+                document._index.refresh()  # pylint: disable=protected-access
+                index_documents_updated.send(sender=model, pks=sorted(updated_pks + deleted_pks))
+
+    @staticmethod
+    def get_last_updated(conn, index_name):
+        """
+        Returns when the objects in the index, or the index behind the alias, were last read from the database.
+        """
+        for mapping in conn.indices.get_mapping(index=index_name).values():
+            last_updated = mapping['mappings'].get('_meta', {}).get(LAST_UPDATED_META_KEY)
+            if last_updated:
+                return parse_datetime(last_updated)
+        return None
+
+    @staticmethod
+    def set_last_updated(conn, index_name, timestamp):
+        """
+        Records when the objects in the index were last read from the database.
+        """
+        conn.indices.put_mapping(index=index_name, body={'_meta': {LAST_UPDATED_META_KEY: timestamp.isoformat()}})
+
     @staticmethod
     def percentage_change(current, previous):
         if current == previous:
@@ -9,6 +9,7 @@ from course_discovery.apps.edx_elasticsearch_dsl_extensions.elasticsearch_boost_
 from course_discovery.apps.edx_elasticsearch_dsl_extensions.response import DSLResponse
 
 DEFAULT_SIZE = 10
+DEFAULT_PK_CHUNK_SIZE = 10000
 
 
 class Search(OriginSearch):
@@ -41,6 +42,28 @@ class Search(OriginSearch):
 
         return query_dict
 
+    def iter_pk_chunks(self, chunk_size=None):
+        """
+        Yields the primary keys of all matching documents, one list per request.
+
+        Only the `pk` field is loaded, and the results are walked in `pk` order with `search_after`,
+        so the whole result set is returned rather than the first page of it.
+        """
+        chunk_size = chunk_size or getattr(settings, 'ELASTICSEARCH_DSL_PK_CHUNK_SIZE', DEFAULT_PK_CHUNK_SIZE)
+        search = self.source(['pk']).sort('pk').extra(  # pylint: disable=no-member
+            size=chunk_size, track_total_hits=False
+        )
+        search_after = None
+
+        while True:
+            page = search if search_after is None else search.extra(search_after=search_after)
+            hits = page.execute().hits
+            if hits:
+                yield [hit.pk for hit in hits]
+            if len(hits) < chunk_size:
+                return
+            search_after = list(hits[-1].meta.sort)
+
 
 class FacetedSearch(OriginSearch):
     """
@@ -0,0 +1,44 @@
+from django.dispatch import Signal, receiver
+from django_elasticsearch_dsl.registries import registry
+
+from course_discovery.apps.edx_elasticsearch_dsl_extensions.cache import invalidate_search_results
+
+# Sent by the update_index command once the aliases of the rebuilt indexes point at the new indexes.
+# Arguments: models (list) - the models whose documents were reindexed.
+index_aliases_updated = Signal()
+
+# Sent by the realtime signal processor after the documents of a saved object have been updated.
+# The sender is the model of the saved object. Arguments: instance - the saved object.
+search_documents_updated = Signal()
+
+# Sent by the update_index command, and by the realtime signal processor for the objects saved in a transaction,
+# after the documents of changed objects were updated in the live indexes.
+# The sender is the model of the objects. Arguments: pks (list) - primary keys of the updated or deleted objects.
+index_documents_updated = Signal()
+
+
+@receiver(index_aliases_updated)
+def invalidate_search_results_on_reindex(sender, models, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the cached search results of the rebuilt indexes.
+    """
+    documents = registry.get_documents(models=models)
+    invalidate_search_results([document._index._name for document in documents])  # pylint: disable=protected-access
+
+
+@receiver(index_documents_updated)
+def invalidate_search_results_on_incremental_update(sender, **kwargs):
+    """
+    Invalidate the cached search results of the indexes whose documents were updated.
+    """
+    documents = registry.get_documents(models=[sender])
+    invalidate_search_results([document._index._name for document in documents])  # pylint: disable=protected-access
+
+
+@receiver(search_documents_updated)
+def invalidate_search_results_on_document_update(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the cached search results of all indexes, since the documents of related objects
+    in other indexes are updated along with those of the saved object.
+    """
+    invalidate_search_results()
@@ -0,0 +1,76 @@
+from unittest import mock
+
+import ddt
+from django.core.cache import cache
+from django.test import TestCase
+
+from course_discovery.apps.course_metadata.models import Course, Program
+from course_discovery.apps.course_metadata.search_indexes.documents import CourseDocument, ProgramDocument
+from course_discovery.apps.edx_elasticsearch_dsl_extensions.cache import (
+    decode_pks, encode_pks, get_search_pks, get_search_results_version, invalidate_search_results
+)
+from course_discovery.apps.edx_elasticsearch_dsl_extensions.signals import (
+    index_aliases_updated, search_documents_updated
+)
+
+ITER_PK_CHUNKS_PATH = 'course_discovery.apps.edx_elasticsearch_dsl_extensions.search.Search.iter_pk_chunks'
+
+
+@ddt.ddt
+class SearchResultsCacheTests(TestCase):
+    """ Tests for the cache of search results. """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.course_index = CourseDocument._index._name  # pylint: disable=protected-access
+        self.program_index = ProgramDocument._index._name  # pylint: disable=protected-access
+
+    @ddt.data([], [7], [1, 2, 3, 4, 100000, 100002], list(range(1, 10000)))
+    def test_encode_pks(self, pks):
+        """ Verify primary keys survive encoding. """
+        assert decode_pks(encode_pks(pks)) == pks
+
+    def test_invalidate_search_results(self):
+        """ Verify invalidating an index only changes its version, and invalidating all indexes changes every one. """
+        course_version = get_search_results_version(self.course_index)
+        program_version = get_search_results_version(self.program_index)
+        assert get_search_results_version(self.course_index) == course_version
+
+        invalidate_search_results([self.course_index])
+        assert get_search_results_version(self.course_index) != course_version
+        assert get_search_results_version(self.program_index) == program_version
+
+        course_version = get_search_results_version(self.course_index)
+        invalidate_search_results()
+        assert get_search_results_version(self.course_index) != course_version
+        assert get_search_results_version(self.program_index) != program_version
+
+    def test_signals_invalidate_search_results(self):
+        """ Verify rebuilding an index or updating documents invalidates the cached results. """
+        course_version = get_search_results_version(self.course_index)
+        program_version = get_search_results_version(self.program_index)
+
+        index_aliases_updated.send(sender=self.__class__, models=[Course])
+        assert get_search_results_version(self.course_index) != course_version
+        assert get_search_results_version(self.program_index) == program_version
+
+        search_documents_updated.send(sender=Program, instance=mock.Mock())
+        assert get_search_results_version(self.program_index) != program_version
+
+    def test_get_search_pks(self):
+        """ Verify matching primary keys are searched once, then served from the cache until the index changes. """
+        with mock.patch(ITER_PK_CHUNKS_PATH, return_value=iter([[5, 3], [9]])) as iter_pk_chunks:
+            assert get_search_pks(CourseDocument, '(title:test)') == [3, 5, 9]
+            assert get_search_pks(CourseDocument, '(title:test)') == [3, 5, 9]
+        assert iter_pk_chunks.call_count == 1
+
+        invalidate_search_results([self.program_index])
+        with mock.patch(ITER_PK_CHUNKS_PATH) as iter_pk_chunks:
+            assert get_search_pks(CourseDocument, '(title:test)') == [3, 5, 9]
+        assert not iter_pk_chunks.called
+
+        invalidate_search_results([self.course_index])
+        with mock.patch(ITER_PK_CHUNKS_PATH, return_value=iter([[3]])) as iter_pk_chunks:
+            assert get_search_pks(CourseDocument, '(title:test)') == [3]
+        assert iter_pk_chunks.call_count == 1
@@ -1,15 +1,46 @@
+import datetime
+from concurrent.futures import Future
 from unittest import mock
 
 import pytest
+import pytz
 from django.conf import settings
 from django.core.management import CommandError, call_command
 from django.test import TestCase, override_settings
 from freezegun import freeze_time
 
 from course_discovery.apps.core.tests.mixins import ElasticsearchTestMixin
-from course_discovery.apps.course_metadata.tests.factories import CourseRunFactory, PersonFactory, ProgramFactory
+from course_discovery.apps.course_metadata.models import Course, CourseRun, Person
+from course_discovery.apps.course_metadata.search_indexes.documents import (
+    CourseDocument, CourseRunDocument, PersonDocument
+)
+from course_discovery.apps.course_metadata.tests.factories import (
+    CourseFactory, CourseRunFactory, OrganizationFactory, PersonFactory, ProgramFactory
+)
+from course_discovery.apps.edx_elasticsearch_dsl_extensions.management.commands.update_index import prepare_documents
+from course_discovery.apps.edx_elasticsearch_dsl_extensions.signals import index_documents_updated
 from course_discovery.apps.edx_elasticsearch_dsl_extensions.tests.mixins import SearchIndexTestMixin
 
+UPDATE_INDEX_PATH = 'course_discovery.apps.edx_elasticsearch_dsl_extensions.management.commands.update_index'
+
+
+class SynchronousExecutor:
+    """ Stands in for a process pool, running the submitted functions in the test's database transaction. """
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
 
 @override_settings(ELASTICSEARCH_DSL_SIGNAL_PROCESSOR='django_elasticsearch_dsl.signals.BaseSignalProcessor')
 class UpdateIndexTests(ElasticsearchTestMixin, SearchIndexTestMixin, TestCase):
@@ -65,3 +96,126 @@ class UpdateIndexTests(ElasticsearchTestMixin, SearchIndexTestMixin, TestCase):
                         'update_index.Command.sanity_check_new_index') as mock_sanity_check_new_index:
             call_command('update_index', disable_change_limit=True)
             assert not mock_sanity_check_new_index.called
+
+    def test_incremental_requires_previous_update(self):
+        """ Verify an incremental update fails if no previous update of the index is recorded. """
+        with pytest.raises(CommandError):
+            call_command('update_index', '--incremental', '--models', 'course_metadata.person')
+
+    def test_incremental(self):
+        """ Verify an incremental update reindexes modified objects and removes deleted ones in the live index. """
+        person, deleted_person = PersonFactory.create_batch(2)
+        with freeze_time('2016-06-21'):
+            call_command('update_index', '--models', 'course_metadata.person', disable_change_limit=True)
+        index_name = PersonDocument._index._name  # pylint: disable=protected-access
+
+        with freeze_time('2016-06-22'):
+            new_person = PersonFactory()
+            person.save()
+        Person.objects.filter(pk=person.pk).update(given_name='Stale', family_name='')
+        deleted_person.delete()
+
+        receiver = mock.Mock()
+        index_documents_updated.connect(receiver, sender=Person)
+        try:
+            call_command('update_index', '--incremental', '--models', 'course_metadata.person', refresh=True)
+        finally:
+            index_documents_updated.disconnect(receiver, sender=Person)
+
+        # The alias still points at the index built by the full update.
+        assert list(self.conn.indices.get_alias(name=index_name)) == [f'{index_name}_20160621_000000']
+        documents = {hit.pk: hit for hit in PersonDocument.search().query('match_all')}
+        assert set(documents) == {person.pk, new_person.pk}
+        assert documents[person.pk].full_name == 'Stale'
+        receiver.assert_called_once_with(
+            signal=index_documents_updated,
+            sender=Person,
+            pks=sorted([person.pk, new_person.pk, deleted_person.pk]),
+        )
+
+        # Objects modified before the previous incremental update aren't reindexed again.
+        Person.objects.filter(pk=person.pk).update(given_name='Staler', family_name='')
+        call_command('update_index', '--incremental', '--models', 'course_metadata.person', refresh=True)
+        document = PersonDocument.search().query('match_all').filter('term', pk=person.pk).execute()[0]
+        assert document.full_name == 'Stale'
+
+    def test_incremental_searchable_before_signal(self):
+        """ Verify the updated documents are searchable when receivers are notified, even without --refresh. """
+        person = PersonFactory()
+        with freeze_time('2016-06-21'):
+            call_command('update_index', '--models', 'course_metadata.person', disable_change_limit=True)
+
+        with freeze_time('2016-06-22'):
+            person.save()
+        Person.objects.filter(pk=person.pk).update(given_name='Renamed', family_name='')
+
+        full_names = []
+
+        def receiver(**kwargs):  # pylint: disable=unused-argument
+            full_names.extend(hit.full_name for hit in PersonDocument.search().query('match_all'))
+
+        index_documents_updated.connect(receiver, sender=Person)
+        try:
+            call_command('update_index', '--incremental', '--models', 'course_metadata.person')
+        finally:
+            index_documents_updated.disconnect(receiver, sender=Person)
+
+        assert full_names == ['Renamed']
+
+    def test_incremental_related_object(self):
+        """ Verify an incremental update reindexes the objects whose documents embed a modified related object. """
+        organization = OrganizationFactory(key='org', name='Old name')
+        course = CourseFactory()
+        course.authoring_organizations.add(organization)
+        with freeze_time('2016-06-21'):
+            call_command('update_index', '--models', 'course_metadata.course', disable_change_limit=True)
+
+        with freeze_time('2016-06-22'):
+            organization.name = 'New name'
+            organization.save()
+        # Only the organization changed since the previous update, not the course itself.
+        previous_update = datetime.datetime(2016, 6, 20, tzinfo=pytz.UTC)
+        Course.everything.filter(pk=course.pk).update(modified=previous_update, data_modified_timestamp=previous_update)
+
+        call_command('update_index', '--incremental', '--models', 'course_metadata.course', refresh=True)
+
+        document = CourseDocument.search().query('match_all').filter('term', pk=course.pk).execute()[0]
+        assert list(document.authoring_organizations) == ['org: New name']
+
+    def test_incremental_since(self):
+        """ Verify documents of course runs which are no longer indexed are removed, starting from the given time. """
+        course_run = CourseRunFactory()
+        call_command('update_index', '--models', 'course_metadata.courserun', disable_change_limit=True)
+        CourseRun.objects.filter(pk=course_run.pk).update(draft=True)
+
+        call_command(
+            'update_index', '--incremental', '--models', 'course_metadata.courserun', '--since', '2016-06-21',
+            refresh=True,
+        )
+
+        assert CourseRunDocument.search().query('match_all').count() == 0
+
+    @mock.patch(UPDATE_INDEX_PATH + '.connection')
+    def test_prepare_documents(self, mock_connection):
+        """ Verify the bulk actions of the given objects are prepared with a connection of their own. """
+        person, __ = PersonFactory.create_batch(2)
+
+        actions = prepare_documents(PersonDocument, 'person_index', [person.pk])
+
+        assert mock_connection.close.called
+        assert [(action['_index'], action['_id'], action['_source']['uuid']) for action in actions] == [
+            ('person_index', person.pk, person.uuid)
+        ]
+
+    @override_settings(ELASTICSEARCH_DSL_PREPARE_SLICE_SIZE=2)
+    @mock.patch(UPDATE_INDEX_PATH + '.connection')
+    @mock.patch(UPDATE_INDEX_PATH + '.ProcessPoolExecutor', SynchronousExecutor)
+    def test_populate_in_processes(self, __):
+        """ Verify documents prepared in slices by a pool of processes are all indexed. """
+        people = PersonFactory.create_batch(5)
+
+        call_command('update_index', '--models', 'course_metadata.person', processes=2, refresh=True,
+                     disable_change_limit=True)
+
+        indexed_pks = {hit.pk for hit in PersonDocument.search().query('match_all')}
+        assert indexed_pks == {person.pk for person in people}
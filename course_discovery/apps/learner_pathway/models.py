@@ -53,7 +53,8 @@ class LearnerPathwayNode(models.Model, metaclass=AbstractModelMeta):
     def get_nodes(cls, step):
         nodes = []
         for node_class in cls.get_subclasses():
-            nodes += node_class.objects.filter(step=step).all()
+            # Read through the reverse relation of the step, so nodes prefetched along with the step are reused.
+            nodes += getattr(step, f'{node_class._meta.model_name}_set').all()
         return nodes
 
     @classmethod
@@ -41,7 +41,9 @@ class DiscoveryCourseMetadataProvider(CourseMetadataProvider):
         Get list of courses matching the given course UUIDs and return them in the form of a dict.
         """
         courses = Course.everything.filter(uuid__in=course_ids).distinct()
-        contentful_data = fetch_and_transform_bootcamp_contentful_data()
+        contentful_data = fetch_and_transform_bootcamp_contentful_data(
+            product_uuids=[str(course_id) for course_id in course_ids]
+        )
         return [{
             'uuid': course.uuid,
             'key': course.key,
@@ -114,7 +116,9 @@ class DiscoveryProgramMetadataProvider(ProgramMetadataProvider):
         Get list of programs matching the given program UUIDs and return them in the form of a dict.
         """
         programs = Program.objects.filter(uuid__in=program_ids).distinct()
-        contentful_data = fetch_and_transform_degree_contentful_data()
+        contentful_data = fetch_and_transform_degree_contentful_data(
+            product_uuids=[str(program_id) for program_id in program_ids]
+        )
         return [{
             'uuid': program.uuid,
             'title': program.title,
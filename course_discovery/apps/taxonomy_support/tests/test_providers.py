@@ -48,17 +48,17 @@ class TaxonomyIntegrationTests(TestCase, LMSAPIClientMixin):
     """
     @mock.patch('course_discovery.apps.taxonomy_support.providers.fetch_and_transform_bootcamp_contentful_data',
                 return_value={})
-    def test_validate_course_metadata(self, _contentful_data):
+    def test_validate_course_metadata(self, mock_contentful_data):
         """
         Validate that there are no integration issues.
         """
         courses = CourseFactory.create_batch(3)
-        course_metadata_validator = CourseMetadataProviderValidator(
-            [str(course.uuid) for course in courses]
-        )
+        course_uuids = [str(course.uuid) for course in courses]
+        course_metadata_validator = CourseMetadataProviderValidator(course_uuids)
 
         # Run all the validations, note that an assertion error will be raised if any of the validation fail.
         course_metadata_validator.validate()
+        mock_contentful_data.assert_any_call(product_uuids=course_uuids)
 
     def test_validate_course_run_metadata(self):
         """
@@ -87,17 +87,17 @@ class TaxonomyIntegrationTests(TestCase, LMSAPIClientMixin):
 
     @mock.patch('course_discovery.apps.taxonomy_support.providers.fetch_and_transform_degree_contentful_data',
                 return_value={})
-    def test_validate_program_metadata(self, _contentful_data):
+    def test_validate_program_metadata(self, mock_contentful_data):
         """
         Validate that there are no integration issues.
         """
         programs = ProgramFactory.create_batch(3)
-        program_metadata_validator = ProgramMetadataProviderValidator(
-            [str(program.uuid) for program in programs]
-        )
+        program_uuids = [str(program.uuid) for program in programs]
+        program_metadata_validator = ProgramMetadataProviderValidator(program_uuids)
 
         # Run all the validations, note that an assertion error will be raised if any of the validation fail.
         program_metadata_validator.validate()
+        mock_contentful_data.assert_any_call(product_uuids=program_uuids)
 
     def test_validate_xblock_metadata(self):
         """
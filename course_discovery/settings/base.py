@@ -174,6 +174,33 @@ PARLER_ENABLE_CACHING = False
 # Determines whether the caching mixin in course_discovery/apps/api/cache.py is used
 USE_API_CACHING = True
 
+# Number of seconds an invalidated API response may still be served while a single worker
+# regenerates it. Set to 0 to regenerate invalidated responses on every request that sees them.
+API_CACHE_STALE_GRACE_PERIOD = 60
+
+# Number of seconds an API response is kept in the cache past its timeout, so that it can still be
+# served while a single worker regenerates it. Set to 0 to drop responses as soon as they expire.
+API_CACHE_STALE_TIMEOUT = 60 * 10
+
+# Number of seconds a worker holds the lock for regenerating a stale API response before
+# another worker may take over.
+API_CACHE_REGENERATION_LOCK_TIMEOUT = 60
+
+# Number of seconds the results of the bulk catalog contains endpoint are cached for each query. Cached
+# results are invalidated as soon as the searched index is rebuilt or its documents are updated.
+QUERY_CONTAINS_CACHE_TIMEOUT = 60 * 5
+
+# Number of course runs the catalog CSV export reads, prefetches and streams at a time.
+CATALOG_CSV_CHUNK_SIZE = 500
+
+# Number of products the Affiliate Window feeds read, prefetch and stream at a time.
+AFFILIATE_WINDOW_FEED_CHUNK_SIZE = 500
+
+# If True, the Affiliate Window feeds are served from compressed files in the default storage, which
+# refresh_course_metadata regenerates after each refresh. Feeds that haven't been generated yet are
+# streamed from the database.
+AFFILIATE_WINDOW_PREGENERATED_FEEDS = False
+
 TIME_ZONE = 'UTC'
 
 USE_I18N = True
@@ -467,6 +494,20 @@ ELASTICSEARCH_DSL_QUERYSET_PAGINATION = 10000
 # whose parameters 'size' and 'from' are not explicitly set.
 ELASTICSEARCH_DSL_LOAD_PER_QUERY = 10000
 
+# Number of primary keys requested at a time when collecting every match of a query from ElasticSearch.
+ELASTICSEARCH_DSL_PK_CHUNK_SIZE = 10000
+
+# Number of processes update_index prepares documents in. With 1, documents are prepared by the command itself.
+ELASTICSEARCH_DSL_PREPARE_PROCESSES = 1
+
+# Number of objects whose documents are prepared at a time, by update_index or one of its processes. Data the
+# prefetch plans can't load along with the objects, like their skills, is loaded once per batch.
+ELASTICSEARCH_DSL_PREPARE_SLICE_SIZE = 500
+
+# Number of seconds the primary keys matching a search query are cached. Cached results are
+# invalidated as soon as the index is rebuilt or its documents are updated.
+SEARCH_RESULTS_CACHE_TIMEOUT = 60 * 60
+
 ELASTICSEARCH_DSL = {
     'default': {'hosts': '127.0.0.1:9200'}
 }
@@ -484,6 +525,9 @@ ELASTICSEARCH_DSL_INDEX_SETTINGS = {'number_of_shards': 1, 'number_of_replicas':
 # If you still want to use please use customized RealTimeSignalProcessor
 # course_discovery.apps.course_metadata.search_indexes.signals.RealTimeSignalProcessor
 ELASTICSEARCH_DSL_SIGNAL_PROCESSOR = 'django_elasticsearch_dsl.signals.BaseSignalProcessor'
+# With the customized RealTimeSignalProcessor, defer the document updates of the objects saved in a
+# transaction until it commits, and send them in one bulk request.
+ELASTICSEARCH_DSL_UPDATE_ON_COMMIT = True
 ELASTICSEARCH_DSL_INDEX_RETENTION_LIMIT = 3
 
 # Update Index Settings
@@ -753,6 +797,10 @@ EVENT_BUS_MESSAGE_DELAY_THRESHOLD_SECONDS = 60
 
 ALGOLIA_INDEX_EXCLUDED_SOURCES = []
 
+# Number of processes algolia_reindex_delta serializes courses and programs in. With 1, they are serialized by the
+# command itself.
+ALGOLIA_REINDEX_PROCESSES = 1
+
 DEGREE_VARIANTS_FIELD_MAP = {}
 
 JOB_DESCRIPTION_PROMPT = 'Generate a description for {job_name} job role.'
@@ -4,6 +4,8 @@ ELASTICSEARCH_DSL = {'default': {'hosts': os.environ.get('TEST_ELASTICSEARCH_URL
 # We use the RealtimeSignalProcessor here to ensure that our index is
 # updated, so that we can search for data that we create in our tests.
 ELASTICSEARCH_DSL_SIGNAL_PROCESSOR = 'course_discovery.apps.course_metadata.search_indexes.signals.RealTimeSignalProcessor'
+# Test cases run in transactions which never commit, so documents are updated as soon as objects are saved.
+ELASTICSEARCH_DSL_UPDATE_ON_COMMIT = False
 ELASTICSEARCH_INDEX_NAMES = {
     'course_discovery.apps.course_metadata.search_indexes.documents.course': 'test_course',
     'course_discovery.apps.course_metadata.search_indexes.documents.course_run': 'test_course_run',